@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+cli.py
+수집/변환/분석 스크립트를 하위 명령 하나로 실행하는 통합 명령행 도구
+
+하위 명령의 모듈(Selenium, pandas, pyarrow 등)은 해당 명령을 실행할 때만 임포트하므로 도움말 출력이나
+잘못된 명령은 즉시 끝납니다. 하위 명령 뒤의 인자는 각 스크립트에 그대로 전달됩니다 (스크립트별 옵션은
+`python cli.py <명령> --help`로 확인).
+
+사용법:
+    python cli.py discover --grid_mode
+    python cli.py crawl --input restaurants/restaurants_MN1.json --headless --parallel
+    python cli.py pipeline --use_tier_based_restaurants --max_reviews 50 --headless --parallel_reviews
+    python cli.py convert --incremental --summaries --workers 0
+    python cli.py analyze --engine duckdb
+
+임포트 시간 확인:
+    python scripts/benchmark_import_time.py
+"""
+
+import argparse
+import importlib
+import sys
+from typing import List, Optional
+
+# 하위 명령 -> (main()을 가진 모듈, 설명)
+COMMANDS = {
+    'discover': ('getRestaurantsInfo', 'Google Places API로 레스토랑 목록 수집 (getRestaurantsInfo.py)'),
+    'crawl': ('getReviews_optimized', '레스토랑 목록 파일의 리뷰 크롤링 (getReviews_optimized.py)'),
+    'pipeline': ('main', '그리드별 레스토랑 수집 + 리뷰 크롤링 전체 파이프라인 (main.py)'),
+    'convert': ('scripts.convert_reviews_to_parquet', '리뷰 JSON을 Parquet으로 변환 (scripts/convert_reviews_to_parquet.py)'),
+    'analyze': ('scripts.analyze_parquet_reviews', 'Parquet 리뷰 데이터 분석 (scripts/analyze_parquet_reviews.py)'),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """하위 명령 목록 도움말용 파서 (하위 명령의 옵션은 각 스크립트가 처리)"""
+    parser = argparse.ArgumentParser(
+        prog='cli.py',
+        description='NYC 레스토랑 리뷰 수집/변환/분석 통합 명령행 도구',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="하위 명령별 옵션: python cli.py <명령> --help"
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='명령', required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        subparsers.add_parser(name, help=help_text, add_help=False)
+    return parser
+
+
+def run_command(name: str, args: List[str]):
+    """
+    하위 명령의 모듈을 임포트하고 main() 실행
+
+    각 스크립트의 main()은 sys.argv를 읽으므로 프로그램 이름을 "cli.py <명령>"으로 바꿔 전달
+
+    Args:
+        name: 하위 명령 (COMMANDS의 키)
+        args: 하위 명령 뒤의 인자
+
+    Returns:
+        main()의 반환값
+    """
+    module_name, _ = COMMANDS[name]
+    module = importlib.import_module(module_name)
+    sys.argv = [f"cli.py {name}", *args]
+    return module.main()
+
+
+def main(argv: Optional[List[str]] = None):
+    """메인 함수"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in COMMANDS:
+        return run_command(argv[0], argv[1:])
+    # 명령이 없거나 도움말/알 수 없는 명령이면 argparse가 사용법을 출력하고 종료
+    build_parser().parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
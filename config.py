@@ -1,12 +1,5 @@
 import os
 from pathlib import Path
-from dotenv import load_dotenv
-
-# .env 파일이 존재하면 해당 파일의 환경 변수를 로드합니다.
-load_dotenv()
-
-# 환경 변수에서 "GOOGLE_MAPS_API_KEY" 값을 가져옵니다.
-API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
 
 # 프로젝트의 기본 경로를 설정합니다.
 # 이 파일(config.py)의 상위 디렉토리를 기본 경로로 사용합니다.
@@ -25,6 +18,15 @@ GRID_INFO_TXT = BASE_DIR / "gridInfo.txt"
 # Parquet 파일 경로
 RESTAURANTS_PARQUET = PARQUET_DATA_DIR / "restaurants.parquet"
 REVIEWS_PARQUET = PARQUET_DATA_DIR / "reviews.parquet"
+# 증분 변환 결과 (원본 JSON 파일별 리뷰 조각과 변환 기록)
+REVIEWS_DATASET_DIR = PARQUET_DATA_DIR / "reviews_dataset"
+CONVERSION_MANIFEST = PARQUET_DATA_DIR / "conversion_manifest.json"
+# borough/grid(/year) 하이브 파티션 리뷰 데이터셋
+REVIEWS_PARTITIONED_DIR = PARQUET_DATA_DIR / "reviews_partitioned"
+# 리뷰 본문/레스토랑 이름 전문 검색 색인 (SQLite FTS5)
+SEARCH_INDEX_DB = PARQUET_DATA_DIR / "search_index.db"
+# 분석 스크립트의 디코딩된 테이블 캐시 (메모리 맵 Arrow IPC 파일)
+ARROW_CACHE_DIR = PARQUET_DATA_DIR / "arrow_cache"
 
 # Tier별 레스토랑 수집 개수 설정
 # grid_tier.csv의 tier 값에 따라 수집할 레스토랑 개수를 지정합니다.
@@ -34,8 +36,27 @@ TIER_RESTAURANT_COUNT = {
     "RES": 25    # 주거 지역
 }
 
-# 디렉토리가 존재하지 않으면 생성
-RESTAURANTS_DIR.mkdir(exist_ok=True)
-REVIEWS_DIR.mkdir(exist_ok=True)
-PARQUET_DATA_DIR.mkdir(exist_ok=True)
-LOG_DIR.mkdir(exist_ok=True)
+
+def ensure_dirs():
+    """
+    데이터/로그 디렉토리가 존재하지 않으면 생성합니다.
+
+    임포트만으로 파일 시스템을 건드리지 않도록 각 스크립트의 main()에서 호출합니다
+    (워커 프로세스나 --help 실행에서는 만들지 않음).
+    """
+    for directory in (RESTAURANTS_DIR, REVIEWS_DIR, PARQUET_DATA_DIR, LOG_DIR):
+        directory.mkdir(exist_ok=True)
+
+
+def __getattr__(name):
+    """
+    API_KEY는 처음 읽을 때 값을 가져옵니다 (python-dotenv 임포트와 .env 로드를 필요할 때까지 미룸).
+
+    .env 파일이 존재하면 해당 파일의 환경 변수를 로드한 뒤 "GOOGLE_MAPS_API_KEY" 값을 사용합니다.
+    """
+    if name == "API_KEY":
+        from dotenv import load_dotenv
+        load_dotenv()
+        globals()["API_KEY"] = os.getenv("GOOGLE_MAPS_API_KEY")
+        return globals()["API_KEY"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,12 +9,9 @@ import time
 import argparse
 import requests
 import config
-from config import API_KEY, TIER_RESTAURANT_COUNT, GRID_TIER_CSV, GRID_INFO_TXT, RESTAURANTS_DIR
+from config import API_KEY, TIER_RESTAURANT_COUNT, GRID_TIER_CSV, GRID_INFO_TXT, RESTAURANTS_DIR, ensure_dirs
 from typing import List, Dict, Optional
 
-if not API_KEY:
-    raise RuntimeError("API_KEY가 설정되어 있지 않습니다. 환경변수 GOOGLE_MAPS_API_KEY를 확인하세요.")
-
 TEXT_SEARCH_URL = "https://maps.googleapis.com/maps/api/place/textsearch/json"
 DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
 
@@ -175,6 +172,10 @@ def main():
     ap.add_argument("--grid_mode", action="store_true", help="gridInfo.txt와 grid_tier.csv를 사용하여 자동으로 모든 그리드 처리")
     args = ap.parse_args()
 
+    if not API_KEY:
+        raise RuntimeError("API_KEY가 설정되어 있지 않습니다. 환경변수 GOOGLE_MAPS_API_KEY를 확인하세요.")
+    ensure_dirs()
+
     if args.grid_mode:
         # Grid 모드: gridInfo.txt와 grid_tier.csv를 읽어서 처리
         print("Grid 모드로 실행합니다...")
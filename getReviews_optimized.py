@@ -9,20 +9,63 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 import re
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import statistics
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 import multiprocessing
+from multiprocessing.util import Finalize
+from config import REVIEWS_DIR
+from utils.shard_planner import CrawlCostModel, order_restaurants_by_cost
+from utils.process_tools import kill_process_tree, process_tree_usage
+from utils.autoscaler import WorkerAutoscaler
+
+# 레스토랑 1곳당 기본 제한 시간(초) - 동의 페이지, implicitly_wait 무한 대기 등으로 멈춘 브라우저 처리
+DEFAULT_RESTAURANT_TIMEOUT = 900
+
+# 브라우저 메모리 관리 기본값 - 오래 실행되는 브라우저의 렌더러 메모리 누적 방지
+DEFAULT_MAX_BROWSER_MB = 1500      # 브라우저 프로세스 트리 메모리 상한(MB), 초과 시 브라우저 재시작
+DEFAULT_MAX_PAGES_PER_BROWSER = 300  # 브라우저 하나로 여는 최대 페이지 수, 도달 시 브라우저 재시작
+TAB_RECYCLE_RATIO = 0.7            # 상한의 이 비율을 넘으면 탭만 새로 열어 렌더러 교체
+# 식당 사이에 지우는 저장소 (쿠키는 유지 - 동의 페이지가 다시 뜨지 않도록)
+CLEARED_STORAGE_TYPES = "appcache,cache_storage,file_systems,indexeddb,local_storage,service_workers,shader_cache,websql"
+CLEARED_ORIGIN = "https://www.google.com"
 
 
 class OptimizedGoogleMapsReviewCrawler:
-    def __init__(self, headless=False, max_reviews=None):
+    def __init__(self, headless=False, max_reviews=None, restaurant_timeout=None,
+                 max_browser_mb=DEFAULT_MAX_BROWSER_MB, max_pages_per_browser=DEFAULT_MAX_PAGES_PER_BROWSER):
         """
         최적화된 구글 맵 리뷰 크롤러 초기화 (안정성 개선)
         
         Args:
             headless (bool): 브라우저를 백그라운드에서 실행할지 여부
             max_reviews (int): 수집할 최대 리뷰 개수
+            restaurant_timeout (float): 레스토랑 1곳당 제한 시간(초). 초과 시 브라우저를 강제 종료하고 재시작
+            max_browser_mb (float): 브라우저 메모리 상한(MB). 상한의 70%를 넘으면 탭 교체, 상한을 넘으면 브라우저 재시작 (None이면 확인 안 함)
+            max_pages_per_browser (int): 브라우저 하나로 여는 최대 페이지 수 (None이면 제한 없음)
         """
+        self.headless = headless
         self.max_reviews = max_reviews
+        self.restaurant_timeout = restaurant_timeout
+        self.max_browser_mb = max_browser_mb
+        self.max_pages_per_browser = max_pages_per_browser
+        self.deadline_exceeded = False  # 마지막 레스토랑이 제한 시간을 초과했는지 여부
+        self.last_error = None          # 마지막 레스토랑의 오류 메시지
+        self._needs_restart = False     # 강제 종료된 브라우저를 다음 식당 전에 재시작해야 하는지 여부
+        self.pages_loaded = 0           # 현재 브라우저로 연 페이지 수
+        # 메모리 관리 통계 (누적)
+        self.recycle_stats = {
+            'restaurants': 0,          # 처리한 식당 수
+            'pages': 0,                # 연 페이지 수
+            'cache_clears': 0,         # 식당 사이 캐시/저장소 정리 횟수
+            'tab_recycles': 0,         # 메모리 경고 수준 초과로 탭 교체
+            'memory_restarts': 0,      # 메모리 상한 초과로 브라우저 재시작
+            'page_limit_restarts': 0,  # 페이지 수 제한으로 브라우저 재시작
+            'crash_restarts': 0,       # 제한 시간 초과/비정상 종료 후 브라우저 재시작
+            'peak_memory_mb': 0.0      # 측정된 최대 브라우저 메모리
+        }
         self.driver = self._setup_driver(headless)
 
     def _setup_driver(self, headless):
@@ -54,427 +97,132 @@ class OptimizedGoogleMapsReviewCrawler:
         driver.implicitly_wait(5)  # 3초 → 5초로 증가 (안정성)
         return driver
 
-    def get_reviews_url(self, place_id):
-        """place_id를 사용하여 구글 맵 URL 생성"""
-        return f"https://www.google.com/maps/place/?q=place_id:{place_id}"
-
-    def click_reviews_tab(self, restaurant_name):
-        """리뷰 탭 클릭 - JavaScript로 직접 클릭"""
-        log_prefix = f"[{restaurant_name}] "
+    def browser_pid(self):
+        """크롬드라이버 프로세스 pid (크롬 브라우저는 이 프로세스의 하위 프로세스)"""
         try:
-            wait = WebDriverWait(self.driver, 7)
-            reviews_button = wait.until(
-                EC.presence_of_element_located((By.XPATH, "//button[contains(@aria-label, '리뷰')]"))
-            )
-            self.driver.execute_script("arguments[0].click();", reviews_button)
-            time.sleep(1.5)
-            print(f"{log_prefix}리뷰 탭 클릭 완료")
-            return True
-        except TimeoutException:
-            print(f"{log_prefix}리뷰 탭을 찾을 수 없습니다.")
-            return False
+            return self.driver.service.process.pid
+        except AttributeError:
+            return None
 
-    def sort_reviews(self, sort_method, restaurant_name):
-        """리뷰 정렬 - 최적화 (안정성 개선)"""
-        log_prefix = f"[{restaurant_name}] "
+    def restart_driver(self):
+        """브라우저를 강제 종료하고 새로 실행"""
+        pid = self.browser_pid()
         try:
-            sort_button = WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, "//button[@aria-label='리뷰 정렬' or contains(@data-value, '정렬')]"))
-            )
-            self.driver.execute_script("arguments[0].click();", sort_button)
-            time.sleep(0.8)
+            self.driver.quit()
+        except Exception:
+            pass
+        kill_process_tree(pid)
+        self.driver = self._setup_driver(self.headless)
+        self.pages_loaded = 0
 
-            if sort_method == 'newest':
-                xpath = "//div[@role='menuitemradio' and contains(.//div, '최신순')]"
-            else:
-                xpath = "//div[@role='menuitemradio' and contains(.//div, '관련성순')]"
-            
-            option = WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, xpath))
-            )
-            self.driver.execute_script("arguments[0].click();", option)
-            time.sleep(1.5)
-            print(f"{log_prefix}{sort_method} 정렬 완료")
+    def browser_alive(self):
+        """브라우저가 살아 있고 명령에 응답하는지 여부"""
+        try:
+            if self.driver.service.process.poll() is not None:
+                return False
+            self.driver.current_window_handle
             return True
-        except (TimeoutException, NoSuchElementException):
-            print(f"{log_prefix}정렬 옵션을 찾을 수 없습니다. 기본 정렬로 진행합니다.")
+        except Exception:
             return False
 
-    def expand_all_reviews_batch(self, review_elements, restaurant_name):
-        """모든 리뷰의 '자세히', '원문보기' 버튼을 배치로 클릭 - JavaScript 사용"""
-        log_prefix = f"[{restaurant_name}] "
-        script = """
-        var reviews = arguments[0];
-        reviews.forEach(function(review) {
-            var detailButtons = review.querySelectorAll("button.w8nwRe");
-            detailButtons.forEach(function(btn) {
-                if (btn.textContent.includes('자세히')) {
-                    btn.click();
-                }
-            });
-            
-            var originalButtons = review.querySelectorAll("button.kyuRq");
-            originalButtons.forEach(function(btn) {
-                if (btn.textContent.includes('원문보기') || btn.textContent.includes('원본 보기')) {
-                    btn.click();
-                }
-            });
-        });
-        """
-        
-        try:
-            self.driver.execute_script(script, review_elements)
-            time.sleep(0.5)
-        except Exception as e:
-            print(f"{log_prefix}배치 확장 중 오류: {str(e)}")
+    def ensure_browser(self):
+        """강제 종료되었거나 죽은 브라우저를 재시작 (식당 처리 전에 호출)"""
+        if self._needs_restart or not self.browser_alive():
+            self.recycle_stats['crash_restarts'] += 1
+            self.restart_driver()
+            self._needs_restart = False
 
-    def extract_reviews_batch(self, review_elements, restaurant_name):
-        """여러 리뷰를 한 번에 배치 처리"""
-        log_prefix = f"[{restaurant_name}] "
-        reviews = []
-        
-        script = """
-        var reviews = arguments[0];
-        var results = [];
-        
-        reviews.forEach(function(review) {
-            try {
-                var data = {};
-                
-                var elementsWithId = review.querySelectorAll('[data-review-id]');
-                data.review_id = elementsWithId.length > 0 ? elementsWithId[0].getAttribute('data-review-id') : null;
-                
-                var ratingElement = review.querySelector('span.kvMYJc');
-                if (ratingElement) {
-                    var ariaLabel = ratingElement.getAttribute('aria-label');
-                    var match = ariaLabel.match(/별표\\s+(\\d+)개||(\\d+)\\s+stars?/);
-                    data.rating = match ? parseInt(match[1] || match[2]) : null;
-                }
-                
-                var dateElement = review.querySelector('span.rsqaWe');
-                data.date = dateElement ? dateElement.textContent.trim() : null;
-                
-                var textDiv = review.querySelector('div.MyEned');
-                if (textDiv) {
-                    data.language = textDiv.getAttribute('lang');
-                    var textSpan = textDiv.querySelector('span.wiI7pd');
-                    data.text = textSpan ? textSpan.textContent.trim() : textDiv.textContent.trim();
-                }
-                
-                if (data.text) {
-                    results.push(data);
-                }
-            } catch (e) {
-            }
-        });
-        
-        return results;
+    def browser_memory_mb(self):
         """
-        
-        try:
-            results = self.driver.execute_script(script, review_elements)
-            reviews.extend(results)
-            print(f"{log_prefix}배치 처리: {len(results)}개 리뷰 추출")
-        except Exception as e:
-            print(f"{log_prefix}배치 추출 중 오류: {str(e)}")
-            reviews.extend(self._extract_reviews_fallback(review_elements))
-        
-        return reviews
-
-    def _extract_reviews_fallback(self, review_elements):
-        """JavaScript 실패 시 폴백 메서드"""
-        reviews = []
-        for review_element in review_elements:
-            try:
-                review_data = self._extract_single_review(review_element)
-                if review_data and review_data.get('text'):
-                    reviews.append(review_data)
-            except StaleElementReferenceException:
-                continue
-        return reviews
-
-    def _extract_single_review(self, review_element):
-        """단일 리뷰 추출 (폴백용)"""
-        try:
-            review_id = None
-            try:
-                elements_with_id = review_element.find_elements(By.CSS_SELECTOR, "[data-review-id]")
-                if elements_with_id:
-                    review_id = elements_with_id[0].get_attribute("data-review-id")
-            except:
-                pass
-
-            rating = None
-            try:
-                rating_element = review_element.find_element(By.CSS_SELECTOR, "span.kvMYJc")
-                aria_label = rating_element.get_attribute("aria-label")
-                match = re.search(r'별표\s+(\d+)개|(\d+)\s+stars?', aria_label)
-                if match:
-                    rating = int(match.group(1) or match.group(2))
-            except:
-                pass
-
-            date = None
-            try:
-                date_element = review_element.find_element(By.CSS_SELECTOR, "span.rsqaWe")
-                date = date_element.text.strip()
-            except:
-                pass
-
-            text, lang = None, None
-            try:
-                review_text_div = review_element.find_element(By.CSS_SELECTOR, "div.MyEned")
-                lang = review_text_div.get_attribute("lang")
-                try:
-                    text_span = review_text_div.find_element(By.CSS_SELECTOR, "span.wiI7pd")
-                    text = text_span.text.strip()
-                except:
-                    text = review_text_div.text.strip()
-            except:
-                pass
-
-            if text:
-                return {
-                    "review_id": review_id,
-                    "rating": rating,
-                    "date": date,
-                    "text": text,
-                    "language": lang
-                }
-        except:
-            pass
-        return None
-
-    def smart_scroll(self, scrollable_element, target_count, restaurant_name):
-        """스마트 스크롤 - 목표 개수에 도달하면 조기 종료 (안정성 개선)"""
-        log_prefix = f"[{restaurant_name}] "
-        last_height = 0
-        stale_count = 0
-        max_stale = 20
-        
-        while stale_count < max_stale:
-            current_height = self.driver.execute_script(
-                "return arguments[0].scrollHeight", 
-                scrollable_element
-            )
-            
-            current_reviews = len(self.driver.find_elements(By.CSS_SELECTOR, "div.jJc9Ad"))
-            
-            if target_count and current_reviews >= target_count * 1.5:
-                print(f"{log_prefix}목표 개수 도달: {current_reviews}개")
-                break
-            
-            self.driver.execute_script(
-                "arguments[0].scrollTop = arguments[0].scrollHeight", 
-                scrollable_element
-            )
-            time.sleep(1.2)
-            
-            new_height = self.driver.execute_script(
-                "return arguments[0].scrollHeight", 
-                scrollable_element
-            )
-            
-            if new_height == last_height:
-                stale_count += 1
-            else:
-                stale_count = 0
-            
-            last_height = new_height
-
-    def crawl_reviews_by_sort(self, place_id, restaurant_name, sort_method='newest'):
-        """특정 장소의 리뷰를 특정 정렬 방식으로 크롤링 - 최적화 (안정성 개선)"""
-        log_prefix = f"[{restaurant_name}] "
-        url = self.get_reviews_url(place_id)
-        print(f"{log_prefix}크롤링 시작: {sort_method}")
-
-        self.driver.get(url)
-        time.sleep(2)
-
-        # 리뷰 탭 클릭
-        if not self.click_reviews_tab(restaurant_name):
-            return []
+        브라우저 메모리 사용량(MB)
 
-        # 정렬
-        self.sort_reviews(sort_method, restaurant_name)
+        psutil이 있으면 크롬드라이버 프로세스 트리(브라우저, 렌더러, GPU 프로세스 포함)의 RSS 합계,
+        없으면 CDP Performance.getMetrics의 JS 힙 크기로 근사 (RSS보다 작게 측정됨)
 
-        # 스크롤 컨테이너 찾기
+        Returns:
+            메모리 사용량(MB) 또는 측정 실패 시 None
+        """
+        usage = process_tree_usage(self.browser_pid())
+        if usage is not None:
+            return usage[0] / (1024 * 1024)
         try:
-            scrollable_div = WebDriverWait(self.driver, 7).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div.m6QErb.DxyBCb"))
-            )
-            print(f"{log_prefix}스크롤 컨테이너 찾기 완료")
-        except TimeoutException:
-            print(f"{log_prefix}스크롤 가능한 영역을 찾을 수 없습니다.")
-            return []
-
-        time.sleep(2)
-
-        # 스마트 스크롤로 리뷰 로드
-        target = self.max_reviews if self.max_reviews else 1000
-        self.smart_scroll(scrollable_div, target, restaurant_name)
-
-        # 모든 리뷰 요소 한 번에 가져오기
-        review_elements = self.driver.find_elements(By.CSS_SELECTOR, "div.jJc9Ad")
-        print(f"{log_prefix}총 {len(review_elements)}개 리뷰 요소 발견")
-
-        # 배치로 버튼 확장
-        self.expand_all_reviews_batch(review_elements, restaurant_name)
-
-        # 배치로 리뷰 데이터 추출
-        reviews = self.extract_reviews_batch(review_elements, restaurant_name)
-
-        # 최대 개수 제한
-        if self.max_reviews and len(reviews) > self.max_reviews:
-            reviews = reviews[:self.max_reviews]
-
-        print(f"{log_prefix}총 {len(reviews)}개의 리뷰를 수집했습니다.")
-        return reviews
-
-    def crawl_reviews(self, place_id, restaurant_name):
-        """특정 장소의 리뷰를 최신순과 관련성순으로 모두 크롤링하고 중복 제거"""
-        log_prefix = f"[{restaurant_name}] "
-        print(f"\n{'='*60}")
-        print(f"{log_prefix}리뷰 크롤링 시작")
-        print(f"{'='*60}")
-
-        # 1. 최신순으로 크롤링
-        print(f"{log_prefix}[1단계] 최신순 크롤링 시작...")
-        newest_reviews = self.crawl_reviews_by_sort(place_id, restaurant_name, 'newest')
-        print(f"{log_prefix}[1단계] 최신순 크롤링 완료: {len(newest_reviews)}개")
-
-        # 2. 관련성순으로 크롤링
-        print(f"{log_prefix}[2단계] 관련성순 크롤링 시작...")
-        relevance_reviews = self.crawl_reviews_by_sort(place_id, restaurant_name, 'relevance')
-        print(f"{log_prefix}[2단계] 관련성순 크롤링 완료: {len(relevance_reviews)}개")
-
-        # 3. 중복 제거
-        print(f"{log_prefix}[3단계] 중복 제거 시작...")
-        all_reviews = newest_reviews + relevance_reviews
-
-        # review_id 기반으로 중복 제거
-        seen_ids = set()
-        unique_reviews = []
-        duplicate_count = 0
-
-        for review in all_reviews:
-            review_id = review.get('review_id')
-            if review_id:
-                if review_id not in seen_ids:
-                    seen_ids.add(review_id)
-                    unique_reviews.append(review)
-                else:
-                    duplicate_count += 1
-            else:
-                text_date_key = f"{review.get('text')}_{review.get('date')}"
-                if text_date_key not in seen_ids:
-                    seen_ids.add(text_date_key)
-                    unique_reviews.append(review)
-                else:
-                    duplicate_count += 1
-
-        print(f"{log_prefix}[3단계] 중복 제거 완료: {duplicate_count}개 제거됨")
-        print(f"\n{'='*60}")
-        print(f"{log_prefix}최종 결과: 총 {len(unique_reviews)}개의 고유 리뷰")
-        print(f"{'='*60}\n")
-
-        return unique_reviews
+            self.driver.execute_cdp_cmd('Performance.enable', {})
+            metrics = self.driver.execute_cdp_cmd('Performance.getMetrics', {})
+        except Exception:
+            return None
+        values = {metric['name']: metric['value'] for metric in metrics.get('metrics', [])}
+        if 'JSHeapTotalSize' not in values:
+            return None
+        return values['JSHeapTotalSize'] / (1024 * 1024)
+
+    def clear_browser_state(self):
+        """식당 사이에 HTTP 캐시와 사이트 저장소를 비우고 빈 페이지로 이동 (쿠키는 유지)"""
+        self.driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        self.driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+            'origin': CLEARED_ORIGIN,
+            'storageTypes': CLEARED_STORAGE_TYPES
+        })
+        self.driver.get('about:blank')
+        self.recycle_stats['cache_clears'] += 1
+
+    def recycle_tab(self):
+        """새 탭을 열고 기존 탭을 닫아 렌더러 프로세스 교체 (브라우저 재시작보다 빠름)"""
+        old_handle = self.driver.current_window_handle
+        self.driver.switch_to.new_window('tab')
+        new_handle = self.driver.current_window_handle
+        self.driver.switch_to.window(old_handle)
+        self.driver.close()
+        self.driver.switch_to.window(new_handle)
+        self.recycle_stats['tab_recycles'] += 1
+
+    def govern_memory(self, restaurant_name=None):
+        """
+        식당 처리 후 브라우저 상태 정리 및 메모리/페이지 수 제한 확인
 
-    def crawl_single_restaurant(self, restaurant, output_dir, grid_from_filename):
-        """단일 식당 크롤링 (병렬 처리용)"""
-        name = restaurant['name']
-        place_id = restaurant['place_id']
-        grid = restaurant.get('grid', grid_from_filename or place_id)
-        grid_name = f"{grid}_{name}"
-        log_prefix = f"[{name}] "
-        
-        # 새로운 grid별 디렉토리 경로 생성
-        grid_output_dir = os.path.join(output_dir, grid)
-        os.makedirs(grid_output_dir, exist_ok=True) # 디렉토리 생성
+        - 캐시/저장소 정리
+        - 페이지 수 제한 도달 또는 메모리 상한 초과: 브라우저 재시작
+        - 메모리 경고 수준(상한의 70%) 초과: 탭 교체
+        """
+        log_prefix = f"[{restaurant_name}] " if restaurant_name else ""
+        if self._needs_restart:
+            return  # 다음 식당 전에 어차피 재시작
 
         try:
-            reviews = self.crawl_reviews(place_id, name)
-            review_data = {
-                "name": name,
-                "place_id": place_id,
-                "grid": grid,
-                "address": restaurant.get('address'),
-                "rating": restaurant.get('rating'),
-                "user_ratings_total": restaurant.get('user_ratings_total'),
-                "phone_number": restaurant.get('phone_number'),
-                "reviews": reviews,
-                "reviews_count": len(reviews)
-            }
-
-            # grid별 디렉토리에 파일 저장
-            output_file = os.path.join(grid_output_dir, f"{grid_name}_reviews.json")
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(review_data, f, ensure_ascii=False, indent=4)
-            
-            print(f"\n{'='*60}")
-            print(f"{log_prefix}✓ 저장 완료: {output_file} (리뷰 {len(reviews)}개)")
-            print(f"{'='*60}\n")
-            return len(reviews)
-
+            self.clear_browser_state()
         except Exception as e:
-            print(f"{log_prefix}오류 발생: {str(e)}")
-            error_data = {
-                "name": name,
-                "place_id": place_id,
-                "grid": grid,
-                "error": str(e),
-                "reviews": []
-            }
-            # 오류 발생 시에도 grid별 디렉토리에 저장
-            output_file = os.path.join(grid_output_dir, f"{grid_name}_reviews.json")
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(error_data, f, ensure_ascii=False, indent=4)
-            print(f"{log_prefix}✗ 오류 저장: {output_file}")
-            return 0
-
-    from config import REVIEWS_DIR
-
-
-class OptimizedGoogleMapsReviewCrawler:
-    def __init__(self, headless=False, max_reviews=None):
-        """
-        최적화된 구글 맵 리뷰 크롤러 초기화 (안정성 개선)
-        
-        Args:
-            headless (bool): 브라우저를 백그라운드에서 실행할지 여부
-            max_reviews (int): 수집할 최대 리뷰 개수
-        """
-        self.max_reviews = max_reviews
-        self.driver = self._setup_driver(headless)
-
-    def _setup_driver(self, headless):
-        """크롬 드라이버 설정 - 성능 최적화 (안정성 균형)"""
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument('--headless')
-        
-        # 성능 최적화 옵션들
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_argument('--lang=ko-KR')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--disable-extensions')
-        chrome_options.add_argument('--disable-images')  # 이미지 로딩 비활성화
-        chrome_options.add_argument('--disable-javascript-harmony')
-        chrome_options.add_argument('--disable-notifications')
-        chrome_options.page_load_strategy = 'eager'  # DOM이 로드되면 바로 진행
-        
-        # 이미지, CSS, 폰트 등 불필요한 리소스 차단
-        prefs = {
-            "profile.managed_default_content_settings.images": 2,
-            "profile.default_content_setting_values.notifications": 2,
-        }
-        chrome_options.add_experimental_option("prefs", prefs)
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.implicitly_wait(5)  # 3초 → 5초로 증가 (안정성)
-        return driver
+            print(f"{log_prefix}브라우저 캐시 정리 실패: {e}")
+
+        if self.max_pages_per_browser and self.pages_loaded >= self.max_pages_per_browser:
+            print(f"{log_prefix}페이지 수 제한({self.max_pages_per_browser}) 도달 - 브라우저 재시작")
+            self.recycle_stats['page_limit_restarts'] += 1
+            self.restart_driver()
+            return
+
+        if not self.max_browser_mb:
+            return
+        memory_mb = self.browser_memory_mb()
+        if memory_mb is None:
+            return
+        self.recycle_stats['peak_memory_mb'] = max(self.recycle_stats['peak_memory_mb'], round(memory_mb, 1))
+
+        if memory_mb > self.max_browser_mb:
+            print(f"{log_prefix}브라우저 메모리 {memory_mb:.0f}MB > {self.max_browser_mb:.0f}MB - 브라우저 재시작")
+            self.recycle_stats['memory_restarts'] += 1
+            self.restart_driver()
+        elif memory_mb > self.max_browser_mb * TAB_RECYCLE_RATIO:
+            print(f"{log_prefix}브라우저 메모리 {memory_mb:.0f}MB - 탭 교체")
+            try:
+                self.recycle_tab()
+            except Exception as e:
+                print(f"{log_prefix}탭 교체 실패: {e} - 브라우저 재시작")
+                self.recycle_stats['memory_restarts'] += 1
+                self.restart_driver()
+
+    def _on_deadline(self, restaurant_name):
+        """제한 시간 초과 시 (타이머 스레드에서) 브라우저 강제 종료 - 진행 중인 셀레니움 호출이 즉시 실패함"""
+        self.deadline_exceeded = True
+        print(f"[{restaurant_name}] 제한 시간({self.restaurant_timeout}초) 초과 - 브라우저 강제 종료")
+        kill_process_tree(self.browser_pid())
 
     def get_reviews_url(self, place_id):
         """place_id를 사용하여 구글 맵 URL 생성"""
@@ -711,6 +459,8 @@ class OptimizedGoogleMapsReviewCrawler:
         print(f"{log_prefix}크롤링 시작: {sort_method}")
 
         self.driver.get(url)
+        self.pages_loaded += 1
+        self.recycle_stats['pages'] += 1
         time.sleep(2)
 
         # 리뷰 탭 클릭
@@ -813,9 +563,23 @@ class OptimizedGoogleMapsReviewCrawler:
         # 새로운 grid별 디렉토리 경로 생성
         grid_output_dir = os.path.join(output_dir, grid)
         os.makedirs(grid_output_dir, exist_ok=True) # 디렉토리 생성
+        output_file = os.path.join(grid_output_dir, f"{grid_name}_reviews.json")
+
+        self.ensure_browser()
+        self.recycle_stats['restaurants'] += 1
+
+        self.deadline_exceeded = False
+        self.last_error = None
+        deadline = None
+        if self.restaurant_timeout:
+            deadline = threading.Timer(self.restaurant_timeout, self._on_deadline, args=(name,))
+            deadline.daemon = True
+            deadline.start()
 
         try:
             reviews = self.crawl_reviews(place_id, name)
+            if self.deadline_exceeded:
+                raise TimeoutError(f"제한 시간 {self.restaurant_timeout}초 초과")
             review_data = {
                 "name": name,
                 "place_id": place_id,
@@ -828,10 +592,11 @@ class OptimizedGoogleMapsReviewCrawler:
                 "reviews_count": len(reviews)
             }
 
-            # grid별 디렉토리에 파일 저장
-            output_file = os.path.join(grid_output_dir, f"{grid_name}_reviews.json")
-            with open(output_file, 'w', encoding='utf-8') as f:
+            # grid별 디렉토리에 파일 저장 (임시 파일에 쓴 뒤 교체 - 같은 식당을 동시에 처리하는 중복 실행과 충돌 방지)
+            temp_file = f"{output_file}.{os.getpid()}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
                 json.dump(review_data, f, ensure_ascii=False, indent=4)
+            os.replace(temp_file, output_file)
             
             print(f"\n{'='*60}")
             print(f"{log_prefix}✓ 저장 완료: {output_file} (리뷰 {len(reviews)}개)")
@@ -839,6 +604,9 @@ class OptimizedGoogleMapsReviewCrawler:
             return len(reviews)
 
         except Exception as e:
+            if self.deadline_exceeded:
+                e = TimeoutError(f"제한 시간 {self.restaurant_timeout}초 초과")
+            self.last_error = str(e)
             print(f"{log_prefix}오류 발생: {str(e)}")
             error_data = {
                 "name": name,
@@ -847,13 +615,28 @@ class OptimizedGoogleMapsReviewCrawler:
                 "error": str(e),
                 "reviews": []
             }
-            # 오류 발생 시에도 grid별 디렉토리에 저장
-            output_file = os.path.join(grid_output_dir, f"{grid_name}_reviews.json")
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(error_data, f, ensure_ascii=False, indent=4)
-            print(f"{log_prefix}✗ 오류 저장: {output_file}")
+            # 오류 발생 시에도 grid별 디렉토리에 저장 (다른 실행이 이미 저장한 정상 결과는 덮어쓰지 않음)
+            if os.path.exists(output_file):
+                print(f"{log_prefix}✗ 기존 결과 유지: {output_file}")
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(error_data, f, ensure_ascii=False, indent=4)
+                print(f"{log_prefix}✗ 오류 저장: {output_file}")
+
+            # 강제 종료되었거나 죽은 브라우저는 다음 식당 전에 재시작
+            if self.deadline_exceeded or not self.browser_alive():
+                self._needs_restart = True
             return 0
 
+        finally:
+            if deadline is not None:
+                deadline.cancel()
+            try:
+                self.govern_memory(name)
+            except Exception as e:
+                print(f"{log_prefix}브라우저 정리 실패: {e} - 다음 식당 전에 재시작")
+                self._needs_restart = True
+
     def crawl_all_restaurants(self, restaurants_file, output_dir=REVIEWS_DIR):
         """restaurants.json 파일의 모든 식당 리뷰 크롤링 및 개별 저장"""
         # 파일명에서 grid 추출
@@ -883,28 +666,524 @@ class OptimizedGoogleMapsReviewCrawler:
         return processed_count, total_reviews_count
 
     def close(self):
-        """드라이버 종료"""
+        """드라이버 종료 (여러 번 호출해도 안전)"""
         if self.driver:
-            self.driver.quit()
+            pid = self.browser_pid()
+            try:
+                self.driver.quit()
+            except Exception:
+                # 강제 종료 등으로 응답하지 않는 브라우저는 프로세스를 직접 정리
+                kill_process_tree(pid)
+            self.driver = None
+
+
+def format_recycle_stats(stats):
+    """브라우저 메모리 관리 통계를 한 줄 문자열로 변환"""
+    return (f"브라우저 관리: 식당 {stats['restaurants']}곳, 페이지 {stats['pages']}개, "
+            f"캐시 정리 {stats['cache_clears']}회, 탭 교체 {stats['tab_recycles']}회, "
+            f"재시작 (메모리 {stats['memory_restarts']}회, 페이지 수 {stats['page_limit_restarts']}회, "
+            f"오류/제한 시간 {stats['crash_restarts']}회), 최대 메모리 {stats['peak_memory_mb']:.0f}MB")
+
+
+# 워커 프로세스마다 하나씩 유지하는 크롤러 (식당마다 브라우저를 새로 띄우는 비용 제거)
+_worker_crawler = None
+_worker_crawler_options = None
+
+
+def _get_worker_crawler(crawler_options):
+    """현재 워커 프로세스의 크롤러 반환 (없으면 생성하고 워커 종료 시 브라우저를 닫도록 등록)"""
+    global _worker_crawler, _worker_crawler_options
+    if _worker_crawler is not None and _worker_crawler_options != crawler_options:
+        _worker_crawler.close()
+        _worker_crawler = None
+    if _worker_crawler is None:
+        _worker_crawler = OptimizedGoogleMapsReviewCrawler(**crawler_options)
+        _worker_crawler_options = dict(crawler_options)
+        Finalize(None, _worker_crawler.close, exitpriority=10)
+    return _worker_crawler
+
+
+def browser_memory_mb(browser_pids):
+    """브라우저(크롬드라이버 + 크롬) 프로세스 트리의 RSS 합계(MB), 이미 종료된 브라우저는 0"""
+    total = 0
+    for pid in browser_pids:
+        usage = process_tree_usage(pid)
+        if usage is not None:
+            total += usage[0]
+    return total / (1024 * 1024)
 
 
 def crawl_restaurant_worker(args):
-    """병렬 처리를 위한 워커 함수"""
-    restaurant, output_dir, grid_from_filename, headless, max_reviews = args
-    
-    # 각 워커가 자체 크롤러 인스턴스 생성
-    crawler = OptimizedGoogleMapsReviewCrawler(headless=headless, max_reviews=max_reviews)
-    
+    """병렬 처리를 위한 워커 함수 (워커 프로세스의 브라우저를 여러 식당에 재사용)"""
+    attempt_id, restaurant, output_dir, grid_from_filename, crawler_options, task_status = args
+    started = time.time()
+
+    # 감시자가 멈춘 워커/브라우저를 종료할 수 있도록 pid 기록
+    task_status[attempt_id] = {'pid': os.getpid(), 'browser_pid': None}
+
+    crawler = _get_worker_crawler(crawler_options)
+    crawler.ensure_browser()
+    task_status[attempt_id] = {'pid': os.getpid(), 'browser_pid': crawler.browser_pid()}
+
     try:
         reviews_count = crawler.crawl_single_restaurant(restaurant, output_dir, grid_from_filename)
-        return reviews_count
+        return {
+            'attempt_id': attempt_id,
+            'reviews_count': reviews_count,
+            'error': crawler.last_error,
+            'timed_out': crawler.deadline_exceeded,
+            'elapsed': time.time() - started,
+            'worker_pid': os.getpid(),
+            'browser_pid': crawler.browser_pid(),
+            'recycle_stats': dict(crawler.recycle_stats)
+        }
     finally:
-        crawler.close()
+        # 끝난 작업의 브라우저는 다음 식당에 재사용되므로 감시 대상에서 제외
+        task_status.pop(attempt_id, None)
+
+
+class ParallelCrawlSupervisor:
+    """
+    병렬 크롤링 감시자
+
+    - 워커 수만큼만 작업을 투입하고 as_completed로 끝나는 순서대로 결과를 소비 (입력 순서 대기 없음)
+    - 워커마다 프로세스 1개짜리 풀을 두어 작업을 보낼 워커를 감시자가 고름 (ProcessPoolExecutor 하나로는
+      작업이 아무 워커에나 배정되어 워커를 골라 줄이거나 다시 만들 수 없음)
+    - 레스토랑별 제한 시간: 워커 내부 타이머가 브라우저를 종료하고, 그래도 워커가 응답하지 않으면
+      제한 시간 + 유예 시간 후 워커 프로세스를 종료하고 그 워커만 재생성
+    - 대기 작업이 모두 투입된 뒤 남는 워커가 있으면, 오래 걸리는 작업(straggler)을 중복 실행하여
+      먼저 끝난 결과를 사용
+    - 워커는 브라우저를 여러 식당에 재사용하므로, 워커를 버릴 때 남은 브라우저를 직접 정리
+    - 자동 조정으로 워커 수가 줄면 남는 워커만 종료 (쉬는 워커는 바로, 실행 중인 워커는 작업이 끝난 뒤)하고
+      나머지 워커의 브라우저는 유지. 종료 후 브라우저 메모리가 실제로 줄었는지 확인
+    """
+
+    WATCHDOG_INTERVAL = 5  # 감시 주기(초)
+    MIN_SPECULATION_SECONDS = 60  # 이보다 짧게 실행 중인 작업은 중복 실행하지 않음
+
+    def __init__(self, output_dir, grid_from_filename, headless=False, max_reviews=None, max_workers=2,
+                 restaurant_timeout=DEFAULT_RESTAURANT_TIMEOUT, kill_grace=60, max_retries=1,
+                 speculation=True, straggler_factor=2.0, autoscaler=None,
+                 max_browser_mb=DEFAULT_MAX_BROWSER_MB, max_pages_per_browser=DEFAULT_MAX_PAGES_PER_BROWSER):
+        """
+        Args:
+            output_dir (str): 리뷰 출력 디렉토리
+            grid_from_filename (str): 입력 파일명에서 추출한 그리드 코드
+            headless (bool): 헤드리스 모드 여부
+            max_reviews (int): 식당당 최대 리뷰 수
+            max_workers (int): 워커(브라우저) 수 (autoscaler를 지정하면 autoscaler가 정함)
+            restaurant_timeout (float): 레스토랑 1곳당 제한 시간(초), None이면 제한 없음
+            kill_grace (float): 제한 시간 후 워커 프로세스를 종료하기까지의 유예 시간(초)
+            max_retries (int): 제한 시간 초과 시 재시도 횟수
+            speculation (bool): 오래 걸리는 작업의 중복 실행 여부
+            straggler_factor (float): 완료 작업 중앙 소요 시간의 몇 배를 넘으면 중복 실행할지
+            autoscaler (WorkerAutoscaler): 지정 시 워커 수를 자동 조정
+            max_browser_mb (float): 워커 브라우저 메모리 상한(MB)
+            max_pages_per_browser (int): 워커 브라우저 하나로 여는 최대 페이지 수
+        """
+        self.output_dir = output_dir
+        self.grid_from_filename = grid_from_filename
+        self.headless = headless
+        self.max_reviews = max_reviews
+        self.max_workers = max_workers
+        self.restaurant_timeout = restaurant_timeout
+        self.kill_grace = kill_grace
+        self.max_retries = max_retries
+        self.speculation = speculation
+        self.straggler_factor = straggler_factor
+        self.autoscaler = autoscaler
+        self.crawler_options = {
+            'headless': headless,
+            'max_reviews': max_reviews,
+            'restaurant_timeout': restaurant_timeout,
+            'max_browser_mb': max_browser_mb,
+            'max_pages_per_browser': max_pages_per_browser
+        }
+        self.worker_browsers = {}       # 워커 pid -> 마지막으로 확인한 브라우저 pid
+        self.worker_recycle_stats = {}  # 워커 pid -> 브라우저 메모리 관리 통계 (누적)
+        self.pools = []                 # 워커마다 하나씩 둔 프로세스 1개짜리 풀
+        self.retiring = set()           # 워커 수를 줄여 작업이 끝나면 종료할 풀
+        self.pool_workers = {}          # 풀 -> 워커 pid (작업을 실행한 적이 있는 풀만)
+        self.closed_browsers = []       # 축소로 종료한 워커의 브라우저 (메모리 감소 확인 대기)
+
+        self.stats = {
+            'timeouts': 0,
+            'retries': 0,
+            'worker_kills': 0,
+            'pool_restarts': 0,
+            'speculative_launched': 0,
+            'speculative_won': 0,
+            'workers_retired': 0
+        }
+
+    def active_limit(self):
+        """동시에 실행할 작업(브라우저) 수"""
+        if self.autoscaler is not None:
+            return self.autoscaler.target
+        return self.max_workers
+
+    def _autoscale(self):
+        """실행 중인 워커의 자원 사용량과 처리량으로 동시 실행 수 조정 (줄면 남는 워커 종료)"""
+        if self.autoscaler is None:
+            return
+        worker_pids = []
+        for attempt in self.running.values():
+            status = self.task_status.get(attempt['attempt_id'])
+            if status:
+                worker_pids.append(status['pid'])
+        self.autoscaler.update(worker_pids, sum(self.results.values()))
+        self._check_closed_browsers()
+        self._retire_surplus_workers()
+
+    def _busy_pools(self):
+        return {attempt['executor'] for attempt in self.running.values()}
+
+    def _idle_pool(self):
+        """작업을 보낼 쉬는 워커 (없으면 워커 수가 목표보다 적을 때만 새로 생성, 그래도 없으면 None)"""
+        busy = self._busy_pools()
+        for pool in self.pools:
+            if pool not in busy and pool not in self.retiring:
+                return pool
+        if len(self.pools) - len(self.retiring) >= self.active_limit():
+            return None
+        pool = ProcessPoolExecutor(max_workers=1)
+        self.pools.append(pool)
+        return pool
+
+    def _retire_surplus_workers(self):
+        """
+        워커 수를 목표에 맞춤
+
+        목표보다 많으면 쉬는 워커부터 바로 종료하고, 모자라면 실행 중인 워커를 작업이 끝난 뒤 종료하도록 표시.
+        목표가 다시 늘면 종료 예정인 워커를 먼저 되살림 (브라우저 유지). 남는 워커만 건드리므로 나머지 워커의
+        브라우저는 그대로 재사용됨
+        """
+        active = [pool for pool in self.pools if pool not in self.retiring]
+        target = self.active_limit()
+        if len(active) < target:
+            for pool in list(self.retiring)[:target - len(active)]:
+                self.retiring.discard(pool)
+            return
+        surplus = len(active) - target
+        if surplus <= 0:
+            return
+        busy = self._busy_pools()
+        idle = [pool for pool in active if pool not in busy]
+        close_now = idle[:surplus]
+        later = [pool for pool in active if pool in busy][:surplus - len(close_now)]
+        self.retiring.update(later)
+        print(f"[감시자] 워커 {len(active)}개 -> {target}개: 쉬는 워커 {len(close_now)}개 종료"
+              + (f", 실행 중인 워커 {len(later)}개는 작업 후 종료" if later else ""))
+        self._close_pools(close_now)
+
+    def _close_pools(self, pools):
+        """
+        워커 종료 (워커 프로세스가 끝나면서 브라우저를 닫음)
+
+        종료 전 브라우저 메모리 합계를 기록해 두고, 브라우저가 모두 닫히면 _check_closed_browsers()에서 비교
+        """
+        if not pools:
+            return
+        before_mb = browser_memory_mb(self.worker_browsers.values())
+        browsers = []
+        for pool in pools:
+            self.pools.remove(pool)
+            self.retiring.discard(pool)
+            pool.shutdown(wait=False)
+            worker_pid = self.pool_workers.pop(pool, None)
+            if worker_pid in self.worker_browsers:
+                browsers.append((worker_pid, self.worker_browsers[worker_pid]))
+        self.stats['workers_retired'] += len(pools)
+        if browsers:
+            self.closed_browsers.append({
+                'browsers': browsers,
+                'before_mb': before_mb,
+                'deadline': time.time() + self.kill_grace
+            })
+
+    def _check_closed_browsers(self):
+        """종료한 워커의 브라우저가 닫혔는지 확인하고 브라우저 메모리가 실제로 줄었는지 비교 (유예 시간 후 남은 것은 강제 종료)"""
+        for closed in list(self.closed_browsers):
+            alive = [browser_pid for _, browser_pid in closed['browsers'] if process_tree_usage(browser_pid) is not None]
+            if alive and time.time() < closed['deadline']:
+                continue
+            # 강제 종료 전에 측정 - 워커가 브라우저를 닫지 못했으면 메모리가 줄지 않아 경고가 출력됨
+            before_mb = closed['before_mb']
+            after_mb = browser_memory_mb(self.worker_browsers.values())
+            if after_mb < before_mb:
+                print(f"[자동 조정] 워커 {len(closed['browsers'])}개 종료: "
+                      f"브라우저 메모리 {before_mb:.0f}MB -> {after_mb:.0f}MB")
+            else:
+                print(f"[자동 조정] ⚠️ 워커 {len(closed['browsers'])}개를 종료했지만 브라우저 메모리가 줄지 않음 "
+                      f"({before_mb:.0f}MB -> {after_mb:.0f}MB, 닫히지 않은 브라우저 {len(alive)}개 강제 종료)")
+            for worker_pid, browser_pid in closed['browsers']:
+                kill_process_tree(browser_pid)
+                self.worker_browsers.pop(worker_pid, None)
+            self.closed_browsers.remove(closed)
+
+    def _shutdown_pools(self, wait):
+        """모든 워커 종료"""
+        for pool in self.pools:
+            pool.shutdown(wait=wait, cancel_futures=not wait)
+        self.pools = []
+        self.retiring = set()
+        self.pool_workers = {}
+
+    def run(self, restaurants):
+        """
+        모든 식당 크롤링
+
+        Returns:
+            (리뷰를 수집한 식당 수, 총 리뷰 수)
+        """
+        self.restaurants = restaurants
+        self.pending = list(range(len(restaurants)))  # 앞에서부터 투입
+        self.running = {}          # future -> attempt 정보
+        self.attempt_counts = {}   # task -> 시도 횟수 (중복 실행 제외)
+        self.speculated = set()    # 중복 실행을 이미 시작한 task
+        self.results = {}          # task -> 리뷰 수 (완료된 task)
+        self.durations = []        # 정상 완료 작업의 소요 시간
+        self._next_attempt_id = 0
+
+        with multiprocessing.Manager() as manager:
+            self.task_status = manager.dict()
+            try:
+                while self.pending or self.running:
+                    self._fill_slots()
+                    self._speculate()
+                    try:
+                        # 끝난 작업 하나를 처리하면 바로 빈 슬롯을 채우러 돌아감
+                        for future in as_completed(list(self.running), timeout=self.WATCHDOG_INTERVAL):
+                            self._handle_completed(future)
+                            break
+                    except FuturesTimeoutError:
+                        pass
+                    self._track_browsers()
+                    self._watchdog()
+                    self._autoscale()
+                # 워커 종료 시 각 워커가 자기 브라우저를 닫음 - 그래도 남은 브라우저는 직접 정리
+                self._shutdown_pools(wait=True)
+                self._kill_worker_browsers()
+            except BaseException:
+                self._kill_running()
+                self._shutdown_pools(wait=False)
+                self._kill_worker_browsers()
+                raise
+
+        processed_count = sum(1 for count in self.results.values() if count > 0)
+        total_reviews_count = sum(self.results.values())
+        return processed_count, total_reviews_count
+
+    def _submit(self, pool, task, speculative=False):
+        attempt_id = self._next_attempt_id
+        self._next_attempt_id += 1
+        args = (attempt_id, self.restaurants[task], self.output_dir, self.grid_from_filename,
+                self.crawler_options, self.task_status)
+        future = pool.submit(crawl_restaurant_worker, args)
+        self.running[future] = {
+            'attempt_id': attempt_id,
+            'executor': pool,
+            'task': task,
+            'submitted': time.time(),
+            'speculative': speculative,
+            'killed': False
+        }
+        if not speculative:
+            self.attempt_counts[task] = self.attempt_counts.get(task, 0) + 1
+
+    def _fill_slots(self):
+        while self.pending and len(self.running) < self.active_limit():
+            pool = self._idle_pool()
+            if pool is None:
+                break  # 종료 예정인 워커가 아직 작업 중
+            task = self.pending.pop(0)
+            if task not in self.results:
+                self._submit(pool, task)
+
+    def _task_name(self, task):
+        return self.restaurants[task].get('name', str(task))
+
+    def _kill_attempt(self, attempt, kill_worker=False):
+        """시도 중인 작업의 브라우저(필요 시 워커 프로세스까지) 강제 종료"""
+        status = self.task_status.get(attempt['attempt_id'])
+        if not status:
+            return
+        kill_process_tree(status.get('browser_pid'))
+        if kill_worker:
+            kill_process_tree(status.get('pid'))
+
+    def _kill_running(self):
+        for attempt in self.running.values():
+            self._kill_attempt(attempt, kill_worker=True)
+
+    def _track_browsers(self):
+        """실행 중인 작업의 워커별 브라우저 pid 기록 (워커 풀을 버릴 때 정리용)"""
+        for attempt in self.running.values():
+            status = self.task_status.get(attempt['attempt_id'])
+            if status:
+                self.pool_workers[attempt['executor']] = status['pid']
+            if status and status.get('browser_pid'):
+                self.worker_browsers[status['pid']] = status['browser_pid']
+
+    def _kill_worker_browsers(self):
+        """기록된 워커 브라우저 중 아직 남아 있는 것을 강제 종료 (강제 종료된 워커는 브라우저를 닫지 못함)"""
+        for browser_pid in self.worker_browsers.values():
+            kill_process_tree(browser_pid)
+        self.worker_browsers = {}
+
+    def _retry_or_give_up(self, task, reason):
+        """제한 시간 초과 등으로 실패한 작업 재시도 여부 결정"""
+        if task in self.results or any(a['task'] == task for a in self.running.values()):
+            return  # 다른 시도가 이미 성공했거나 진행 중
+        if self.attempt_counts.get(task, 0) <= self.max_retries:
+            self.stats['retries'] += 1
+            print(f"[감시자] [{self._task_name(task)}] {reason} - 재시도 예정")
+            self.pending.insert(0, task)
+        else:
+            print(f"[감시자] [{self._task_name(task)}] {reason} - 재시도 횟수 초과, 건너뜀")
+            self.results[task] = 0
+
+    def _handle_completed(self, future):
+        attempt = self.running.pop(future)
+        task = attempt['task']
+        try:
+            result = future.result()
+        except BrokenProcessPool:
+            self._replace_worker(attempt)
+            return
+        except Exception as e:
+            print(f"[감시자] [{self._task_name(task)}] 워커 오류: {e}")
+            self._retry_or_give_up(task, "워커 오류")
+            if attempt['executor'] in self.retiring:
+                self._close_pools([attempt['executor']])
+            return
+
+        self.worker_browsers[result['worker_pid']] = result['browser_pid']
+        self.pool_workers[attempt['executor']] = result['worker_pid']
+        self.worker_recycle_stats[result['worker_pid']] = result['recycle_stats']
+        if attempt['executor'] in self.retiring:
+            self._close_pools([attempt['executor']])
+
+        if task in self.results:
+            return  # 중복 실행 중 늦게 끝난 쪽 - 결과 무시
+
+        if result['timed_out']:
+            self.stats['timeouts'] += 1
+            self._retry_or_give_up(task, "제한 시간 초과")
+            return
+
+        self.results[task] = result['reviews_count']
+        if not result['error']:
+            self.durations.append(result['elapsed'])
+        if attempt['speculative']:
+            self.stats['speculative_won'] += 1
+            print(f"[감시자] [{self._task_name(task)}] 중복 실행이 먼저 완료됨")
+
+        # 같은 식당을 처리 중인 나머지 시도는 브라우저를 종료하여 슬롯 반환
+        for other in self.running.values():
+            if other['task'] == task:
+                self._kill_attempt(other)
+
+    def _watchdog(self):
+        """제한 시간 + 유예 시간이 지나도 응답하지 않는 워커 프로세스 종료"""
+        if not self.restaurant_timeout:
+            return
+        now = time.time()
+        hard_limit = self.restaurant_timeout + self.kill_grace
+        for attempt in self.running.values():
+            if attempt['killed'] or now - attempt['submitted'] <= hard_limit:
+                continue
+            print(f"[감시자] [{self._task_name(attempt['task'])}] 워커가 응답하지 않음 "
+                  f"({now - attempt['submitted']:.0f}초) - 워커 프로세스 종료")
+            attempt['killed'] = True
+            self.stats['worker_kills'] += 1
+            self._kill_attempt(attempt, kill_worker=True)
+
+    def _replace_worker(self, attempt):
+        """
+        워커 프로세스가 종료되어 깨진 워커를 버리고, 진행 중이던 작업을 다시 투입
+
+        워커마다 풀이 따로 있으므로 다른 워커에서 실행 중인 작업은 그대로 둠 (새 워커는 빈 슬롯을 채울 때 생성)
+        """
+        self.stats['pool_restarts'] += 1
+        pool = attempt['executor']
+        print(f"[감시자] [{self._task_name(attempt['task'])}] 워커 프로세스 종료 - 워커 재생성")
+        pool.shutdown(wait=False, cancel_futures=True)
+        if pool in self.pools:
+            self.pools.remove(pool)
+        self.retiring.discard(pool)
+        # 강제 종료된 워커는 브라우저를 닫지 못하므로 직접 정리
+        worker_pid = self.pool_workers.pop(pool, None)
+        kill_process_tree(self.worker_browsers.pop(worker_pid, None))
+
+        task = attempt['task']
+        if attempt['killed']:
+            self.stats['timeouts'] += 1
+            self._retry_or_give_up(task, "제한 시간 초과 (워커 종료)")
+        elif task not in self.results and task not in self.pending:
+            # 워커 오류로 중단된 작업은 시도 횟수에 포함하지 않고 다시 투입
+            if not attempt['speculative']:
+                self.attempt_counts[task] -= 1
+            self.pending.insert(0, task)
+
+    def _speculate(self):
+        """대기 작업이 없고 남는 슬롯이 있으면 오래 걸리는 작업을 중복 실행"""
+        if not self.speculation or self.pending or len(self.durations) < 3:
+            return
+        free_slots = self.active_limit() - len(self.running)
+        if free_slots <= 0:
+            return
+
+        threshold = max(statistics.median(self.durations) * self.straggler_factor,
+                        self.MIN_SPECULATION_SECONDS)
+        now = time.time()
+        stragglers = sorted(
+            (a for a in self.running.values()
+             if not a['speculative'] and not a['killed'] and a['task'] not in self.speculated
+             and now - a['submitted'] > threshold),
+            key=lambda a: a['submitted']
+        )
+        for attempt in stragglers[:free_slots]:
+            pool = self._idle_pool()
+            if pool is None:
+                break
+            task = attempt['task']
+            self.speculated.add(task)
+            self.stats['speculative_launched'] += 1
+            print(f"[감시자] [{self._task_name(task)}] {now - attempt['submitted']:.0f}초째 실행 중 "
+                  f"(기준 {threshold:.0f}초) - 남는 워커에서 중복 실행")
+            self._submit(pool, task, speculative=True)
+
+    def recycle_stats(self):
+        """모든 워커의 브라우저 메모리 관리 통계 합계"""
+        totals = {}
+        for stats in self.worker_recycle_stats.values():
+            for key, value in stats.items():
+                if key == 'peak_memory_mb':
+                    totals[key] = max(totals.get(key, 0.0), value)
+                else:
+                    totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def print_stats(self):
+        print(f"감시자 통계: 제한 시간 초과 {self.stats['timeouts']}회, 재시도 {self.stats['retries']}회, "
+              f"워커 종료 {self.stats['worker_kills']}회, 워커 재생성 {self.stats['pool_restarts']}회, "
+              f"중복 실행 {self.stats['speculative_launched']}회 (먼저 완료 {self.stats['speculative_won']}회)")
+        if self.autoscaler is not None:
+            levels = ", ".join(f"{level}개: {rate:.2f}" for level, rate in sorted(self.autoscaler.throughput_by_level.items()))
+            print(f"자동 조정: 최종 워커 {self.autoscaler.target}개, 워커 수별 처리량(리뷰/초) {levels or '측정 없음'}, "
+                  f"축소로 종료한 워커 {self.stats['workers_retired']}개")
+        if self.worker_recycle_stats:
+            print(format_recycle_stats(self.recycle_stats()))
 
 
 def crawl_all_restaurants_parallel(restaurants_file, output_dir=REVIEWS_DIR, headless=False, 
-                                   max_reviews=None, max_workers=2):
-    """병렬 처리로 여러 식당을 동시에 크롤링"""
+                                   max_reviews=None, max_workers=2,
+                                   restaurant_timeout=DEFAULT_RESTAURANT_TIMEOUT, kill_grace=60,
+                                   max_retries=1, speculation=True, straggler_factor=2.0,
+                                   autoscaler=None, max_browser_mb=DEFAULT_MAX_BROWSER_MB,
+                                   max_pages_per_browser=DEFAULT_MAX_PAGES_PER_BROWSER):
+    """병렬 처리로 여러 식당을 동시에 크롤링 (감시자가 멈춘 워커와 오래 걸리는 작업 처리)"""
     # 파일명에서 grid 추출
     filename = os.path.basename(restaurants_file)
     match = re.search(r"restaurants_(.+?)\.json", filename)
@@ -919,23 +1198,18 @@ def crawl_all_restaurants_parallel(restaurants_file, output_dir=REVIEWS_DIR, hea
         os.makedirs(output_dir)
         print(f"디렉토리 생성: {output_dir}")
 
-    # 병렬 처리 준비
-    args_list = [
-        (restaurant, output_dir, grid_from_filename, headless, max_reviews)
-        for restaurant in restaurants
-    ]
+    # 예상 시간이 긴 레스토랑부터 투입 (LPT) - 마지막에 큰 레스토랑 하나만 남는 꼬리 지연 감소
+    restaurants = order_restaurants_by_cost(restaurants, CrawlCostModel(max_reviews=max_reviews))
 
-    total_reviews_count = 0
-    processed_count = 0
-
-    # ProcessPoolExecutor 사용 (각 프로세스가 독립적인 브라우저 실행)
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        results = executor.map(crawl_restaurant_worker, args_list)
-        
-        for reviews_count in results:
-            if reviews_count > 0:
-                processed_count += 1
-                total_reviews_count += reviews_count
+    supervisor = ParallelCrawlSupervisor(
+        output_dir, grid_from_filename, headless=headless, max_reviews=max_reviews,
+        max_workers=max_workers, restaurant_timeout=restaurant_timeout, kill_grace=kill_grace,
+        max_retries=max_retries, speculation=speculation, straggler_factor=straggler_factor,
+        autoscaler=autoscaler, max_browser_mb=max_browser_mb,
+        max_pages_per_browser=max_pages_per_browser
+    )
+    processed_count, total_reviews_count = supervisor.run(restaurants)
+    supervisor.print_stats()
 
     return processed_count, total_reviews_count
 
@@ -954,6 +1228,28 @@ def main():
                         help='병렬 처리 활성화 (더 빠르지만 리소스 사용 많음)')
     parser.add_argument('--workers', type=int, default=2,
                         help='병렬 처리 시 워커 수 (기본값: 2)')
+    parser.add_argument('--autoscale', action='store_true',
+                        help='메모리/CPU 여유와 처리량에 따라 워커 수 자동 조정 (psutil 필요, --workers는 시작 워커 수)')
+    parser.add_argument('--min_workers', type=int, default=1,
+                        help='자동 조정 시 최소 워커 수 (기본값: 1)')
+    parser.add_argument('--max_workers', type=int, default=None,
+                        help='자동 조정 시 최대 워커 수 (기본값: CPU 코어 수의 절반)')
+    parser.add_argument('--memory_reserve_mb', type=float, default=1024,
+                        help='자동 조정 시 항상 남겨둘 여유 메모리(MB) (기본값: 1024)')
+    parser.add_argument('--restaurant_timeout', type=float, default=DEFAULT_RESTAURANT_TIMEOUT,
+                        help=f'레스토랑 1곳당 제한 시간(초), 0이면 제한 없음 (기본값: {DEFAULT_RESTAURANT_TIMEOUT})')
+    parser.add_argument('--kill_grace', type=float, default=60,
+                        help='제한 시간 후에도 응답 없는 워커를 종료하기까지의 유예 시간(초) (기본값: 60)')
+    parser.add_argument('--max_retries', type=int, default=1,
+                        help='제한 시간 초과 식당 재시도 횟수 (기본값: 1)')
+    parser.add_argument('--no_speculation', action='store_true',
+                        help='오래 걸리는 식당의 중복 실행 비활성화')
+    parser.add_argument('--straggler_factor', type=float, default=2.0,
+                        help='완료 식당 중앙 소요 시간의 몇 배를 넘으면 중복 실행할지 (기본값: 2.0)')
+    parser.add_argument('--max_browser_mb', type=float, default=DEFAULT_MAX_BROWSER_MB,
+                        help=f'브라우저 메모리 상한(MB), 70%% 초과 시 탭 교체, 초과 시 재시작, 0이면 확인 안 함 (기본값: {DEFAULT_MAX_BROWSER_MB})')
+    parser.add_argument('--max_pages_per_browser', type=int, default=DEFAULT_MAX_PAGES_PER_BROWSER,
+                        help=f'브라우저 하나로 여는 최대 페이지 수, 0이면 제한 없음 (기본값: {DEFAULT_MAX_PAGES_PER_BROWSER})')
 
     args = parser.parse_args()
 
@@ -965,27 +1261,51 @@ def main():
     print(f"최대 리뷰 개수: {args.max_reviews if args.max_reviews else '제한 없음'}")
     print(f"헤드리스 모드: {'예' if args.headless else '아니오'}")
     print(f"병렬 처리: {'예 (워커 ' + str(args.workers) + '개)' if args.parallel else '아니오'}")
+    print(f"식당당 제한 시간: {str(int(args.restaurant_timeout)) + '초' if args.restaurant_timeout else '제한 없음'}")
     print("=" * 50)
 
     start_time = time.time()
 
+    autoscaler = None
+    if args.parallel and args.autoscale:
+        max_workers = args.max_workers or max((os.cpu_count() or 2) // 2, args.workers)
+        try:
+            autoscaler = WorkerAutoscaler(min_workers=args.min_workers, max_workers=max_workers,
+                                          initial_workers=args.workers,
+                                          memory_reserve_mb=args.memory_reserve_mb)
+            print(f"워커 자동 조정: {args.min_workers}~{max_workers}개 (시작 {autoscaler.target}개)")
+        except (RuntimeError, ValueError) as e:
+            print(f"워커 자동 조정을 사용할 수 없습니다: {e} - 고정 워커 {args.workers}개로 진행")
+
     try:
         if args.parallel:
             # 병렬 처리
             processed_count, total_reviews = crawl_all_restaurants_parallel(
                 args.input, args.output_dir, args.headless, 
-                args.max_reviews, args.workers
+                args.max_reviews, args.workers,
+                restaurant_timeout=args.restaurant_timeout or None,
+                kill_grace=args.kill_grace,
+                max_retries=args.max_retries,
+                speculation=not args.no_speculation,
+                straggler_factor=args.straggler_factor,
+                autoscaler=autoscaler,
+                max_browser_mb=args.max_browser_mb or None,
+                max_pages_per_browser=args.max_pages_per_browser or None
             )
         else:
             # 순차 처리
             crawler = OptimizedGoogleMapsReviewCrawler(
                 headless=args.headless, 
-                max_reviews=args.max_reviews
+                max_reviews=args.max_reviews,
+                restaurant_timeout=args.restaurant_timeout or None,
+                max_browser_mb=args.max_browser_mb or None,
+                max_pages_per_browser=args.max_pages_per_browser or None
             )
             try:
                 processed_count, total_reviews = crawler.crawl_all_restaurants(
                     args.input, args.output_dir
                 )
+                print(format_recycle_stats(crawler.recycle_stats))
             finally:
                 crawler.close()
 
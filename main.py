@@ -28,6 +28,13 @@ python main.py --grid_file gridInfo.txt --start_from 36 --limit 12 --use_tier_ba
 # 팀원 5: 그리드 48~58 (11개)
 python main.py --grid_file gridInfo.txt --start_from 48 --limit 11 --use_tier_based_restaurants --max_reviews 50 --headless --parallel_reviews
 
+    # 예상 크롤링 시간 기반 샤드 계획으로 분할 (HOT/RES 그리드 작업량 차이 반영)
+    python utils/shard_planner.py --shards 5 --max_reviews 50 --output shard_plan.json
+    python main.py --shard_plan shard_plan.json --shard_index 0 --use_tier_based_restaurants --max_reviews 50 --headless --parallel_reviews
+
+    # 공유 작업 큐 모드 (수동 분할 없이 모든 머신에서 같은 명령 실행)
+    python main.py --grid_file gridInfo.txt --use_tier_based_restaurants --max_reviews 50 --headless --parallel_reviews --queue_db //shared/crawler/work_queue.db
+
     # 특정 그리드만 테스트
     python main.py --grid_file gridInfo.txt --limit 1 --max_restaurants 10 --max_reviews 20
     
@@ -47,7 +54,10 @@ import json
 import csv
 from datetime import datetime
 import config
-from config import TIER_RESTAURANT_COUNT, RESTAURANTS_DIR, REVIEWS_DIR, GRID_TIER_CSV, GRID_INFO_TXT, LOG_DIR
+from config import TIER_RESTAURANT_COUNT, RESTAURANTS_DIR, REVIEWS_DIR, GRID_TIER_CSV, GRID_INFO_TXT, LOG_DIR, ensure_dirs
+from utils.review_io import ReviewFileReader, load_json
+from utils.work_queue import WorkQueue, LeaseHeartbeat, default_worker_id
+from utils.shard_planner import CrawlCostModel, estimate_grid_costs, load_shard_grids
 
 
 class GridBasedPipelineRunner:
@@ -57,6 +67,7 @@ class GridBasedPipelineRunner:
         self.restaurants_dir = args.restaurants_dir
         self.reviews_dir = args.reviews_dir
         self.tier_dict = {}  # tier 정보 저장
+        self.review_reader = ReviewFileReader()  # 리뷰 파일 디코더 (msgspec/orjson/json 중 가장 빠른 것)
 
         # tier 기반 모드가 활성화된 경우 tier 정보 로드
         if args.use_tier_based_restaurants:
@@ -198,10 +209,9 @@ class GridBasedPipelineRunner:
         restaurant_count = 0
         if success and os.path.exists(output_file):
             try:
-                with open(output_file, 'r', encoding='utf-8') as f:
-                    restaurants = json.load(f)
-                    restaurant_count = len(restaurants)
-                    print(f"   수집된 레스토랑: {restaurant_count}개")
+                restaurants = load_json(output_file)
+                restaurant_count = len(restaurants)
+                print(f"   수집된 레스토랑: {restaurant_count}개")
             except:
                 pass
 
@@ -231,22 +241,44 @@ class GridBasedPipelineRunner:
         if self.args.parallel_reviews:
             command.append('--parallel')
             command.extend(['--workers', str(self.args.review_workers)])
+            if self.args.review_autoscale:
+                command.append('--autoscale')
+                command.extend(['--min_workers', str(self.args.review_min_workers)])
+                if self.args.review_max_workers:
+                    command.extend(['--max_workers', str(self.args.review_max_workers)])
+
+        # 레스토랑별 제한 시간 (멈춘 브라우저 강제 종료)
+        if self.args.review_timeout is not None:
+            command.extend(['--restaurant_timeout', str(self.args.review_timeout)])
+
+        # 브라우저 메모리 관리 (탭 교체/브라우저 재시작 기준)
+        if self.args.review_max_browser_mb is not None:
+            command.extend(['--max_browser_mb', str(self.args.review_max_browser_mb)])
+        if self.args.review_max_pages is not None:
+            command.extend(['--max_pages_per_browser', str(self.args.review_max_pages)])
 
         success = self.run_command(command, f"리뷰 수집 [{grid_code}]")
 
         # 수집된 리뷰 수 확인
         total_reviews = 0
         if success:
-            # reviews 디렉토리에서 해당 그리드의 리뷰 파일 찾기
-            review_files = [f for f in os.listdir(self.reviews_dir) if f.startswith(f"{grid_code}_") and f.endswith('_reviews.json')]
+            # reviews/{grid} 디렉토리에서 해당 그리드의 리뷰 파일 찾기
+            grid_reviews_dir = os.path.join(self.reviews_dir, grid_code)
+            review_files = []
+            if os.path.isdir(grid_reviews_dir):
+                review_files = [f for f in os.listdir(grid_reviews_dir) if f.startswith(f"{grid_code}_") and f.endswith('_reviews.json')]
+            error_files = []
             for review_file in review_files:
                 try:
-                    with open(os.path.join(self.reviews_dir, review_file), 'r', encoding='utf-8') as f:
-                        review_data = json.load(f)
-                        total_reviews += review_data.get('reviews_count', 0)
-                except:
-                    pass
+                    review_data = self.review_reader.read(os.path.join(grid_reviews_dir, review_file))
+                    total_reviews += review_data.restaurant['reviews_count']
+                except (OSError, ValueError) as e:  # ReviewFileError 포함
+                    error_files.append(f"{review_file} ({e})")
             print(f"   수집된 리뷰: {total_reviews}개")
+            if error_files:
+                print(f"   ⚠️ 읽을 수 없는 리뷰 파일 {len(error_files)}개:")
+                for error_file in error_files:
+                    print(f"      - {error_file}")
 
         return success, total_reviews
 
@@ -257,6 +289,7 @@ class GridBasedPipelineRunner:
         2. 리뷰 수집
         """
         code = district['code']
+        grid_start = time.time()
 
         print(f"\n\n{'#'*80}")
         print(f"Progress: {current_idx}/{total} ({current_idx*100//total}%)")
@@ -274,7 +307,8 @@ class GridBasedPipelineRunner:
                 'restaurants_success': False,
                 'reviews_success': False,
                 'restaurant_count': 0,
-                'review_count': 0
+                'review_count': 0,
+                'elapsed_seconds': time.time() - grid_start
             }
 
         # Step 2: 리뷰 수집
@@ -286,9 +320,92 @@ class GridBasedPipelineRunner:
             'restaurants_success': restaurants_success,
             'reviews_success': reviews_success,
             'restaurant_count': restaurant_count,
-            'review_count': review_count
+            'review_count': review_count,
+            # 그리드별 소요 시간 (utils/shard_planner.py의 비용 모델 보정에 사용)
+            'elapsed_seconds': time.time() - grid_start
         }
 
+    def estimate_grid_costs(self, districts):
+        """
+        그리드별 예상 크롤링 시간(초) 계산 (utils/shard_planner.py의 비용 모델 사용)
+
+        Returns:
+            Dict[str, float]: {code: 예상 시간(초)}
+        """
+        model = CrawlCostModel(max_reviews=self.args.max_reviews)
+        model.calibrate(LOG_DIR)
+        tier_dict = self.tier_dict or {}
+        max_restaurants = None if self.args.use_tier_based_restaurants else self.args.max_restaurants
+        return estimate_grid_costs([d['code'] for d in districts], model, tier_dict,
+                                   self.restaurants_dir, max_restaurants)
+
+    def process_grids_from_queue(self, districts):
+        """
+        공유 작업 큐에서 그리드를 하나씩 리스하여 처리
+
+        - 모든 인스턴스가 같은 그리드 목록을 등록하지만 이미 등록된 그리드는 무시되므로 안전
+        - 처리 중에는 하트비트로 리스를 연장하고, 인스턴스가 죽으면 리스 만료 후 다른 인스턴스가 재처리
+        - 대기 작업이 없어도 다른 인스턴스가 처리 중인 작업이 남아 있으면 만료 여부를 계속 확인
+
+        Returns:
+            List[Dict]: 이 인스턴스가 처리한 그리드 결과 목록
+        """
+        queue = WorkQueue(self.args.queue_db, max_attempts=self.args.queue_max_attempts)
+        worker_id = self.args.worker_id
+        lease_seconds = self.args.lease_seconds
+
+        # 예상 크롤링 시간이 긴 그리드부터 처리해야 마지막에 큰 작업 하나만 남는 상황을 줄일 수 있음
+        costs = self.estimate_grid_costs(districts)
+        units = [(f"grid:{d['code']}", "grid", d, costs[d['code']]) for d in districts]
+        added = queue.enqueue(units)
+        print(f"\n작업 큐 등록: {added}개 신규 (전체 {len(units)}개 중)")
+
+        results_by_code = {}  # 재시도한 그리드는 마지막 결과만 유지
+        while True:
+            unit = queue.lease(worker_id, lease_seconds)
+            if unit is None:
+                if queue.is_drained():
+                    break
+                counts = queue.counts()
+                print(f"\n대기 작업 없음 - 다른 워커 처리 중 {counts['leased']}개, "
+                      f"{self.args.queue_poll}초 후 다시 확인")
+                time.sleep(self.args.queue_poll)
+                continue
+
+            district = unit['payload']
+            counts = queue.counts()
+            done = counts['done'] + counts['failed']
+            total = sum(counts.values())
+            print(f"\n작업 리스: {unit['unit_id']} (시도 {unit['attempts']}회차)")
+
+            with LeaseHeartbeat(queue, unit['unit_id'], worker_id, lease_seconds) as heartbeat:
+                try:
+                    result = self.process_grid(district, done + 1, total)
+                except Exception as e:
+                    status = queue.fail(unit['unit_id'], worker_id, str(e))
+                    print(f"\n✗ [{district['code']}] 처리 중 오류: {e} (작업 상태: {status})")
+                    continue
+
+            results_by_code[district['code']] = result
+            if result['restaurants_success'] and result['reviews_success']:
+                queue.complete(unit['unit_id'], worker_id, result)
+            else:
+                status = queue.fail(unit['unit_id'], worker_id, "grid pipeline failed")
+                print(f"\n[{district['code']}] 작업 상태: {status}")
+            if heartbeat.lost:
+                print(f"\n경고: [{district['code']}] 처리 중 리스를 잃어 다른 워커가 중복 처리했을 수 있습니다.")
+
+            # API 제한 방지를 위한 대기
+            time.sleep(self.args.delay)
+
+        failed = queue.failed_units()
+        if failed:
+            print(f"\n최종 실패한 작업 ({len(failed)}개):")
+            for unit in failed:
+                print(f"  - {unit['unit_id']}: {unit['last_error']} (시도 {unit['attempts']}회)")
+
+        return list(results_by_code.values())
+
     def print_summary(self, results_list, elapsed_time):
         """최종 결과 요약"""
         self.print_header("실행 결과 요약")
@@ -361,9 +478,21 @@ class GridBasedPipelineRunner:
 
         districts_to_process = districts[start_idx:end_idx]
 
+        # 샤드 계획이 지정되면 해당 샤드의 그리드만 계획 순서대로 처리
+        if self.args.shard_plan:
+            shard_grids = load_shard_grids(self.args.shard_plan, self.args.shard_index)
+            district_by_code = {d['code']: d for d in districts}
+            unknown = [code for code in shard_grids if code not in district_by_code]
+            if unknown:
+                print(f"경고: 샤드 계획의 그리드가 gridInfo에 없습니다: {', '.join(unknown)}")
+            districts_to_process = [district_by_code[code] for code in shard_grids if code in district_by_code]
+
         print(f"\n설정:")
         print(f"  그리드 파일: {self.args.grid_file}")
-        print(f"  처리할 그리드: {len(districts_to_process)}개 (전체 {len(districts)}개 중 {start_idx}~{end_idx-1})")
+        if self.args.shard_plan:
+            print(f"  처리할 그리드: {len(districts_to_process)}개 (샤드 계획 {self.args.shard_plan}의 {self.args.shard_index}번 샤드)")
+        else:
+            print(f"  처리할 그리드: {len(districts_to_process)}개 (전체 {len(districts)}개 중 {start_idx}~{end_idx-1})")
         if self.args.use_tier_based_restaurants:
             # config에서 tier 설정을 동적으로 가져와서 표시
             tier_info = ", ".join([f"{tier}:{count}" for tier, count in TIER_RESTAURANT_COUNT.items()])
@@ -374,18 +503,25 @@ class GridBasedPipelineRunner:
         print(f"  레스토랑당 최대 리뷰: {self.args.max_reviews if self.args.max_reviews else '제한 없음'}")
         print(f"  헤드리스 모드: {'예' if self.args.headless else '아니오'}")
         print(f"  리뷰 병렬 처리: {'예 (워커 ' + str(self.args.review_workers) + '개)' if self.args.parallel_reviews else '아니오'}")
+        if self.args.parallel_reviews and self.args.review_autoscale:
+            print(f"  리뷰 워커 자동 조정: 예 (최소 {self.args.review_min_workers}개, 최대 {self.args.review_max_workers or 'CPU 코어 수의 절반'})")
         print(f"  API 요청 간 대기 시간: {self.args.delay}초")
+        if self.args.queue_db:
+            print(f"  공유 작업 큐: {self.args.queue_db} (워커 ID: {self.args.worker_id})")
 
         # 각 그리드별로 처리
-        results = []
-        for idx, district in enumerate(districts_to_process, start=1):
-            result = self.process_grid(district, idx, len(districts_to_process))
-            results.append(result)
+        if self.args.queue_db:
+            results = self.process_grids_from_queue(districts_to_process)
+        else:
+            results = []
+            for idx, district in enumerate(districts_to_process, start=1):
+                result = self.process_grid(district, idx, len(districts_to_process))
+                results.append(result)
 
-            # API 제한 방지를 위한 대기 (마지막 그리드가 아닌 경우)
-            if idx < len(districts_to_process):
-                print(f"\n대기 중... ({self.args.delay}초)")
-                time.sleep(self.args.delay)
+                # API 제한 방지를 위한 대기 (마지막 그리드가 아닌 경우)
+                if idx < len(districts_to_process):
+                    print(f"\n대기 중... ({self.args.delay}초)")
+                    time.sleep(self.args.delay)
 
         # 최종 요약
         elapsed_time = time.time() - self.start_time.timestamp()
@@ -443,6 +579,13 @@ def main():
   # 팀원 5: 그리드 48~58 (11개)
   python main.py --grid_file gridInfo.txt --start_from 48 --limit 11 --use_tier_based_restaurants --max_reviews 40 --headless --parallel_reviews
 
+  # 예상 크롤링 시간 기반 샤드 계획으로 분할 (utils/shard_planner.py로 계획 파일 생성)
+  python utils/shard_planner.py --shards 5 --max_reviews 40 --output shard_plan.json
+  python main.py --shard_plan shard_plan.json --shard_index 0 --use_tier_based_restaurants --max_reviews 40 --headless --parallel_reviews
+
+  # 공유 작업 큐 모드: 모든 머신에서 같은 명령을 실행하면 큐에서 그리드를 나눠 가져감
+  python main.py --grid_file gridInfo.txt --use_tier_based_restaurants --max_reviews 40 --headless --parallel_reviews --queue_db //shared/crawler/work_queue.db
+
   # 특정 그리드만 테스트
   python main.py --grid_file gridInfo.txt --limit 1 --max_restaurants 10 --max_reviews 20
         """
@@ -480,16 +623,49 @@ def main():
                         help='리뷰 수집 시 병렬 처리 활성화 (더 빠르지만 리소스 사용 많음)')
     parser.add_argument('--review_workers', type=int, default=2,
                         help='병렬 리뷰 수집 시 워커 수 (기본값: 2, 권장: 2-4)')
+    parser.add_argument('--review_autoscale', action='store_true',
+                        help='메모리/CPU 여유와 처리량에 따라 리뷰 워커 수 자동 조정 (psutil 필요, --review_workers는 시작 워커 수)')
+    parser.add_argument('--review_min_workers', type=int, default=1,
+                        help='자동 조정 시 최소 리뷰 워커 수 (기본값: 1)')
+    parser.add_argument('--review_max_workers', type=int, default=None,
+                        help='자동 조정 시 최대 리뷰 워커 수 (기본값: CPU 코어 수의 절반)')
+    parser.add_argument('--review_timeout', type=float, default=None,
+                        help='레스토랑 1곳당 리뷰 수집 제한 시간(초), 0이면 제한 없음 (기본값: 크롤러 기본값 900)')
+    parser.add_argument('--review_max_browser_mb', type=float, default=None,
+                        help='리뷰 수집 브라우저 메모리 상한(MB), 0이면 확인 안 함 (기본값: 크롤러 기본값 1500)')
+    parser.add_argument('--review_max_pages', type=int, default=None,
+                        help='리뷰 수집 브라우저 하나로 여는 최대 페이지 수, 0이면 제한 없음 (기본값: 크롤러 기본값 300)')
 
     # API 제한 관련
     parser.add_argument('--delay', type=float, default=2.0,
                         help='각 그리드 처리 사이의 대기 시간(초) (기본값: 2.0)')
 
+    # 샤드 계획 관련
+    parser.add_argument('--shard_plan', type=str, default=None,
+                        help='utils/shard_planner.py로 생성한 샤드 계획 파일 (지정 시 --start_from/--limit 대신 사용)')
+    parser.add_argument('--shard_index', type=int, default=0,
+                        help='샤드 계획에서 처리할 샤드 번호 (0부터 시작, 기본값: 0)')
+
+    # 공유 작업 큐 관련
+    parser.add_argument('--queue_db', type=str, default=None,
+                        help='공유 작업 큐 SQLite 파일 경로 (지정 시 --start_from/--limit 수동 분할 대신 큐에서 그리드를 리스)')
+    parser.add_argument('--worker_id', type=str, default=default_worker_id(),
+                        help='작업 큐에서 사용할 워커 ID (기본값: 호스트명:PID)')
+    parser.add_argument('--lease_seconds', type=float, default=300.0,
+                        help='작업 리스 유효 시간(초), 하트비트로 자동 연장 (기본값: 300)')
+    parser.add_argument('--queue_max_attempts', type=int, default=3,
+                        help='그리드당 최대 시도 횟수 (기본값: 3)')
+    parser.add_argument('--queue_poll', type=float, default=30.0,
+                        help='대기 작업이 없을 때 다시 확인하는 주기(초) (기본값: 30)')
+
     args = parser.parse_args()
 
     # 검증
     if not os.path.exists(args.grid_file):
         parser.error(f"Grid 파일을 찾을 수 없습니다: {args.grid_file}")
+    if args.shard_plan and not os.path.exists(args.shard_plan):
+        parser.error(f"샤드 계획 파일을 찾을 수 없습니다: {args.shard_plan}")
+    ensure_dirs()
 
     # 파이프라인 실행
     runner = GridBasedPipelineRunner(args)
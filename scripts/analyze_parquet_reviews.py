@@ -9,63 +9,614 @@ Parquet 형식으로 저장된 리뷰 데이터를 분석하는 예제 코드
 
 import pandas as pd
 import numpy as np
-from pathlib import Path
-import matplotlib.pyplot as plt
-import seaborn as sns
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
-# 한글 폰트 설정 (Windows)
-import matplotlib.font_manager as fm
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
-
-
 import sys
 import os
+import time
+import argparse
 from pathlib import Path
 
 # 상위 디렉토리를 sys.path에 추가하여 config 모듈을 임포트할 수 있도록 함
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from config import PARQUET_DATA_DIR
+from config import (ARROW_CACHE_DIR, GRID_TIER_CSV, PARQUET_DATA_DIR, REVIEWS_DATASET_DIR, REVIEWS_PARTITIONED_DIR,
+                    SEARCH_INDEX_DB)
+from utils.arrow_cache import COMPRESSIONS, ArrowCache
+from utils.process_tools import available_memory
+from utils.review_aggregates import (REPORT_SECTIONS, SECTION_COLUMNS, SECTION_FILTERS, SUMMARY_SECTIONS,
+                                     TOTAL_COLUMNS, ReviewAggregates, histogram_mean, histogram_median,
+                                     histogram_std)
+from utils.review_filters import FILTER_PRESETS, ReviewFilter
+from utils.review_sketches import SKETCH_TABLES, merge_rows, read_sketches
+from utils.review_summaries import SUMMARY_TABLES, read_summaries
+from utils.search_index import SearchIndex
+from utils.shard_planner import load_tier_info
+from utils.sketches import TopN
+
 
-# 한글 폰트 설정 (Windows)
-import matplotlib.font_manager as fm
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+SEARCH_RESULT_LIMIT = 10   # 검색 결과로 출력할 레스토랑 수
+SEARCH_SAMPLE_REVIEWS = 2  # 검색 결과 레스토랑별 샘플 리뷰 수
+SKETCH_GROUPS = ('restaurant', 'grid', 'tier', 'borough')  # 스케치 질의의 묶음 단위
+
+ENGINES = ('arrow', 'duckdb')  # 리포트 집계 엔진
+
+EXPORT_ROW_GROUP_SIZE = 131_072  # 추출 파일의 행 그룹당 리뷰 수 (작은 배치를 모아 기록)
+
+MEMORY_LIMIT_FRACTION = 0.5  # 리뷰 예상 크기가 사용 가능한 메모리의 이 비율을 넘으면 배치 단위 집계(out-of-core)로 분석
+TRACKED_RESTAURANTS = 100    # out-of-core 모드에서 언어/평점 분포를 집계할 상위 레스토랑 수 (리뷰 수 기준)
+
+# 리포트 섹션 -> 읽을 때 적용할 행 조건 (pyarrow.dataset 필터로 푸시다운)
+REPORT_FILTERS = {section: ds.field(column) == value for section, (column, value) in SECTION_FILTERS.items()}
 
 
 class ReviewAnalyzer:
     """Parquet 형식의 리뷰 데이터 분석 클래스"""
     
-    def __init__(self, data_dir: str = PARQUET_DATA_DIR):
+    def __init__(self, data_dir: str = PARQUET_DATA_DIR, engine: str = 'arrow', cache: bool = False,
+                 cache_compression: str = None, out_of_core: bool = None, memory_limit: int = None):
         """
         초기화
         
         Args:
             data_dir: Parquet 파일이 있는 디렉토리
+            engine: 리포트 집계 엔진 ('arrow': pyarrow 배치 스캔, 'duckdb': DuckDB SQL) - 출력은 같음
+            cache: restaurants/reviews 테이블을 디코딩한 Arrow IPC 캐시(data_dir/arrow_cache/)를 메모리 맵으로 열지 여부
+                   (원본 Parquet이 바뀌면 캐시를 다시 만듦)
+            cache_compression: 캐시 파일 압축 (None: 복사 없이 읽기, 'lz4': 파일 크기 절감)
+            out_of_core: 리뷰를 데이터프레임으로 올리지 않고 배치 단위 집계로 분석할지 여부
+                         (None: 리뷰 예상 크기가 메모리 한도를 넘을 때 자동으로 사용)
+            memory_limit: 자동 선택에 쓸 메모리 한도 (바이트, 기본값: 사용 가능한 메모리 x MEMORY_LIMIT_FRACTION)
         """
+        if engine not in ENGINES:
+            raise ValueError(f"알 수 없는 엔진: {engine} (사용 가능: {', '.join(ENGINES)})")
         self.data_dir = Path(data_dir)
+        self.engine = engine
+        self.arrow_cache = ArrowCache(self.data_dir / ARROW_CACHE_DIR.name, cache_compression) if cache else None
+        self.out_of_core = out_of_core
+        self.memory_limit = memory_limit
+        # 배치 단위 집계로 분석 중인지 여부 (load_data/compute_aggregates에서 정함)
+        self._streaming = False
         self.df_restaurants = None
         self.df_reviews = None
+        # 스타 스키마 (convert_reviews_to_parquet.py --star_schema 출력)
+        self.dim_restaurants = None
+        self.fact_reviews = None
+        self.dim_grid = None
+        # 그룹 값 -> 행 위치 배열 인덱스 캐시 ((테이블 이름, 열 이름) -> dict)
+        self._group_index = {}
+        # 리포트 집계 (compute_aggregates 결과)
+        self.aggregates = None
+        # df_reviews를 읽을 때 적용한 행 조건 (None이면 전체 행)
+        self._reviews_filter = None
+        # 전문 검색 색인 (search_index.db, 처음 검색할 때 열기)
+        self._search_index = None
+        # 스케치 테이블 (restaurant_sketches, grid_sketches, 처음 질의할 때 읽기)
+        self.sketches = None
+        
+    def load_data(self, sections=REPORT_SECTIONS, with_text: bool = False):
+        """
+        Parquet 파일 로드 (리포트 섹션에 필요한 열과 행만)
         
-    def load_data(self):
-        """Parquet 파일 로드"""
+        섹션별로 선언한 열(SECTION_COLUMNS)만 읽고, 모든 섹션이 같은 행 조건(REPORT_FILTERS)을 가지면
+        그 조건을 pyarrow.dataset 필터로 넘겨 조건에 맞는 행만 읽음. 용량이 가장 큰 text 열은
+        with_text=True가 아니면 읽지 않고, 검색/추출에서 필요할 때 load_text()로 붙임
+        
+        리뷰 예상 크기가 메모리 한도를 넘으면(is_out_of_core) 데이터프레임을 만들지 않고
+        compute_aggregates로 리포트 집계만 계산함 (out-of-core 모드, df_reviews는 None)
+        
+        Args:
+            sections: 사용할 리포트 섹션 (예: ('korean',)이면 language == 'ko'인 행만 읽음)
+            with_text: text 열도 함께 읽을지 여부
+        """
         print("📂 Parquet 파일 로딩 중...")
         
-        restaurants_path = self.data_dir / 'restaurants.parquet'
-        reviews_path = self.data_dir / 'reviews.parquet'
+        columns = self.review_columns(sections, with_text=with_text)
+        self._reviews_filter = self._common_filter(sections)
         
-        self.df_restaurants = pd.read_parquet(restaurants_path)
-        self.df_reviews = pd.read_parquet(reviews_path)
+        self.load_restaurants()
+        self._streaming = self.is_out_of_core(columns)
+        if self._streaming:
+            # 리뷰는 메모리에 올리지 않고, 리포트 집계를 배치 단위 스캔으로 계산
+            self.df_reviews = None
+            aggregates = self.compute_aggregates(sections)
+            print(f"✅ 레스토랑 {len(self.df_restaurants):,}개 로드 완료")
+            print(f"✅ 리뷰 {aggregates.total_reviews:,}개 배치 단위 집계 완료 (out-of-core)")
+            return
+        self.df_reviews = self.reviews_file_dataset().to_table(
+            columns=columns, filter=self._reviews_filter).to_pandas()
         
         print(f"✅ 레스토랑 {len(self.df_restaurants):,}개 로드 완료")
         print(f"✅ 리뷰 {len(self.df_reviews):,}개 로드 완료")
         
+    def review_columns(self, sections=REPORT_SECTIONS, with_text: bool = False) -> list:
+        """리포트 섹션에 필요한 리뷰 열 (restaurant_id는 항상 포함, text는 with_text일 때만)"""
+        columns = ['restaurant_id']
+        for section in sections:
+            for column in SECTION_COLUMNS[section]:
+                if column not in columns:
+                    columns.append(column)
+        if with_text and 'text' not in columns:
+            columns.append('text')
+        if not with_text and 'text' in columns:
+            columns.remove('text')
+        return columns
+        
+    def estimate_review_memory(self, columns=None) -> int:
+        """
+        리뷰 열을 메모리에 올렸을 때의 예상 크기 (리뷰 파일 메타데이터의 압축 전 크기 합, 파일 본문은 읽지 않음)
+        
+        Args:
+            columns: 읽을 열 (기본값: 전체)
+            
+        Returns:
+            바이트 수
+        """
+        source = self.reviews_source()
+        paths = sorted(source.rglob('*.parquet')) if source.is_dir() else [source]
+        wanted = None if columns is None else set(columns)
+        total = 0
+        for path in paths:
+            metadata = pq.read_metadata(path)
+            for i in range(metadata.num_row_groups):
+                row_group = metadata.row_group(i)
+                for j in range(row_group.num_columns):
+                    column = row_group.column(j)
+                    if wanted is None or column.path_in_schema in wanted:
+                        total += column.total_uncompressed_size
+        return total
+        
+    def is_out_of_core(self, columns=None) -> bool:
+        """
+        배치 단위 집계(out-of-core)로 분석할지 여부
+        
+        out_of_core를 지정하지 않았으면 리뷰 예상 크기(estimate_review_memory)를 메모리 한도와 비교함.
+        한도를 정할 수 없으면(사용 가능한 메모리를 알 수 없는 시스템) 기존처럼 메모리에 올림
+        
+        Args:
+            columns: 읽을 리뷰 열 (기본값: 전체)
+        """
+        if self.out_of_core is not None:
+            return self.out_of_core
+        if self.arrow_cache is not None or not self.reviews_source().exists():
+            return False
+        limit = self.memory_limit
+        if limit is None:
+            available = available_memory()
+            if available is None:
+                return False
+            limit = int(available * MEMORY_LIMIT_FRACTION)
+        estimate = self.estimate_review_memory(columns)
+        if estimate <= limit:
+            return False
+        print(f"⚠️ 리뷰 예상 크기 {estimate / 2**20:,.0f}MB가 메모리 한도 {limit / 2**20:,.0f}MB를 넘어 "
+              f"배치 단위 집계로 분석합니다 (out-of-core)")
+        return True
+        
+    @staticmethod
+    def _common_filter(sections):
+        """모든 섹션이 같은 행 조건을 가지면 그 조건, 아니면 None (전체 행)"""
+        filters = {SECTION_FILTERS.get(section) for section in sections}
+        if len(filters) != 1 or None in filters:
+            return None
+        return REPORT_FILTERS[sections[0]]
+        
+    def reviews_source(self) -> Path:
+        """
+        리뷰 데이터 위치 (reviews.parquet, 없으면 증분 변환의 리뷰 조각 디렉토리, 그것도 없으면 하이브 파티션 데이터셋)
+
+        증분 변환(--incremental)은 reviews.parquet을 만들지 않으므로 리뷰 조각 디렉토리를 데이터셋으로 읽음
+        """
+        reviews_path = self.data_dir / 'reviews.parquet'
+        if reviews_path.exists():
+            return reviews_path
+        for directory in (self.data_dir / REVIEWS_DATASET_DIR.name, self.data_dir / REVIEWS_PARTITIONED_DIR.name):
+            if directory.is_dir():
+                return directory
+        return reviews_path
+        
+    def duckdb_source(self) -> Path:
+        """DuckDB 엔진이 쿼리할 리뷰 데이터 (reviews_source와 같음)"""
+        return self.reviews_source()
+        
+    def read_table(self, name: str) -> pa.Table:
+        """data_dir의 <name>.parquet 테이블 (캐시를 쓰면 메모리 맵 Arrow 캐시에서 복사 없이)"""
+        path = self.data_dir / f"{name}.parquet"
+        if self.arrow_cache is None:
+            return pq.read_table(path)
+        return self.arrow_cache.load(path)
+        
+    def reviews_file_dataset(self) -> ds.Dataset:
+        """
+        리뷰 데이터셋 (열 선택과 행 조건 푸시다운용, 캐시를 쓰면 메모리 맵 테이블의 데이터셋)
+
+        reviews.parquet이 없으면 reviews_source()의 디렉토리를 읽음 (하이브 파티션 값은 사전 인코딩 열로)
+        """
+        source = self.reviews_source()
+        if source.is_dir():
+            return ds.dataset(source, format='parquet',
+                              partitioning=ds.HivePartitioning.discover(infer_dictionary=True))
+        if self.arrow_cache is not None:
+            return ds.dataset(self.read_table('reviews'))
+        return ds.dataset(source, format='parquet')
+        
+    def load_text(self) -> pd.DataFrame:
+        """
+        load_data에서 빼 둔 text 열을 df_reviews에 붙임 (같은 행 조건으로 읽으므로 행 순서가 같음)
+        
+        Returns:
+            text 열이 포함된 df_reviews
+            
+        Raises:
+            MemoryError: out-of-core 모드 (리뷰 본문은 filtered_batches/export_filtered_data로 배치 단위로 읽음)
+        """
+        if self._streaming:
+            raise MemoryError("out-of-core 모드에서는 리뷰 본문을 메모리에 올리지 않습니다 "
+                              "(filtered_batches 또는 export_filtered_data로 배치 단위로 읽으세요).")
+        if self.df_reviews is None:
+            self.load_data(with_text=True)
+        elif 'text' not in self.df_reviews.columns:
+            text = self.reviews_file_dataset().to_table(columns=['text'], filter=self._reviews_filter)
+            self.df_reviews['text'] = text.column('text').to_pandas().set_axis(self.df_reviews.index)
+        return self.df_reviews
+        
+
+    def load_restaurants(self):
+        """레스토랑 테이블만 로드 (리포트 집계는 리뷰 파일을 직접 스캔)"""
+        self.df_restaurants = self.read_table('restaurants').to_pandas()
+        self._group_index = {}
+        
+    def load_star_schema(self):
+        """정규화된 스타 스키마 Parquet 파일 로드 (dim_grid.parquet은 있을 때만)"""
+        print("📂 스타 스키마 Parquet 파일 로딩 중...")
+        
+        self.dim_restaurants = pd.read_parquet(self.data_dir / 'dim_restaurants.parquet')
+        self.fact_reviews = pd.read_parquet(self.data_dir / 'fact_reviews.parquet')
+        grid_path = self.data_dir / 'dim_grid.parquet'
+        self.dim_grid = pd.read_parquet(grid_path) if grid_path.exists() else None
+        
+        print(f"✅ 레스토랑 {len(self.dim_restaurants):,}개, 리뷰 {len(self.fact_reviews):,}개 로드 완료")
+        
+    def join_reviews(self, restaurant_columns=('restaurant_id', 'name', 'grid'), grid_columns=()) -> pd.DataFrame:
+        """
+        리뷰 팩트 테이블에 레스토랑/grid 차원 열을 붙인 데이터프레임 생성
+        
+        restaurant_key가 dim_restaurants의 행 번호이므로 병합(merge) 대신 위치 인덱싱으로 붙임
+        
+        Args:
+            restaurant_columns: 붙일 레스토랑 열 (예: 'name', 'grid', 'rating' - name은 restaurant_name으로 붙임)
+            grid_columns: 붙일 grid 차원 열 (예: 'borough', 'area_kr', 'tier'), grid 열이 필요함
+            
+        Returns:
+            리뷰 열 + 요청한 차원 열 (리뷰 열과 이름이 겹치는 레스토랑 열은 'restaurant_' 접두어)
+        """
+        if self.fact_reviews is None:
+            self.load_star_schema()
+        
+        df = self.fact_reviews.copy()
+        positions = df['restaurant_key'].to_numpy()
+        for column in restaurant_columns:
+            name = f'restaurant_{column}' if column == 'name' or column in df.columns else column
+            df[name] = self.dim_restaurants[column].iloc[positions].set_axis(df.index)
+        
+        if grid_columns:
+            if self.dim_grid is None:
+                raise FileNotFoundError("dim_grid.parquet이 없습니다.")
+            grids = self.dim_restaurants['grid'].astype(str).iloc[positions].to_numpy()
+            grid_table = self.dim_grid.set_index('grid')
+            for column in grid_columns:
+                df[column] = grid_table[column].reindex(grids).to_numpy()
+        return df
+        
+    def reviews_dataset(self) -> ds.Dataset:
+        """borough/grid(/year) 하이브 파티션 리뷰 데이터셋 (convert_reviews_to_parquet.py --partitioned 출력)"""
+        return ds.dataset(self.data_dir / REVIEWS_PARTITIONED_DIR.name, format='parquet', partitioning='hive')
+        
+    def load_reviews(self, grids=None, boroughs=None, years=None, restaurant_ids=None, columns=None) -> pd.DataFrame:
+        """
+        파티션 데이터셋에서 조건에 맞는 리뷰만 로드
+        
+        grid/borough/year 조건은 경로의 파티션 값으로 파일 자체를 건너뜀. restaurant_id만 주어지면
+        레스토랑 테이블에서 해당 레스토랑의 grid를 찾아 grid 조건으로도 사용하므로 필요한 파일만 읽음
+        
+        Args:
+            grids: grid 코드 목록 (예: ['MN1', 'MN2'])
+            boroughs: 자치구 코드 목록 (예: ['MN'])
+            years: 추정 날짜 연도 목록 (연도 파티션이 없으면 estimated_date로 필터)
+            restaurant_ids: 레스토랑 ID 목록
+            columns: 읽을 열 (기본값: 전체)
+            
+        Returns:
+            조건에 맞는 리뷰 데이터프레임
+        """
+        dataset = self.reviews_dataset()
+        if restaurant_ids is not None and grids is None:
+            restaurants = self.df_restaurants
+            if restaurants is None:
+                restaurants = pd.read_parquet(self.data_dir / 'restaurants.parquet', columns=['restaurant_id', 'grid'])
+            grids = restaurants.loc[restaurants['restaurant_id'].isin(list(restaurant_ids)), 'grid'].astype(str).unique()
+        
+        conditions = []
+        if grids is not None:
+            conditions.append(ds.field('grid').isin(list(grids)))
+        if boroughs is not None:
+            conditions.append(ds.field('borough').isin(list(boroughs)))
+        if years is not None:
+            if 'year' in dataset.schema.names:
+                conditions.append(ds.field('year').isin(list(years)))
+            else:
+                conditions.append(pc.year(ds.field('estimated_date')).isin(list(years)))
+        if restaurant_ids is not None:
+            conditions.append(ds.field('restaurant_id').isin(list(restaurant_ids)))
+        
+        condition = None
+        for expression in conditions:
+            condition = expression if condition is None else condition & expression
+        return dataset.to_table(columns=columns, filter=condition).to_pandas()
+        
+    def group_positions(self, table: str, column: str) -> dict:
+        """
+        열 값별 행 위치 인덱스 (한 번의 groupby로 만들고 캐시)
+        
+        값마다 불리언 마스크로 전체 행을 다시 훑는 대신 위치 배열로 해당 행만 꺼낼 수 있어,
+        그룹 수와 관계없이 전체 비용이 행 수에 비례함
+        
+        Args:
+            table: 'df_reviews' 또는 'df_restaurants'
+            column: 그룹 기준 열
+            
+        Returns:
+            값 -> 행 위치 배열(원래 행 순서) 딕셔너리
+        """
+        key = (table, column)
+        if key not in self._group_index:
+            df = getattr(self, table)
+            self._group_index[key] = df.groupby(column, observed=True, sort=False).indices
+        return self._group_index[key]
+        
+    def rows_for(self, table: str, column: str, value, columns=None, limit=None) -> pd.DataFrame:
+        """
+        df[df[column] == value]와 같은 행을 위치 인덱스로 꺼냄 (행 순서 동일, 없으면 빈 데이터프레임)
+        
+        Args:
+            columns: 꺼낼 열 (기본값: 전체). 문자열 열은 꺼낼 때마다 비용이 크므로 필요한 열만 지정
+            limit: 앞에서부터 꺼낼 최대 행 수 (.head(limit)와 같음)
+        """
+        positions = self.group_positions(table, column).get(value, np.empty(0, dtype=np.intp))[:limit]
+        df = getattr(self, table)
+        if columns is not None:
+            df = df[list(columns)]
+        return df.iloc[positions]
+        
+    def compute_aggregates(self, sections=REPORT_SECTIONS, search_keywords=(), batch_size: int = 65_536):
+        """
+        선언한 리포트 섹션에 필요한 집계를 reviews.parquet 한 번의 스캔으로 계산 (self.aggregates에 저장)
+        
+        필요한 열만 배치 단위로 읽으므로 리뷰 전체를 메모리에 올리지 않으며, 섹션 수와 관계없이 스캔은 한 번임.
+        이후 각 리포트 메서드는 저장된 집계로 출력함. out-of-core 모드면 크기가 일정한 sketch 집계를 사용하고
+        레스토랑별 분포는 리뷰 수 상위 TRACKED_RESTAURANTS개 레스토랑만 집계함
+        
+        Args:
+            sections: 계산할 리포트 섹션 ('basic', 'top_restaurants', 'grid', 'korean', 'search')
+            search_keywords: 'search' 섹션에서 샘플 리뷰를 미리 모을 검색어
+            batch_size: 한 번에 읽을 리뷰 수
+            
+        Returns:
+            ReviewAggregates
+        """
+        if self.df_restaurants is None:
+            self.load_restaurants()
+        sample_ids = set()
+        for keyword in search_keywords:
+            sample_ids.update(self._search_matches(keyword).head(SEARCH_RESULT_LIMIT)['restaurant_id'])
+        
+        if self.engine == 'duckdb':
+            self.aggregates = ReviewAggregates.from_duckdb(self.duckdb_source(), sections, sample_ids,
+                                                           SEARCH_SAMPLE_REVIEWS)
+            return self.aggregates
+        
+        if self.df_reviews is None and not self._streaming:
+            self._streaming = self.is_out_of_core(self.review_columns(sections))
+        aggregates = self._new_aggregates(sections, sample_ids)
+        source = self.reviews_source()
+        if source.is_dir():
+            batches = self.reviews_file_dataset().to_batches(columns=aggregates.columns, batch_size=batch_size)
+        elif self.arrow_cache is not None:
+            batches = self.read_table('reviews').select(aggregates.columns).to_batches(max_chunksize=batch_size)
+        else:
+            batches = pq.ParquetFile(source).iter_batches(batch_size=batch_size, columns=aggregates.columns)
+        for batch in batches:
+            aggregates.update(batch)
+        self.aggregates = aggregates
+        return aggregates
+        
+    def _new_aggregates(self, sections, sample_ids=(), restaurant_ids=()) -> ReviewAggregates:
+        """빈 리포트 집계 (out-of-core 모드면 sketch 집계, 분포는 상위 레스토랑 + restaurant_ids만)"""
+        if not self._streaming:
+            return ReviewAggregates(sections, sample_restaurant_ids=sample_ids,
+                                    samples_per_restaurant=SEARCH_SAMPLE_REVIEWS)
+        tracked = set(self.top_restaurant_ids(TRACKED_RESTAURANTS)) | set(restaurant_ids)
+        return ReviewAggregates(sections, sample_restaurant_ids=sample_ids, samples_per_restaurant=SEARCH_SAMPLE_REVIEWS,
+                                sketch=True, tracked_restaurant_ids=tracked)
+        
+    def top_restaurant_ids(self, n: int) -> list:
+        """리뷰 수(reviews_count) 상위 n개 레스토랑 ID (힙으로 선택, 동률은 테이블 순서 - nlargest와 같은 순서)"""
+        restaurants = self.df_restaurants.dropna(subset=['reviews_count'])
+        top = TopN(n)
+        top.update(restaurants['restaurant_id'], restaurants['reviews_count'].to_numpy())
+        return [restaurant_id for restaurant_id, _ in top.items()]
+        
+    def has_summaries(self) -> bool:
+        """요약 테이블(convert_reviews_to_parquet.py --summaries 출력)이 있는지 여부"""
+        return all((self.data_dir / f"{name}.parquet").exists() for name in SUMMARY_TABLES)
+        
+    def load_summaries(self, sections=SUMMARY_SECTIONS) -> ReviewAggregates:
+        """
+        요약 테이블로 리포트 집계 생성 (self.aggregates에 저장, 리뷰 원본을 읽지 않음)
+        
+        'search' 섹션(샘플 리뷰)은 요약 테이블에 없으므로 검색할 때 해당 레스토랑의 리뷰만 파일에서 읽음
+        
+        Args:
+            sections: 만들 리포트 섹션 (SUMMARY_SECTIONS 중에서)
+            
+        Returns:
+            ReviewAggregates
+        """
+        if not self.has_summaries():
+            raise FileNotFoundError(f"요약 테이블이 없습니다: {self.data_dir} (변환 시 --summaries 사용)")
+        if self.df_restaurants is None:
+            self.load_restaurants()
+        summaries = read_summaries(self.data_dir)
+        self.aggregates = ReviewAggregates.from_summaries(summaries['restaurant_stats'], summaries['language_stats'],
+                                                          sections)
+        return self.aggregates
+        
+    def has_sketches(self) -> bool:
+        """스케치 테이블(convert_reviews_to_parquet.py --sketches 출력)이 있는지 여부"""
+        return all((self.data_dir / f"{name}.parquet").exists() for name in SKETCH_TABLES)
+        
+    def sketch_groups(self, by: str = 'grid') -> dict:
+        """
+        묶음별 스케치 (레스토랑은 여러 grid의 행을, 티어/자치구는 grid 스케치를 합침)
+        
+        Args:
+            by: 'restaurant' (restaurant_id), 'grid', 'tier' (grid_tier.csv, 티어가 없는 grid는 빠짐), 'borough'
+            
+        Returns:
+            묶음 값 -> ReviewSketch
+        """
+        if by not in SKETCH_GROUPS:
+            raise ValueError(f"알 수 없는 묶음 단위: {by} (사용 가능: {', '.join(SKETCH_GROUPS)})")
+        if self.sketches is None:
+            if not self.has_sketches():
+                raise FileNotFoundError(f"스케치 테이블이 없습니다: {self.data_dir} (변환 시 --sketches 사용)")
+            self.sketches = read_sketches(self.data_dir)
+        if by == 'restaurant':
+            return merge_rows(self.sketches['restaurant_sketches'], 'restaurant_id')
+        grids = self.sketches['grid_sketches']
+        if by == 'grid':
+            return merge_rows(grids, 'grid')
+        if by == 'borough':
+            return merge_rows(grids, lambda row: row['grid'][:2] if row['grid'] else None)
+        tier_info = load_tier_info(GRID_TIER_CSV)
+        return merge_rows(grids, lambda row: tier_info.get(row['grid']))
+        
+    def approximate_distinct(self, column: str = 'review_id', by: str = 'grid') -> pd.DataFrame:
+        """
+        묶음별 서로 다른 값의 수 근사 (스케치 테이블의 HyperLogLog, 리뷰 원본을 읽지 않음)
+        
+        Args:
+            column: 'review_id' (고유 리뷰 수 - 여러 grid에 함께 수집된 리뷰는 한 번만) 또는 'language' (언어 수)
+            by: 묶음 단위 ('restaurant', 'grid', 'tier', 'borough')
+            
+        Returns:
+            묶음, review_count (리뷰 수 합계, 중복 포함), estimate (추정치), std_error (표준오차) 열 - 추정치 내림차순
+        """
+        rows = []
+        for group, sketch in self.sketch_groups(by).items():
+            estimate, error = sketch.distinct_count(column)
+            rows.append({by: group, 'review_count': sketch.review_count, 'estimate': estimate, 'std_error': error})
+        df = pd.DataFrame(rows, columns=[by, 'review_count', 'estimate', 'std_error'])
+        return df.sort_values('estimate', ascending=False, kind='stable').reset_index(drop=True)
+        
+    def approximate_quantile(self, column: str = 'text_length', q: float = 0.5, by: str = 'grid') -> pd.DataFrame:
+        """
+        묶음별 분위수 근사 (스케치 테이블, 리뷰 원본을 읽지 않음)
+        
+        Args:
+            column: 'text_length' (t-digest 근사) 또는 'rating' (평점 히스토그램, 오차 없음)
+            q: 0~1 (예: 0.9 = p90)
+            by: 묶음 단위 ('restaurant', 'grid', 'tier', 'borough')
+            
+        Returns:
+            묶음, review_count, value (근사값), low/high (오차 범위), rank_error (순위 오차 비율) 열 - 묶음 순
+        """
+        rows = []
+        for group, sketch in self.sketch_groups(by).items():
+            value, low, high, error = sketch.quantile(column, q)
+            rows.append({by: group, 'review_count': sketch.review_count, 'value': value, 'low': low, 'high': high,
+                         'rank_error': error})
+        return pd.DataFrame(rows, columns=[by, 'review_count', 'value', 'low', 'high', 'rank_error'])
+        
+    def sketch_report(self):
+        """스케치 테이블로 답하는 근사 통계 (고유 리뷰 수, 레스토랑별 언어 수, 리뷰 길이 분위수)"""
+        by = 'tier' if load_tier_info(GRID_TIER_CSV) else 'borough'
+        label = '티어' if by == 'tier' else '자치구'
+        print("\n🧮 스케치 기반 근사 통계 (restaurant_sketches / grid_sketches)")
+        print("="*60)
+        
+        print(f"\n1. {label}별 고유 리뷰 수 (HyperLogLog, ± 표준오차):")
+        for _, row in self.approximate_distinct('review_id', by).iterrows():
+            print(f"   {row[by]}: 리뷰 {row['review_count']:,}개 중 고유 약 {row['estimate']:,.0f}개 "
+                  f"(±{row['std_error']:,.0f})")
+        
+        print("\n2. 언어 수가 많은 레스토랑 TOP 10 (HyperLogLog):")
+        restaurants = self.sketches['restaurant_sketches']
+        names = dict(zip(restaurants['restaurant_id'].to_pylist(), restaurants['restaurant_name'].to_pylist()))
+        for _, row in self.approximate_distinct('language', 'restaurant').head(10).iterrows():
+            print(f"   • {names.get(row['restaurant']) or row['restaurant']}: 약 {row['estimate']:.0f}개 언어 "
+                  f"(리뷰 {row['review_count']:,}개)")
+        
+        print(f"\n3. {label}별 리뷰 길이 중앙값 / p90 (t-digest, 오차 범위):")
+        medians = self.approximate_quantile('text_length', 0.5, by)
+        p90 = self.approximate_quantile('text_length', 0.9, by)
+        for (_, median), (_, high) in zip(medians.iterrows(), p90.iterrows()):
+            print(f"   {median[by]}: 중앙값 {median['value']:.0f}자 ({median['low']:.0f}~{median['high']:.0f}), "
+                  f"p90 {high['value']:.0f}자 ({high['low']:.0f}~{high['high']:.0f}, 순위 ±{high['rank_error']:.1%})")
+        
+    def _aggregates_for(self, section: str, sample_ids=(), restaurant_ids=()) -> ReviewAggregates:
+        """
+        섹션을 포함한 저장된 집계 반환 (없거나 검색 샘플/레스토랑별 분포가 부족하면 해당 섹션만 새로 집계)
+        
+        새로 집계할 때는 load_data로 읽어 둔 df_reviews에 필요한 열이 있으면 그것을 쓰고, 없으면 섹션의 열만
+        파일에서 읽음. 행 조건이 있는 섹션은 조건에 맞는 행만 읽음 (검색 섹션은 샘플을 뽑을 레스토랑의 행만)
+        """
+        aggregates = self.aggregates
+        if aggregates is not None and section in aggregates.sections \
+                and set(sample_ids) <= aggregates.sample_restaurant_ids and aggregates.tracks(restaurant_ids):
+            return aggregates
+        if self.df_restaurants is None:
+            self.load_restaurants()
+        if self.engine == 'duckdb':
+            return ReviewAggregates.from_duckdb(self.duckdb_source(), (section,), sample_ids, SEARCH_SAMPLE_REVIEWS)
+        aggregates = self._new_aggregates((section,), sample_ids, restaurant_ids)
+        section_filter = REPORT_FILTERS.get(section)
+        if section == 'search':
+            section_filter = ds.field('restaurant_id').isin(list(sample_ids))
+        
+        df = self.df_reviews
+        loaded_all_rows = df is not None and self._reviews_filter is None
+        if loaded_all_rows and section_filter is None and set(aggregates.columns) <= set(df.columns):
+            aggregates.update(pa.Table.from_pandas(df[aggregates.columns], preserve_index=False))
+            return aggregates
+        
+        dataset = self.reviews_file_dataset()
+        if section_filter is not None:
+            # 조건으로 거른 행에는 전체 리뷰 수/분포가 빠지므로 작은 열만 전체 행에서 따로 집계
+            if loaded_all_rows and set(TOTAL_COLUMNS) <= set(df.columns):
+                aggregates.update_totals(pa.Table.from_pandas(df[list(TOTAL_COLUMNS)], preserve_index=False))
+            else:
+                for batch in dataset.to_batches(columns=list(TOTAL_COLUMNS)):
+                    aggregates.update_totals(batch)
+        for batch in dataset.to_batches(columns=aggregates.columns, filter=section_filter):
+            aggregates.update(batch, totals=section_filter is None)
+        return aggregates
+        
+    def _search_matches(self, keyword: str) -> pd.DataFrame:
+        """이름에 검색어가 들어간 레스토랑 (대소문자 무시)"""
+        return self.df_restaurants[
+            self.df_restaurants['name'].str.contains(keyword, case=False, na=False)
+        ]
+        
     def basic_statistics(self):
         """기본 통계 분석"""
+        aggregates = self._aggregates_for('basic')
         print("\n📊 기본 통계 분석")
         print("="*60)
         
@@ -77,67 +628,72 @@ class ReviewAnalyzer:
         
         # 2. 언어별 리뷰 분포
         print("\n2. 언어별 리뷰 분포:")
-        lang_counts = self.df_reviews['language'].value_counts()
+        lang_counts = pd.Series(aggregates.language_counts, dtype='int64').sort_index()
+        lang_counts = lang_counts.sort_values(ascending=False, kind='stable')
         for lang, count in lang_counts.head(10).items():
-            pct = count / len(self.df_reviews) * 100
+            pct = count / aggregates.total_reviews * 100
             print(f"   {lang}: {count:,}개 ({pct:.1f}%)")
         
         # 3. 평점 통계
+        ratings = aggregates.rating_counts
         print("\n3. 평점 통계:")
-        print(f"   평균 평점: {self.df_reviews['rating'].mean():.2f}")
-        print(f"   중앙값: {self.df_reviews['rating'].median():.1f}")
-        print(f"   표준편차: {self.df_reviews['rating'].std():.2f}")
+        print(f"   평균 평점: {histogram_mean(ratings):.2f}")
+        print(f"   중앙값: {histogram_median(ratings):.1f}")
+        print(f"   표준편차: {histogram_std(ratings):.2f}")
         
         # 4. 리뷰 길이 통계
+        lengths = aggregates.text_length_stats()
         print("\n4. 리뷰 길이 통계:")
-        print(f"   평균 길이: {self.df_reviews['text_length'].mean():.0f}자")
-        print(f"   최소 길이: {self.df_reviews['text_length'].min()}자")
-        print(f"   최대 길이: {self.df_reviews['text_length'].max()}자")
-        print(f"   중앙값: {self.df_reviews['text_length'].median():.0f}자")
+        print(f"   평균 길이: {lengths['mean']:.0f}자")
+        print(f"   최소 길이: {lengths['min']}자")
+        print(f"   최대 길이: {lengths['max']}자")
+        print(f"   중앙값: {lengths['median']:.0f}자{' (근사값)' if aggregates.sketch else ''}")
         
     def analyze_top_restaurants(self, n=20):
         """상위 레스토랑 분석"""
+        if self.df_restaurants is None:
+            self.load_restaurants()
+        top_restaurants = self.df_restaurants.nlargest(n, 'reviews_count')
+        aggregates = self._aggregates_for('top_restaurants', restaurant_ids=set(top_restaurants['restaurant_id']))
         print(f"\n🏆 상위 {n}개 레스토랑 (리뷰 수 기준)")
         print("="*60)
         
-        top_restaurants = self.df_restaurants.nlargest(n, 'reviews_count')
         
         for idx, row in top_restaurants.iterrows():
-            # 해당 레스토랑의 리뷰들 가져오기
-            restaurant_reviews = self.df_reviews[
-                self.df_reviews['restaurant_id'] == row['restaurant_id']
-            ]
-            
-            # 언어 분포
-            lang_dist = restaurant_reviews['language'].value_counts().head(3)
+            # 언어 분포 (전체 언어 범주 기준, 리뷰 수 내림차순 - 동률은 정렬된 범주 순서)
+            lang_dist = pd.Series(aggregates.restaurant_language_counts(row['restaurant_id']), dtype='int64').sort_index()
+            lang_dist = lang_dist.sort_values(ascending=False, kind='stable').head(3)
             lang_str = ", ".join([f"{lang}({cnt})" for lang, cnt in lang_dist.items()])
+            rating_counts = aggregates.restaurant_rating_counts(row['restaurant_id'])
             
             print(f"\n{row['name']} ({row['grid']})")
             print(f"  📍 평점: {row['rating']:.1f} | 리뷰: {row['reviews_count']}개")
             print(f"  📝 언어: {lang_str}")
             print(f"  📊 리뷰 평점 분포: ", end="")
             for rating in [1, 2, 3, 4, 5]:
-                count = (restaurant_reviews['rating'] == rating).sum()
+                count = rating_counts.get(rating, 0)
                 print(f"{rating}★({count}) ", end="")
         
     def analyze_by_grid(self):
         """Grid별 분석"""
+        aggregates = self._aggregates_for('grid')
         print("\n🗺️ Grid별 상세 분석")
         print("="*60)
         
-        # Grid별 통계 계산
+        # Grid별 통계 계산 (리뷰 수는 집계 결과, 레스토랑 통계는 레스토랑 테이블)
+        review_counts = aggregates.grid_counts()
         grid_stats = []
         for grid in self.df_restaurants['grid'].unique():
-            grid_restaurants = self.df_restaurants[self.df_restaurants['grid'] == grid]
-            grid_reviews = self.df_reviews[self.df_reviews['grid'] == grid]
+            grid_restaurants = self.rows_for('df_restaurants', 'grid', grid, columns=['rating'])
+            review_count, korean_count = review_counts.get(grid, (0, 0))
             
             stats = {
                 'grid': grid,
                 'restaurant_count': len(grid_restaurants),
-                'review_count': len(grid_reviews),
+                'review_count': review_count,
                 'avg_rating': grid_restaurants['rating'].mean(),
-                'avg_review_per_restaurant': len(grid_reviews) / max(len(grid_restaurants), 1),
-                'korean_review_pct': (grid_reviews['language'] == 'ko').mean() * 100
+                'avg_review_per_restaurant': review_count / max(len(grid_restaurants), 1),
+                'korean_review_pct': (korean_count / review_count if review_count else np.nan) * 100
             }
             grid_stats.append(stats)
         
@@ -157,92 +713,243 @@ class ReviewAnalyzer:
     
     def analyze_korean_reviews(self):
         """한국어 리뷰 특별 분석"""
+        aggregates = self._aggregates_for('korean')
         print("\n🇰🇷 한국어 리뷰 분석")
         print("="*60)
         
-        korean_reviews = self.df_reviews[self.df_reviews['language'] == 'ko']
-        print(f"총 한국어 리뷰 수: {len(korean_reviews):,}개")
-        print(f"전체 리뷰 중 비율: {len(korean_reviews)/len(self.df_reviews)*100:.1f}%")
+        korean_total = aggregates.korean_reviews
+        print(f"총 한국어 리뷰 수: {korean_total:,}개")
+        print(f"전체 리뷰 중 비율: {korean_total/aggregates.total_reviews*100:.1f}%")
         
-        # 한국어 리뷰가 많은 레스토랑
-        korean_review_counts = korean_reviews.groupby('restaurant_name').size()
+        # 한국어 리뷰가 많은 레스토랑 (이름순으로 정렬한 뒤 선택 - 동률이면 이름순, groupby 결과와 같은 순서)
+        korean_review_counts = pd.Series(aggregates.korean_counts_by_name, dtype='int64').sort_index()
         top_korean = korean_review_counts.nlargest(10)
         
+        # 이름이 같은 레스토랑이 여러 개면 첫 번째 레스토랑 기준
+        first_by_name = {name: positions[0]
+                         for name, positions in self.group_positions('df_restaurants', 'name').items()}
+        
         print("\n한국어 리뷰가 많은 레스토랑 TOP 10:")
         for name, count in top_korean.items():
-            restaurant_info = self.df_restaurants[
-                self.df_restaurants['name'] == name
-            ].iloc[0] if len(self.df_restaurants[self.df_restaurants['name'] == name]) > 0 else None
-            
-            if restaurant_info is not None:
-                total_reviews = restaurant_info['reviews_count']
+            if name in first_by_name:
+                total_reviews = self.df_restaurants['reviews_count'].iloc[first_by_name[name]]
                 korean_pct = (count / total_reviews * 100) if total_reviews > 0 else 0
                 print(f"  • {name}: {count}개 ({korean_pct:.1f}% 한국어)")
         
         # 한국어 리뷰 평점 vs 전체 평점
         print(f"\n평점 비교:")
-        print(f"  한국어 리뷰 평균 평점: {korean_reviews['rating'].mean():.2f}")
-        print(f"  전체 리뷰 평균 평점: {self.df_reviews['rating'].mean():.2f}")
+        print(f"  한국어 리뷰 평균 평점: {histogram_mean(aggregates.korean_rating_counts):.2f}")
+        print(f"  전체 리뷰 평균 평점: {histogram_mean(aggregates.rating_counts):.2f}")
         
     def search_restaurants(self, keyword: str):
         """레스토랑 검색 기능"""
+        if self.df_restaurants is None:
+            self.load_restaurants()
         print(f"\n🔍 '{keyword}' 검색 결과")
         print("="*60)
         
         # 레스토랑 이름에서 검색
-        matches = self.df_restaurants[
-            self.df_restaurants['name'].str.contains(keyword, case=False, na=False)
-        ]
+        matches = self._search_matches(keyword)
         
         if len(matches) == 0:
             print("검색 결과가 없습니다.")
             return
         
+        shown = matches.head(SEARCH_RESULT_LIMIT)
+        aggregates = self._aggregates_for('search', sample_ids=set(shown['restaurant_id']))
         print(f"총 {len(matches)}개 레스토랑 발견:")
-        for _, restaurant in matches.head(10).iterrows():
+        for _, restaurant in shown.iterrows():
             print(f"\n• {restaurant['name']} ({restaurant['grid']})")
             print(f"  평점: {restaurant['rating']:.1f} | 리뷰: {restaurant['reviews_count']}개")
             print(f"  주소: {restaurant['address'][:50]}...")
             
-            # 해당 레스토랑의 샘플 리뷰
-            sample_reviews = self.df_reviews[
-                self.df_reviews['restaurant_id'] == restaurant['restaurant_id']
-            ].head(2)
+            # 해당 레스토랑의 샘플 리뷰 (파일 순서로 앞에서부터)
+            sample_reviews = aggregates.samples.get(restaurant['restaurant_id'], [])
             
             if len(sample_reviews) > 0:
                 print("  샘플 리뷰:")
-                for _, review in sample_reviews.iterrows():
+                for review in sample_reviews:
                     text = review['text'][:100] if len(review['text']) > 100 else review['text']
                     print(f"    - [{review['rating']}★] {text}...")
     
-    def export_filtered_data(self, condition: str, output_name: str):
-        """조건에 맞는 데이터 추출 및 저장"""
-        print(f"\n💾 조건부 데이터 추출: {condition}")
+    def search_index(self) -> SearchIndex:
+        """전문 검색 색인 (convert_reviews_to_parquet.py --search_index 출력)"""
+        if self._search_index is None:
+            index_path = self.data_dir / SEARCH_INDEX_DB.name
+            if not index_path.exists():
+                raise FileNotFoundError(f"검색 색인이 없습니다: {index_path} (변환 시 --search_index 사용)")
+            self._search_index = SearchIndex(index_path)
+        return self._search_index
         
-        # 예시: 평점 4.5 이상 레스토랑의 리뷰만 추출
-        if condition == "high_rating":
-            high_rated = self.df_restaurants[self.df_restaurants['rating'] >= 4.5]
-            restaurant_ids = high_rated['restaurant_id'].tolist()
-            filtered_reviews = self.df_reviews[
-                self.df_reviews['restaurant_id'].isin(restaurant_ids)
-            ]
+    def search_reviews(self, query: str, limit: int = SEARCH_RESULT_LIMIT):
+        """
+        리뷰 본문 전문 검색 (검색 색인 사용, 관련도 순 + 검색어 주변 스니펫)
+        
+        Args:
+            query: 검색어 (예: "pizza", "김치" - 한글은 단어 일부로도 검색됨)
+            limit: 출력할 최대 리뷰 수
             
-            output_path = self.data_dir / f"{output_name}.parquet"
-            filtered_reviews.to_parquet(output_path, compression='snappy')
-            print(f"✅ {len(filtered_reviews):,}개 리뷰를 {output_path}에 저장")
+        Returns:
+            검색 결과 리스트 (review_id, restaurant_id, restaurant_name, rating, language, score, snippet)
+        """
+        index = self.search_index()
+        start = time.perf_counter()
+        hits = index.search_reviews(query, limit=limit)
+        total = index.count_reviews(query)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        print(f"\n🔎 리뷰 본문 '{query}' 검색 결과")
+        print("="*60)
+        if not hits:
+            print("검색 결과가 없습니다.")
+            return hits
+        
+        print(f"총 {total:,}개 리뷰 중 상위 {len(hits)}개 ({elapsed_ms:.1f}ms):")
+        for hit in hits:
+            print(f"\n• {hit['restaurant_name']} [{hit['rating']}★] ({hit['language']})")
+            print(f"  {hit['snippet']}")
+        return hits
+        
+    def filtered_batches(self, expression=None, columns=None, batch_size: int = 65_536):
+        """
+        리뷰 파일(reviews_source)에서 조건에 맞는 리뷰를 레코드 배치 단위로 읽기
+        
+        행 그룹 통계(최소/최대)로 조건에 맞는 행이 없는 행 그룹을 먼저 거르고, 남은 행 그룹만 배치 단위로 읽어
+        필터를 적용하므로 메모리에는 배치 하나 분량만 올라옴. 캐시를 쓰면 메모리 맵 테이블에서 바로 필터
+        
+        Args:
+            expression: pyarrow.dataset 필터 식 (None이면 전체 행)
+            columns: 읽을 열 (기본값: 전체) - 필터 식이 참조하는 열이 포함되어야 함
+            batch_size: 한 번에 읽을 리뷰 수
             
-        # 추가 조건들을 여기에 구현 가능
+        Yields:
+            조건에 맞는 행만 남은 레코드 배치 (빈 배치는 건너뜀)
+        """
+        reviews_path = self.reviews_source()
+        if self.arrow_cache is not None or reviews_path.is_dir():
+            batches = self.reviews_file_dataset().to_batches(columns=columns, filter=expression, batch_size=batch_size)
+            yield from (batch for batch in batches if batch.num_rows)
+            return
+        
+        row_groups = None
+        if expression is not None:
+            fragment = next(ds.dataset(reviews_path, format='parquet').get_fragments())
+            row_groups = [row_group.id for piece in fragment.split_by_row_group(expression)
+                          for row_group in piece.row_groups]
+            if not row_groups:
+                return
+        reviews_file = pq.ParquetFile(reviews_path, pre_buffer=False)
+        for batch in reviews_file.iter_batches(batch_size=batch_size, row_groups=row_groups, columns=columns):
+            if expression is not None:
+                batch = pa.Table.from_batches([batch]).filter(expression).combine_chunks()
+                batch = batch.to_batches()[0] if batch.num_rows else None
+            if batch is not None and batch.num_rows:
+                yield batch
+        
+    def export_filtered_data(self, condition, output_name: str, columns=None, batch_size: int = 65_536) -> int:
+        """
+        조건에 맞는 리뷰를 배치 단위로 읽어 바로 Parquet 파일로 저장
+        
+        조건은 pyarrow.dataset 필터 식으로 바뀌어 행 그룹 통계로 건너뛰기까지 푸시다운되므로,
+        리뷰 전체를 메모리에 올리지 않고 조건에 맞는 행만 EXPORT_ROW_GROUP_SIZE 단위로 모아 기록함.
+        걸러진 배치의 사전 열은 남은 값만으로 다시 인코딩하여 행 그룹마다 원본 사전 전체를 쓰지 않음
+        
+        Args:
+            condition: 프리셋 이름(FILTER_PRESETS, 예: 'high_rating'), 조건 문자열
+                       (예: "borough=MN language=ko rating=4..") 또는 ReviewFilter
+            output_name: 저장할 파일 이름 (data_dir/<output_name>.parquet)
+            columns: 저장할 리뷰 열 (기본값: 전체)
+            batch_size: 한 번에 읽을 리뷰 수
+            
+        Returns:
+            저장한 리뷰 수
+        """
+        print(f"\n💾 조건부 데이터 추출: {condition}")
+        
+        if isinstance(condition, ReviewFilter):
+            review_filter = condition
+        elif condition in FILTER_PRESETS:
+            review_filter = FILTER_PRESETS[condition]
+        else:
+            review_filter = ReviewFilter.parse(condition)
+        expression = review_filter.expression(self.read_table('restaurants'), load_tier_info(GRID_TIER_CSV))
+        
+        schema = self.reviews_file_dataset().schema
+        read_columns = None
+        if columns is not None:
+            columns = list(columns)
+            read_columns = columns + [column for column in review_filter.review_columns() if column not in columns]
+            schema = pa.schema([schema.field(column) for column in columns])
+        
+        output_path = self.data_dir / f"{output_name}.parquet"
+        exported = 0
+        buffer = []
+        buffered = 0
+        with pq.ParquetWriter(output_path, schema.remove_metadata(), compression='snappy') as writer:
+            for batch in self.filtered_batches(expression, read_columns, batch_size):
+                buffer.append(_compact_dictionaries(batch.select(schema.names)))
+                buffered += batch.num_rows
+                if buffered >= EXPORT_ROW_GROUP_SIZE:
+                    writer.write_table(pa.Table.from_batches(buffer, schema=schema.remove_metadata()))
+                    exported += buffered
+                    buffer, buffered = [], 0
+            if buffer:
+                writer.write_table(pa.Table.from_batches(buffer, schema=schema.remove_metadata()))
+                exported += buffered
+        print(f"✅ {exported:,}개 리뷰를 {output_path}에 저장")
+        return exported
+
+
+def _compact_dictionaries(batch: pa.RecordBatch) -> pa.RecordBatch:
+    """사전 인코딩 열을 배치에 남은 값만으로 다시 인코딩 (걸러진 배치도 원본 행 그룹의 사전 전체를 들고 있음)"""
+    columns = [pc.dictionary_encode(column.dictionary_decode()).cast(column.type)
+               if pa.types.is_dictionary(column.type) else column for column in batch.columns]
+    return pa.RecordBatch.from_arrays(columns, schema=batch.schema)
 
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='Parquet 리뷰 데이터 분석')
+    parser.add_argument('--engine', choices=ENGINES, default='arrow',
+                        help='리포트 집계 엔진 (arrow: pyarrow 배치 스캔, duckdb: DuckDB SQL, 기본값: arrow)')
+    parser.add_argument('--data_dir', type=str, default=str(PARQUET_DATA_DIR),
+                        help='Parquet 파일 디렉토리')
+    parser.add_argument('--cache', action='store_true',
+                        help='디코딩한 테이블을 Arrow IPC 캐시(arrow_cache/)에 두고 메모리 맵으로 열기 (두 번째 실행부터 빠름)')
+    parser.add_argument('--cache_compression', choices=[c for c in COMPRESSIONS if c], default=None,
+                        help='캐시 파일 압축 (기본값: 압축 안 함 - 복사 없이 읽기)')
+    parser.add_argument('--out_of_core', action='store_true', default=None,
+                        help='리뷰를 메모리에 올리지 않고 배치 단위 집계로 분석 (기본값: 예상 크기가 메모리 한도를 넘으면 자동)')
+    parser.add_argument('--memory_limit_mb', type=int, default=None,
+                        help=f'out-of-core 자동 선택 기준 메모리 한도 (MB, 기본값: 사용 가능한 메모리의 '
+                             f'{MEMORY_LIMIT_FRACTION * 100:.0f}%%)')
+    parser.add_argument('--export', type=str, default=None, metavar='CONDITION',
+                        help=f'조건에 맞는 리뷰만 Parquet으로 추출 - 프리셋({", ".join(FILTER_PRESETS)}) 또는 '
+                             f'조건 문자열 (예: "borough=MN language=ko rating=4.. date=2024-01-01..")')
+    parser.add_argument('--export_name', type=str, default='filtered_reviews',
+                        help='추출 파일 이름 (data_dir/<이름>.parquet, 기본값: filtered_reviews)')
+    args = parser.parse_args()
+    
     print("\n🔍 NYC Restaurant Reviews Parquet Data Analyzer")
     print("="*60)
     
-    analyzer = ReviewAnalyzer()
+    analyzer = ReviewAnalyzer(args.data_dir, engine=args.engine, cache=args.cache,
+                              cache_compression=args.cache_compression, out_of_core=args.out_of_core,
+                              memory_limit=args.memory_limit_mb * 2**20 if args.memory_limit_mb else None)
     
-    # 데이터 로드
-    analyzer.load_data()
+    # 레스토랑 로드 + 모든 리포트 집계 (요약 테이블이 있으면 그대로 사용, 없으면 리뷰 파일 한 번의 스캔으로 계산)
+    print("📂 Parquet 파일 로딩 중...")
+    analyzer.load_restaurants()
+    start = time.perf_counter()
+    if analyzer.has_summaries():
+        aggregates = analyzer.load_summaries()
+        source = "요약 테이블"
+    else:
+        aggregates = analyzer.compute_aggregates(search_keywords=["Pizza"])
+        source = "리뷰 파일 스캔, out-of-core" if aggregates.sketch else "리뷰 파일 스캔"
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"✅ 레스토랑 {len(analyzer.df_restaurants):,}개 로드 완료")
+    print(f"✅ 리뷰 {aggregates.total_reviews:,}개 집계 완료 ({source}, {elapsed_ms:.0f}ms)")
     
     # 기본 통계
     analyzer.basic_statistics()
@@ -260,8 +967,18 @@ def main():
     print("\n" + "="*60)
     analyzer.search_restaurants("Pizza")
     
-    # 데이터 추출 예시
-    # analyzer.export_filtered_data("high_rating", "high_rated_reviews")
+    # 리뷰 본문 검색 예시 (검색 색인이 있을 때)
+    if (analyzer.data_dir / SEARCH_INDEX_DB.name).exists():
+        analyzer.search_reviews("pizza", limit=5)
+        analyzer.search_reviews("김치", limit=5)
+    
+    # 스케치 기반 근사 통계 (스케치 테이블이 있을 때)
+    if analyzer.has_sketches():
+        analyzer.sketch_report()
+    
+    # 데이터 추출 (예: --export high_rating, --export "tier=HOT language=ko")
+    if args.export:
+        analyzer.export_filtered_data(args.export, args.export_name)
     
     print("\n✅ 분석 완료!")
     
@@ -307,7 +1024,3 @@ result = conn.execute('''
 
 if __name__ == "__main__":
     main()
-
-
-if __name__ == "__main__":
-    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+엔트리 포인트 임포트 시간 벤치마크 (python -X importtime)
+
+모듈마다 새 인터프리터에서 `-X importtime`으로 임포트하여 인터프리터 시작 시 읽는 모듈을 뺀 누적 임포트 시간과
+가장 무거운 패키지를 출력합니다. 임포트 시간은 main.py가 띄우는 하위 프로세스와 변환 워커 프로세스(spawn)마다
+반복되므로, cli.py와 config.py는 무거운 패키지(pandas, pyarrow, Selenium 등)를 읽지 않아야 합니다.
+
+사용법:
+    python scripts/benchmark_import_time.py --repeat 5
+    # cli 임포트가 50ms를 넘거나 무거운 패키지를 읽으면 종료 코드 1
+    python scripts/benchmark_import_time.py --max_ms 50
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# 이름 -> 임포트할 모듈 (프로젝트 루트 기준)
+TARGETS = {
+    'cli': 'cli',
+    'config': 'config',
+    'convert': 'scripts.convert_reviews_to_parquet',
+    'analyze': 'scripts.analyze_parquet_reviews',
+    'pipeline': 'main',
+}
+
+# 시작만 하는 명령(cli, config)에서 읽으면 안 되는 패키지
+HEAVY_PACKAGES = ('pandas', 'numpy', 'pyarrow', 'duckdb', 'dotenv', 'matplotlib', 'seaborn', 'selenium', 'requests')
+
+
+def parse_importtime(stderr: str) -> List[Tuple[int, int, str]]:
+    """
+    -X importtime 출력 파싱
+
+    Returns:
+        [(깊이, 누적 시간(µs), 모듈 이름), ...] 임포트가 끝난 순서
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():  # 머리글 줄
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, int(cumulative), name.strip()))
+    return entries
+
+
+def run_importtime(code: str) -> List[Tuple[int, int, str]]:
+    """새 인터프리터에서 코드를 실행하고 -X importtime 결과 반환"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=BASE_DIR,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"임포트 실패: {code}\n{result.stderr.splitlines()[-1]}")
+    return parse_importtime(result.stderr)
+
+
+def benchmark(module: str, startup: Set[str], repeat: int) -> Tuple[float, Dict[str, int], Set[str]]:
+    """
+    모듈 하나를 repeat번 새로 임포트
+
+    Args:
+        module: 임포트할 모듈 이름
+        startup: 인터프리터 시작 시 읽는 모듈 (빈 프로그램의 -X importtime 결과, 시간에서 제외)
+        repeat: 반복 횟수
+
+    Returns:
+        (최소 임포트 시간(ms), 최상위 패키지별 누적 시간(µs, 가장 빠른 실행), 읽은 최상위 패키지)
+    """
+    best = None
+    for _ in range(repeat):
+        entries = [entry for entry in run_importtime(f"import {module}") if entry[2] not in startup]
+        total = sum(cumulative for depth, cumulative, _ in entries if depth == 0)
+        if best is None or total < best[0]:
+            best = (total, entries)
+    total, entries = best
+    packages = {}
+    for _, cumulative, name in entries:
+        package = name.split('.')[0]
+        packages[package] = max(packages.get(package, 0), cumulative)
+    return total / 1000, packages, set(packages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='엔트리 포인트 임포트 시간 벤치마크 (-X importtime)')
+    parser.add_argument('--targets', nargs='+', choices=list(TARGETS), default=list(TARGETS),
+                        help='측정할 엔트리 포인트 (기본값: 전체)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='반복 횟수 (가장 빠른 결과 사용, 기본값: 3)')
+    parser.add_argument('--top', type=int, default=5,
+                        help='무거운 패키지 출력 개수 (기본값: 5)')
+    parser.add_argument('--max_ms', type=float, default=None,
+                        help='cli 임포트 시간 상한(ms) - 넘거나 무거운 패키지를 읽으면 종료 코드 1')
+    args = parser.parse_args()
+
+    startup = {name for _, _, name in run_importtime("pass")}
+    print(f"\n⏱️  임포트 시간 벤치마크 (python -X importtime, 반복 {args.repeat}회, 인터프리터 시작 모듈 제외)")
+    print("=" * 60)
+
+    failed = False
+    for name in args.targets:
+        module = TARGETS[name]
+        try:
+            elapsed_ms, packages, loaded = benchmark(module, startup, max(1, args.repeat))
+        except RuntimeError as e:
+            print(f"  {name:9s} 건너뜀 - {e}")
+            continue
+        own = set(module.split('.')[:1]) | {'utils', 'config'}
+        heaviest = sorted(((us, package) for package, us in packages.items() if package not in own), reverse=True)
+        heavy = [package for package in HEAVY_PACKAGES if package in loaded]
+        print(f"  {name:9s} {elapsed_ms:8.1f}ms  ({module})")
+        print("            무거운 패키지: " +
+              (", ".join(f"{package} {us / 1000:.1f}ms" for us, package in heaviest[:args.top]) or "없음"))
+        if name in ('cli', 'config') and heavy:
+            print(f"            ⚠️  시작 단계에서 읽으면 안 되는 패키지: {', '.join(heavy)}")
+            failed = True
+        if name == 'cli' and args.max_ms is not None and elapsed_ms > args.max_ms:
+            print(f"            ⚠️  상한 {args.max_ms:.0f}ms 초과")
+            failed = True
+    print("=" * 60)
+
+    if args.max_ms is not None and failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+리뷰 JSON 디코더 벤치마크 (utils/review_io.py)
+
+사용 가능한 디코더(msgspec, orjson, json)별로 모든 리뷰 파일을 디코딩+스키마 검증하는 시간을 측정합니다.
+파일 읽기 시간을 빼기 위해 파일 내용은 먼저 메모리에 올려 두고 디코딩만 반복합니다.
+
+사용법:
+    python scripts/benchmark_json_decoding.py --repeat 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 상위 디렉토리를 sys.path에 추가하여 config 모듈을 임포트할 수 있도록 함
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from config import REVIEWS_DIR
+from utils.review_io import ReviewFileError, ReviewFileReader, available_backends
+
+
+def benchmark(raw_files, backend: str, repeat: int):
+    """
+    디코더 하나로 전체 파일을 repeat번 디코딩
+
+    Returns:
+        (최소 소요 시간(초), 리뷰 수, 실패 파일 수)
+    """
+    reader = ReviewFileReader(backend)
+    best = None
+    for _ in range(repeat):
+        reviews = 0
+        failed = 0
+        start = time.perf_counter()
+        for raw in raw_files:
+            try:
+                reviews += len(reader.decode(raw).reviews['review_id'])
+            except ReviewFileError:
+                failed += 1
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, reviews, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='리뷰 JSON 디코더 벤치마크')
+    parser.add_argument('--reviews_dir', type=str, default=str(REVIEWS_DIR),
+                        help='리뷰 JSON 디렉토리')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='반복 횟수 (가장 빠른 결과 사용, 기본값: 3)')
+    args = parser.parse_args()
+
+    paths = sorted(Path(args.reviews_dir).glob("**/*_reviews.json"))
+    raw_files = [path.read_bytes() for path in paths]
+    total_mb = sum(len(raw) for raw in raw_files) / (1024 * 1024)
+    print(f"\n📊 리뷰 JSON 디코딩 벤치마크: 파일 {len(raw_files):,}개 ({total_mb:.1f} MB), 반복 {args.repeat}회")
+    print("=" * 60)
+
+    baseline = None
+    for backend in reversed(available_backends()):  # 표준 json부터 측정하여 기준으로 사용
+        elapsed, reviews, failed = benchmark(raw_files, backend, max(1, args.repeat))
+        baseline = baseline or elapsed
+        print(f"  {backend:8s} {elapsed:6.3f}초  {total_mb / elapsed:7.1f} MB/s  "
+              f"리뷰 {reviews:,}개, 실패 {failed}개  (json 대비 {baseline / elapsed:.2f}배)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+근사 중복 탐지 벤치마크 (convert_reviews_to_parquet.py --dedup)
+
+리뷰 수를 지정한 합성 본문을 만들고 일부를 단어 몇 개만 바꾼 사본/번역 표시가 붙은 사본으로 심은 뒤,
+서명 계산, LSH 후보 쌍, 검증 + 묶음 단계별 시간과 심은 중복을 찾은 비율(재현율)을 측정합니다.
+리뷰 수가 늘 때 시간이 거의 비례해서 늘어나는지(리뷰당 시간, 규모 지수)와 모든 쌍을 비교할 때의
+비교 횟수(n²/2) 대비 후보 쌍 수를 함께 표시합니다.
+
+사용법:
+    python scripts/benchmark_near_duplicates.py --sizes 100000 300000 1000000 --workers 4
+"""
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+
+# 상위 디렉토리를 sys.path에 추가하여 config 모듈을 임포트할 수 있도록 함
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.near_duplicates import (BANDS, THRESHOLD, NearDuplicateDetector, candidate_pairs, group_labels,
+                                   similar_pairs)
+
+VOCABULARY_SIZE = 20_000
+BATCH_ROWS = 100_000
+DUPLICATE_RATE = 0.05       # 앞선 리뷰의 사본으로 심는 비율
+EDIT_RATE = 0.03            # 사본에서 바꾸는 단어 비율
+TRANSLATED_RATE = 0.3       # 사본 중 Google 번역 표시를 붙이는 비율
+HANGUL_RATE = 0.1           # 한글 단어로 쓰는 리뷰 비율
+
+
+def make_texts(num_reviews: int, seed: int = 0):
+    """
+    합성 리뷰 본문 생성 (단어 수 5~120개, 일부는 앞선 리뷰의 편집 사본)
+
+    Args:
+        num_reviews: 리뷰 수
+        seed: 난수 시드
+
+    Returns:
+        (본문 배치 목록 - pyarrow 문자열 배열, 심은 중복 쌍 (원본 번호, 사본 번호) 배열)
+    """
+    rng = np.random.default_rng(seed)
+    letters = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+    syllables = np.array(list('가나다라마바사아자차카타파하맛집국밥찌개김치불고기냉면'))
+    latin = [''.join(rng.choice(letters, rng.integers(2, 10))) for _ in range(VOCABULARY_SIZE)]
+    hangul = [''.join(rng.choice(syllables, rng.integers(1, 5))) for _ in range(VOCABULARY_SIZE // 4)]
+
+    words = []
+    planted = []
+    batches = []
+    batch = []
+    for index in range(num_reviews):
+        if index > 0 and rng.random() < DUPLICATE_RATE:
+            source = int(rng.integers(0, index))
+            copied = list(words[source])
+            for position in np.flatnonzero(rng.random(len(copied)) < EDIT_RATE):
+                copied[position] = latin[rng.integers(0, VOCABULARY_SIZE)]
+            words.append(copied)
+            planted.append((source, index))
+            text = ' '.join(copied)
+            if rng.random() < TRANSLATED_RATE:
+                text = f"(Translated by Google) {' '.join(latin[:8])} (Original) {text}"
+        else:
+            vocabulary = hangul if rng.random() < HANGUL_RATE else latin
+            words.append([vocabulary[i] for i in rng.integers(0, len(vocabulary), rng.integers(5, 121))])
+            text = ' '.join(words[-1])
+        batch.append(text)
+        if len(batch) == BATCH_ROWS:
+            batches.append(pa.array(batch, pa.string()))
+            batch = []
+    if batch:
+        batches.append(pa.array(batch, pa.string()))
+    return batches, np.array(planted, dtype=np.int64).reshape(-1, 2)
+
+
+def run_detector(detector: NearDuplicateDetector, batches):
+    """
+    단계별로 근사 중복 탐지 실행
+
+    Returns:
+        (단계별 소요 시간(초) 딕셔너리, 후보 쌍 수, 묶음 번호 배열)
+    """
+    timings = {}
+    start = time.perf_counter()
+    signatures = np.concatenate(list(detector.signatures(batches)))
+    timings['서명'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pairs = candidate_pairs(signatures, detector.bands)
+    timings['후보 쌍'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    groups = group_labels(len(signatures), similar_pairs(signatures, pairs, detector.threshold))
+    timings['검증 + 묶음'] = time.perf_counter() - start
+    return timings, len(pairs), groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description='근사 중복 탐지(MinHash LSH) 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 300_000, 1_000_000],
+                        help='합성 리뷰 수 (기본값: 100000 300000 1000000)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='서명을 계산할 프로세스 수 (기본값: 1)')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help=f'같은 묶음으로 볼 최소 자카드 유사도 추정치 (기본값: {THRESHOLD})')
+    parser.add_argument('--bands', type=int, default=BANDS,
+                        help=f'LSH 밴드 수 (기본값: {BANDS})')
+    args = parser.parse_args()
+
+    detector = NearDuplicateDetector(threshold=args.threshold, bands=args.bands, workers=args.workers)
+    print(f"\n📊 근사 중복 탐지 벤치마크 (워커 {args.workers}개, 임계값 {args.threshold}, 밴드 {args.bands}개)")
+    print("=" * 60)
+    previous = None
+    for size in args.sizes:
+        start = time.perf_counter()
+        batches, planted = make_texts(size)
+        print(f"\n리뷰 {size:,}개 (심은 중복 {len(planted):,}쌍, 생성 {time.perf_counter() - start:.1f}초)")
+
+        timings, num_candidates, groups = run_detector(detector, batches)
+        total = sum(timings.values())
+        for stage, seconds in timings.items():
+            print(f"  {stage:10s} {seconds:7.2f}초")
+        print(f"  {'합계':10s} {total:7.2f}초  (리뷰당 {total / size * 1e6:.1f}µs)")
+
+        found = (groups[planted[:, 0]] >= 0) & (groups[planted[:, 0]] == groups[planted[:, 1]])
+        planted_rows = np.zeros(size, dtype=bool)
+        planted_rows[planted.reshape(-1)] = True
+        print(f"  후보 쌍 {num_candidates:,}개 (모든 쌍 비교 {size * (size - 1) // 2:,}회의 "
+              f"{num_candidates / max(1, size * (size - 1) // 2):.2e}배)")
+        print(f"  재현율 {found.mean() if len(found) else 1.0:.1%}, "
+              f"심지 않은 리뷰가 묶인 경우 {int((groups[~planted_rows] >= 0).sum()):,}개")
+        if previous:
+            exponent = math.log(total / previous[1]) / math.log(size / previous[0])
+            print(f"  규모 지수 {exponent:.2f} (리뷰 {previous[0]:,}개 대비, 1이면 선형 / 2면 모든 쌍 비교)")
+        previous = (size, total)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+리포트 엔진 벤치마크 (analyze_parquet_reviews.py --engine arrow / duckdb)
+
+리뷰 수를 지정한 합성 데이터(restaurants.parquet, reviews.parquet - 변환기와 같은 스키마)를 만들고,
+엔진별로 모든 리포트 집계 + 출력에 걸리는 시간을 측정합니다. 두 엔진의 출력이 같은지, 그리고 기존 방식
+(pandas groupby)으로 계산한 한국어 리뷰 TOP 10과 같은지(동률 순서 포함)도 확인합니다.
+참고로 기존 방식(pd.read_parquet로 리뷰 전체를 읽은 뒤 pandas로 분석)의 로드 단계 시간도 함께 표시합니다.
+
+사용법:
+    python scripts/benchmark_report_engines.py --sizes 1000000 10000000
+"""
+
+import argparse
+import contextlib
+import io
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# 상위 디렉토리를 sys.path에 추가하여 config 모듈을 임포트할 수 있도록 함
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from analyze_parquet_reviews import ENGINES, ReviewAnalyzer
+from convert_reviews_to_parquet import RESTAURANT_SCHEMA, REVIEW_SCHEMA
+from utils.grid_info import BOROUGHS
+
+# 합성 데이터 분포 (실제 수집 데이터와 비슷한 비율)
+LANGUAGES = ['en', 'ko', 'es', 'zh', 'ja', 'fr', 'de', 'it', 'pt', 'ru']
+LANGUAGE_WEIGHTS = [0.72, 0.03, 0.07, 0.05, 0.04, 0.03, 0.02, 0.02, 0.01, 0.01]
+RATING_WEIGHTS = [0.04, 0.03, 0.07, 0.18, 0.68]  # 1~5점
+DATE_TEXTS = ['1주 전', '2주 전', '1달 전', '3달 전', '6달 전', '1년 전', '2년 전', '5년 전']
+NAME_WORDS = ['Pizza', 'Korean', 'Deli', 'Cafe', 'Grill', 'Kitchen', 'Noodle', 'Bistro', 'Bar', 'Diner']
+WRITE_CHUNK_ROWS = 1_000_000
+# 실제 데이터처럼 한국어 리뷰 수가 같은 레스토랑을 만들어 TOP 10의 동률 순서도 비교
+KOREAN_TIE_RESTAURANTS = 20
+KOREAN_TIE_REVIEWS = 200
+
+
+def make_corpus(output_dir: Path, num_reviews: int, seed: int = 0):
+    """
+    합성 리뷰 데이터 생성 (레스토랑 수는 리뷰 70개당 1개, 레스토랑별 리뷰 수는 치우친 분포)
+
+    Args:
+        output_dir: restaurants.parquet, reviews.parquet를 저장할 디렉토리
+        num_reviews: 리뷰 수
+        seed: 난수 시드
+    """
+    rng = np.random.default_rng(seed)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    grids = [f"{code}{number}" for code in BOROUGHS for number in range(1, 13)]
+    num_restaurants = max(100, num_reviews // 70)
+    weights = rng.pareto(1.5, num_restaurants) + 1
+    counts = rng.multinomial(num_reviews, weights / weights.sum())
+    restaurant_grid = rng.integers(0, len(grids), num_restaurants)
+    restaurant_ids = [f"R{i:07d}" for i in range(num_restaurants)]
+    names = [f"{NAME_WORDS[i % len(NAME_WORDS)]} {i // len(NAME_WORDS)}" for i in range(num_restaurants)]
+
+    restaurants = pa.table({
+        'restaurant_id': restaurant_ids,
+        'name': names,
+        'grid': pa.DictionaryArray.from_arrays(pa.array(restaurant_grid, pa.int32()), pa.array(grids)),
+        'address': [f"{i} Broadway, New York, NY" for i in range(num_restaurants)],
+        'rating': rng.uniform(3.0, 5.0, num_restaurants).round(1).astype(np.float32),
+        'user_ratings_total': (counts * 3).astype(np.int32),
+        'phone_number': [''] * num_restaurants,
+        'reviews_count': counts.astype(np.int32),
+        'file_path': [''] * num_restaurants,
+    }, schema=RESTAURANT_SCHEMA)
+    pq.write_table(restaurants, output_dir / 'restaurants.parquet', compression='snappy')
+
+    # 리뷰 텍스트는 길이가 다양한 문장 모음에서 골라 씀
+    pool_lengths = rng.integers(10, 400, 5000)
+    text_pool = pa.array([("맛있어요 great food " * 20)[:length] for length in pool_lengths])
+    restaurant_of_review = np.repeat(np.arange(num_restaurants, dtype=np.int32), counts)
+    first_review = np.cumsum(counts) - counts
+    candidates = np.flatnonzero(counts >= KOREAN_TIE_REVIEWS)
+    tied = np.zeros(num_restaurants, dtype=bool)
+    tied[rng.choice(candidates, min(KOREAN_TIE_RESTAURANTS, len(candidates)), replace=False)] = True
+    korean = LANGUAGES.index('ko')
+    restaurant_dictionary = pa.array(restaurant_ids)
+    name_dictionary = pa.array(names)
+    grid_dictionary = pa.array(grids)
+    language_dictionary = pa.array(LANGUAGES)
+    date_dictionary = pa.array(DATE_TEXTS)
+
+    with pq.ParquetWriter(output_dir / 'reviews.parquet', REVIEW_SCHEMA, compression='snappy') as writer:
+        for start in range(0, num_reviews, WRITE_CHUNK_ROWS):
+            size = min(WRITE_CHUNK_ROWS, num_reviews - start)
+            restaurant = restaurant_of_review[start:start + size]
+            text_index = pa.array(rng.integers(0, len(text_pool), size))
+            language = rng.choice(len(LANGUAGES), size, p=LANGUAGE_WEIGHTS)
+            # 동률 레스토랑은 앞의 KOREAN_TIE_REVIEWS개만 한국어
+            position = np.arange(start, start + size) - first_review[restaurant]
+            in_tied = tied[restaurant]
+            language[in_tied] = np.where(position[in_tied] < KOREAN_TIE_REVIEWS, korean, 0)
+
+            def dictionary(indices, values):
+                return pa.DictionaryArray.from_arrays(pa.array(indices, pa.int32()), values)
+
+            batch = pa.table({
+                'review_id': pc.binary_join_element_wise(
+                    'rv', pc.cast(pa.array(np.arange(start, start + size)), pa.string()), ''),
+                'restaurant_id': dictionary(restaurant, restaurant_dictionary),
+                'restaurant_name': dictionary(restaurant, name_dictionary),
+                'grid': dictionary(restaurant_grid[restaurant], grid_dictionary),
+                'date_original': dictionary(rng.integers(0, len(DATE_TEXTS), size), date_dictionary),
+                'estimated_date': pa.array(np.datetime64('2025-01-27', 'us')
+                                           - rng.integers(0, 5 * 365, size).astype('timedelta64[D]')),
+                'is_modified': pa.array(rng.random(size) < 0.05),
+                'language': dictionary(language, language_dictionary),
+                'rating': pa.array(rng.choice(5, size, p=RATING_WEIGHTS).astype(np.int8) + 1),
+                'text': text_pool.take(text_index),
+                'text_length': pa.array(pool_lengths[text_index.to_numpy()].astype(np.int32)),
+            }, schema=REVIEW_SCHEMA)
+            writer.write_table(batch)
+
+
+def run_reports(data_dir: Path, engine: str):
+    """
+    엔진 하나로 모든 리포트 집계 + 출력
+
+    Returns:
+        (소요 시간(초), 출력 문자열)
+    """
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        analyzer = ReviewAnalyzer(data_dir, engine=engine)
+        analyzer.load_restaurants()
+        analyzer.compute_aggregates(search_keywords=['Pizza'])
+        analyzer.basic_statistics()
+        analyzer.analyze_top_restaurants(n=10)
+        analyzer.analyze_by_grid()
+        analyzer.analyze_korean_reviews()
+        analyzer.search_restaurants('Pizza')
+    return time.perf_counter() - start, output.getvalue()
+
+
+def baseline_korean_top(df_reviews: pd.DataFrame, df_restaurants: pd.DataFrame) -> str:
+    """
+    기존 방식(리뷰 전체를 pandas groupby)으로 만든 한국어 리뷰 TOP 10 출력 - 엔진 출력과 비교용
+
+    groupby는 이름순으로 정렬하므로 nlargest의 동률은 이름순으로 남음
+    """
+    korean = df_reviews[df_reviews['language'] == 'ko']
+    top_korean = korean.groupby(korean['restaurant_name'].astype(str)).size().nlargest(10)
+    first_reviews_count = df_restaurants.drop_duplicates('name').set_index('name')['reviews_count']
+    lines = []
+    for name, count in top_korean.items():
+        if name in first_reviews_count.index:
+            total_reviews = first_reviews_count[name]
+            korean_pct = (count / total_reviews * 100) if total_reviews > 0 else 0
+            lines.append(f"  • {name}: {count}개 ({korean_pct:.1f}% 한국어)")
+    return "\n한국어 리뷰가 많은 레스토랑 TOP 10:\n" + "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='리포트 엔진 벤치마크 (arrow vs duckdb)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000_000, 10_000_000],
+                        help='합성 데이터 리뷰 수 (기본값: 1000000 10000000)')
+    parser.add_argument('--work_dir', type=str, default=None,
+                        help='합성 데이터를 만들 디렉토리 (기본값: 임시 디렉토리, 끝나면 삭제)')
+    args = parser.parse_args()
+
+    work_dir = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix='report_bench_'))
+    print(f"\n📊 리포트 엔진 벤치마크 (데이터: {work_dir})")
+    print("=" * 60)
+    try:
+        for size in args.sizes:
+            data_dir = work_dir / f"reviews_{size}"
+            start = time.perf_counter()
+            make_corpus(data_dir, size)
+            file_mb = (data_dir / 'reviews.parquet').stat().st_size / (1024 * 1024)
+            print(f"\n리뷰 {size:,}개 (reviews.parquet {file_mb:.0f} MB, 생성 {time.perf_counter() - start:.1f}초)")
+
+            start = time.perf_counter()
+            df_reviews = pd.read_parquet(data_dir / 'reviews.parquet')
+            load_seconds = time.perf_counter() - start
+            memory_mb = df_reviews.memory_usage(deep=True).sum() / (1024 * 1024)
+            expected_korean = baseline_korean_top(df_reviews, pd.read_parquet(data_dir / 'restaurants.parquet'))
+            del df_reviews
+            print(f"  {'pandas':8s} {load_seconds:7.2f}초  (read_parquet 전체 로드만, {memory_mb:,.0f} MB)")
+
+            outputs = {}
+            for engine in ENGINES:
+                elapsed, outputs[engine] = run_reports(data_dir, engine)
+                print(f"  {engine:8s} {elapsed:7.2f}초  (집계 + 리포트 출력)")
+            same = len(set(outputs.values())) == 1
+            print(f"  출력 일치: {'예' if same else '아니오'}")
+            baseline_same = all(expected_korean in output for output in outputs.values())
+            print(f"  기존 방식과 한국어 TOP 10 일치: {'예' if baseline_same else '아니오'}")
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,113 +8,466 @@
 """
 
 import os
+import sys
 import json
-import pandas as pd
+import hashlib
+import shutil
+import argparse
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from pathlib import Path
 from datetime import datetime
-import re
-from typing import Dict, List, Tuple
-import logging
-import warnings
-warnings.filterwarnings('ignore')
-
-import sys
-from typing import Dict, List, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 import logging
 import warnings
 
 # 상위 디렉토리를 sys.path에 추가하여 config 모듈을 임포트할 수 있도록 함
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from config import REVIEWS_DIR, PARQUET_DATA_DIR, LOG_DIR
+from config import (REVIEWS_DIR, PARQUET_DATA_DIR, LOG_DIR, REVIEWS_DATASET_DIR, CONVERSION_MANIFEST,
+                    REVIEWS_PARTITIONED_DIR, SEARCH_INDEX_DB, GRID_INFO_TXT, GRID_TIER_CSV, ensure_dirs)
+from utils.grid_info import parse_grid_info
+from utils.near_duplicates import THRESHOLD as DEDUP_THRESHOLD, NearDuplicateDetector
+from utils.review_io import ReviewFileReader, available_backends, default_backend
+from utils.review_sketches import SKETCH_TABLES, build_restaurant_sketches, read_sketches, sketch_batches, write_sketches
+from utils.review_summaries import (SUMMARY_TABLES, build_stats, existing_categories, read_summaries,
+                                    summarize_batches, write_summaries)
+from utils.search_index import REVIEW_COLUMNS as SEARCH_REVIEW_COLUMNS, SearchIndex
+from utils.relative_dates import normalize_relative_dates, reference_timestamp
+from utils.shard_planner import load_tier_info
+
+# pandas와 pyarrow.dataset(pandas를 함께 임포트)은 임포트 비용이 커서 사용하는 메서드 안에서 임포트
+# (기본 변환 경로와 워커 프로세스에서는 읽지 않음)
+if TYPE_CHECKING:
+    import pandas as pd
 
 warnings.filterwarnings('ignore')
 
-# 로깅 설정
 log_file_path = LOG_DIR / 'conversion.log'
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file_path, encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+# 반복되는 문자열 열은 사전 인코딩 (pandas에서는 category로 읽힘)
+# (전체 데이터를 보기 전에는 범주 수를 알 수 없으므로 사전 인덱스는 int32)
+CATEGORY_TYPE = pa.dictionary(pa.int32(), pa.string())
+
+RESTAURANT_SCHEMA = pa.schema([
+    ('restaurant_id', pa.string()),
+    ('name', pa.string()),
+    ('grid', CATEGORY_TYPE),
+    ('address', pa.string()),
+    ('rating', pa.float32()),
+    ('user_ratings_total', pa.int32()),
+    ('phone_number', pa.string()),
+    ('reviews_count', pa.int32()),
+    ('file_path', pa.string()),
+])
+
+# 리뷰 스키마 - 워커가 만드는 레코드 배치, 스트리밍/증분 조각, reviews.parquet 모두 동일
+REVIEW_SCHEMA = pa.schema([
+    ('review_id', pa.string()),
+    ('restaurant_id', CATEGORY_TYPE),
+    ('restaurant_name', CATEGORY_TYPE),
+    ('grid', CATEGORY_TYPE),
+    ('date_original', CATEGORY_TYPE),
+    ('estimated_date', pa.timestamp('us')),
+    ('is_modified', pa.bool_()),
+    ('language', CATEGORY_TYPE),
+    ('rating', pa.int8()),
+    ('text', pa.string()),
+    ('text_length', pa.int32()),
+])
+
+# 근사 중복 탐지(--dedup) 결과 열 - 같은 값의 리뷰는 본문이 거의 같은 묶음 (중복이 없으면 null)
+DUPLICATE_GROUP_FIELD = pa.field('duplicate_group', pa.int32())
+
+# 정규화(스타 스키마) 출력 - 리뷰 팩트 테이블은 레스토랑 단위 열 대신 정수 키만 가짐
+# restaurant_key는 dim_restaurants.parquet의 행 번호 (0부터)
+DIM_RESTAURANT_SCHEMA = pa.schema([('restaurant_key', pa.int32())] + list(RESTAURANT_SCHEMA))
+
+FACT_REVIEW_SCHEMA = pa.schema([
+    ('review_id', pa.string()),
+    ('restaurant_key', pa.int32()),
+    ('date_original', CATEGORY_TYPE),
+    ('estimated_date', pa.timestamp('us')),
+    ('is_modified', pa.bool_()),
+    ('language', CATEGORY_TYPE),
+    ('rating', pa.int8()),
+    ('text', pa.string()),
+    ('text_length', pa.int32()),
+])
+
+DIM_GRID_SCHEMA = pa.schema([
+    ('grid', pa.string()),
+    ('borough_code', pa.string()),
+    ('borough', pa.string()),
+    ('borough_kr', pa.string()),
+    ('district_number', pa.int16()),
+    ('area_en', pa.string()),
+    ('area_kr', pa.string()),
+    ('tier', pa.string()),
+])
+
+# 레스토랑 ID는 여러 grid에 중복될 수 있으므로 (restaurant_id, grid) 쌍으로 키를 찾음
+_PAIR_SEPARATOR = '\x1f'
+
+# 하이브 파티션 데이터셋 (borough=MN/grid=MN1[/year=2024]/part-0.parquet)
+# 파일 안에서는 restaurant_id 순으로 정렬하고, 행 그룹/페이지 통계와 페이지 인덱스로 레스토랑 단위 건너뛰기 가능
+PARTITION_ROW_GROUP_SIZE = 16_384
+PARTITION_DATA_PAGE_SIZE = 64 * 1024  # 작은 페이지일수록 페이지 인덱스로 건너뛰는 단위가 세밀해짐
+
+# JSON 리뷰에서 직접 읽는 열
+JSON_REVIEW_COLUMNS = ('review_id', 'date_original', 'language', 'rating', 'text')
+
+# 레스토랑 정보에서 리뷰마다 펼치는 열 (리뷰 열 이름 -> 레스토랑 정보 키)
+RESTAURANT_LEVEL_COLUMNS = {
+    'restaurant_id': 'restaurant_id',
+    'restaurant_name': 'name',
+    'grid': 'grid',
+}
+
+SAMPLE_ROWS = 100  # 샘플 CSV 행 수
+
+# 변환 기록 형식 버전 - 조각 스키마나 변환 규칙이 바뀌면 올려서 전체 재변환
+MANIFEST_VERSION = 2
+
+# 파일 묶음 하나의 변환 결과: (레스토랑 정보 목록, 리뷰 레코드 배치, 실패 파일 목록)
+ChunkResult = Tuple[List[Dict], pa.RecordBatch, List[str]]
+
+
+class RowGroupWriter:
+    """
+    레코드 배치를 모아 일정 행 수마다 Parquet 행 그룹으로 기록 (메모리에는 행 그룹 하나 분량만 유지)
+    
+    행 그룹마다 배치의 사전이 그대로 기록되므로 범주 순서가 처음 나온 순서가 됨. 기록한 사전 값을 모아 두었다가
+    sorted_dictionaries()와 rewrite_dictionaries()로 정렬된 전체 사전으로 다시 쓰면 한 번에 변환한 결과와 같아짐
+    """
+
+    def __init__(self, path: Path, schema: pa.Schema, row_group_size: int):
+        """
+        Args:
+            path: 출력 Parquet 파일 경로
+            schema: 출력 스키마 (입력 배치는 이 스키마로 변환)
+            row_group_size: 행 그룹 하나의 행 수
+        """
+        self.path = path
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.writer = pq.ParquetWriter(path, schema, compression='snappy')
+        self.buffer = []
+        self.buffered_rows = 0
+        self.num_rows = 0
+        # 사전 인코딩 열 이름 -> 지금까지 기록한 사전 값 (중복 제거 전 배열 목록)
+        self.dictionary_values = {field.name: [] for field in schema if pa.types.is_dictionary(field.type)}
+
+    def write(self, table: pa.Table):
+        """행 추가 - 버퍼가 행 그룹 크기에 도달하면 기록"""
+        if table.num_rows == 0:
+            return
+        table = table.cast(self.schema)
+        for name, values in self.dictionary_values.items():
+            values.extend(chunk.dictionary for chunk in table.column(name).chunks)
+        self.buffer.append(table)
+        self.buffered_rows += table.num_rows
+        self.num_rows += table.num_rows
+        if self.buffered_rows >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """버퍼를 행 그룹 크기 단위로 기록 (남은 행은 다음 기록 때까지 유지, 마지막 flush는 close에서)"""
+        if not self.buffer:
+            return
+        combined = pa.concat_tables(self.buffer)
+        full_rows = (combined.num_rows // self.row_group_size) * self.row_group_size
+        if full_rows:
+            self.writer.write_table(combined.slice(0, full_rows), row_group_size=self.row_group_size)
+        rest = combined.slice(full_rows)
+        self.buffer = [rest] if rest.num_rows else []
+        self.buffered_rows = rest.num_rows
+        # 모은 사전 값은 중복을 제거해 두어 메모리가 고유 값 수만큼만 늘어나게 함
+        for name, values in self.dictionary_values.items():
+            if len(values) > 1:
+                self.dictionary_values[name] = [pc.unique(pa.concat_arrays(values))]
+
+    def close(self):
+        """남은 행을 기록하고 파일 닫기"""
+        if self.buffer:
+            self.writer.write_table(pa.concat_tables(self.buffer), row_group_size=self.row_group_size)
+            self.buffer = []
+            self.buffered_rows = 0
+        self.writer.close()
+
+    def sorted_dictionaries(self) -> Dict[str, pa.Array]:
+        """
+        지금까지 기록한 사전 인코딩 열의 전체 사전 (값 순서로 정렬)
+        
+        Returns:
+            열 이름 -> 정렬된 사전 값 배열
+        """
+        dictionaries = {}
+        for name, values in self.dictionary_values.items():
+            unique = pc.unique(pa.concat_arrays(values)) if values else pa.array([], pa.string())
+            dictionaries[name] = unique.take(pc.array_sort_indices(unique))
+        return dictionaries
+
+
+def rewrite_dictionaries(source: Path, target: Path, dictionaries: Dict[str, pa.Array]):
+    """
+    Parquet 파일을 행 그룹 단위로 다시 읽어 사전 인코딩 열을 주어진 전체 사전으로 바꿔 기록
+    
+    모든 행 그룹이 같은 정렬된 사전을 갖게 되어 pandas 범주 순서가 sort_dictionaries()의 결과와 같아짐.
+    메모리에는 행 그룹 하나만 유지하고 행 그룹 구성은 그대로 둠. 기록이 끝나면 원본 파일은 삭제
+    
+    Args:
+        source: 원본 Parquet 파일 (RowGroupWriter 출력)
+        target: 출력 경로
+        dictionaries: 열 이름 -> 정렬된 사전 값 (RowGroupWriter.sorted_dictionaries())
+    """
+    parquet_file = pq.ParquetFile(source)
+    schema = parquet_file.schema_arrow
+    with pq.ParquetWriter(target, schema, compression='snappy') as writer:
+        for i in range(parquet_file.num_row_groups):
+            table = parquet_file.read_row_group(i)
+            for name, dictionary in dictionaries.items():
+                index = table.schema.get_field_index(name)
+                chunks = [pa.DictionaryArray.from_arrays(
+                              pc.index_in(chunk.dictionary, value_set=dictionary).take(chunk.indices), dictionary)
+                          for chunk in table.column(index).chunks]
+                field = schema.field(index)
+                table = table.set_column(index, field, pa.chunked_array(chunks, type=field.type))
+            writer.write_table(table, row_group_size=max(1, table.num_rows))
+    source.unlink()
+
+
+def sort_dictionaries(table: pa.Table) -> pa.Table:
+    """
+    사전 인코딩 열의 사전을 하나로 합치고 값 순서로 정렬
+    
+    pandas astype('category')처럼 범주가 정렬된 순서가 되므로, value_counts 동률 순서 등
+    분석 결과가 기존 변환 결과와 같아짐
+    """
+    table = table.unify_dictionaries()
+    for i, field in enumerate(table.schema):
+        column = table.column(i)
+        if not pa.types.is_dictionary(field.type) or column.num_chunks == 0:
+            continue
+        dictionary = column.chunk(0).dictionary
+        order = pc.array_sort_indices(dictionary).to_numpy()
+        rank = np.empty(len(order), dtype=np.int32)
+        rank[order] = np.arange(len(order), dtype=np.int32)
+        rank = pa.array(rank)
+        sorted_dictionary = dictionary.take(pa.array(order))
+        chunks = [pa.DictionaryArray.from_arrays(rank.take(chunk.indices), sorted_dictionary)
+                  for chunk in column.chunks]
+        table = table.set_column(i, field, pa.chunked_array(chunks, type=field.type))
+    return table
+
+
+def restaurant_pairs(restaurant_ids, grids) -> pa.Array:
+    """(restaurant_id, grid) 쌍을 하나의 문자열 배열로 결합 (사전 인코딩 열도 허용)"""
+    return pc.binary_join_element_wise(
+        pc.cast(restaurant_ids, pa.string()), pc.cast(grids, pa.string()), _PAIR_SEPARATOR
+    )
+
+
+def file_sha256(file_path: Path) -> str:
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fragment_name(relative_path: str) -> str:
+    """원본 JSON 상대 경로로 리뷰 조각 파일 이름 생성 (같은 원본은 항상 같은 조각을 교체)"""
+    return hashlib.sha1(relative_path.encode('utf-8')).hexdigest()[:16] + '.parquet'
+
+
+def setup_logging():
+    """콘솔과 변환 로그 파일에 로그 출력 (스크립트 실행 시 한 번만 호출)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file_path, encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+    )
+
 
 class ReviewsToParquetConverter:
     """리뷰 JSON 파일을 Parquet으로 변환하는 클래스"""
     
     def __init__(self, reviews_dir: str = REVIEWS_DIR,
-                 output_dir: str = PARQUET_DATA_DIR):
+                 output_dir: str = PARQUET_DATA_DIR,
+                 workers: int = 1, files_per_chunk: int = 50,
+                 stream: bool = False, row_group_size: int = 100_000,
+                 incremental: bool = False, dataset_dir: Optional[str] = None,
+                 manifest_path: Optional[str] = None, reference_time: Optional[datetime] = None,
+                 star_schema: bool = False, partitioned: bool = False, partition_by_year: bool = False,
+                 partitioned_dir: Optional[str] = None, partition_row_group_size: int = PARTITION_ROW_GROUP_SIZE,
+                 json_backend: Optional[str] = None, search_index: bool = False, summaries: bool = False,
+                 dedup: bool = False, dedup_threshold: float = DEDUP_THRESHOLD, sketches: bool = False):
         """
         초기화
         
         Args:
             reviews_dir: 리뷰 JSON 파일들이 있는 디렉토리
             output_dir: Parquet 파일을 저장할 디렉토리
+            workers: JSON 파일을 읽을 프로세스 수 (1이면 현재 프로세스에서 순차 처리)
+            files_per_chunk: 워커에 한 번에 넘길 파일 수
+            stream: 전체 데이터를 메모리에 모으지 않고 행 그룹 단위로 바로 기록할지 여부
+            row_group_size: 스트리밍 모드에서 행 그룹 하나의 리뷰 수 (메모리 사용량 상한을 결정)
+            incremental: 변환 기록과 비교하여 새로 생기거나 바뀐 JSON 파일만 다시 변환할지 여부
+            dataset_dir: 증분 모드에서 원본 파일별 리뷰 조각을 저장할 디렉토리 (기본값: output_dir/reviews_dataset)
+            manifest_path: 증분 모드의 변환 기록 파일 경로 (기본값: output_dir/conversion_manifest.json)
+            reference_time: 상대 날짜("2주 전")를 계산할 기준 시각 (기본값: 변환기 생성 시각, 모든 워커가 공유)
+            star_schema: 변환 후 정규화된 출력(dim_restaurants, fact_reviews, dim_grid)도 생성할지 여부
+            partitioned: 변환 후 borough/grid 하이브 파티션 리뷰 데이터셋도 생성할지 여부
+            partition_by_year: 파티션 데이터셋을 추정 날짜의 연도로도 나눌지 여부
+            partitioned_dir: 파티션 데이터셋 디렉토리 (기본값: output_dir/reviews_partitioned)
+            partition_row_group_size: 파티션 데이터셋 파일의 행 그룹당 최대 리뷰 수
+            json_backend: 리뷰 JSON 디코더 ('msgspec', 'orjson', 'json', 기본값: 사용 가능한 가장 빠른 디코더)
+            search_index: 변환 후 전문 검색 색인(search_index.db)도 갱신할지 여부 (증분 모드에서는 바뀐 파일만)
+            summaries: 변환 후 요약 테이블(restaurant_stats, language_stats, grid_stats)도 갱신할지 여부
+                       (증분 모드에서는 바뀐 파일의 행만 다시 계산)
+            dedup: 변환 후 리뷰 본문 근사 중복 묶음을 찾아 reviews.parquet에 duplicate_group 열을 추가할지 여부
+            dedup_threshold: 같은 묶음으로 볼 최소 자카드 유사도 추정치 (0~1)
+            sketches: 변환 후 스케치 테이블(restaurant_sketches, grid_sketches)도 갱신할지 여부
+                      (증분 모드에서는 바뀐 파일의 행만 다시 계산)
         """
         self.reviews_dir = Path(reviews_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.workers = max(1, workers)
+        self.files_per_chunk = max(1, files_per_chunk)
+        self.stream = stream
+        self.row_group_size = max(1, row_group_size)
+        self.incremental = incremental
+        self.dataset_dir = Path(dataset_dir) if dataset_dir else self.output_dir / REVIEWS_DATASET_DIR.name
+        self.manifest_path = Path(manifest_path) if manifest_path else self.output_dir / CONVERSION_MANIFEST.name
+        self.reference_time = reference_time or reference_timestamp()
+        self.star_schema = star_schema
+        self.partitioned = partitioned
+        self.partition_by_year = partition_by_year
+        self.partitioned_dir = Path(partitioned_dir) if partitioned_dir else self.output_dir / REVIEWS_PARTITIONED_DIR.name
+        self.partition_row_group_size = max(1, partition_row_group_size)
+        self.review_reader = ReviewFileReader(json_backend)
+        self.search_index = search_index
+        self.search_index_path = self.output_dir / SEARCH_INDEX_DB.name
+        self.summaries = summaries
+        self.dedup = dedup
+        self.dedup_threshold = dedup_threshold
+        self.sketches = sketches
         
         self.restaurants_data = []
-        self.reviews_data = []
+        self.review_batches = []  # 파일 묶음별 리뷰 레코드 배치 (pyarrow.RecordBatch)
         self.error_files = []
         
-    def parse_date(self, date_str: str) -> Tuple[datetime, bool]:
+    def extract_records(self, file_path: Path) -> Tuple[Dict, Dict[str, List]]:
         """
-        한국어/영어 날짜 문자열을 파싱
+        단일 JSON 파일에서 레스토랑 정보와 리뷰 열 추출 (실패 시 예외 발생)
+        
+        리뷰마다 딕셔너리를 만들지 않고 JSON에서 읽는 값만 열별 리스트로 모음.
+        레스토랑 ID/이름/grid는 build_review_batch에서 사전 인코딩 인덱스로 펼침
         
         Args:
-            date_str: 날짜 문자열 (예: "2주 전", "1달 전", "수정일: 3달 전")
+            file_path: JSON 파일 경로
             
         Returns:
-            (추정 날짜, 수정 여부)
+            (레스토랑 정보, 리뷰 열 이름 -> 값 리스트)
         """
-        try:
-            # 현재 날짜 기준
-            base_date = datetime.now()
-            is_modified = False
-            
-            # 수정일 체크
-            if "수정일:" in date_str or "수정일:" in date_str:
-                is_modified = True
-                date_str = date_str.replace("수정일:", "").replace("수정일:", "").strip()
+        # 디코딩과 스키마 검증을 한 번에 수행 (형식 오류는 ReviewFileError)
+        restaurant, reviews = self.review_reader.read(file_path)
             
-            # 상대 시간 파싱
-            if "전" in date_str:
-                # 숫자 추출
-                numbers = re.findall(r'\d+', date_str)
-                if numbers:
-                    num = int(numbers[0])
-                else:
-                    num = 1
-                
-                if "일" in date_str or "day" in date_str.lower():
-                    days_ago = num
-                elif "주" in date_str or "week" in date_str.lower():
-                    days_ago = num * 7
-                elif "달" in date_str or "month" in date_str.lower():
-                    days_ago = num * 30
-                elif "년" in date_str or "year" in date_str.lower():
-                    days_ago = num * 365
-                else:
-                    days_ago = 0
-                    
-                estimated_date = pd.Timestamp(base_date) - pd.Timedelta(days=days_ago)
-            else:
-                # 기본값: 현재 날짜
-                estimated_date = pd.Timestamp(base_date)
-                
-            return estimated_date, is_modified
+        # 레스토랑 정보 추출
+        restaurant_info = {
+            'restaurant_id': restaurant['place_id'],
+            'name': restaurant['name'],
+            'grid': restaurant['grid'],
+            'address': restaurant['address'],
+            'rating': restaurant['rating'],
+            'user_ratings_total': restaurant['user_ratings_total'],
+            'phone_number': restaurant['phone_number'],
+            'reviews_count': restaurant['reviews_count'],
+            'file_path': str(file_path)
+        }
+        
+        # 리뷰 열 추출 (JSON_REVIEW_COLUMNS)
+        review_columns = {
+            'review_id': reviews['review_id'],
+            'date_original': reviews['date'],
+            'language': reviews['language'],
+            'rating': reviews['rating'],
+            'text': reviews['text'],
+        }
+        
+        return restaurant_info, review_columns
+
+    def build_review_batch(self, restaurants: List[Dict], review_columns: Dict[str, List],
+                           review_counts: List[int]) -> pa.RecordBatch:
+        """
+        열별 리스트로 리뷰 레코드 배치 생성
+        
+        - 레스토랑 단위 값(ID, 이름, grid)은 레스토랑별 사전 인코딩 후 인덱스만 리뷰 수만큼 반복
+        - 언어/날짜 문자열은 사전 인코딩, 날짜는 고유 값만 해석한 뒤 인덱스로 펼침 (utils.relative_dates)
+        - 평점은 int8 (astype('int8')과 같이 소수점 버림), 본문만 일반 문자열
+        
+        Args:
+            restaurants: 레스토랑 정보 목록
+            review_columns: 리뷰 열 이름 -> 값 리스트 (레스토랑 순서대로 이어 붙인 값)
+            review_counts: 레스토랑별 리뷰 수
+        """
+        owner = pa.array(np.repeat(np.arange(len(review_counts), dtype=np.int32), review_counts))
+        columns = {}
+        for column, key in RESTAURANT_LEVEL_COLUMNS.items():
+            values = pa.array([restaurant[key] for restaurant in restaurants], pa.string())
+            columns[column] = values.dictionary_encode().take(owner)
+        
+        dates = pa.array(review_columns['date_original'], pa.string()).dictionary_encode()
+        columns['date_original'] = dates
+        columns['estimated_date'], columns['is_modified'] = normalize_relative_dates(dates, self.reference_time)
+        columns['review_id'] = pa.array(review_columns['review_id'], pa.string())
+        columns['language'] = pa.array(review_columns['language'], pa.string()).dictionary_encode()
+        columns['rating'] = pa.array(review_columns['rating'], pa.float64()).cast(pa.int8(), safe=False)
+        columns['text'] = pa.array(review_columns['text'], pa.string())
+        columns['text_length'] = pc.utf8_length(columns['text']).cast(pa.int32())
+        
+        return pa.RecordBatch.from_arrays(
+            [columns[field.name].cast(field.type) for field in REVIEW_SCHEMA], schema=REVIEW_SCHEMA
+        )
+
+    def convert_chunk(self, file_paths: List[Path]) -> ChunkResult:
+        """
+        파일 묶음을 변환하여 리뷰를 열 단위 레코드 배치로 반환 (워커 프로세스에서 호출)
+        
+        Args:
+            file_paths: JSON 파일 경로 목록
             
-        except Exception as e:
-            logger.warning(f"날짜 파싱 실패: {date_str} - {str(e)}")
-            return pd.Timestamp(base_date), False
-    
+        Returns:
+            (레스토랑 정보 목록, 리뷰 레코드 배치, 실패 파일 목록)
+        """
+        restaurants = []
+        review_columns = {column: [] for column in JSON_REVIEW_COLUMNS}
+        review_counts = []
+        error_files = []
+        for file_path in file_paths:
+            try:
+                restaurant_info, columns = self.extract_records(Path(file_path))
+            except Exception as e:
+                logger.error(f"파일 처리 실패: {file_path} - {str(e)}")
+                error_files.append(str(file_path))
+                continue
+            restaurants.append(restaurant_info)
+            review_counts.append(len(columns['review_id']))
+            for column, values in columns.items():
+                review_columns[column].extend(values)
+        return restaurants, self.build_review_batch(restaurants, review_columns, review_counts), error_files
+
     def process_json_file(self, file_path: Path) -> bool:
         """
         단일 JSON 파일 처리
@@ -125,54 +478,28 @@ class ReviewsToParquetConverter:
         Returns:
             성공 여부
         """
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # 레스토랑 정보 추출
-            restaurant_info = {
-                'restaurant_id': data.get('place_id', ''),
-                'name': data.get('name', ''),
-                'grid': data.get('grid', ''),
-                'address': data.get('address', ''),
-                'rating': float(data.get('rating', 0)),
-                'user_ratings_total': int(data.get('user_ratings_total', 0)),
-                'phone_number': data.get('phone_number', ''),
-                'reviews_count': int(data.get('reviews_count', 0)),
-                'file_path': str(file_path)
-            }
-            self.restaurants_data.append(restaurant_info)
-            
-            # 리뷰 정보 추출
-            reviews = data.get('reviews', [])
-            for review in reviews:
-                # 날짜 파싱
-                estimated_date, is_modified = self.parse_date(review.get('date', ''))
-                
-                review_info = {
-                    'review_id': review.get('review_id', ''),
-                    'restaurant_id': data.get('place_id', ''),
-                    'restaurant_name': data.get('name', ''),
-                    'grid': data.get('grid', ''),
-                    'date_original': review.get('date', ''),
-                    'estimated_date': estimated_date,
-                    'is_modified': is_modified,
-                    'language': review.get('language', ''),
-                    'rating': float(review.get('rating', 0)),
-                    'text': review.get('text', ''),
-                    'text_length': len(review.get('text', '')),
-                }
-                self.reviews_data.append(review_info)
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"파일 처리 실패: {file_path} - {str(e)}")
-            self.error_files.append(str(file_path))
-            return False
+        restaurants, batch, error_files = self.convert_chunk([file_path])
+        self._merge_chunk(restaurants, batch, error_files)
+        return not error_files
+
+    def _merge_chunk(self, restaurants: List[Dict], batch: pa.RecordBatch, error_files: List[str]):
+        """파일 묶음 변환 결과를 누적"""
+        self.restaurants_data.extend(restaurants)
+        if batch.num_rows:
+            self.review_batches.append(batch)
+        self.error_files.extend(error_files)
+
     
-    def convert_all_files(self):
-        """모든 JSON 파일을 변환"""
+    def iter_chunk_results(self):
+        """
+        모든 JSON 파일을 파일 묶음 단위로 변환하여 입력 순서대로 반환
+        
+        워커 수가 2 이상이면 프로세스 풀에서 병렬 처리하되, 동시에 진행 중인 묶음 수를
+        워커 수의 2배로 제한하여 부모가 소비하지 못한 결과가 메모리에 쌓이지 않도록 함
+        
+        Yields:
+            (레스토랑 정보 목록, 리뷰 레코드 배치, 실패 파일 목록)
+        """
         logger.info("JSON 파일 검색 시작...")
         
         # 모든 JSON 파일 찾기
@@ -181,64 +508,665 @@ class ReviewsToParquetConverter:
         
         logger.info(f"총 {total_files}개의 JSON 파일 발견")
         
-        # 각 파일 처리
-        for i, file_path in enumerate(json_files, 1):
-            if i % 100 == 0:
-                logger.info(f"진행 상황: {i}/{total_files} 파일 처리 완료")
-            self.process_json_file(file_path)
+        failed = 0
+        for result in self._map_chunks(json_files, 'convert_chunk'):
+            failed += len(result[2])
+            yield result
+        
+        logger.info(f"파일 처리 완료: 성공 {total_files - failed}개, 실패 {failed}개")
+
+    def _map_chunks(self, file_paths: List[Path], method: str):
+        """
+        파일 목록을 묶음으로 나누어 변환기 메서드를 실행하고 결과를 입력 순서대로 반환
         
-        logger.info(f"파일 처리 완료: 성공 {total_files - len(self.error_files)}개, 실패 {len(self.error_files)}개")
+        Args:
+            file_paths: 처리할 JSON 파일 목록
+            method: 파일 묶음을 인자로 받는 변환기 메서드 이름 (워커에서도 같은 메서드 실행)
+        """
+        total_files = len(file_paths)
+        chunks = [file_paths[i:i + self.files_per_chunk]
+                  for i in range(0, total_files, self.files_per_chunk)]
+        processed = 0
+
+        def progress(chunk):
+            nonlocal processed
+            processed += len(chunk)
+            if processed // 100 > (processed - len(chunk)) // 100:
+                logger.info(f"진행 상황: {processed}/{total_files} 파일 처리 완료")
+
+        if self.workers > 1 and len(chunks) > 1:
+            logger.info(f"워커 {self.workers}개로 병렬 처리")
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self._worker_options(),)) as executor:
+                in_flight = deque()
+                remaining = iter(chunks)
+                for chunk in remaining:
+                    in_flight.append((chunk, executor.submit(_chunk_worker, method, chunk)))
+                    if len(in_flight) >= self.workers * 2:
+                        break
+                while in_flight:
+                    chunk, future = in_flight.popleft()
+                    result = future.result()
+                    next_chunk = next(remaining, None)
+                    if next_chunk is not None:
+                        in_flight.append((next_chunk, executor.submit(_chunk_worker, method, next_chunk)))
+                    progress(chunk)
+                    yield result
+        else:
+            for chunk in chunks:
+                result = getattr(self, method)(chunk)
+                progress(chunk)
+                yield result
+
+    def _worker_options(self) -> Dict:
+        """워커 프로세스에서 같은 설정의 변환기를 만들기 위한 인자"""
+        return {
+            'reviews_dir': str(self.reviews_dir),
+            'output_dir': str(self.output_dir),
+            'dataset_dir': str(self.dataset_dir),
+            'manifest_path': str(self.manifest_path),
+            'reference_time': self.reference_time,
+            'json_backend': self.review_reader.backend
+        }
+
+    def convert_all_files(self):
+        """모든 JSON 파일을 변환"""
+        for restaurants, batch, error_files in self.iter_chunk_results():
+            self._merge_chunk(restaurants, batch, error_files)
     
     def create_parquet_files(self):
         """Parquet 파일 생성"""
-        if not self.restaurants_data or not self.reviews_data:
+        if not self.restaurants_data or not self.review_batches:
             logger.error("변환할 데이터가 없습니다.")
             return
         
-        # 레스토랑 DataFrame 생성
-        logger.info("레스토랑 데이터프레임 생성 중...")
-        df_restaurants = pd.DataFrame(self.restaurants_data)
-        
-        # 데이터 타입 최적화
-        df_restaurants['grid'] = df_restaurants['grid'].astype('category')
-        
-        # 리뷰 DataFrame 생성
-        logger.info("리뷰 데이터프레임 생성 중...")
-        df_reviews = pd.DataFrame(self.reviews_data)
-        
-        # 데이터 타입 최적화
-        df_reviews['grid'] = df_reviews['grid'].astype('category')
-        df_reviews['language'] = df_reviews['language'].astype('category')
-        df_reviews['rating'] = df_reviews['rating'].astype('int8')
+        # 레스토랑/리뷰 테이블 생성 (리뷰 배치는 워커에서 이미 최종 스키마로 생성됨)
+        logger.info("Arrow 테이블 생성 중...")
+        restaurants_table = sort_dictionaries(pa.Table.from_pylist(self.restaurants_data, schema=RESTAURANT_SCHEMA))
+        reviews_table = sort_dictionaries(pa.Table.from_batches(self.review_batches, schema=REVIEW_SCHEMA))
         
         # Parquet 파일 저장
         restaurants_path = self.output_dir / 'restaurants.parquet'
         reviews_path = self.output_dir / 'reviews.parquet'
         
         logger.info("Parquet 파일 저장 중...")
-        df_restaurants.to_parquet(
-            restaurants_path,
-            engine='pyarrow',
-            compression='snappy',
-            index=False
-        )
+        pq.write_table(restaurants_table, restaurants_path, compression='snappy')
+        pq.write_table(reviews_table, reviews_path, compression='snappy')
         
-        df_reviews.to_parquet(
-            reviews_path,
-            engine='pyarrow',
-            compression='snappy',
-            index=False
-        )
+        # 통계에 필요한 열만 pandas로 변환
+        df_restaurants = restaurants_table.select(['grid', 'rating', 'reviews_count']).to_pandas()
+        df_reviews = reviews_table.select(['language', 'text_length', 'rating']).to_pandas()
         
         # 통계 출력
         self.print_statistics(df_restaurants, df_reviews)
         
         # 샘플 데이터 저장 (분석 확인용)
-        self.save_samples(df_restaurants, df_reviews)
+        self.save_samples(restaurants_table.slice(0, SAMPLE_ROWS).to_pandas(),
+                          reviews_table.slice(0, SAMPLE_ROWS).to_pandas())
         
         logger.info(f"변환 완료! 파일 저장 위치: {self.output_dir}")
         
-    def print_statistics(self, df_restaurants: pd.DataFrame, df_reviews: pd.DataFrame):
+    def stream_parquet_files(self):
+        """
+        스트리밍 Parquet 생성 - 파일 묶음을 변환하는 대로 행 그룹 단위로 기록
+        
+        메모리에는 행 그룹 하나 분량의 데이터와 샘플만 유지하며, 통계는 완성된 파일에서
+        필요한 열만 다시 읽어 계산함. 기록 중에는 임시 파일에 쓰고, 끝나면 사전 인코딩 열을 정렬된 전체 사전으로
+        바꿔 최종 파일로 다시 기록 (범주 순서가 한 번에 변환한 결과와 같아짐)
+        """
+        restaurants_path = self.output_dir / 'restaurants.parquet'
+        reviews_path = self.output_dir / 'reviews.parquet'
+        restaurants_temp = self.output_dir / 'restaurants.parquet.tmp'
+        reviews_temp = self.output_dir / 'reviews.parquet.tmp'
+        
+        logger.info(f"스트리밍 Parquet 생성 (행 그룹당 리뷰 {self.row_group_size:,}개)")
+        restaurant_writer = RowGroupWriter(restaurants_temp, RESTAURANT_SCHEMA, self.row_group_size)
+        review_writer = RowGroupWriter(reviews_temp, REVIEW_SCHEMA, self.row_group_size)
+        restaurant_samples = []
+        review_samples = []
+        sampled_restaurants = 0
+        sampled_reviews = 0
+        try:
+            for restaurants, batch, error_files in self.iter_chunk_results():
+                self.error_files.extend(error_files)
+                restaurant_table = pa.Table.from_pylist(restaurants, schema=RESTAURANT_SCHEMA)
+                review_table = pa.Table.from_batches([batch])
+                restaurant_writer.write(restaurant_table)
+                review_writer.write(review_table)
+                
+                if sampled_restaurants < SAMPLE_ROWS and restaurant_table.num_rows:
+                    restaurant_samples.append(restaurant_table.slice(0, SAMPLE_ROWS - sampled_restaurants))
+                    sampled_restaurants += restaurant_samples[-1].num_rows
+                if sampled_reviews < SAMPLE_ROWS and review_table.num_rows:
+                    review_samples.append(review_table.slice(0, SAMPLE_ROWS - sampled_reviews))
+                    sampled_reviews += review_samples[-1].num_rows
+        finally:
+            restaurant_writer.close()
+            review_writer.close()
+        
+        if not restaurant_writer.num_rows or not review_writer.num_rows:
+            restaurants_temp.unlink()
+            reviews_temp.unlink()
+            logger.error("변환할 데이터가 없습니다.")
+            return
+        
+        # 행 그룹마다 다른 사전을 정렬된 전체 사전으로 바꿔 create_parquet_files()와 같은 범주 순서로 기록
+        logger.info("사전 인코딩 열을 정렬된 전체 사전으로 다시 기록 중...")
+        rewrite_dictionaries(restaurants_temp, restaurants_path, restaurant_writer.sorted_dictionaries())
+        rewrite_dictionaries(reviews_temp, reviews_path, review_writer.sorted_dictionaries())
+        
+        # 통계는 필요한 열만 다시 읽어 계산
+        df_restaurants = pq.read_table(restaurants_path, columns=['grid', 'rating', 'reviews_count']).to_pandas()
+        df_reviews = pq.read_table(reviews_path, columns=['language', 'text_length', 'rating']).to_pandas()
+        self.print_statistics(df_restaurants, df_reviews)
+        
+        self.save_samples(
+            pa.concat_tables(restaurant_samples).to_pandas(),
+            pa.concat_tables(review_samples).to_pandas()
+        )
+        
+        logger.info(f"변환 완료! 파일 저장 위치: {self.output_dir}")
+        
+    def convert_to_fragments(self, file_paths: List[Path]) -> List[Dict]:
+        """
+        파일마다 리뷰 조각(Parquet)을 기록하고 변환 기록 항목을 반환 (워커 프로세스에서 호출)
+        
+        Args:
+            file_paths: JSON 파일 경로 목록
+            
+        Returns:
+            파일별 변환 기록 항목 목록 (path, size, mtime_ns, sha256, fragment, reviews, restaurant 또는 error)
+        """
+        entries = []
+        for file_path in file_paths:
+            file_path = Path(file_path)
+            relative_path = file_path.relative_to(self.reviews_dir).as_posix()
+            stat = file_path.stat()
+            entry = {
+                'path': relative_path,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': file_sha256(file_path),
+                'fragment': None,
+                'reviews': 0,
+                'reference_time': self.reference_time.isoformat()
+            }
+            fragment_path = self.dataset_dir / fragment_name(relative_path)
+            try:
+                restaurant_info, columns = self.extract_records(file_path)
+            except Exception as e:
+                logger.error(f"파일 처리 실패: {file_path} - {str(e)}")
+                entry['error'] = str(e)
+                fragment_path.unlink(missing_ok=True)
+                entries.append(entry)
+                continue
+            
+            restaurant_info['file_path'] = str(file_path)
+            entry['restaurant'] = restaurant_info
+            review_count = len(columns['review_id'])
+            if review_count:
+                table = pa.Table.from_batches([self.build_review_batch([restaurant_info], columns, [review_count])])
+                temp_path = fragment_path.with_name(f"{fragment_path.name}.{os.getpid()}.tmp")
+                pq.write_table(table, temp_path, compression='snappy')
+                os.replace(temp_path, fragment_path)
+                entry['fragment'] = fragment_path.name
+                entry['reviews'] = review_count
+            else:
+                fragment_path.unlink(missing_ok=True)
+            entries.append(entry)
+        return entries
+
+    def load_manifest(self) -> Dict:
+        """변환 기록 로드 (없거나 형식 버전이 다르면 빈 기록)"""
+        if not self.manifest_path.exists():
+            return {'version': MANIFEST_VERSION, 'files': {}}
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != MANIFEST_VERSION:
+            logger.info("변환 기록 형식이 바뀌어 전체 재변환합니다.")
+            return {'version': MANIFEST_VERSION, 'files': {}}
+        return manifest
+
+    def save_manifest(self, manifest: Dict):
+        """변환 기록 저장 (임시 파일에 쓴 뒤 교체)"""
+        manifest['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        temp_path = self.manifest_path.with_name(self.manifest_path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.manifest_path)
+
+    def incremental_update(self):
+        """
+        증분 변환 - 변환 기록과 비교하여 새로 생기거나 바뀐 JSON 파일만 다시 변환
+        
+        - 크기와 수정 시각이 같으면 변경 없음, 다르면 내용 해시로 실제 변경 여부 확인
+        - 바뀐 파일의 리뷰 조각만 교체하고, 삭제된 파일의 조각은 제거
+        - restaurants.parquet은 변환 기록의 레스토랑 정보로 다시 생성 (작은 파일, 전체 변환과 같은 파일 순서)
+        - 전체 변환이 남긴 reviews.parquet은 조각과 맞지 않으므로 삭제 (분석 스크립트는 조각 디렉토리를 읽음)
+        """
+        self.dataset_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self.load_manifest()
+        if not manifest['files']:
+            # 기록이 없는데 남아 있는 조각은 어느 원본의 것인지 알 수 없으므로 정리
+            for stale in self.dataset_dir.glob('*.parquet'):
+                stale.unlink()
+        known = manifest['files']
+        
+        logger.info("JSON 파일 검색 시작...")
+        # 전체 변환(iter_chunk_results)과 같은 파일 순서 - 레스토랑 테이블 행 순서를 맞추기 위함
+        json_files = list(self.reviews_dir.glob("**/*_reviews.json"))
+        seen = set()
+        changed = []
+        touched = 0
+        for file_path in json_files:
+            relative_path = file_path.relative_to(self.reviews_dir).as_posix()
+            seen.add(relative_path)
+            entry = known.get(relative_path)
+            stat = file_path.stat()
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                continue
+            if entry and entry['size'] == stat.st_size and entry['sha256'] == file_sha256(file_path):
+                # 내용은 같고 수정 시각만 바뀜 (복사, 재다운로드 등)
+                entry['mtime_ns'] = stat.st_mtime_ns
+                touched += 1
+                continue
+            changed.append(file_path)
+        
+        deleted = [path for path in known if path not in seen]
+        for relative_path in deleted:
+            fragment = known.pop(relative_path).get('fragment')
+            if fragment:
+                (self.dataset_dir / fragment).unlink(missing_ok=True)
+        
+        new_count = sum(1 for path in changed if path.relative_to(self.reviews_dir).as_posix() not in known)
+        logger.info(f"총 {len(json_files)}개 중 새 파일 {new_count}개, 변경 {len(changed) - new_count}개, "
+                    f"삭제 {len(deleted)}개, 수정 시각만 변경 {touched}개")
+        
+        for entries in self._map_chunks(changed, 'convert_to_fragments'):
+            for entry in entries:
+                known[entry['path']] = entry
+                if 'error' in entry:
+                    self.error_files.append(str(self.reviews_dir / entry['path']))
+        
+        # 레스토랑 테이블은 변환 기록에서 다시 생성 (원본 파일 검색 순서 - 전체 변환과 같은 행 순서)
+        source_order = (file_path.relative_to(self.reviews_dir).as_posix() for file_path in json_files)
+        restaurants = [known[path]['restaurant'] for path in source_order if 'restaurant' in known.get(path, {})]
+        restaurants_path = self.output_dir / 'restaurants.parquet'
+        if restaurants:
+            pq.write_table(sort_dictionaries(pa.Table.from_pylist(restaurants, schema=RESTAURANT_SCHEMA)),
+                           restaurants_path, compression='snappy')
+        
+        stale_reviews = self.output_dir / 'reviews.parquet'
+        if stale_reviews.exists():
+            stale_reviews.unlink()
+            logger.info(f"이전 전체 변환의 {stale_reviews.name} 삭제 (리뷰는 {self.dataset_dir.name}/ 조각에서 읽음)")
+        
+        self.save_manifest(manifest)
+        
+        total_reviews = sum(entry['reviews'] for entry in known.values())
+        failed = sum(1 for entry in known.values() if 'error' in entry)
+        print("\n" + "="*60)
+        print("📊 증분 변환 결과")
+        print("="*60)
+        print(f"  - 다시 변환한 파일: {len(changed):,}개 (새 파일 {new_count:,}개), 삭제 반영: {len(deleted):,}개")
+        print(f"  - 총 레스토랑 수: {len(restaurants):,}개 (변환 실패 파일 {failed:,}개)")
+        print(f"  - 총 리뷰 수: {total_reviews:,}개")
+        print(f"  - 리뷰 조각 디렉토리: {self.dataset_dir}")
+        print("="*60)
+        
+        logger.info(f"증분 변환 완료! 파일 저장 위치: {self.output_dir}")
+
+    def iter_review_batches(self):
+        """
+        변환 결과 리뷰를 레코드 배치 단위로 읽기 (증분 모드는 리뷰 조각 디렉토리, 그 외에는 reviews.parquet)
+
+        Yields:
+            리뷰 레코드 배치 (REVIEW_SCHEMA)
+        """
+        if self.incremental:
+            import pyarrow.dataset as ds
+
+            dataset = ds.dataset(self.dataset_dir, format='parquet', schema=REVIEW_SCHEMA)
+            yield from dataset.to_batches(batch_size=self.row_group_size)
+        else:
+            reviews_file = pq.ParquetFile(self.output_dir / 'reviews.parquet')
+            yield from reviews_file.iter_batches(batch_size=self.row_group_size)
+
+    def flag_near_duplicates(self):
+        """
+        리뷰 본문 근사 중복 묶음을 찾아 reviews.parquet에 duplicate_group 열 추가 (MinHash LSH)
+        
+        본문 열만 배치 단위로 읽어 서명을 계산하고(워커 수만큼 프로세스), 묶음 번호를 붙여 행 그룹 단위로
+        임시 파일에 다시 기록한 뒤 교체함. 이미 duplicate_group 열이 있으면 새 결과로 바꿈.
+        증분 모드의 리뷰 조각은 묶음이 여러 조각에 걸치므로 지원하지 않음
+        """
+        if self.incremental:
+            logger.warning("증분 모드에서는 근사 중복 탐지를 건너뜁니다 (reviews.parquet 전체 변환에서 사용).")
+            return
+        reviews_path = self.output_dir / 'reviews.parquet'
+        if not reviews_path.exists():
+            logger.error("reviews.parquet이 없어 근사 중복 탐지를 할 수 없습니다.")
+            return
+        
+        logger.info(f"근사 중복 탐지 시작 (임계값 {self.dedup_threshold}, 워커 {self.workers}개)...")
+        detector = NearDuplicateDetector(threshold=self.dedup_threshold, workers=self.workers)
+        reviews_file = pq.ParquetFile(reviews_path)
+        groups = detector.find_groups(reviews_file.iter_batches(columns=['text'], batch_size=self.row_group_size))
+        
+        schema = reviews_file.schema_arrow
+        if DUPLICATE_GROUP_FIELD.name in schema.names:
+            schema = schema.remove(schema.get_field_index(DUPLICATE_GROUP_FIELD.name))
+        schema = schema.append(DUPLICATE_GROUP_FIELD)
+        reviews_temp = self.output_dir / 'reviews.parquet.tmp'
+        start = 0
+        with pq.ParquetWriter(reviews_temp, schema, compression='snappy') as writer:
+            for index in range(reviews_file.num_row_groups):
+                table = reviews_file.read_row_group(index, columns=schema.names[:-1])
+                group = groups[start:start + table.num_rows]
+                start += table.num_rows
+                table = table.append_column(DUPLICATE_GROUP_FIELD,
+                                            pa.array(group, pa.int32(), mask=group < 0))
+                writer.write_table(table)
+        os.replace(reviews_temp, reviews_path)
+        
+        flagged = int((groups >= 0).sum())
+        logger.info(f"근사 중복 탐지 완료: 묶음 {int(groups.max()) + 1 if flagged else 0:,}개, "
+                    f"리뷰 {flagged:,}개 / {len(groups):,}개")
+
+    def build_grid_dimension(self) -> Optional[pa.Table]:
+        """
+        gridInfo.txt와 grid_tier.csv로 grid 차원 테이블 생성 (지구 이름, 자치구, 티어)
+
+        Returns:
+            grid 차원 테이블 또는 gridInfo.txt가 없으면 None
+        """
+        if not GRID_INFO_TXT.exists():
+            logger.warning(f"{GRID_INFO_TXT.name}이 없어 grid 차원 테이블을 건너뜁니다.")
+            return None
+
+        tier_dict = load_tier_info(GRID_TIER_CSV)
+        rows = []
+        for district in parse_grid_info(GRID_INFO_TXT):
+            row = dict(district)
+            row['grid'] = row.pop('code')
+            row['tier'] = tier_dict.get(row['grid'])
+            rows.append(row)
+        return pa.Table.from_pylist(rows, schema=DIM_GRID_SCHEMA)
+
+    def write_star_schema(self):
+        """
+        정규화된 스타 스키마 출력 생성
+
+        - dim_restaurants.parquet: restaurants.parquet + 정수 키(restaurant_key = 행 번호)
+        - fact_reviews.parquet: 리뷰 열에서 레스토랑 이름/grid를 빼고 restaurant_key만 남긴 팩트 테이블
+        - dim_grid.parquet: grid별 지구 이름, 자치구, 티어 (gridInfo.txt가 있을 때만)
+
+        리뷰는 배치 단위로 읽어 키를 붙인 뒤 행 그룹 단위로 기록하므로 모든 변환 모드에서 메모리 사용량이 일정함
+        """
+        restaurants_path = self.output_dir / 'restaurants.parquet'
+        if not restaurants_path.exists():
+            logger.error("restaurants.parquet이 없어 스타 스키마를 생성할 수 없습니다.")
+            return
+
+        logger.info("스타 스키마 생성 중...")
+        restaurants = pq.read_table(restaurants_path, schema=RESTAURANT_SCHEMA)
+        keys = pa.array(np.arange(restaurants.num_rows, dtype=np.int32))
+        dim_restaurants = restaurants.add_column(0, DIM_RESTAURANT_SCHEMA.field('restaurant_key'), keys)
+        pq.write_table(dim_restaurants, self.output_dir / 'dim_restaurants.parquet', compression='snappy')
+
+        dim_pairs = restaurant_pairs(restaurants['restaurant_id'], restaurants['grid']).combine_chunks()
+        fact_path = self.output_dir / 'fact_reviews.parquet'
+        fact_temp = self.output_dir / 'fact_reviews.parquet.tmp'
+        fact_writer = RowGroupWriter(fact_temp, FACT_REVIEW_SCHEMA, self.row_group_size)
+        unmatched = 0
+        try:
+            for batch in self.iter_review_batches():
+                restaurant_key = pc.index_in(restaurant_pairs(batch['restaurant_id'], batch['grid']),
+                                             value_set=dim_pairs)
+                unmatched += restaurant_key.null_count
+                columns = {name: batch[name] for name in FACT_REVIEW_SCHEMA.names if name != 'restaurant_key'}
+                columns['restaurant_key'] = restaurant_key
+                fact_writer.write(pa.table([columns[name] for name in FACT_REVIEW_SCHEMA.names],
+                                           names=FACT_REVIEW_SCHEMA.names))
+        finally:
+            fact_writer.close()
+        rewrite_dictionaries(fact_temp, fact_path, fact_writer.sorted_dictionaries())
+        if unmatched:
+            logger.warning(f"레스토랑 차원 테이블에 없는 리뷰 {unmatched:,}개 (restaurant_key = null)")
+
+        dim_grid = self.build_grid_dimension()
+        if dim_grid is not None:
+            pq.write_table(dim_grid, self.output_dir / 'dim_grid.parquet', compression='snappy')
+
+        fact_size = fact_path.stat().st_size / (1024*1024)
+        logger.info(f"스타 스키마 생성 완료: 레스토랑 {dim_restaurants.num_rows:,}개, "
+                    f"리뷰 {fact_writer.num_rows:,}개 (fact_reviews.parquet {fact_size:.2f} MB)")
+
+    def write_partitioned_dataset(self):
+        """
+        borough/grid(/year) 하이브 파티션 리뷰 데이터셋 생성
+        
+        - 경로의 파티션 값으로 파일 단위 건너뛰기 (grid, borough, year 조건)
+        - 파일 안은 restaurant_id -> 추정 날짜 순으로 정렬하고 정렬 열을 메타데이터에 기록
+        - 작은 행 그룹/데이터 페이지와 열 통계, 페이지 인덱스로 레스토랑 단위 건너뛰기
+        
+        정렬을 위해 리뷰 전체를 한 번 메모리에 올림 (스트리밍 모드에서도 이 단계는 전체 테이블 크기만큼 사용)
+        기록 중에는 임시 디렉토리에 쓰고 끝나면 교체
+        """
+        import pyarrow.dataset as ds
+
+        logger.info("파티션 데이터셋 생성 중...")
+        batches = list(self.iter_review_batches())
+        if not batches:
+            logger.error("파티션할 리뷰가 없습니다.")
+            return
+        table = pa.Table.from_batches(batches)
+        del batches
+        
+        # 파티션 열은 일반 문자열/정수 (경로에 값으로 기록되고 파일에서는 빠짐)
+        grid = pc.cast(table['grid'], pa.string())
+        table = table.set_column(table.schema.get_field_index('grid'), 'grid', grid)
+        table = table.append_column('borough', pc.utf8_slice_codeunits(grid, 0, 2))
+        partition_fields = [('borough', pa.string()), ('grid', pa.string())]
+        if self.partition_by_year:
+            table = table.append_column('year', pc.year(table['estimated_date']).cast(pa.int16()))
+            partition_fields.append(('year', pa.int16()))
+        
+        # 사전 인코딩 열은 정렬 키로 쓸 수 없으므로 문자열 키로 정렬 순서만 계산
+        sort_keys = pa.table({
+            'grid': grid,
+            'restaurant_id': pc.cast(table['restaurant_id'], pa.string()),
+            'estimated_date': table['estimated_date'],
+        })
+        order = pc.sort_indices(sort_keys, sort_keys=[('grid', 'ascending'), ('restaurant_id', 'ascending'),
+                                                      ('estimated_date', 'descending')])
+        table = table.take(order)
+        
+        file_schema = pa.schema([field for field in table.schema
+                                 if field.name not in dict(partition_fields)])
+        sorting_columns = [pq.SortingColumn(file_schema.get_field_index('restaurant_id')),
+                           pq.SortingColumn(file_schema.get_field_index('estimated_date'), descending=True)]
+        file_options = ds.ParquetFileFormat().make_write_options(
+            compression='snappy',
+            write_statistics=True,
+            write_page_index=True,
+            data_page_size=PARTITION_DATA_PAGE_SIZE,
+            sorting_columns=sorting_columns
+        )
+        
+        temp_dir = self.partitioned_dir.with_name(self.partitioned_dir.name + '.tmp')
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        ds.write_dataset(
+            table, temp_dir, format='parquet',
+            partitioning=ds.partitioning(pa.schema(partition_fields), flavor='hive'),
+            file_options=file_options,
+            basename_template='part-{i}.parquet',
+            max_rows_per_group=self.partition_row_group_size,
+            min_rows_per_group=min(self.partition_row_group_size, 1024),
+            max_partitions=4096,
+            preserve_order=True
+        )
+        shutil.rmtree(self.partitioned_dir, ignore_errors=True)
+        os.replace(temp_dir, self.partitioned_dir)
+        
+        num_files = sum(1 for _ in self.partitioned_dir.glob('**/*.parquet'))
+        logger.info(f"파티션 데이터셋 생성 완료: 리뷰 {table.num_rows:,}개, 파일 {num_files:,}개 "
+                    f"({' / '.join(name for name, _ in partition_fields)}) -> {self.partitioned_dir}")
+        
+    def update_search_index(self):
+        """
+        전문 검색 색인 갱신 (search_index.db)
+        
+        증분 모드에서는 변환 기록의 파일별 내용 해시를 색인된 해시와 비교하여, 새로 생기거나 바뀐 파일은
+        해당 리뷰 조각으로 다시 색인하고 삭제된 파일의 문서는 지움. 그 외 모드에서는 전체 재색인
+        """
+        logger.info("전문 검색 색인 갱신 시작...")
+        with SearchIndex(self.search_index_path) as index:
+            if self.incremental:
+                files = {path: entry for path, entry in self.load_manifest()['files'].items() if 'restaurant' in entry}
+                indexed = index.indexed_sources()
+                stale = [path for path, sha256 in indexed.items()
+                         if path not in files or files[path]['sha256'] != sha256]
+                added = [path for path, entry in files.items() if indexed.get(path) != entry['sha256']]
+                index.remove_sources(stale)
+                for path in added:
+                    entry = files[path]
+                    reviews = []
+                    if entry['fragment']:
+                        reviews = [pq.read_table(self.dataset_dir / entry['fragment'],
+                                                 columns=list(SEARCH_REVIEW_COLUMNS))]
+                    index.add_source(path, entry['sha256'], [entry['restaurant']], reviews)
+                removed = [path for path in stale if path not in files]
+                logger.info(f"검색 색인: 새로 색인한 파일 {len(added):,}개, 삭제 반영 {len(removed):,}개")
+            else:
+                index.clear()
+                restaurants = pq.read_table(self.output_dir / 'restaurants.parquet',
+                                            columns=['restaurant_id', 'name', 'grid']).to_pylist()
+                batches = (batch.select(list(SEARCH_REVIEW_COLUMNS)) for batch in self.iter_review_batches())
+                index.add_source('', None, restaurants, batches)
+            index.optimize()
+            counts = index.document_counts()
+        logger.info(f"검색 색인 갱신 완료: 리뷰 {counts['reviews']:,}개, 레스토랑 {counts['restaurants']:,}개 "
+                    f"({self.search_index_path})")
+        
+    def source_path(self, file_path: str) -> str:
+        """레스토랑의 원본 JSON 경로를 변환 기록과 같은 상대 경로로 (리뷰 디렉토리 밖이면 그대로)"""
+        try:
+            return Path(file_path).relative_to(self.reviews_dir).as_posix()
+        except ValueError:
+            return str(file_path)
+
+    def changed_sources(self, previous: Optional[pa.Table]) -> Tuple[List[str], pa.Table, Iterable]:
+        """
+        원본 파일(레스토랑)별 테이블(요약/스케치)에서 다시 계산할 레스토랑과 리뷰
+        
+        증분 모드에서는 기존 테이블의 파일별 내용 해시를 변환 기록과 비교하여, 바뀌지 않은 파일은 그대로 두고
+        새로 생기거나 바뀐 파일만 해당 리뷰 조각으로 다시 계산함 (삭제된 파일은 어느 쪽에도 없음).
+        그 외 모드에서는 전체 레스토랑과 리뷰 전체
+        
+        Args:
+            previous: 기존 테이블 (source, source_sha256 열, 없으면 None)
+            
+        Returns:
+            (그대로 둘 원본 파일 목록, 다시 계산할 레스토랑 테이블 (source, source_sha256, restaurant_id, name, grid 포함),
+             해당 리뷰 레코드 배치)
+        """
+        if not self.incremental:
+            restaurants = pq.read_table(self.output_dir / 'restaurants.parquet',
+                                        columns=['restaurant_id', 'name', 'grid', 'file_path'])
+            restaurants = restaurants.append_column(
+                'source', pa.array([self.source_path(path) for path in restaurants['file_path'].to_pylist()],
+                                   pa.string()))
+            restaurants = restaurants.append_column('source_sha256', pa.nulls(len(restaurants), pa.string()))
+            return [], restaurants, self.iter_review_batches()
+        
+        files = {path: entry for path, entry in self.load_manifest()['files'].items() if 'restaurant' in entry}
+        kept = []
+        if previous is not None:
+            indexed = dict(zip(previous['source'].to_pylist(), previous['source_sha256'].to_pylist()))
+            kept = [path for path, entry in files.items() if indexed.get(path) == entry['sha256']]
+        unchanged = set(kept)
+        changed = [path for path in sorted(files) if path not in unchanged]
+        restaurants = pa.Table.from_pylist([
+            {'source': path, 'source_sha256': files[path]['sha256'], **files[path]['restaurant']}
+            for path in changed])
+        import pyarrow.dataset as ds
+
+        fragments = [str(self.dataset_dir / files[path]['fragment']) for path in changed
+                     if files[path]['fragment']]
+        batches = ds.dataset(fragments, format='parquet', schema=REVIEW_SCHEMA).to_batches(
+            batch_size=self.row_group_size) if fragments else []
+        return kept, restaurants, batches
+
+    def write_summary_tables(self):
+        """
+        요약 테이블 갱신 (restaurant_stats.parquet, language_stats.parquet, grid_stats.parquet)
+        
+        증분 모드에서는 바뀌지 않은 파일의 행은 그대로 두고 새로 생기거나 바뀐 파일의 행만 다시 계산함
+        (changed_sources). grid_stats는 남은 행을 합쳐 다시 만듦. 그 외 모드에서는 리뷰 전체를 한 번 훑어 새로 만듦
+        """
+        logger.info("요약 테이블 갱신 시작...")
+        categories = {}
+        previous = {}
+        if self.incremental:
+            previous = read_summaries(self.output_dir)
+            if 'restaurant_stats' in previous and 'language_stats' in previous:
+                categories = existing_categories(previous)
+        kept, restaurants, batches = self.changed_sources(previous['restaurant_stats'] if categories else None)
+        
+        cells, lengths = summarize_batches(batches, categories, self.row_group_size)
+        if len(restaurants):
+            restaurant_stats, language_stats = build_stats(restaurants, cells, lengths)
+        if kept:
+            def kept_rows(table):
+                table = table.filter(pc.is_in(table['source'], value_set=pa.array(kept, pa.string())))
+                for column in ('restaurant_name', 'language', 'grid'):
+                    if column in table.column_names:
+                        index = table.schema.get_field_index(column)
+                        table = table.set_column(index, column, pc.cast(table[column], pa.string()))
+                return table
+            old_restaurants = kept_rows(previous['restaurant_stats'])
+            old_languages = kept_rows(previous['language_stats'])
+            if len(restaurants):
+                old_restaurants = pa.concat_tables([old_restaurants, restaurant_stats.cast(old_restaurants.schema)])
+                old_languages = pa.concat_tables([old_languages, language_stats.cast(old_languages.schema)])
+            restaurant_stats, language_stats = old_restaurants, old_languages
+        elif not len(restaurants):
+            logger.warning("요약 테이블을 만들 레스토랑이 없습니다.")
+            return
+        
+        tables = write_summaries(self.output_dir, restaurant_stats, language_stats, categories)
+        logger.info(f"요약 테이블 갱신 완료: 레스토랑 {len(restaurant_stats):,}개 "
+                    f"(다시 계산 {len(restaurants):,}개), 리뷰 {pc.sum(restaurant_stats['review_count']).as_py() or 0:,}개, "
+                    f"grid {len(tables['grid_stats']):,}개 -> {self.output_dir}")
+        
+    def write_sketch_tables(self):
+        """
+        스케치 테이블 갱신 (restaurant_sketches.parquet, grid_sketches.parquet)
+        
+        레스토랑(원본 파일)별 고유 리뷰 수/언어 수 HyperLogLog, 리뷰 길이 t-digest, 평점 히스토그램을 만들고,
+        grid_sketches는 레스토랑 행을 합쳐 다시 만듦. 증분 모드에서는 요약 테이블과 같이 바뀐 파일의 행만 다시 계산함
+        """
+        logger.info("스케치 테이블 갱신 시작...")
+        previous = read_sketches(self.output_dir).get('restaurant_sketches') if self.incremental else None
+        kept, restaurants, batches = self.changed_sources(previous)
+        
+        restaurant_sketches = None
+        if len(restaurants):
+            restaurant_sketches = build_restaurant_sketches(restaurants, sketch_batches(batches))
+        if kept:
+            old_rows = previous.filter(pc.is_in(previous['source'], value_set=pa.array(kept, pa.string())))
+            restaurant_sketches = old_rows if restaurant_sketches is None \
+                else pa.concat_tables([old_rows, restaurant_sketches.cast(old_rows.schema)])
+        elif restaurant_sketches is None:
+            logger.warning("스케치 테이블을 만들 레스토랑이 없습니다.")
+            return
+        
+        tables = write_sketches(self.output_dir, restaurant_sketches)
+        logger.info(f"스케치 테이블 갱신 완료: 레스토랑 {len(restaurant_sketches):,}개 "
+                    f"(다시 계산 {len(restaurants):,}개), grid {len(tables['grid_sketches']):,}개 -> {self.output_dir}")
+        
+    def print_statistics(self, df_restaurants: 'pd.DataFrame', df_reviews: 'pd.DataFrame'):
         """데이터 통계 출력"""
         print("\n" + "="*60)
         print("📊 데이터 변환 결과 통계")
@@ -274,10 +1202,10 @@ class ReviewsToParquetConverter:
         print(f"  - reviews.parquet: {reviews_size:.2f} MB")
         print("="*60)
         
-    def save_samples(self, df_restaurants: pd.DataFrame, df_reviews: pd.DataFrame):
+    def save_samples(self, df_restaurants: 'pd.DataFrame', df_reviews: 'pd.DataFrame'):
         """샘플 데이터를 CSV로 저장 (확인용)"""
         # 레스토랑 샘플
-        sample_restaurants = df_restaurants.head(100)
+        sample_restaurants = df_restaurants.head(SAMPLE_ROWS)
         sample_restaurants.to_csv(
             self.output_dir / 'sample_restaurants.csv',
             index=False,
@@ -285,7 +1213,7 @@ class ReviewsToParquetConverter:
         )
         
         # 리뷰 샘플
-        sample_reviews = df_reviews.head(100)
+        sample_reviews = df_reviews.head(SAMPLE_ROWS)
         sample_reviews.to_csv(
             self.output_dir / 'sample_reviews.csv',
             index=False,
@@ -294,15 +1222,63 @@ class ReviewsToParquetConverter:
         
         logger.info("샘플 CSV 파일 생성 완료")
     
+    def remove_stale_tables(self):
+        """
+        이전 실행이 남긴 요약/스케치 테이블 중 이번 실행에서 갱신하지 않는 것을 삭제
+        
+        --summaries/--sketches 없이 다시 변환하면 기존 테이블이 새 리뷰와 맞지 않게 되므로,
+        분석 스크립트가 오래된 집계를 읽지 않도록 지움
+        """
+        stale = ([] if self.summaries else list(SUMMARY_TABLES)) + ([] if self.sketches else list(SKETCH_TABLES))
+        for name in stale:
+            path = self.output_dir / f"{name}.parquet"
+            if path.exists():
+                path.unlink()
+                logger.info(f"이전 실행의 {path.name} 삭제 (이번 변환에서 갱신하지 않음)")
+    
     def run(self):
         """전체 변환 프로세스 실행"""
-        logger.info("리뷰 데이터 Parquet 변환 시작")
+        logger.info(f"리뷰 데이터 Parquet 변환 시작 (JSON 디코더: {self.review_reader.backend})")
+        
+        # 이번 실행에서 갱신하지 않는 요약/스케치 테이블은 바뀐 리뷰와 맞지 않으므로 먼저 삭제
+        self.remove_stale_tables()
+        
+        if self.incremental:
+            # 바뀐 JSON 파일만 다시 변환하여 리뷰 조각 교체
+            self.incremental_update()
+        elif self.stream:
+            # JSON 파일 처리와 Parquet 기록을 함께 진행 (메모리 사용량 일정)
+            self.stream_parquet_files()
+        else:
+            # JSON 파일 처리
+            self.convert_all_files()
+            
+            # Parquet 파일 생성
+            self.create_parquet_files()
+        
+        if self.dedup:
+            # 본문이 거의 같은 리뷰 묶음 표시 (이후 단계의 출력에도 duplicate_group 열이 포함됨)
+            self.flag_near_duplicates()
+        
+        if self.star_schema:
+            # 정규화된 출력 (레스토랑/grid 차원 + 정수 키 리뷰 팩트 테이블)
+            self.write_star_schema()
+        
+        if self.partitioned:
+            # grid 단위로 읽을 수 있는 하이브 파티션 데이터셋
+            self.write_partitioned_dataset()
         
-        # JSON 파일 처리
-        self.convert_all_files()
+        if self.search_index:
+            # 리뷰 본문/레스토랑 이름 전문 검색 색인
+            self.update_search_index()
         
-        # Parquet 파일 생성
-        self.create_parquet_files()
+        if self.summaries:
+            # 레스토랑/언어/grid별 요약 테이블 (분석 스크립트가 리뷰 원본 없이 리포트 생성)
+            self.write_summary_tables()
+        
+        if self.sketches:
+            # 레스토랑/grid별 병합 가능한 스케치 (고유 리뷰 수, 언어 수, 리뷰 길이 분위수 근사)
+            self.write_sketch_tables()
         
         # 에러 파일 로깅
         if self.error_files:
@@ -313,31 +1289,118 @@ class ReviewsToParquetConverter:
         logger.info("모든 작업 완료!")
 
 
+# 워커 프로세스마다 하나씩 만드는 변환기 (프로세스 풀 initializer에서 생성)
+_worker_converter = None
+
+
+def _init_worker(options: Dict):
+    """워커 프로세스 초기화"""
+    global _worker_converter
+    _worker_converter = ReviewsToParquetConverter(**options)
+
+
+def _chunk_worker(method: str, file_paths: List[Path]):
+    """파일 묶음 처리 (프로세스 풀 작업 함수) - 부모와 같은 변환기 메서드 실행"""
+    return getattr(_worker_converter, method)(file_paths)
+
+
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description='리뷰 JSON 파일을 Parquet으로 변환')
+    parser.add_argument('--reviews_dir', type=str, default=str(REVIEWS_DIR),
+                        help='리뷰 JSON 디렉토리')
+    parser.add_argument('--output_dir', type=str, default=str(PARQUET_DATA_DIR),
+                        help='Parquet 출력 디렉토리')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='JSON 파일을 읽을 프로세스 수, 0이면 CPU 코어 수 (기본값: 1)')
+    parser.add_argument('--files_per_chunk', type=int, default=50,
+                        help='워커에 한 번에 넘길 파일 수 (기본값: 50)')
+    parser.add_argument('--stream', action='store_true',
+                        help='전체 데이터를 메모리에 모으지 않고 행 그룹 단위로 바로 기록 (메모리 사용량 일정)')
+    parser.add_argument('--row_group_size', type=int, default=100_000,
+                        help='스트리밍 모드에서 행 그룹 하나의 리뷰 수 (기본값: 100000)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='새로 생기거나 바뀐 JSON 파일만 다시 변환하여 reviews_dataset/의 리뷰 조각 교체')
+    parser.add_argument('--reference_time', type=str, default=None,
+                        help='상대 날짜("2주 전")를 계산할 기준 시각, ISO 형식 (기본값: 현재 시각) - 같은 값이면 결과 재현 가능')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='증분 모드에서 변환 기록을 무시하고 전체 재변환')
+    parser.add_argument('--partitioned', action='store_true',
+                        help='borough/grid 하이브 파티션 리뷰 데이터셋도 생성 (reviews_partitioned/)')
+    parser.add_argument('--partition_by_year', action='store_true',
+                        help='파티션 데이터셋을 추정 날짜의 연도로도 나눔 (--partitioned와 함께 사용)')
+    parser.add_argument('--partition_row_group_size', type=int, default=PARTITION_ROW_GROUP_SIZE,
+                        help=f'파티션 데이터셋의 행 그룹당 최대 리뷰 수 (기본값: {PARTITION_ROW_GROUP_SIZE})')
+    parser.add_argument('--json_backend', type=str, choices=available_backends(), default=None,
+                        help=f'리뷰 JSON 디코더 (기본값: 사용 가능한 가장 빠른 디코더, 현재 {default_backend()})')
+    parser.add_argument('--star_schema', action='store_true',
+                        help='정규화된 출력도 생성 (dim_restaurants, 정수 키 fact_reviews, dim_grid)')
+    parser.add_argument('--search_index', action='store_true',
+                        help='리뷰 본문/레스토랑 이름 전문 검색 색인(search_index.db)도 갱신 (증분 모드에서는 바뀐 파일만)')
+    parser.add_argument('--summaries', action='store_true',
+                        help='레스토랑/언어/grid별 요약 테이블(restaurant_stats, language_stats, grid_stats)도 갱신 '
+                             '(증분 모드에서는 바뀐 파일만 다시 계산)')
+    parser.add_argument('--sketches', action='store_true',
+                        help='레스토랑/grid별 스케치 테이블(restaurant_sketches, grid_sketches)도 갱신 - 고유 리뷰 수/언어 수 '
+                             'HyperLogLog, 리뷰 길이 t-digest (증분 모드에서는 바뀐 파일만 다시 계산)')
+    parser.add_argument('--dedup', action='store_true',
+                        help='리뷰 본문 근사 중복 묶음을 찾아 reviews.parquet에 duplicate_group 열 추가 (MinHash LSH)')
+    parser.add_argument('--dedup_threshold', type=float, default=DEDUP_THRESHOLD,
+                        help=f'근사 중복으로 볼 최소 자카드 유사도 추정치 (기본값: {DEDUP_THRESHOLD})')
+    args = parser.parse_args()
+
+    ensure_dirs()
+    setup_logging()
+
     print("\n🚀 NYC Restaurant Reviews JSON to Parquet Converter")
     print("="*60)
     
     try:
-        # 필요한 패키지 체크
-        try:
-            import pyarrow
-        except ImportError:
-            print("⚠️ pyarrow가 설치되지 않았습니다. 설치 중...")
-            os.system("pip install pyarrow")
-            import pyarrow
-        
         # 변환기 실행
-        converter = ReviewsToParquetConverter()
+        converter = ReviewsToParquetConverter(
+            args.reviews_dir, args.output_dir,
+            workers=args.workers or os.cpu_count() or 1,
+            files_per_chunk=args.files_per_chunk,
+            stream=args.stream,
+            row_group_size=args.row_group_size,
+            incremental=args.incremental,
+            reference_time=reference_timestamp(args.reference_time),
+            star_schema=args.star_schema,
+            partitioned=args.partitioned or args.partition_by_year,
+            partition_by_year=args.partition_by_year,
+            partition_row_group_size=args.partition_row_group_size,
+            json_backend=args.json_backend,
+            search_index=args.search_index,
+            summaries=args.summaries,
+            dedup=args.dedup,
+            dedup_threshold=args.dedup_threshold,
+            sketches=args.sketches
+        )
+        if args.incremental and args.rebuild:
+            converter.manifest_path.unlink(missing_ok=True)
         converter.run()
         
         print("\n✅ 변환이 성공적으로 완료되었습니다!")
-        print(f"📂 출력 디렉토리: {PARQUET_DATA_DIR}")
+        print(f"📂 출력 디렉토리: {args.output_dir}")
         print("\n다음 파일들이 생성되었습니다:")
         print("  • restaurants.parquet - 레스토랑 정보")
-        print("  • reviews.parquet - 모든 리뷰 데이터")
-        print("  • sample_restaurants.csv - 레스토랑 샘플 (확인용)")
-        print("  • sample_reviews.csv - 리뷰 샘플 (확인용)")
+        if args.incremental:
+            print(f"  • {converter.dataset_dir.name}/ - 원본 JSON 파일별 리뷰 조각")
+            print(f"  • {converter.manifest_path.name} - 변환 기록 (다음 증분 변환에 사용)")
+        else:
+            print("  • reviews.parquet - 모든 리뷰 데이터" + (" (duplicate_group: 근사 중복 묶음)" if args.dedup else ""))
+            print("  • sample_restaurants.csv - 레스토랑 샘플 (확인용)")
+            print("  • sample_reviews.csv - 리뷰 샘플 (확인용)")
+        if args.star_schema:
+            print("  • dim_restaurants.parquet / fact_reviews.parquet / dim_grid.parquet - 정규화된 출력")
+        if converter.partitioned:
+            print(f"  • {converter.partitioned_dir.name}/ - borough/grid 파티션 리뷰 데이터셋")
+        if converter.search_index:
+            print(f"  • {converter.search_index_path.name} - 리뷰/레스토랑 전문 검색 색인")
+        if converter.summaries:
+            print(f"  • {' / '.join(f'{name}.parquet' for name in SUMMARY_TABLES)} - 요약 테이블")
+        if converter.sketches:
+            print(f"  • {' / '.join(f'{name}.parquet' for name in SKETCH_TABLES)} - 스케치 테이블")
         print(f"  • {log_file_path.name} - 변환 로그")
         
     except Exception as e:
@@ -348,7 +1411,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
-
-if __name__ == "__main__":
-    main()
@@ -0,0 +1,146 @@
+"""
+arrow_cache.py
+Parquet 파일을 디코딩한 테이블의 로컬 캐시 (Arrow IPC 파일 = Feather v2, 메모리 맵으로 열기)
+
+- Parquet은 읽을 때마다 압축 해제와 인코딩 해제가 필요하지만, 압축하지 않은 IPC 파일은 디스크의 바이트가
+  메모리 상의 Arrow 배열과 같으므로 pyarrow.memory_map으로 열면 복사 없이 바로 테이블이 됩니다.
+  실제로 읽는 열의 페이지만 운영체제 페이지 캐시에 올라오고, 같은 캐시를 여는 여러 분석 세션/노트북 커널이
+  페이지 캐시를 공유합니다 (프로세스마다 사본을 따로 들고 있지 않음).
+- 캐시 파일은 원본 Parquet의 지문(파일 크기 + 푸터 메타데이터 해시)을 스키마 메타데이터로 기록하고,
+  열 때 원본 지문과 다르면 다시 만듭니다. 푸터에는 행 그룹 위치/통계가 들어 있으므로 내용이 바뀌면 지문도 바뀝니다.
+- 사전 인코딩 열은 캐시를 만들 때 사전을 통합합니다 (IPC 파일 형식은 열마다 사전 하나). 통합 순서는
+  pandas category 순서와 같으므로 캐시로 만든 리포트도 Parquet으로 만든 리포트와 같습니다.
+- compression='lz4'로 만들면 파일은 작아지지만 열 때 압축을 풀어야 하므로 복사 없이 읽는 이점은 없어집니다.
+
+사용 예:
+    cache = ArrowCache("parquet_data/arrow_cache")
+    reviews = cache.load("parquet_data/reviews.parquet")  # pyarrow.Table (메모리 맵)
+"""
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIONS = (None, 'lz4')
+FINGERPRINT_KEY = b'arrow_cache.source_fingerprint'
+COMPRESSION_KEY = b'arrow_cache.compression'
+_PARQUET_MAGIC = b'PAR1'
+
+
+def parquet_fingerprint(path) -> str:
+    """
+    Parquet 파일의 지문 (파일 크기 + 푸터 메타데이터의 sha256, 푸터만 읽으므로 파일 크기와 관계없이 빠름)
+
+    Args:
+        path: Parquet 파일 경로
+
+    Returns:
+        16진수 지문 문자열
+    """
+    path = Path(path)
+    size = path.stat().st_size
+    with open(path, 'rb') as f:
+        f.seek(-8, os.SEEK_END)
+        tail = f.read(8)
+        if tail[4:] != _PARQUET_MAGIC:
+            raise ValueError(f"Parquet 파일이 아닙니다: {path}")
+        footer_length = int.from_bytes(tail[:4], 'little')
+        f.seek(-8 - footer_length, os.SEEK_END)
+        footer = f.read(footer_length)
+    digest = hashlib.sha256(size.to_bytes(8, 'little'))
+    digest.update(footer)
+    return digest.hexdigest()
+
+
+class ArrowCache:
+    """Parquet 파일 -> 메모리 맵 Arrow IPC 캐시"""
+
+    def __init__(self, cache_dir, compression: Optional[str] = None):
+        """
+        Args:
+            cache_dir: 캐시 파일(<원본 이름>.arrow)을 둘 디렉토리 (없으면 생성)
+            compression: None(압축 안 함, 복사 없이 읽기) 또는 'lz4'
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"지원하지 않는 압축: {compression} (사용 가능: 없음, lz4)")
+        self.cache_dir = Path(cache_dir)
+        self.compression = compression
+
+    def cache_path(self, source) -> Path:
+        """원본 Parquet 파일의 캐시 파일 경로"""
+        return self.cache_dir / f"{Path(source).stem}.arrow"
+
+    def load(self, source) -> pa.Table:
+        """
+        원본 Parquet 파일의 테이블 (캐시가 최신이면 메모리 맵으로 열고, 아니면 캐시를 다시 만든 뒤 열기)
+
+        Args:
+            source: 원본 Parquet 파일 경로
+
+        Returns:
+            전체 열의 테이블 (압축하지 않은 캐시는 파일을 가리키는 복사 없는 배열)
+        """
+        fingerprint = parquet_fingerprint(source)
+        table = self._open(self.cache_path(source), fingerprint)
+        if table is None:
+            self.build(source, fingerprint)
+            table = self._open(self.cache_path(source), fingerprint)
+            if table is None:
+                # 다른 프로세스가 이전 캐시를 열고 있어 교체하지 못한 경우 (Windows) 원본을 직접 읽음
+                return pq.read_table(source)
+        return table
+
+    def _open(self, path: Path, fingerprint: str) -> Optional[pa.Table]:
+        """캐시 파일을 메모리 맵으로 열기 (없거나 지문/압축 설정이 다르면 None)"""
+        if not path.exists():
+            return None
+        try:
+            reader = pa.ipc.open_file(pa.memory_map(str(path), 'r'))
+        except (OSError, pa.ArrowInvalid):
+            return None
+        metadata = reader.schema.metadata or {}
+        if metadata.get(FINGERPRINT_KEY, b'').decode() != fingerprint \
+                or metadata.get(COMPRESSION_KEY, b'').decode() != (self.compression or ''):
+            return None
+        table = reader.read_all()
+        metadata = {key: value for key, value in metadata.items() if key not in (FINGERPRINT_KEY, COMPRESSION_KEY)}
+        return table.replace_schema_metadata(metadata or None)
+
+    def build(self, source, fingerprint: Optional[str] = None) -> Path:
+        """
+        원본 Parquet 파일을 디코딩하여 캐시 파일 생성 (임시 파일에 쓴 뒤 교체)
+
+        Returns:
+            캐시 파일 경로
+        """
+        fingerprint = fingerprint or parquet_fingerprint(source)
+        path = self.cache_path(source)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        table = pq.read_table(source).unify_dictionaries()
+        metadata = dict(table.schema.metadata or {})
+        metadata.update({FINGERPRINT_KEY: fingerprint.encode(), COMPRESSION_KEY: (self.compression or '').encode()})
+        table = table.replace_schema_metadata(metadata)
+
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        with pa.OSFile(str(temp_path), 'wb') as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        try:
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"캐시 파일을 교체하지 못했습니다: {path} - {e}")
+            temp_path.unlink(missing_ok=True)
+        logger.info(f"Arrow 캐시 생성: {source} -> {path} ({table.num_rows:,}행)")
+        return path
+
+    def clear(self):
+        """캐시 파일 모두 삭제"""
+        for path in self.cache_dir.glob('*.arrow'):
+            path.unlink(missing_ok=True)
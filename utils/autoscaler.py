@@ -0,0 +1,147 @@
+"""
+autoscaler.py
+호스트의 메모리/CPU 여유와 리뷰 수집 처리량을 보고 병렬 크롤링 워커(브라우저) 수를 조정하는 컨트롤러
+
+- 메모리 여유가 브라우저 하나 분량보다 부족하거나 CPU가 포화되면 워커 수를 줄입니다.
+- 여유가 충분하면 워커 수를 하나씩 늘리되, 늘려도 처리량(리뷰/초)이 좋아지지 않으면 더 늘리지 않습니다.
+- 워커를 줄일 때 실행 중인 작업은 중단하지 않고, 끝난 뒤 빈 슬롯을 채우지 않는 방식으로 줄입니다.
+  감시자(ParallelCrawlSupervisor)는 워커 풀을 목표 워커 수 크기로 다시 만들고 남는 워커의 브라우저를 닫습니다.
+- psutil이 필요합니다 (pip install psutil).
+"""
+
+import os
+import time
+from typing import Dict, Iterable, Optional
+
+from utils.process_tools import psutil, process_tree_usage
+
+MB = 1024 * 1024
+
+
+class WorkerAutoscaler:
+    """병렬 크롤링 워커 수 자동 조정"""
+
+    def __init__(self, min_workers: int = 1, max_workers: int = 4, initial_workers: Optional[int] = None,
+                 memory_reserve_mb: float = 1024, max_load_ratio: float = 0.9,
+                 interval: float = 30.0, cooldown: float = 300.0, min_gain: float = 0.05,
+                 default_worker_mb: float = 500):
+        """
+        Args:
+            min_workers: 최소 워커 수
+            max_workers: 최대 워커 수 (워커 풀 크기)
+            initial_workers: 시작 워커 수 (기본값: min_workers)
+            memory_reserve_mb: 항상 남겨둘 여유 메모리(MB)
+            max_load_ratio: 코어당 부하(load average / CPU 수) 상한
+            interval: 조정 주기(초)
+            cooldown: 축소 또는 증설 효과 없음 판정 후 다시 늘리기까지 대기 시간(초)
+            min_gain: 워커를 늘렸을 때 기대하는 최소 처리량 증가율
+            default_worker_mb: 측정값이 없을 때 가정하는 워커(브라우저 포함) 1개의 메모리(MB)
+        """
+        if psutil is None:
+            raise RuntimeError("워커 자동 조정에는 psutil이 필요합니다. pip install psutil")
+        if not 1 <= min_workers <= max_workers:
+            raise ValueError("1 <= min_workers <= max_workers 이어야 합니다.")
+
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.target = max(min_workers, min(initial_workers or min_workers, max_workers))
+        self.memory_reserve = memory_reserve_mb * MB
+        self.max_load_ratio = max_load_ratio
+        self.interval = interval
+        self.cooldown = cooldown
+        self.min_gain = min_gain
+
+        self.worker_rss = default_worker_mb * MB  # 워커 1개당 RSS (EWMA)
+        self.throughput_by_level: Dict[int, float] = {}  # 워커 수별 처리량 (EWMA, 리뷰/초)
+        self.history = []  # (시각, 워커 수, 처리량, 여유 메모리 MB, 부하, 결정)
+
+        self._last_tick = time.time()
+        self._last_reviews = 0
+        self._last_cpu: Dict[int, float] = {}
+        self._grow_blocked_until = 0.0
+
+    def _host_load_ratio(self) -> float:
+        """코어당 부하 (load average가 없는 Windows에서는 CPU 사용률)"""
+        cpu_count = os.cpu_count() or 1
+        if hasattr(os, 'getloadavg'):
+            return os.getloadavg()[0] / cpu_count
+        return psutil.cpu_percent(interval=None) / 100
+
+    def _sample_workers(self, worker_pids: Iterable[int], dt: float):
+        """워커 프로세스 트리별 RSS 평균과 CPU 사용률(코어 수 기준) 측정"""
+        rss_values = []
+        cpu_usage = 0.0
+        current_cpu = {}
+        for pid in worker_pids:
+            usage = process_tree_usage(pid)
+            if usage is None:
+                continue
+            rss, cpu_seconds = usage
+            rss_values.append(rss)
+            current_cpu[pid] = cpu_seconds
+            if pid in self._last_cpu and dt > 0:
+                cpu_usage += max(cpu_seconds - self._last_cpu[pid], 0.0) / dt
+        self._last_cpu = current_cpu
+
+        if rss_values:
+            mean_rss = sum(rss_values) / len(rss_values)
+            self.worker_rss = 0.5 * self.worker_rss + 0.5 * mean_rss
+        return cpu_usage
+
+    def update(self, worker_pids: Iterable[int], reviews_done: int) -> int:
+        """
+        주기마다 측정하고 목표 워커 수 갱신 (주기가 되지 않았으면 현재 목표 그대로 반환)
+
+        Args:
+            worker_pids: 현재 작업 중인 워커 프로세스 pid 목록 (하위 크롬 프로세스 포함 측정)
+            reviews_done: 지금까지 수집 완료한 총 리뷰 수
+
+        Returns:
+            목표 워커 수
+        """
+        now = time.time()
+        dt = now - self._last_tick
+        if dt < self.interval:
+            return self.target
+
+        throughput = max(reviews_done - self._last_reviews, 0) / dt
+        self._last_tick = now
+        self._last_reviews = reviews_done
+
+        previous = self.throughput_by_level.get(self.target)
+        self.throughput_by_level[self.target] = (
+            throughput if previous is None else 0.5 * previous + 0.5 * throughput
+        )
+
+        worker_cpu = self._sample_workers(worker_pids, dt)
+        available = psutil.virtual_memory().available
+        headroom = available - self.memory_reserve
+        load_ratio = self._host_load_ratio()
+
+        decision = "유지"
+        if headroom < 0.5 * self.worker_rss or load_ratio > self.max_load_ratio:
+            # 메모리 부족(스왑/OOM 직전) 또는 CPU 포화 - 즉시 축소
+            if self.target > self.min_workers:
+                self.target -= 1
+                decision = "축소"
+            self._grow_blocked_until = now + self.cooldown
+        elif (headroom > 1.5 * self.worker_rss and load_ratio < 0.8 * self.max_load_ratio
+              and self.target < self.max_workers and now >= self._grow_blocked_until):
+            current = self.throughput_by_level.get(self.target)
+            lower = self.throughput_by_level.get(self.target - 1)
+            if lower is not None and current is not None and current < lower * (1 + self.min_gain):
+                # 마지막 증설이 처리량을 늘리지 못함 - 한 단계 되돌리고 잠시 증설 중단
+                self.target -= 1
+                self._grow_blocked_until = now + self.cooldown
+                decision = "증설 효과 없음, 축소"
+            else:
+                self.target += 1
+                decision = "확대"
+
+        self.history.append((now, self.target, throughput, available / MB, load_ratio, decision))
+        if decision != "유지":
+            print(f"[자동 조정] 워커 {self.target}개로 {decision} "
+                  f"(처리량 {throughput:.2f} 리뷰/초, 여유 메모리 {available / MB:.0f}MB, "
+                  f"워커당 {self.worker_rss / MB:.0f}MB, 코어당 부하 {load_ratio:.2f}, "
+                  f"워커 CPU {worker_cpu:.1f}코어)")
+        return self.target
@@ -0,0 +1,53 @@
+"""
+grid_info.py
+gridInfo.txt(뉴욕시 커뮤니티 지구 목록) 파싱 유틸리티
+
+- main.py의 GridBasedPipelineRunner.parse_grid_info와 같은 형식을 읽으며, 자치구 정보를 함께 반환합니다.
+- 변환기의 grid 차원 테이블(dim_grid) 생성 등 파이프라인 밖에서 지구 정보가 필요할 때 사용합니다.
+"""
+
+import re
+from typing import Dict, List
+
+# 그리드 코드 접두어 -> 자치구 (영문, 한글)
+BOROUGHS = {
+    'MN': ('Manhattan', '맨해튼'),
+    'BX': ('Bronx', '브롱스'),
+    'BK': ('Brooklyn', '브루클린'),
+    'QN': ('Queens', '퀸스'),
+    'SI': ('Staten Island', '스태튼 아일랜드'),
+}
+
+_DISTRICT_PATTERN = re.compile(r'^([A-Z]{2})\s+(\d+),\"(.+)\s+\((.+)\)\"$')
+
+
+def parse_grid_info(txt_path) -> List[Dict]:
+    """
+    gridInfo.txt를 파싱하여 지구 정보 목록 반환
+
+    Args:
+        txt_path: gridInfo.txt 경로
+
+    Returns:
+        [{'code': 'MN1', 'borough_code': 'MN', 'borough': 'Manhattan', 'borough_kr': '맨해튼',
+          'district_number': 1, 'area_en': 'Tribeca, Financial District', 'area_kr': '트라이베카, 금융 지구'}, ...]
+    """
+    districts = []
+    with open(txt_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            # 지구 정보 줄: MN 1,"트라이베카, 금융 지구 (Tribeca, Financial District)"
+            match = _DISTRICT_PATTERN.match(line.strip())
+            if not match:
+                continue
+            borough_code, number, area_kr, area_en = match.groups()
+            borough, borough_kr = BOROUGHS.get(borough_code, (borough_code, borough_code))
+            districts.append({
+                'code': f"{borough_code}{number}",
+                'borough_code': borough_code,
+                'borough': borough,
+                'borough_kr': borough_kr,
+                'district_number': int(number),
+                'area_en': area_en,
+                'area_kr': area_kr
+            })
+    return districts
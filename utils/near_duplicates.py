@@ -0,0 +1,288 @@
+"""
+near_duplicates.py
+리뷰 본문 근사 중복 탐지 (글자 shingle + MinHash 서명 + LSH 밴딩)
+
+- 크롤러는 review_id나 (본문, 날짜)가 정확히 같은 리뷰만 걸러내므로, 여러 레스토랑에 올린 같은 리뷰나
+  번역본/원문('원문보기') 변형처럼 조금 다른 중복은 남습니다. 모든 쌍을 비교하면 리뷰 수의 제곱에 비례하므로
+  MinHash 서명으로 자카드 유사도를 근사하고, LSH 밴딩으로 비슷할 가능성이 있는 쌍만 골라 비교합니다.
+- 본문은 소문자로 바꾸고 문장부호를 지운 뒤 글자 5-gram(shingle)으로 나눕니다. Google 번역 표시
+  ("(Translated by Google) ... (Original) ...", "(Google 번역 제공) ... (원문) ...")가 있으면 원문 부분만 씁니다.
+- 서명은 one-permutation MinHash입니다. shingle 해시 하나를 서명 칸(bin)과 값으로 나눠 칸별 최솟값을 구하므로
+  순열 수만큼 해시를 다시 계산하지 않고, 빈 칸은 오른쪽의 채워진 칸에서 빌려 옵니다(rotation densification).
+- 밴드마다 서명 조각이 같은 리뷰끼리 후보가 되고, 후보는 서명 일치 비율(자카드 유사도 추정치)이 threshold
+  이상일 때만 같은 묶음으로 합칩니다. 시간은 리뷰 수에 거의 비례합니다.
+
+사용 예:
+    detector = NearDuplicateDetector(threshold=0.7, workers=4)
+    groups = detector.find_groups(pq.ParquetFile("reviews.parquet").iter_batches(columns=['text']))
+    # groups: 리뷰마다 근사 중복 묶음 번호 (중복이 없으면 -1)
+"""
+
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+SHINGLE_SIZE = 5        # shingle 글자 수
+NUM_BINS = 64           # 서명 길이 (2의 거듭제곱)
+BANDS = 16              # LSH 밴드 수 (밴드당 NUM_BINS // BANDS칸)
+THRESHOLD = 0.7         # 같은 묶음으로 볼 최소 자카드 유사도 추정치
+MIN_TEXT_LENGTH = 40    # 정규화한 본문이 이보다 짧으면 비교하지 않음 ("맛있어요" 같은 짧은 리뷰)
+
+EMPTY = np.uint32(0xFFFFFFFF)  # 빈 서명 칸
+_VALUE_BITS = 25                # 칸에 기록하는 해시 값 비트 수 (빌려 온 칸은 거리 * 2^25를 더함)
+_SHINGLE_PRIME = np.uint32(16777619)
+_NORMALIZE_PATTERN = r'[^\p{L}\p{N}]+'  # RE2 (pyarrow.compute) 문법: 글자/숫자가 아닌 구간
+_TRANSLATED_PATTERN = r'\((?:translated by google|google 번역 제공)\)'
+_TRANSLATED_RE = re.compile(_TRANSLATED_PATTERN, re.IGNORECASE)
+_ORIGINAL_RE = re.compile(r'\((?:original|원문)\)', re.IGNORECASE)
+
+
+def _original_text(text: str) -> str:
+    """Google 번역 표시가 있는 본문에서 원문 부분 (원문 표시가 없으면 번역 표시만 제거)"""
+    parts = _ORIGINAL_RE.split(text, maxsplit=1)
+    return parts[1] if len(parts) > 1 else _TRANSLATED_RE.sub(' ', text)
+
+
+def normalize(texts) -> List[str]:
+    """
+    비교용 본문 (번역 표시가 있으면 원문 부분만, 소문자, 글자/숫자가 아닌 구간은 공백 하나로)
+
+    Args:
+        texts: 리뷰 본문 목록 또는 pyarrow 문자열 배열 (None은 빈 문자열)
+
+    Returns:
+        정규화한 본문 리스트
+    """
+    if isinstance(texts, pa.ChunkedArray):
+        texts = texts.combine_chunks()
+    elif not isinstance(texts, pa.Array):
+        texts = pa.array(texts, type=pa.string())
+    translated = pc.match_substring_regex(texts, _TRANSLATED_PATTERN, ignore_case=True).fill_null(False)
+    translated = np.flatnonzero(translated.to_numpy(zero_copy_only=False))
+    if len(translated):
+        values = texts.to_pylist()
+        for row in translated:
+            values[row] = _original_text(values[row])
+        texts = pa.array(values, type=pa.string())
+    normalized = pc.utf8_trim_whitespace(pc.replace_substring_regex(pc.utf8_lower(texts), _NORMALIZE_PATTERN, ' '))
+    return normalized.fill_null('').to_pylist()
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """32비트 해시 섞기 (murmur3 finalizer)"""
+    values = values ^ (values >> np.uint32(16))
+    values = values * np.uint32(0x85EBCA6B)
+    values ^= values >> np.uint32(13)
+    values *= np.uint32(0xC2B2AE35)
+    values ^= values >> np.uint32(16)
+    return values
+
+
+def minhash_signatures(texts: Sequence[Optional[str]], num_bins: int = NUM_BINS,
+                       shingle_size: int = SHINGLE_SIZE, min_length: int = MIN_TEXT_LENGTH) -> np.ndarray:
+    """
+    리뷰 본문의 one-permutation MinHash 서명
+
+    Args:
+        texts: 리뷰 본문 목록 또는 pyarrow 문자열 배열
+        num_bins: 서명 길이 (2의 거듭제곱)
+        shingle_size: shingle 글자 수
+        min_length: 정규화한 본문이 이보다 짧으면 빈 서명 (모든 칸이 EMPTY)
+
+    Returns:
+        (len(texts), num_bins) uint32 서명 배열
+    """
+    normalized = normalize(texts)
+    lengths = np.array([len(text) for text in normalized], dtype=np.int64)
+    lengths[lengths < max(min_length, shingle_size)] = 0
+    signatures = np.full((len(texts), num_bins), EMPTY, dtype=np.uint32)
+    total = int(lengths.sum())
+    if total == 0:
+        return signatures
+
+    # 모든 본문을 이어 붙인 글자 코드에서 위치별 shingle 해시를 한 번에 계산
+    kept = ''.join(text for text, length in zip(normalized, lengths) if length)
+    codes = np.frombuffer(kept.encode('utf-32-le'), dtype=np.uint32)
+    count = len(codes) - shingle_size + 1
+    hashes = codes[:count].copy()
+    for offset in range(1, shingle_size):
+        hashes = hashes * _SHINGLE_PRIME + codes[offset:offset + count]
+    hashes = _mix(hashes)
+
+    # 본문 경계를 넘는 shingle 제외
+    owners = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)[:count]
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)[:count]
+    inside = np.arange(count) - starts <= lengths[owners] - shingle_size
+    hashes, owners = hashes[inside], owners[inside]
+
+    # 해시의 아래 비트로 칸을 정하고 위 25비트를 값으로 칸별 최솟값
+    np.minimum.at(signatures.reshape(-1), owners * num_bins + (hashes & np.uint32(num_bins - 1)),
+                  hashes >> np.uint32(32 - _VALUE_BITS))
+    compared = lengths > 0
+    signatures[compared] = _densify(signatures[compared])
+    return signatures
+
+
+def _densify(signatures: np.ndarray) -> np.ndarray:
+    """빈 칸을 오른쪽(순환)으로 가장 가까운 채워진 칸의 값 + 거리 * 2^25로 채운 서명"""
+    empty = signatures == EMPTY
+    rows = np.flatnonzero(empty.any(axis=1))
+    if len(rows) == 0:
+        return signatures
+    block = signatures[rows]
+    filled = block.copy()
+    missing = empty[rows]
+    for distance in range(1, block.shape[1]):
+        source = np.roll(block, -distance, axis=1)
+        take = missing & (source != EMPTY)
+        filled[take] = source[take] + np.uint32(distance << _VALUE_BITS)
+        missing &= ~take
+        if not missing.any():
+            break
+    signatures[rows] = filled
+    return signatures
+
+
+def _band_keys(signatures: np.ndarray, bands: int) -> np.ndarray:
+    """밴드별 서명 조각의 64비트 키 (len(signatures), bands)"""
+    rows_per_band = signatures.shape[1] // bands
+    parts = signatures[:, :bands * rows_per_band].reshape(len(signatures), bands, rows_per_band).astype(np.uint64)
+    keys = np.zeros((len(signatures), bands), dtype=np.uint64)
+    for column in range(rows_per_band):
+        keys = keys * np.uint64(0x100000001B3) + parts[:, :, column] + np.uint64(1)
+    return keys
+
+
+def candidate_pairs(signatures: np.ndarray, bands: int = BANDS) -> np.ndarray:
+    """
+    LSH 밴딩 후보 쌍 (밴드 조각이 같은 리뷰 묶음마다 첫 리뷰와 나머지 리뷰의 쌍)
+
+    Returns:
+        (쌍 수, 2) int64 배열 (중복 제거, 왼쪽 < 오른쪽)
+    """
+    valid = np.flatnonzero(signatures[:, 0] != EMPTY)
+    if len(valid) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    keys = _band_keys(signatures[valid], bands)
+    pairs = []
+    for band in range(bands):
+        order = np.argsort(keys[:, band], kind='stable')
+        band_keys = keys[order, band]
+        starts = np.ones(len(order), dtype=bool)
+        starts[1:] = band_keys[1:] != band_keys[:-1]
+        first = order[np.maximum.accumulate(np.where(starts, np.arange(len(order)), 0))]
+        members = ~starts
+        pairs.append(np.column_stack([valid[first[members]], valid[order[members]]]))
+    pairs = np.concatenate(pairs)
+    pairs.sort(axis=1)
+    return np.unique(pairs, axis=0)
+
+
+def similar_pairs(signatures: np.ndarray, pairs: np.ndarray, threshold: float = THRESHOLD,
+                  chunk_size: int = 1_000_000) -> np.ndarray:
+    """후보 쌍 중 서명 일치 비율(자카드 유사도 추정치)이 threshold 이상인 쌍"""
+    keep = np.zeros(len(pairs), dtype=bool)
+    for start in range(0, len(pairs), chunk_size):
+        chunk = pairs[start:start + chunk_size]
+        agreement = (signatures[chunk[:, 0]] == signatures[chunk[:, 1]]).mean(axis=1)
+        keep[start:start + chunk_size] = agreement >= threshold
+    return pairs[keep]
+
+
+def group_labels(num_items: int, pairs: np.ndarray) -> np.ndarray:
+    """
+    쌍으로 연결된 리뷰를 묶음 번호로 (연결 요소, 처음 나온 순서대로 0부터)
+
+    Returns:
+        리뷰별 묶음 번호 (다른 리뷰와 연결되지 않았으면 -1)
+    """
+    labels = np.arange(num_items, dtype=np.int64)
+    if len(pairs):
+        left, right = pairs[:, 0], pairs[:, 1]
+        while True:
+            # 쌍의 양쪽을 더 작은 대표 번호로 맞추고, 대표 번호를 따라가 경로를 줄이기를 변화가 없을 때까지 반복
+            smaller = np.minimum(labels[left], labels[right])
+            before = labels.copy()
+            np.minimum.at(labels, left, smaller)
+            np.minimum.at(labels, right, smaller)
+            labels = labels[labels]
+            if np.array_equal(labels, before):
+                break
+    sizes = np.bincount(labels, minlength=num_items)
+    grouped = sizes[labels] > 1
+    groups = np.full(num_items, -1, dtype=np.int64)
+    _, dense = np.unique(labels[grouped], return_inverse=True)
+    groups[grouped] = dense
+    return groups
+
+
+class NearDuplicateDetector:
+    """리뷰 본문 근사 중복 묶음 탐지 (서명 계산은 여러 프로세스로 나눠 실행)"""
+
+    def __init__(self, threshold: float = THRESHOLD, num_bins: int = NUM_BINS, bands: int = BANDS,
+                 shingle_size: int = SHINGLE_SIZE, min_length: int = MIN_TEXT_LENGTH, workers: int = 1):
+        """
+        Args:
+            threshold: 같은 묶음으로 볼 최소 자카드 유사도 추정치 (0~1)
+            num_bins: 서명 길이 (128 이하의 2의 거듭제곱)
+            bands: LSH 밴드 수 (num_bins의 약수, 많을수록 낮은 유사도의 쌍까지 후보가 됨)
+            shingle_size: shingle 글자 수
+            min_length: 비교할 최소 본문 길이 (정규화 후)
+            workers: 서명을 계산할 프로세스 수
+        """
+        if num_bins & (num_bins - 1) or num_bins > 128 or num_bins % bands:
+            raise ValueError(f"num_bins는 128 이하의 2의 거듭제곱이고 bands의 배수여야 합니다 "
+                             f"(num_bins={num_bins}, bands={bands})")
+        self.threshold = threshold
+        self.num_bins = num_bins
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.min_length = min_length
+        self.workers = max(1, workers)
+
+    def signatures(self, text_batches: Iterable) -> Iterator[np.ndarray]:
+        """
+        배치별 서명 (입력 순서대로, 워커가 2 이상이면 동시에 진행 중인 배치를 워커 수의 2배로 제한)
+
+        Args:
+            text_batches: text 열이 있는 레코드 배치 또는 본문 리스트
+        """
+        options = (self.num_bins, self.shingle_size, self.min_length)
+        texts = (_texts(batch) for batch in text_batches)
+        if self.workers == 1:
+            for chunk in texts:
+                yield minhash_signatures(chunk, *options)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            in_flight = deque()
+            for chunk in texts:
+                in_flight.append(executor.submit(minhash_signatures, chunk, *options))
+                if len(in_flight) >= self.workers * 2:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+    def find_groups(self, text_batches: Iterable) -> np.ndarray:
+        """
+        모든 리뷰의 근사 중복 묶음 번호
+
+        Returns:
+            리뷰별 묶음 번호 (입력 순서, 중복이 없으면 -1)
+        """
+        chunks = list(self.signatures(text_batches))
+        signatures = np.concatenate(chunks) if chunks else np.empty((0, self.num_bins), dtype=np.uint32)
+        del chunks
+        pairs = similar_pairs(signatures, candidate_pairs(signatures, self.bands), self.threshold)
+        return group_labels(len(signatures), pairs)
+
+
+def _texts(batch):
+    """레코드 배치(text 열)나 리스트에서 본문 목록"""
+    if isinstance(batch, (list, pa.Array)):
+        return batch
+    return batch.column('text')
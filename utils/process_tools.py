@@ -0,0 +1,146 @@
+"""
+process_tools.py
+크롬/크롬드라이버 및 워커 프로세스 관리를 위한 프로세스 유틸리티
+
+- psutil이 설치되어 있으면 psutil을 사용하고, 없으면 OS 명령(ps, taskkill, PowerShell Get-CimInstance)으로 대체합니다.
+"""
+
+import os
+import signal
+import subprocess
+import sys
+from typing import List
+
+try:
+    import psutil
+except ImportError:  # 선택 의존성
+    psutil = None
+
+
+def _child_pids_without_psutil(pid: int) -> List[int]:
+    """OS 명령 출력으로 pid의 모든 하위 프로세스 pid 목록 생성 (POSIX: ps, Windows: PowerShell Get-CimInstance)"""
+    if sys.platform.startswith('win'):
+        command = ['powershell', '-NoProfile', '-Command',
+                   'Get-CimInstance Win32_Process | ForEach-Object { "$($_.ProcessId) $($_.ParentProcessId)" }']
+    else:
+        command = ['ps', '-eo', 'pid=,ppid=']
+    try:
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return []
+
+    children = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            child, parent = int(parts[0]), int(parts[1])
+            children.setdefault(parent, []).append(child)
+
+    result = []
+    seen = {pid}
+    stack = [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            if child not in seen:  # Windows에서는 pid 재사용으로 부모 관계가 순환할 수 있음
+                seen.add(child)
+                result.append(child)
+                stack.append(child)
+    return result
+
+
+def kill_process_tree(pid: int, include_parent: bool = True) -> int:
+    """
+    프로세스와 모든 하위 프로세스를 강제 종료
+
+    Args:
+        pid: 최상위 프로세스 pid (예: 크롬드라이버 또는 워커 프로세스)
+        include_parent: 최상위 프로세스도 종료할지 여부
+
+    Returns:
+        종료 신호를 보낸 프로세스 수
+    """
+    if pid is None:
+        return 0
+
+    if psutil is not None:
+        try:
+            parent = psutil.Process(pid)
+            targets = parent.children(recursive=True)
+            if include_parent:
+                targets.append(parent)
+        except psutil.NoSuchProcess:
+            return 0
+        killed = 0
+        for proc in targets:
+            try:
+                proc.kill()
+                killed += 1
+            except psutil.NoSuchProcess:
+                pass
+        psutil.wait_procs(targets, timeout=5)
+        return killed
+
+    if sys.platform.startswith('win'):
+        if include_parent:
+            result = subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)], capture_output=True)
+            return 1 if result.returncode == 0 else 0
+        # taskkill /T는 최상위 프로세스까지 종료하므로, 하위 프로세스를 찾아 하위부터 하나씩 종료
+        killed = 0
+        for target in reversed(_child_pids_without_psutil(pid)):
+            result = subprocess.run(['taskkill', '/F', '/PID', str(target)], capture_output=True)
+            if result.returncode == 0:
+                killed += 1
+        return killed
+
+    targets = ([pid] if include_parent else []) + _child_pids_without_psutil(pid)
+    killed = 0
+    # 하위 프로세스부터 종료해야 크롬이 고아 프로세스로 남지 않음
+    for target in reversed(targets):
+        try:
+            os.kill(target, signal.SIGKILL)
+            killed += 1
+        except (ProcessLookupError, PermissionError):
+            pass
+    return killed
+
+
+def process_tree_usage(pid: int):
+    """
+    프로세스 트리(자기 자신 + 모든 하위 프로세스)의 메모리/CPU 사용량 (psutil 필요)
+
+    Returns:
+        (RSS 합계 바이트, 누적 CPU 시간 합계 초) 또는 프로세스가 없거나 psutil이 없으면 None
+    """
+    if psutil is None or pid is None:
+        return None
+    try:
+        parent = psutil.Process(pid)
+        procs = [parent] + parent.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return None
+
+    rss = 0
+    cpu_seconds = 0.0
+    for proc in procs:
+        try:
+            rss += proc.memory_info().rss
+            times = proc.cpu_times()
+            cpu_seconds += times.user + times.system
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return rss, cpu_seconds
+
+
+def available_memory():
+    """
+    지금 사용할 수 있는 물리 메모리 (psutil이 없으면 sysconf, 둘 다 안 되면 None)
+
+    Returns:
+        바이트 수 또는 None
+    """
+    if psutil is not None:
+        return psutil.virtual_memory().available
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):  # Windows 또는 지원하지 않는 시스템
+        return None
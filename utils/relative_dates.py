@@ -0,0 +1,109 @@
+"""
+relative_dates.py
+구글 맵 리뷰의 상대 날짜 문자열("2주 전", "수정일: 3달 전" 등)을 추정 날짜로 변환
+
+- 리뷰는 수십만 개지만 서로 다른 날짜 문자열은 백여 개뿐이므로, 문자열별 변환 결과(며칠 전, 수정 여부)를
+  한 번만 계산하여 캐시하고 사전 인코딩 인덱스로 전체 열에 펼칩니다.
+- 기준 시각은 실행 단위로 하나만 사용하므로 같은 변환 안에서는 결과가 일관되고 재현 가능합니다.
+
+사용 예:
+    reference = reference_timestamp()
+    estimated, modified = normalize_relative_dates(pa.array(["2주 전", "수정일: 1년 전", None]), reference)
+"""
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+MODIFIED_PREFIX = "수정일:"
+MICROSECONDS_PER_DAY = 86_400 * 1_000_000
+
+_NUMBER_PATTERN = re.compile(r'\d+')
+
+# (단위 키워드, 영어 키워드, 일 수) - 앞에서부터 먼저 일치하는 단위 사용
+_UNITS = (
+    ("일", "day", 1),
+    ("주", "week", 7),
+    ("달", "month", 30),
+    ("년", "year", 365),
+)
+
+
+def reference_timestamp(value: Optional[str] = None) -> datetime:
+    """
+    변환 기준 시각 생성
+
+    Args:
+        value: ISO 형식 시각 문자열 (예: "2025-01-27T09:00:00"). 없으면 현재 시각
+
+    Returns:
+        기준 시각
+    """
+    return datetime.fromisoformat(value) if value else datetime.now()
+
+
+@lru_cache(maxsize=4096)
+def parse_relative_offset(date_str: Optional[str]) -> Tuple[int, bool]:
+    """
+    상대 날짜 문자열을 기준 시각으로부터의 일 수로 변환 (문자열별로 캐시)
+
+    Args:
+        date_str: 날짜 문자열 (예: "2주 전", "1달 전", "수정일: 3달 전")
+
+    Returns:
+        (며칠 전, 수정 여부). 해석할 수 없으면 (0, False) - 기준 시각을 그대로 사용
+    """
+    if not isinstance(date_str, str):
+        return 0, False
+
+    is_modified = False
+    if MODIFIED_PREFIX in date_str:
+        is_modified = True
+        date_str = date_str.replace(MODIFIED_PREFIX, "").strip()
+
+    if "전" not in date_str:
+        return 0, is_modified
+
+    match = _NUMBER_PATTERN.search(date_str)
+    num = int(match.group()) if match else 1
+    lowered = date_str.lower()
+    for korean, english, days in _UNITS:
+        if korean in date_str or english in lowered:
+            return num * days, is_modified
+    return 0, is_modified
+
+
+def normalize_relative_dates(values: pa.Array, reference_time: datetime) -> Tuple[pa.Array, pa.Array]:
+    """
+    날짜 문자열 열 전체를 추정 날짜/수정 여부 열로 변환
+
+    서로 다른 문자열만 parse_relative_offset으로 변환한 뒤 사전 인코딩 인덱스로 펼치므로,
+    리뷰 수와 관계없이 문자열 처리는 고유 값 개수만큼만 수행합니다.
+
+    Args:
+        values: 날짜 문자열 배열 (string 또는 dictionary<string>, null 허용)
+        reference_time: 실행 단위 기준 시각
+
+    Returns:
+        (추정 날짜 timestamp[us] 배열, 수정 여부 bool 배열)
+    """
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    encoded = values if pa.types.is_dictionary(values.type) else values.dictionary_encode()
+
+    offsets = [parse_relative_offset(value) for value in encoded.dictionary.to_pylist()]
+    days_by_code = np.array([days for days, _ in offsets] + [0], dtype=np.int64)
+    modified_by_code = np.array([modified for _, modified in offsets] + [False], dtype=bool)
+
+    # null은 마지막 자리(기준 시각, 수정 아님)로 보냄
+    codes = encoded.indices.fill_null(len(offsets)).to_numpy(zero_copy_only=False)
+    reference_us = np.datetime64(reference_time, 'us').astype(np.int64)
+    estimated_us = reference_us - days_by_code[codes] * MICROSECONDS_PER_DAY
+
+    estimated = pa.array(estimated_us.astype('datetime64[us]'), type=pa.timestamp('us'))
+    modified = pa.array(modified_by_code[codes], type=pa.bool_())
+    return estimated, modified
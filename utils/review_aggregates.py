@@ -0,0 +1,630 @@
+"""
+review_aggregates.py
+리뷰 분석 리포트에 필요한 집계를 레코드 배치 단위로 한 번에 계산 (analyze_parquet_reviews.py의 리포트 엔진)
+
+- 리포트 섹션을 먼저 선언하면 필요한 열과 집계만 정해지고, 리뷰 데이터는 한 번만 훑습니다.
+- 모든 집계는 개수/합계 기반이라 배치 순서대로 update() 하거나 부분 결과를 merge() 해도 같은 값이 됩니다.
+- 범주 값(언어, 레스토랑 이름 등)은 pandas가 Parquet을 읽을 때와 같은 순서(배치별 사전을 처음 등장한 순서로 합침)로
+  기록하므로, 동률 정렬 순서까지 pandas로 계산한 리포트와 같습니다.
+
+- ReviewAggregates.from_duckdb()는 같은 집계를 DuckDB SQL(GROUP BY)로 계산합니다 (선택 의존성 duckdb).
+  범주 순서는 Parquet 사전에서 가져오므로 두 방식의 리포트 출력이 같습니다.
+- ReviewAggregates.from_summaries()는 변환기가 만든 요약 테이블(review_summaries.py)에서 같은 집계를 만듭니다.
+  리뷰 원본을 읽지 않으므로 리포트가 밀리초 단위로 준비됩니다 ('search' 섹션 제외).
+- sketch=True(메모리보다 큰 데이터용)면 집계 크기가 리뷰 수/값 종류와 관계없이 일정합니다. 개수/평균/최솟값/최댓값은
+  그대로 정확하고, 리뷰 길이 중앙값은 t-digest(sketches.py) 근사값이며, 레스토랑별 분포는
+  tracked_restaurant_ids로 지정한 레스토랑(리포트에 나올 상위 레스토랑)만 집계합니다.
+
+사용 예:
+    aggregates = ReviewAggregates(sections=('basic', 'grid'))
+    for batch in pq.ParquetFile("reviews.parquet").iter_batches(columns=aggregates.columns):
+        aggregates.update(batch)
+    aggregates.language_counts  # {'en': 120000, 'ko': 30000, ...}
+
+    aggregates = ReviewAggregates.from_duckdb("reviews.parquet", sections=('basic', 'grid'))
+"""
+
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from utils.sketches import TDigest
+
+# 리포트 섹션 -> 필요한 리뷰 열
+SECTION_COLUMNS = {
+    'basic': ('language', 'rating', 'text_length'),
+    'top_restaurants': ('restaurant_id', 'language', 'rating'),
+    'grid': ('grid', 'language'),
+    'korean': ('restaurant_name', 'language', 'rating'),
+    'search': ('restaurant_id', 'rating', 'text'),
+}
+REPORT_SECTIONS = tuple(SECTION_COLUMNS)
+SUMMARY_SECTIONS = ('basic', 'top_restaurants', 'grid', 'korean')  # 요약 테이블로 만들 수 있는 섹션
+
+KOREAN = 'ko'
+
+# 리포트 섹션 -> 섹션 전용 집계에 필요한 행 조건 (열, 값). 섹션만 따로 계산할 때 조건에 맞는 행만 읽어도 됨
+# (전체 리뷰 수와 언어/평점 분포는 TOTAL_COLUMNS만 따로 전체 행에서 읽어 update_totals()로 반영)
+SECTION_FILTERS = {
+    'korean': ('language', KOREAN),
+}
+TOTAL_COLUMNS = ('language', 'rating')
+
+RATING_VALUES = tuple(range(6))  # 리뷰 평점 값 (0은 평점을 남기지 않은 리뷰)
+
+
+def dictionary_codes(column, categories: Dict[str, int],
+                     cache: Optional[Dict] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    사전 인코딩(또는 문자열) 열을 전체 범주 번호로 변환
+
+    배치의 사전 값을 순서대로 categories에 추가하므로 (pyarrow의 사전 통합과 같은 순서),
+    여러 배치를 거친 뒤 categories의 삽입 순서가 pandas category 순서와 같아짐
+
+    Args:
+        cache: 직전 배치의 (사전, 번호 변환표)를 기억할 딕셔너리. 같은 row group의 배치는 사전이 같으므로
+               레스토랑 ID처럼 사전이 큰 열도 사전을 한 번만 변환함
+
+    Returns:
+        (행별 전체 범주 번호 배열 (null은 -1), null이 아닌 행 마스크)
+    """
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    if not pa.types.is_dictionary(column.type):
+        column = column.dictionary_encode()
+    dictionary = column.dictionary
+    if cache is not None and cache.get('dictionary') is not None and cache['dictionary'].equals(dictionary):
+        mapping = cache['mapping']
+    else:
+        mapping = np.array([categories.setdefault(value, len(categories))
+                            for value in dictionary.to_pylist()] + [-1], dtype=np.int64)
+        if cache is not None:
+            cache.update(dictionary=dictionary, mapping=mapping)
+    local = column.indices.fill_null(len(mapping) - 1).to_numpy(zero_copy_only=False)
+    codes = mapping[local]
+    return codes, codes >= 0
+
+
+def _add_counts(target: Dict, keys: np.ndarray):
+    """정수 키 배열의 값별 개수를 target 딕셔너리에 누적"""
+    if len(keys) == 0:
+        return
+    values, counts = np.unique(keys, return_counts=True)
+    for value, count in zip(values.tolist(), counts.tolist()):
+        target[value] = target.get(value, 0) + count
+
+
+def _add_weighted(target: Dict, keys: np.ndarray, weights: np.ndarray):
+    """정수 키 배열의 값별 가중치(개수) 합을 target 딕셔너리에 누적 (가중치가 0인 키는 건너뜀)"""
+    keep = weights > 0
+    if not keep.any():
+        return
+    values, inverse = np.unique(keys[keep], return_inverse=True)
+    sums = np.bincount(inverse, weights=weights[keep]).astype(np.int64)
+    for value, count in zip(values.tolist(), sums.tolist()):
+        target[value] = target.get(value, 0) + count
+
+
+class ReviewAggregates:
+    """선언한 리포트 섹션에 필요한 리뷰 집계 (배치 단위 누적, 병합 가능)"""
+
+    def __init__(self, sections: Sequence[str] = REPORT_SECTIONS,
+                 sample_restaurant_ids: Iterable[str] = (), samples_per_restaurant: int = 2,
+                 sketch: bool = False, tracked_restaurant_ids: Optional[Iterable[str]] = None):
+        """
+        Args:
+            sections: 계산할 리포트 섹션 ('basic', 'top_restaurants', 'grid', 'korean', 'search')
+            sample_restaurant_ids: 'search' 섹션에서 샘플 리뷰를 모을 레스토랑 ID
+            samples_per_restaurant: 레스토랑별 샘플 리뷰 수 (파일 순서로 앞에서부터)
+            sketch: 리뷰 길이를 히스토그램 대신 개수/합계/최솟값/최댓값 + t-digest로 집계할지 여부
+                    (크기가 일정, 중앙값은 근사값)
+            tracked_restaurant_ids: 'top_restaurants' 섹션에서 언어/평점 분포를 집계할 레스토랑 ID
+                                    (기본값 None: 전체 레스토랑)
+        """
+        unknown = set(sections) - set(SECTION_COLUMNS)
+        if unknown:
+            raise ValueError(f"알 수 없는 리포트 섹션: {', '.join(sorted(unknown))}")
+        self.sections = tuple(sections)
+        self.samples_per_restaurant = samples_per_restaurant
+        self.sample_restaurant_ids = set(sample_restaurant_ids)
+        self.sketch = sketch
+        self.tracked_restaurant_ids = set(tracked_restaurant_ids) if tracked_restaurant_ids is not None else None
+
+        # 범주 값 -> 전체 범주 번호 (삽입 순서 = pandas category 순서)
+        self.languages: Dict[str, int] = {}
+        self.restaurant_ids: Dict[str, int] = {}
+        self.restaurant_names: Dict[str, int] = {}
+        self.grids: Dict[str, int] = {}
+
+        self.total_reviews = 0
+        self._language = {}          # 언어 번호 -> 리뷰 수
+        self._rating = {}            # 평점 -> 리뷰 수
+        self._text_length = {}       # 리뷰 길이 -> 리뷰 수 (sketch 모드에서는 비어 있음)
+        self._text_length_stats = [0, 0, None, None]  # sketch 모드의 리뷰 길이 [개수, 합계, 최솟값, 최댓값]
+        self.text_length_digest = TDigest() if sketch else None
+        self._restaurant_language = {}  # (레스토랑 번호 << 16 | 언어 번호) -> 리뷰 수
+        self._restaurant_rating = {}    # (레스토랑 번호 << 8 | 평점 + 128) -> 리뷰 수
+        self._grid = {}              # grid 번호 -> 리뷰 수
+        self._grid_korean = {}       # grid 번호 -> 한국어 리뷰 수
+        self._name_korean = {}       # 레스토랑 이름 번호 -> 한국어 리뷰 수
+        self._korean_rating = {}     # 한국어 리뷰 평점 -> 리뷰 수
+        self.samples: Dict[str, List[Dict]] = defaultdict(list)  # 레스토랑 ID -> [{'rating', 'text'}]
+        self._mapping_cache = defaultdict(dict)  # 열 이름 -> 직전 배치의 사전 변환표 (dictionary_codes)
+        self._tracked_codes = None   # 추적할 레스토랑 번호 배열 (tracked_restaurant_ids가 있을 때)
+        if self.tracked_restaurant_ids is not None:
+            self._tracked_codes = np.array([self.restaurant_ids.setdefault(rid, len(self.restaurant_ids))
+                                            for rid in sorted(self.tracked_restaurant_ids)], dtype=np.int64)
+
+    @property
+    def columns(self) -> List[str]:
+        """선언한 섹션에 필요한 리뷰 열 (읽을 때 열 선택에 사용)"""
+        needed = []
+        for section in self.sections:
+            for column in SECTION_COLUMNS[section]:
+                if column not in needed:
+                    needed.append(column)
+        return needed
+
+    def update(self, batch, totals: bool = True):
+        """
+        레코드 배치(또는 테이블) 하나를 집계에 반영
+
+        Args:
+            batch: 리뷰 레코드 배치 (self.columns 열 포함)
+            totals: False면 전체 리뷰 수와 언어/평점 분포는 건너뜀 (SECTION_FILTERS 조건으로 거른 배치를
+                    반영할 때 사용하며, 이 값들은 update_totals()로 따로 반영)
+        """
+        sections = self.sections
+        if totals:
+            self.total_reviews += batch.num_rows
+        if batch.num_rows == 0:
+            return
+
+        language = is_korean = None
+        if 'language' in batch.schema.names:
+            language, has_language = dictionary_codes(batch['language'], self.languages,
+                                                      self._mapping_cache['language'])
+            is_korean = language == self.languages.get(KOREAN, -2)
+        rating = None
+        if 'rating' in batch.schema.names:
+            rating_array = batch['rating']
+            rating = rating_array.to_numpy(zero_copy_only=False).astype(np.int64)
+            has_rating = ~np.asarray(rating_array.is_null(), dtype=bool)
+
+        if totals and ('basic' in sections or 'korean' in sections):
+            _add_counts(self._language, language[has_language])
+            _add_counts(self._rating, rating[has_rating])
+        if 'basic' in sections:
+            lengths = batch['text_length']
+            length_values = lengths.to_numpy(zero_copy_only=False)
+            length_values = length_values[~np.asarray(lengths.is_null(), dtype=bool)].astype(np.int64)
+            if self.sketch:
+                self._add_length_stats(len(length_values), int(length_values.sum()),
+                                       *((int(length_values.min()), int(length_values.max()))
+                                         if len(length_values) else (None, None)))
+                self.text_length_digest.update(length_values)
+            else:
+                _add_counts(self._text_length, length_values)
+
+        if 'top_restaurants' in sections or 'search' in sections:
+            restaurant, has_restaurant = dictionary_codes(batch['restaurant_id'], self.restaurant_ids,
+                                                          self._mapping_cache['restaurant_id'])
+        if 'top_restaurants' in sections:
+            if self._tracked_codes is not None:
+                has_restaurant = has_restaurant & np.isin(restaurant, self._tracked_codes)
+            valid = has_restaurant & has_language
+            _add_counts(self._restaurant_language, (restaurant[valid] << 16) | language[valid])
+            valid = has_restaurant & has_rating
+            _add_counts(self._restaurant_rating, (restaurant[valid] << 8) | (rating[valid] + 128))
+
+        if 'grid' in sections:
+            grid, has_grid = dictionary_codes(batch['grid'], self.grids, self._mapping_cache['grid'])
+            _add_counts(self._grid, grid[has_grid])
+            _add_counts(self._grid_korean, grid[has_grid & is_korean])
+
+        if 'korean' in sections:
+            name, has_name = dictionary_codes(batch['restaurant_name'], self.restaurant_names,
+                                              self._mapping_cache['restaurant_name'])
+            _add_counts(self._name_korean, name[has_name & is_korean])
+            _add_counts(self._korean_rating, rating[is_korean & has_rating])
+
+        if 'search' in sections and self.sample_restaurant_ids:
+            self._collect_samples(batch, restaurant)
+
+    def update_totals(self, batch):
+        """
+        전체 리뷰 수와 언어/평점 분포만 반영 (TOTAL_COLUMNS 열만 있는 배치, 거르지 않은 전체 행)
+
+        Args:
+            batch: 리뷰 레코드 배치
+        """
+        self.total_reviews += batch.num_rows
+        if batch.num_rows == 0:
+            return
+        language, has_language = dictionary_codes(batch['language'], self.languages,
+                                                  self._mapping_cache['language'])
+        _add_counts(self._language, language[has_language])
+        rating_array = batch['rating']
+        rating = rating_array.to_numpy(zero_copy_only=False).astype(np.int64)
+        _add_counts(self._rating, rating[~np.asarray(rating_array.is_null(), dtype=bool)])
+
+    def _add_length_stats(self, count: int, total: int, minimum: Optional[int], maximum: Optional[int]):
+        """sketch 모드의 리뷰 길이 개수/합계/최솟값/최댓값 누적"""
+        stats = self._text_length_stats
+        stats[0] += count
+        stats[1] += total
+        if minimum is not None:
+            stats[2] = minimum if stats[2] is None else min(stats[2], minimum)
+            stats[3] = maximum if stats[3] is None else max(stats[3], maximum)
+
+    def tracks(self, restaurant_ids: Iterable[str]) -> bool:
+        """레스토랑들의 언어/평점 분포를 집계하고 있는지 여부"""
+        return self.tracked_restaurant_ids is None or set(restaurant_ids) <= self.tracked_restaurant_ids
+
+    def _collect_samples(self, batch, restaurant: np.ndarray):
+        """샘플 대상 레스토랑의 리뷰를 파일 순서대로 레스토랑별 최대 samples_per_restaurant개까지 수집"""
+        names = {self.restaurant_ids[rid]: rid for rid in self.sample_restaurant_ids
+                 if rid in self.restaurant_ids and len(self.samples[rid]) < self.samples_per_restaurant}
+        if not names:
+            return
+        positions = np.flatnonzero(np.isin(restaurant, list(names)))
+        if len(positions) == 0:
+            return
+        rows = batch.select(['rating', 'text']).take(pa.array(positions)).to_pylist()
+        for code, row in zip(restaurant[positions].tolist(), rows):
+            samples = self.samples[names[code]]
+            if len(samples) < self.samples_per_restaurant:
+                samples.append(row)
+
+    def merge(self, other: 'ReviewAggregates') -> 'ReviewAggregates':
+        """
+        다른 부분 집계를 이어 붙임 (other가 self 다음 데이터를 집계한 것으로 간주)
+
+        Returns:
+            self
+        """
+        if self.sketch != other.sketch:
+            raise ValueError("sketch 모드가 다른 집계는 합칠 수 없습니다.")
+        if other.tracked_restaurant_ids is not None:
+            # 양쪽 모두 집계한 레스토랑만 분포가 완전함
+            tracked = other.tracked_restaurant_ids
+            if self.tracked_restaurant_ids is not None:
+                tracked = tracked & self.tracked_restaurant_ids
+            self.tracked_restaurant_ids = tracked
+            self._tracked_codes = np.array([self.restaurant_ids.setdefault(rid, len(self.restaurant_ids))
+                                            for rid in sorted(tracked)], dtype=np.int64)
+        remaps = {}
+        for attribute in ('languages', 'restaurant_ids', 'restaurant_names', 'grids'):
+            mine = getattr(self, attribute)
+            remaps[attribute] = {code: mine.setdefault(value, len(mine))
+                                 for value, code in getattr(other, attribute).items()}
+
+        def merge_counts(name, key_map=lambda key: key):
+            target = getattr(self, name)
+            for key, count in getattr(other, name).items():
+                key = key_map(key)
+                target[key] = target.get(key, 0) + count
+
+        language_map = remaps['languages']
+        restaurant_map = remaps['restaurant_ids']
+        merge_counts('_language', language_map.get)
+        merge_counts('_rating')
+        merge_counts('_text_length')
+        if self.sketch:
+            self._add_length_stats(*other._text_length_stats)
+            self.text_length_digest.merge(other.text_length_digest)
+        merge_counts('_restaurant_language',
+                     lambda key: (restaurant_map[key >> 16] << 16) | language_map[key & 0xFFFF])
+        merge_counts('_restaurant_rating', lambda key: (restaurant_map[key >> 8] << 8) | (key & 0xFF))
+        merge_counts('_grid', remaps['grids'].get)
+        merge_counts('_grid_korean', remaps['grids'].get)
+        merge_counts('_name_korean', remaps['restaurant_names'].get)
+        merge_counts('_korean_rating')
+        for rid, rows in other.samples.items():
+            samples = self.samples[rid]
+            samples.extend(rows[:max(0, self.samples_per_restaurant - len(samples))])
+        self.total_reviews += other.total_reviews
+        return self
+
+    @classmethod
+    def from_duckdb(cls, source, sections: Sequence[str] = REPORT_SECTIONS,
+                    sample_restaurant_ids: Iterable[str] = (), samples_per_restaurant: int = 2,
+                    connection=None) -> 'ReviewAggregates':
+        """
+        같은 집계를 DuckDB SQL로 계산 (Parquet 파일을 직접 쿼리, 멀티스레드 벡터화 실행)
+
+        개수는 모두 GROUP BY로 계산하고, 동률 정렬에 쓰이는 범주 순서(언어, 레스토랑 이름)만
+        pyarrow로 해당 열의 사전을 읽어 정하므로 update()로 만든 집계와 결과가 같음
+
+        Args:
+            source: reviews.parquet 경로 또는 하이브 파티션 데이터셋 디렉토리
+            sections: 계산할 리포트 섹션
+            sample_restaurant_ids: 'search' 섹션에서 샘플 리뷰를 모을 레스토랑 ID
+            samples_per_restaurant: 레스토랑별 샘플 리뷰 수 (파일 순서로 앞에서부터)
+            connection: 사용할 DuckDB 연결 (기본값: 새 메모리 연결)
+
+        Returns:
+            ReviewAggregates
+        """
+        try:
+            import duckdb  # 선택 의존성 (임포트 비용이 커서 DuckDB 엔진을 쓸 때만 읽음)
+        except ImportError:
+            raise ImportError("DuckDB 엔진을 사용하려면 duckdb 패키지가 필요합니다 (pip install duckdb).") from None
+        aggregates = cls(sections, sample_restaurant_ids, samples_per_restaurant)
+        sections = aggregates.sections
+        source = Path(source)
+        connection = connection or duckdb.connect()
+
+        path = str(source / '**' / '*.parquet') if source.is_dir() else str(source)
+        reviews = (f"read_parquet('{path.replace(chr(39), chr(39) * 2)}', hive_partitioning = {source.is_dir()}, "
+                   f"filename = true, file_row_number = true)")
+
+        def query(sql: str) -> List[Tuple]:
+            return connection.execute(sql.format(reviews=reviews)).fetchall()
+
+        # 범주 순서 (pandas category 순서와 같게 Parquet 사전 순서를 따름)
+        category_columns = []
+        if set(sections) & {'basic', 'top_restaurants', 'korean'}:
+            category_columns.append(('language', aggregates.languages))
+        if 'korean' in sections:
+            category_columns.append(('restaurant_name', aggregates.restaurant_names))
+        if category_columns:
+            import pyarrow.dataset as ds
+
+            dataset = ds.dataset(source, format='parquet', partitioning='hive' if source.is_dir() else None)
+            for column, categories in category_columns:
+                cache = {}
+                for batch in dataset.to_batches(columns=[column]):
+                    dictionary_codes(batch[column], categories, cache)
+
+        languages, restaurants = aggregates.languages, aggregates.restaurant_ids
+        aggregates.total_reviews = query("SELECT count(*) FROM {reviews}")[0][0]
+        if 'basic' in sections or 'korean' in sections:
+            for language, count in query("SELECT language, count(*) FROM {reviews} "
+                                         "WHERE language IS NOT NULL GROUP BY language"):
+                aggregates._language[languages.setdefault(language, len(languages))] = count
+            aggregates._rating.update(query("SELECT rating, count(*) FROM {reviews} "
+                                            "WHERE rating IS NOT NULL GROUP BY rating"))
+        if 'basic' in sections:
+            aggregates._text_length.update(query("SELECT text_length, count(*) FROM {reviews} "
+                                                 "WHERE text_length IS NOT NULL GROUP BY text_length"))
+
+        if 'top_restaurants' in sections:
+            for restaurant_id, language, count in query(
+                    "SELECT restaurant_id, language, count(*) FROM {reviews} "
+                    "WHERE restaurant_id IS NOT NULL AND language IS NOT NULL GROUP BY ALL"):
+                key = (restaurants.setdefault(restaurant_id, len(restaurants)) << 16) \
+                    | languages.setdefault(language, len(languages))
+                aggregates._restaurant_language[key] = count
+            for restaurant_id, rating, count in query(
+                    "SELECT restaurant_id, rating, count(*) FROM {reviews} "
+                    "WHERE restaurant_id IS NOT NULL AND rating IS NOT NULL GROUP BY ALL"):
+                key = (restaurants.setdefault(restaurant_id, len(restaurants)) << 8) | (rating + 128)
+                aggregates._restaurant_rating[key] = count
+
+        if 'grid' in sections:
+            grids = aggregates.grids
+            for grid, count, korean_count in query(
+                    f"SELECT grid, count(*), count(*) FILTER (WHERE language = '{KOREAN}') FROM {{reviews}} "
+                    "WHERE grid IS NOT NULL GROUP BY grid"):
+                code = grids.setdefault(grid, len(grids))
+                aggregates._grid[code] = count
+                if korean_count:
+                    aggregates._grid_korean[code] = korean_count
+
+        if 'korean' in sections:
+            names = aggregates.restaurant_names
+            for name, count in query(f"SELECT restaurant_name, count(*) FROM {{reviews}} "
+                                     f"WHERE language = '{KOREAN}' AND restaurant_name IS NOT NULL GROUP BY ALL"):
+                aggregates._name_korean[names.setdefault(name, len(names))] = count
+            aggregates._korean_rating.update(query(f"SELECT rating, count(*) FROM {{reviews}} "
+                                                   f"WHERE language = '{KOREAN}' AND rating IS NOT NULL GROUP BY ALL"))
+
+        if 'search' in sections and aggregates.sample_restaurant_ids:
+            wanted = sorted(aggregates.sample_restaurant_ids)
+            rows = connection.execute(
+                "SELECT restaurant_id, rating, text FROM ("
+                "  SELECT restaurant_id, rating, text, filename, file_row_number, row_number() OVER ("
+                "    PARTITION BY restaurant_id ORDER BY filename, file_row_number) AS sample_rank"
+                "  FROM {reviews} WHERE restaurant_id IN (SELECT unnest(?))"
+                ") WHERE sample_rank <= ? ORDER BY filename, file_row_number".format(reviews=reviews),
+                [wanted, samples_per_restaurant]).fetchall()
+            for restaurant_id, rating, text in rows:
+                restaurants.setdefault(restaurant_id, len(restaurants))
+                aggregates.samples[restaurant_id].append({'rating': rating, 'text': text})
+        return aggregates
+
+    @classmethod
+    def from_summaries(cls, restaurant_stats: pa.Table, language_stats: pa.Table,
+                       sections: Sequence[str] = SUMMARY_SECTIONS) -> 'ReviewAggregates':
+        """
+        요약 테이블(restaurant_stats, language_stats)에서 같은 집계 생성 (리뷰 원본을 읽지 않음)
+
+        요약 테이블의 language, restaurant_name 열은 리뷰 데이터의 범주 순서를 가진 사전 열이므로
+        동률 정렬 순서까지 update()로 만든 집계와 같음
+
+        Args:
+            restaurant_stats: 원본 파일(레스토랑)별 리뷰 수/평점 히스토그램/리뷰 길이 히스토그램
+            language_stats: 원본 파일 x 언어별 리뷰 수/평점 히스토그램
+            sections: 만들 리포트 섹션 (SUMMARY_SECTIONS 중에서)
+
+        Returns:
+            ReviewAggregates
+        """
+        unsupported = set(sections) - set(SUMMARY_SECTIONS)
+        if unsupported:
+            raise ValueError(f"요약 테이블로 만들 수 없는 리포트 섹션: {', '.join(sorted(unsupported))}")
+        aggregates = cls(sections)
+        sections = aggregates.sections
+
+        def counts(table: pa.Table, column: str) -> np.ndarray:
+            return table[column].to_numpy(zero_copy_only=False).astype(np.int64)
+
+        language, has_language = dictionary_codes(language_stats['language'], aggregates.languages)
+        is_korean = language == aggregates.languages.get(KOREAN, -2)
+        language_reviews = counts(language_stats, 'review_count')
+        aggregates.total_reviews = int(counts(restaurant_stats, 'review_count').sum())
+
+        if 'basic' in sections or 'korean' in sections:
+            _add_weighted(aggregates._language, language[has_language], language_reviews[has_language])
+            for value in RATING_VALUES:
+                total = int(counts(restaurant_stats, f'rating_{value}').sum())
+                if total:
+                    aggregates._rating[value] = total
+        if 'basic' in sections:
+            lengths = restaurant_stats['text_lengths'].combine_chunks().flatten()
+            length_counts = restaurant_stats['text_length_counts'].combine_chunks().flatten()
+            _add_weighted(aggregates._text_length, lengths.to_numpy(zero_copy_only=False).astype(np.int64),
+                          length_counts.to_numpy(zero_copy_only=False).astype(np.int64))
+
+        if 'top_restaurants' in sections:
+            restaurant, has_restaurant = dictionary_codes(language_stats['restaurant_id'], aggregates.restaurant_ids)
+            valid = has_restaurant & has_language
+            _add_weighted(aggregates._restaurant_language, (restaurant[valid] << 16) | language[valid],
+                          language_reviews[valid])
+            restaurant, has_restaurant = dictionary_codes(restaurant_stats['restaurant_id'], aggregates.restaurant_ids)
+            for value in RATING_VALUES:
+                _add_weighted(aggregates._restaurant_rating, (restaurant[has_restaurant] << 8) | (value + 128),
+                              counts(restaurant_stats, f'rating_{value}')[has_restaurant])
+
+        if 'grid' in sections:
+            grid, has_grid = dictionary_codes(language_stats['grid'], aggregates.grids)
+            _add_weighted(aggregates._grid, grid[has_grid], language_reviews[has_grid])
+            _add_weighted(aggregates._grid_korean, grid[has_grid & is_korean], language_reviews[has_grid & is_korean])
+
+        if 'korean' in sections:
+            # 이름 범주 순서는 restaurant_stats의 사전 (리뷰가 없는 레스토랑 이름은 사전 끝에 있음)
+            dictionary_codes(restaurant_stats['restaurant_name'], aggregates.restaurant_names)
+            name, has_name = dictionary_codes(language_stats['restaurant_name'], aggregates.restaurant_names)
+            _add_weighted(aggregates._name_korean, name[has_name & is_korean], language_reviews[has_name & is_korean])
+            for value in RATING_VALUES:
+                total = int(counts(language_stats, f'rating_{value}')[is_korean].sum())
+                if total:
+                    aggregates._korean_rating[value] = total
+        return aggregates
+
+    # ---- 집계 결과 ----
+
+    @staticmethod
+    def _ordered(categories: Dict[str, int], counts: Dict[int, int]) -> Dict[str, int]:
+        """범주 순서(0개 포함)대로 값 -> 개수"""
+        return {value: counts.get(code, 0) for value, code in categories.items()}
+
+    @property
+    def language_counts(self) -> Dict[str, int]:
+        """언어 -> 리뷰 수 (범주 순서, 0개 포함)"""
+        return self._ordered(self.languages, self._language)
+
+    @property
+    def rating_counts(self) -> Dict[int, int]:
+        """평점 -> 리뷰 수 (평점 오름차순)"""
+        return dict(sorted(self._rating.items()))
+
+    @property
+    def text_length_counts(self) -> Dict[int, int]:
+        """리뷰 길이 -> 리뷰 수 (길이 오름차순, sketch 모드에서는 text_length_stats() 사용)"""
+        if self.sketch:
+            raise ValueError("sketch 모드에서는 리뷰 길이 히스토그램이 없습니다 (text_length_stats() 사용).")
+        return dict(sorted(self._text_length.items()))
+
+    def text_length_stats(self) -> Dict[str, float]:
+        """
+        리뷰 길이 통계 (개수, 평균, 최솟값, 최댓값, 중앙값)
+
+        sketch 모드에서도 개수/평균/최솟값/최댓값은 정확하고, 중앙값만 t-digest 근사값
+
+        Returns:
+            {'count', 'mean', 'min', 'max', 'median'} (리뷰가 없으면 개수 외에는 nan)
+        """
+        if not self.sketch:
+            lengths = self.text_length_counts
+            return {'count': sum(lengths.values()), 'mean': histogram_mean(lengths),
+                    'min': min(lengths) if lengths else float('nan'),
+                    'max': max(lengths) if lengths else float('nan'),
+                    'median': histogram_median(lengths)}
+        count, total, minimum, maximum = self._text_length_stats
+        if count == 0:
+            return {'count': 0, 'mean': float('nan'), 'min': float('nan'), 'max': float('nan'),
+                    'median': float('nan')}
+        return {'count': count, 'mean': total / count, 'min': minimum, 'max': maximum,
+                'median': self.text_length_digest.quantile(0.5)}
+
+    def _check_tracked(self, restaurant_id: str):
+        """분포를 집계하지 않은 레스토랑이면 KeyError (0개로 잘못 출력하지 않도록)"""
+        if not self.tracks((restaurant_id,)):
+            raise KeyError(f"언어/평점 분포를 집계하지 않은 레스토랑입니다: {restaurant_id}")
+
+    def restaurant_language_counts(self, restaurant_id: str) -> Dict[str, int]:
+        """레스토랑의 언어 -> 리뷰 수 (전체 언어 범주 순서, 0개 포함)"""
+        self._check_tracked(restaurant_id)
+        code = self.restaurant_ids.get(restaurant_id)
+        if code is None:
+            return {language: 0 for language in self.languages}
+        return {language: self._restaurant_language.get((code << 16) | language_code, 0)
+                for language, language_code in self.languages.items()}
+
+    def restaurant_rating_counts(self, restaurant_id: str) -> Dict[int, int]:
+        """레스토랑의 평점 -> 리뷰 수"""
+        self._check_tracked(restaurant_id)
+        code = self.restaurant_ids.get(restaurant_id)
+        if code is None:
+            return {}
+        return {(key & 0xFF) - 128: count for key, count in self._restaurant_rating.items() if key >> 8 == code}
+
+    def grid_counts(self) -> Dict[str, Tuple[int, int]]:
+        """grid -> (리뷰 수, 한국어 리뷰 수)"""
+        return {grid: (self._grid.get(code, 0), self._grid_korean.get(code, 0))
+                for grid, code in self.grids.items()}
+
+    @property
+    def korean_counts_by_name(self) -> Dict[str, int]:
+        """레스토랑 이름 -> 한국어 리뷰 수 (이름 범주 순서, 한국어 리뷰가 있는 이름만)"""
+        return {name: self._name_korean[code] for name, code in self.restaurant_names.items()
+                if code in self._name_korean}
+
+    @property
+    def korean_rating_counts(self) -> Dict[int, int]:
+        """한국어 리뷰의 평점 -> 리뷰 수"""
+        return dict(sorted(self._korean_rating.items()))
+
+    @property
+    def korean_reviews(self) -> int:
+        """한국어 리뷰 수"""
+        return self._language.get(self.languages.get(KOREAN), 0)
+
+
+def histogram_mean(counts: Dict[int, int]) -> float:
+    """값 -> 개수 히스토그램의 평균 (없으면 nan)"""
+    total = sum(counts.values())
+    if total == 0:
+        return float('nan')
+    return float(sum(value * count for value, count in counts.items())) / total
+
+
+def histogram_median(counts: Dict[int, int]) -> float:
+    """값 -> 개수 히스토그램(값 오름차순)의 중앙값 - 짝수 개면 가운데 두 값의 평균 (없으면 nan)"""
+    total = sum(counts.values())
+    if total == 0:
+        return float('nan')
+    middle = [(total - 1) // 2, total // 2]
+    found = []
+    seen = 0
+    for value, count in sorted(counts.items()):
+        while middle and middle[0] < seen + count:
+            found.append(value)
+            middle.pop(0)
+        seen += count
+    return (found[0] + found[1]) / 2
+
+
+def histogram_std(counts: Dict[int, int], ddof: int = 1) -> float:
+    """값 -> 개수 히스토그램의 표본 표준편차 (개수가 ddof 이하이면 nan)"""
+    total = sum(counts.values())
+    if total <= ddof:
+        return float('nan')
+    mean = histogram_mean(counts)
+    squares = sum(count * (mean - value) ** 2 for value, count in counts.items())
+    return float(np.sqrt(squares / (total - ddof)))
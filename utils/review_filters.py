@@ -0,0 +1,253 @@
+"""
+review_filters.py
+리뷰 추출 조건 (grid/자치구/티어, 언어, 평점/날짜/본문 길이 범위, 레스토랑 속성) -> pyarrow.dataset 필터 식
+
+- 조건은 모두 AND로 묶입니다. 목록 조건은 값 중 하나와 같으면, 범위 조건은 (최솟값, 최댓값) 양 끝을 포함하며
+  한쪽이 None이면 그쪽은 제한하지 않습니다.
+- 리뷰 열에 있는 조건(grid, language, rating, estimated_date, text_length)은 그대로 필터 식이 되어 Parquet 행 그룹
+  통계로 건너뛰기까지 푸시다운됩니다. 자치구/티어는 grid 목록으로, 레스토랑 속성(평점, 전체 리뷰 수)은
+  레스토랑 테이블에서 고른 restaurant_id 목록으로 바꿔 같은 식에 넣습니다.
+- 문자열 형식("grid=MN1,MN2 rating=4..5 date=2024-01-01..")으로도 만들 수 있습니다 (명령행/프리셋용).
+
+사용 예:
+    review_filter = ReviewFilter.parse("borough=MN language=ko rating=4.. text_length=100..")
+    expression = review_filter.expression(pq.read_table("restaurants.parquet"), load_tier_info())
+    ds.dataset("reviews.parquet").to_table(filter=expression)
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+# 문자열 형식의 키 -> ReviewFilter 인자 (목록 조건)
+LIST_KEYS = {
+    'grid': 'grids',
+    'borough': 'boroughs',
+    'tier': 'tiers',
+    'language': 'languages',
+    'restaurant_id': 'restaurant_ids',
+}
+
+# 문자열 형식의 키 -> (ReviewFilter 인자, 값 변환 함수) (범위 조건, "최솟값..최댓값")
+RANGE_KEYS = {
+    'rating': ('rating', float),
+    'date': ('dates', str),
+    'text_length': ('text_length', int),
+    'restaurant_rating': ('restaurant_rating', float),
+    'user_ratings_total': ('user_ratings_total', int),
+}
+
+Range = Tuple[Optional[float], Optional[float]]
+
+
+def _range_expression(field: ds.Expression, bounds: Range) -> Optional[ds.Expression]:
+    """(최솟값, 최댓값) 범위 식 (양 끝 포함, None인 쪽은 제한 없음)"""
+    low, high = bounds
+    conditions = []
+    if low is not None:
+        conditions.append(field >= low)
+    if high is not None:
+        conditions.append(field <= high)
+    return _and(conditions)
+
+
+def _string_values(values: Iterable[str]) -> pa.Array:
+    """isin()에 넘길 문자열 값 목록 (빈 목록도 string 타입이어야 0행으로 평가됨 - 그냥 []이면 null 타입 오류)"""
+    return pa.array(list(values), pa.string())
+
+
+def _and(conditions: Iterable[ds.Expression]) -> Optional[ds.Expression]:
+    """식을 모두 AND로 묶음 (없으면 None)"""
+    combined = None
+    for condition in conditions:
+        combined = condition if combined is None else combined & condition
+    return combined
+
+
+def _timestamp(value, end: bool = False) -> Optional[pa.Scalar]:
+    """
+    날짜 범위 끝 값을 estimated_date와 비교할 타임스탬프로 (문자열은 ISO 형식)
+
+    날짜만 주어진 종료일은 그날 전체를 포함하도록 다음 날 0시 직전으로 바꿈
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = date.fromisoformat(value) if len(value) == 10 else datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+        if end:
+            value += timedelta(days=1) - timedelta(microseconds=1)
+    return pa.scalar(value, pa.timestamp('us'))
+
+
+class ReviewFilter:
+    """리뷰 추출 조건 (모든 조건은 AND, 지정하지 않은 조건은 제한 없음)"""
+
+    def __init__(self, grids: Optional[Iterable[str]] = None, boroughs: Optional[Iterable[str]] = None,
+                 tiers: Optional[Iterable[str]] = None, languages: Optional[Iterable[str]] = None,
+                 rating: Optional[Range] = None, dates: Optional[Tuple] = None,
+                 text_length: Optional[Range] = None, restaurant_rating: Optional[Range] = None,
+                 user_ratings_total: Optional[Range] = None, restaurant_ids: Optional[Iterable[str]] = None):
+        """
+        Args:
+            grids: grid 코드 목록 (예: ['MN1', 'MN2'])
+            boroughs: 자치구 코드 목록 (예: ['MN', 'BK'])
+            tiers: grid 티어 목록 (grid_tier.csv, 예: ['HOT'])
+            languages: 리뷰 언어 목록 (예: ['ko', 'ja'])
+            rating: 리뷰 평점 범위 (예: (4, 5))
+            dates: 추정 날짜 범위 (date/datetime 또는 ISO 문자열, 날짜만 주면 종료일 포함)
+            text_length: 본문 길이 범위
+            restaurant_rating: 레스토랑 평균 평점 범위 (restaurants.parquet의 rating)
+            user_ratings_total: 레스토랑 전체 리뷰 수 범위
+            restaurant_ids: 레스토랑 ID 목록
+        """
+        self.grids = list(grids) if grids is not None else None
+        self.boroughs = list(boroughs) if boroughs is not None else None
+        self.tiers = list(tiers) if tiers is not None else None
+        self.languages = list(languages) if languages is not None else None
+        self.rating = rating
+        self.dates = dates
+        self.text_length = text_length
+        self.restaurant_rating = restaurant_rating
+        self.user_ratings_total = user_ratings_total
+        self.restaurant_ids = list(restaurant_ids) if restaurant_ids is not None else None
+
+    @classmethod
+    def parse(cls, text: str) -> 'ReviewFilter':
+        """
+        문자열 형식의 조건 ("키=값" 공백 구분)
+
+        목록 조건은 "grid=MN1,MN2", 범위 조건은 "rating=4..5", "date=2024-01-01..", "text_length=..50"
+        (값 하나만 주면 그 값과 같은 행)
+
+        Raises:
+            ValueError: 알 수 없는 키나 잘못된 값
+        """
+        options = {}
+        for token in text.split():
+            key, separator, value = token.partition('=')
+            if not separator or not value:
+                raise ValueError(f"조건은 키=값 형식이어야 합니다: {token}")
+            if key in LIST_KEYS:
+                options[LIST_KEYS[key]] = [item for item in value.split(',') if item]
+            elif key in RANGE_KEYS:
+                name, convert = RANGE_KEYS[key]
+                low, dots, high = value.partition('..')
+                if not dots:
+                    high = low
+                try:
+                    options[name] = (convert(low) if low else None, convert(high) if high else None)
+                except ValueError:
+                    raise ValueError(f"{key} 값이 올바르지 않습니다: {value}") from None
+            else:
+                raise ValueError(f"알 수 없는 조건: {key} (사용 가능: {', '.join([*LIST_KEYS, *RANGE_KEYS])})")
+        return cls(**options)
+
+    def __str__(self) -> str:
+        """parse()와 같은 문자열 형식"""
+        parts = []
+        for key, name in LIST_KEYS.items():
+            values = getattr(self, name)
+            if values is not None:
+                parts.append(f"{key}={','.join(values)}")
+        for key, (name, _) in RANGE_KEYS.items():
+            bounds = getattr(self, name)
+            if bounds is not None:
+                low, high = ('' if bound is None else str(bound) for bound in bounds)
+                parts.append(f"{key}={low}" if low == high else f"{key}={low}..{high}")
+        return ' '.join(parts)
+
+    def grid_codes(self, all_grids: Iterable[str], tier_info: Dict[str, str]) -> Optional[set]:
+        """
+        grid/자치구/티어 조건을 만족하는 grid 코드 집합 (세 조건 모두 없으면 None)
+
+        Args:
+            all_grids: 데이터에 있는 grid 코드 (자치구/티어 조건을 grid로 바꿀 때 사용)
+            tier_info: grid 코드 -> 티어 (grid_tier.csv)
+        """
+        if self.grids is None and self.boroughs is None and self.tiers is None:
+            return None
+        grids = set(all_grids) | set(self.grids or ())
+        if self.grids is not None:
+            grids &= set(self.grids)
+        if self.boroughs is not None:
+            grids = {grid for grid in grids if grid[:2] in self.boroughs}
+        if self.tiers is not None:
+            grids = {grid for grid in grids if tier_info.get(grid) in self.tiers}
+        return grids
+
+    def review_columns(self) -> List[str]:
+        """expression()이 참조하는 리뷰 열 (추출할 열만 읽을 때 조건 평가용으로 함께 읽음)"""
+        columns = []
+        if self.grids is not None or self.boroughs is not None or self.tiers is not None:
+            columns.append('grid')
+        for name, column in (('languages', 'language'), ('rating', 'rating'), ('dates', 'estimated_date'),
+                             ('text_length', 'text_length')):
+            if getattr(self, name) is not None:
+                columns.append(column)
+        if self.restaurant_expression() is not None:
+            columns.append('restaurant_id')
+        return columns
+
+    def restaurant_expression(self) -> Optional[ds.Expression]:
+        """레스토랑 테이블(restaurants.parquet)에 적용할 레스토랑 속성 조건 (없으면 None)"""
+        conditions = []
+        if self.restaurant_rating is not None:
+            conditions.append(_range_expression(ds.field('rating'), self.restaurant_rating))
+        if self.user_ratings_total is not None:
+            conditions.append(_range_expression(ds.field('user_ratings_total'), self.user_ratings_total))
+        if self.restaurant_ids is not None:
+            conditions.append(ds.field('restaurant_id').isin(_string_values(self.restaurant_ids)))
+        return _and(condition for condition in conditions if condition is not None)
+
+    def expression(self, restaurants: Optional[pa.Table] = None,
+                   tier_info: Optional[Dict[str, str]] = None) -> Optional[ds.Expression]:
+        """
+        reviews.parquet에 적용할 pyarrow.dataset 필터 식
+
+        Args:
+            restaurants: 레스토랑 테이블 (restaurant_id, grid, rating, user_ratings_total 열) -
+                         자치구/티어/레스토랑 속성 조건을 쓸 때 필요
+            tier_info: grid 코드 -> 티어 (티어 조건을 쓸 때 필요)
+
+        Returns:
+            필터 식 (조건이 없으면 None - 전체 행)
+        """
+        conditions = []
+        all_grids = ()
+        if self.boroughs is not None or self.tiers is not None:
+            if restaurants is None:
+                raise ValueError("자치구/티어 조건에는 레스토랑 테이블이 필요합니다.")
+            all_grids = pc.unique(pc.cast(restaurants['grid'], pa.string())).drop_null().to_pylist()
+        grids = self.grid_codes(all_grids, tier_info or {})
+        if grids is not None:
+            conditions.append(ds.field('grid').isin(_string_values(sorted(grids))))
+        if self.languages is not None:
+            conditions.append(ds.field('language').isin(_string_values(self.languages)))
+        if self.rating is not None:
+            conditions.append(_range_expression(ds.field('rating'), self.rating))
+        if self.dates is not None:
+            start, end = self.dates
+            conditions.append(_range_expression(ds.field('estimated_date'),
+                                                (_timestamp(start), _timestamp(end, end=True))))
+        if self.text_length is not None:
+            conditions.append(_range_expression(ds.field('text_length'), self.text_length))
+
+        restaurant_condition = self.restaurant_expression()
+        if restaurant_condition is not None:
+            if restaurants is None:
+                raise ValueError("레스토랑 속성 조건에는 레스토랑 테이블이 필요합니다.")
+            selected = restaurants.filter(restaurant_condition)['restaurant_id']
+            conditions.append(ds.field('restaurant_id').isin(_string_values(pc.unique(selected).to_pylist())))
+        return _and(condition for condition in conditions if condition is not None)
+
+
+# export_filtered_data에서 이름으로 쓰는 조건
+FILTER_PRESETS = {
+    'high_rating': ReviewFilter(restaurant_rating=(4.5, None)),  # 평점 4.5 이상 레스토랑의 리뷰
+    'korean': ReviewFilter(languages=['ko']),                    # 한국어 리뷰
+}
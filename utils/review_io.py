@@ -0,0 +1,204 @@
+"""
+review_io.py
+리뷰 JSON 파일(reviews/<grid>/<grid>_<이름>_reviews.json) 디코딩 및 스키마 검증
+
+- 디코더는 msgspec -> orjson -> 표준 json 순으로 설치된 것을 사용합니다 (backend 인자로 지정 가능).
+- msgspec은 타입이 지정된 Struct로 디코딩과 검증을 한 번에 수행하고, orjson/json은 디코딩 후
+  열 단위로 한 번에 타입을 확인합니다. 두 방식의 결과와 허용 범위는 같습니다.
+- 형식이 잘못된 파일은 ReviewFileError를 발생시키며, 호출하는 쪽에서 실패 파일 목록(error_files)으로 보고합니다.
+
+사용 예:
+    reader = ReviewFileReader()
+    review_file = reader.read("reviews/MN1/MN1_ACRE_reviews.json")
+    review_file.restaurant['reviews_count'], review_file.reviews['text'][:3]
+"""
+
+import json
+from typing import Dict, List, NamedTuple, Optional, Union
+
+try:
+    import msgspec
+except ImportError:  # 선택 의존성
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+BACKENDS = ('msgspec', 'orjson', 'json')
+
+# 필드 종류: 'str'은 문자열 또는 null, 'number'는 정수/실수를 실수로 변환 (null 불가), 'int'는 정수로 변환
+# 레스토랑 필드 -> (종류, 기본값)
+RESTAURANT_FIELDS = {
+    'place_id': ('str', ''),
+    'name': ('str', ''),
+    'grid': ('str', ''),
+    'address': ('str', ''),
+    'rating': ('number', 0),
+    'user_ratings_total': ('int', 0),
+    'phone_number': ('str', ''),
+    'reviews_count': ('int', 0),
+}
+
+# 리뷰 필드 -> (종류, 기본값)
+REVIEW_FIELDS = {
+    'review_id': ('str', ''),
+    'date': ('str', ''),
+    'language': ('str', ''),
+    'rating': ('number', 0),
+    'text': ('str', ''),
+}
+
+_ALLOWED_TYPES = {
+    'str': {str, type(None)},
+    'number': {int, float},
+    'int': {int, float},
+}
+
+
+class ReviewFileError(ValueError):
+    """리뷰 파일의 JSON 문법 또는 스키마가 잘못된 경우"""
+
+
+class ReviewFile(NamedTuple):
+    """디코딩한 리뷰 파일: 레스토랑 필드와 리뷰 필드별 값 리스트 (리뷰 순서 유지)"""
+    restaurant: Dict
+    reviews: Dict[str, List]
+
+
+if msgspec is not None:
+    class _ReviewRecord(msgspec.Struct):
+        review_id: Optional[str] = ''
+        date: Optional[str] = ''
+        language: Optional[str] = ''
+        rating: float = 0
+        text: Optional[str] = ''
+
+    class _RestaurantReviews(msgspec.Struct):
+        place_id: Optional[str] = ''
+        name: Optional[str] = ''
+        grid: Optional[str] = ''
+        address: Optional[str] = ''
+        rating: float = 0
+        user_ratings_total: Union[int, float] = 0
+        phone_number: Optional[str] = ''
+        reviews_count: Union[int, float] = 0
+        reviews: List[_ReviewRecord] = []
+
+
+def available_backends() -> List[str]:
+    """현재 환경에서 사용 가능한 디코더 목록 (빠른 순)"""
+    installed = {'msgspec': msgspec is not None, 'orjson': orjson is not None, 'json': True}
+    return [backend for backend in BACKENDS if installed[backend]]
+
+
+def default_backend() -> str:
+    """사용 가능한 가장 빠른 디코더"""
+    return available_backends()[0]
+
+
+def _check_column(values: List, kind: str, field: str) -> List:
+    """열 전체의 값 타입을 한 번에 확인하고, 'int'/'number' 종류는 정수/실수로 변환"""
+    unexpected = set(map(type, values)) - _ALLOWED_TYPES[kind]
+    if unexpected:
+        bad = next(value for value in values if type(value) in unexpected)
+        raise ReviewFileError(f"{field}: 잘못된 값 {bad!r}")
+    if kind == 'int':
+        return [int(value) for value in values]
+    if kind == 'number':
+        return [float(value) for value in values]
+    return values
+
+
+def _validate(data) -> ReviewFile:
+    """디코딩한 객체를 스키마로 검증하여 ReviewFile 생성 (orjson/json 백엔드)"""
+    if not isinstance(data, dict):
+        raise ReviewFileError("최상위 값이 객체가 아닙니다.")
+
+    restaurant = {}
+    for field, (kind, default) in RESTAURANT_FIELDS.items():
+        restaurant[field] = _check_column([data.get(field, default)], kind, field)[0]
+
+    records = data.get('reviews', [])
+    if not isinstance(records, list) or not all(type(record) is dict for record in records):
+        raise ReviewFileError("reviews: 리뷰 객체 배열이 아닙니다.")
+    reviews = {}
+    for field, (kind, default) in REVIEW_FIELDS.items():
+        reviews[field] = _check_column([record.get(field, default) for record in records],
+                                       kind, f"reviews.{field}")
+    return ReviewFile(restaurant, reviews)
+
+
+class ReviewFileReader:
+    """리뷰 JSON 파일 리더 (디코더는 생성 시 한 번 선택)"""
+
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Args:
+            backend: 'msgspec', 'orjson', 'json' 중 하나 (기본값: 사용 가능한 가장 빠른 디코더)
+        """
+        self.backend = backend or default_backend()
+        if self.backend not in available_backends():
+            raise ValueError(f"사용할 수 없는 디코더: {self.backend} (사용 가능: {', '.join(available_backends())})")
+        if self.backend == 'msgspec':
+            self._decoder = msgspec.json.Decoder(_RestaurantReviews)
+
+    def decode(self, raw: bytes) -> ReviewFile:
+        """
+        JSON 바이트를 디코딩하고 스키마 검증
+
+        Args:
+            raw: 파일 내용 (UTF-8)
+
+        Returns:
+            ReviewFile (restaurant: 레스토랑 필드, reviews: 리뷰 필드 -> 값 리스트)
+
+        Raises:
+            ReviewFileError: JSON 문법 오류 또는 스키마 불일치
+        """
+        if self.backend == 'msgspec':
+            try:
+                data = self._decoder.decode(raw)
+            except msgspec.DecodeError as e:  # ValidationError 포함
+                raise ReviewFileError(str(e)) from None
+            restaurant = {field: getattr(data, field) for field in RESTAURANT_FIELDS}
+            restaurant['user_ratings_total'] = int(restaurant['user_ratings_total'])
+            restaurant['reviews_count'] = int(restaurant['reviews_count'])
+            records = data.reviews
+            reviews = {field: [getattr(record, field) for record in records] for field in REVIEW_FIELDS}
+            return ReviewFile(restaurant, reviews)
+
+        try:
+            data = orjson.loads(raw) if self.backend == 'orjson' else json.loads(raw)
+        except ValueError as e:  # orjson.JSONDecodeError, json.JSONDecodeError, UnicodeDecodeError
+            raise ReviewFileError(f"JSON 디코딩 실패: {e}") from None
+        return _validate(data)
+
+    def read(self, file_path) -> ReviewFile:
+        """
+        리뷰 파일 읽기
+
+        Args:
+            file_path: 리뷰 JSON 파일 경로
+
+        Returns:
+            ReviewFile
+
+        Raises:
+            ReviewFileError: JSON 문법 오류 또는 스키마 불일치
+            OSError: 파일을 읽을 수 없는 경우
+        """
+        with open(file_path, 'rb') as f:
+            return self.decode(f.read())
+
+
+def load_json(file_path):
+    """리뷰 파일 외의 JSON 파일(레스토랑 목록 등)을 빠른 디코더로 읽기 (스키마 검증 없음)"""
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    if msgspec is not None:
+        return msgspec.json.decode(raw)
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
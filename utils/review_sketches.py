@@ -0,0 +1,312 @@
+"""
+review_sketches.py
+레스토랑/grid별 병합 가능한 스케치 테이블 (restaurant_sketches, grid_sketches) 생성 및 근사 질의
+
+- restaurant_sketches: 원본 JSON 파일(레스토랑-grid)마다 한 행. 리뷰 수, 평점 히스토그램(0~5점)과
+  고유 리뷰 수(review_id) / 언어 수 HyperLogLog, 리뷰 길이 t-digest (sketches.py, binary 열)
+- grid_sketches: grid마다 한 행 (restaurant_sketches 행을 합친 스케치)
+
+스케치는 합칠 수 있으므로 티어/자치구처럼 더 큰 묶음도 grid 스케치를 합쳐서 답합니다. 같은 레스토랑이 여러 grid에서
+수집되어 리뷰가 겹쳐도 HyperLogLog는 레지스터별 최댓값으로 합쳐지므로 고유 리뷰 수가 중복 없이 계산됩니다
+(리뷰 수 합계와 달리). 증분 변환에서는 요약 테이블과 같이 바뀐 파일의 행만 다시 계산하고 grid_sketches는
+남은 행에서 다시 만듭니다.
+
+- 서로 다른 값의 수(review_id, language)는 HyperLogLog 추정치이며 상대 표준오차는 약 1.6%입니다.
+  review_id가 없는 리뷰는 본문으로 구분합니다.
+- 리뷰 길이 분위수는 t-digest 근사값이며 중심점 크기로 정한 오차 범위를 함께 돌려줍니다.
+- 평점은 값이 0~5점뿐이라 히스토그램 자체가 정확한 스케치이므로 평점 분위수는 오차가 없습니다.
+
+사용 예:
+    sketches = sketch_batches(pq.ParquetFile("reviews.parquet").iter_batches())
+    restaurant_sketches = build_restaurant_sketches(restaurants, sketches)
+    write_sketches("parquet_data", restaurant_sketches)
+
+    groups = merge_rows(read_sketches("parquet_data")['grid_sketches'], 'grid')
+    groups['MN1'].distinct_count('review_id')  # (추정치, 표준오차)
+    groups['MN1'].quantile('text_length', 0.9)  # (값, 하한, 상한, 순위 오차)
+"""
+
+import math
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from utils.review_aggregates import RATING_VALUES, dictionary_codes
+from utils.sketches import HyperLogLog, TDigest, hash_values
+
+SKETCH_TABLES = ('restaurant_sketches', 'grid_sketches')
+DISTINCT_COLUMNS = ('review_id', 'language')   # HyperLogLog로 서로 다른 값의 수를 답하는 열
+QUANTILE_COLUMNS = ('text_length', 'rating')   # 분위수를 답하는 열 (리뷰 길이: t-digest, 평점: 히스토그램)
+
+DIGEST_COMPRESSION = 100   # 레스토랑 행의 t-digest 압축 정도 (행마다 중심점 최대 약 50개)
+DIGEST_BUFFER_SIZE = 4_096
+
+_RATING_COLUMNS = [f'rating_{value}' for value in RATING_VALUES]
+_SKETCH_FIELDS = [
+    pa.field('review_count', pa.int64()),
+    *[pa.field(column, pa.int64()) for column in _RATING_COLUMNS],
+    pa.field('review_id_hll', pa.binary()),
+    pa.field('language_hll', pa.binary()),
+    pa.field('text_length_digest', pa.binary()),
+]
+RESTAURANT_SKETCH_SCHEMA = pa.schema([
+    pa.field('source', pa.string()),
+    pa.field('source_sha256', pa.string()),
+    pa.field('restaurant_id', pa.string()),
+    pa.field('restaurant_name', pa.string()),
+    pa.field('grid', pa.string()),
+    *_SKETCH_FIELDS,
+])
+GRID_SKETCH_SCHEMA = pa.schema([pa.field('grid', pa.string()), pa.field('restaurant_count', pa.int64()),
+                                *_SKETCH_FIELDS])
+
+
+class ReviewSketch:
+    """리뷰 묶음(레스토랑, grid, 티어 등) 하나의 스케치 (병합 가능)"""
+
+    def __init__(self):
+        self.review_count = 0
+        self.ratings = np.zeros(len(RATING_VALUES), dtype=np.int64)
+        self.review_ids = HyperLogLog()
+        self.languages = HyperLogLog()
+        self.text_length = TDigest(DIGEST_COMPRESSION, buffer_size=DIGEST_BUFFER_SIZE)
+
+    def update(self, review_count: int, review_hashes: np.ndarray, language_hashes: np.ndarray,
+               lengths: np.ndarray, ratings: np.ndarray):
+        """
+        리뷰 묶음 반영 (null을 뺀 값 배열)
+
+        Args:
+            review_count: 리뷰 수
+            review_hashes: 리뷰 구분 값(review_id, 없으면 본문)의 해시
+            language_hashes: 언어 해시
+            lengths: 리뷰 길이
+            ratings: 평점 (0~5)
+        """
+        self.review_count += review_count
+        self.review_ids.update(review_hashes)
+        self.languages.update(language_hashes)
+        self.text_length.update(lengths)
+        self.ratings += np.bincount(ratings, minlength=len(RATING_VALUES))[:len(RATING_VALUES)]
+
+    def merge(self, other: 'ReviewSketch') -> 'ReviewSketch':
+        """
+        다른 스케치를 합침
+
+        Returns:
+            self
+        """
+        self.review_count += other.review_count
+        self.ratings += other.ratings
+        self.review_ids.merge(other.review_ids)
+        self.languages.merge(other.languages)
+        self.text_length.merge(other.text_length)
+        return self
+
+    def to_row(self) -> Dict:
+        """테이블 행 (_SKETCH_FIELDS 열)"""
+        return {'review_count': self.review_count,
+                **{column: int(count) for column, count in zip(_RATING_COLUMNS, self.ratings)},
+                'review_id_hll': self.review_ids.to_bytes(), 'language_hll': self.languages.to_bytes(),
+                'text_length_digest': self.text_length.to_bytes()}
+
+    @classmethod
+    def from_row(cls, row: Dict) -> 'ReviewSketch':
+        """to_row() 형식의 행으로 스케치 복원"""
+        sketch = cls()
+        sketch.review_count = row['review_count']
+        sketch.ratings = np.array([row[column] for column in _RATING_COLUMNS], dtype=np.int64)
+        sketch.review_ids = HyperLogLog.from_bytes(row['review_id_hll'])
+        sketch.languages = HyperLogLog.from_bytes(row['language_hll'])
+        sketch.text_length = TDigest.from_bytes(row['text_length_digest'])
+        return sketch
+
+    def distinct_count(self, column: str) -> Tuple[float, float]:
+        """
+        서로 다른 값의 수 추정치
+
+        Args:
+            column: 'review_id' (고유 리뷰 수) 또는 'language' (언어 수)
+
+        Returns:
+            (추정치, 표준오차 - 추정치와 같은 단위)
+        """
+        if column not in DISTINCT_COLUMNS:
+            raise ValueError(f"서로 다른 값의 수를 답할 수 없는 열: {column} (사용 가능: {', '.join(DISTINCT_COLUMNS)})")
+        hll = self.review_ids if column == 'review_id' else self.languages
+        estimate = hll.estimate()
+        return estimate, estimate * hll.relative_error
+
+    def quantile(self, column: str, q: float) -> Tuple[float, float, float, float]:
+        """
+        분위수 근사값과 오차 범위
+
+        Args:
+            column: 'text_length' (t-digest) 또는 'rating' (히스토그램, 정확)
+            q: 0~1 (예: 0.9 = p90)
+
+        Returns:
+            (값, 하한, 상한, 순위 오차 - 비율)
+        """
+        if column == 'text_length':
+            low, high, error = self.text_length.quantile_bounds(q)
+            return self.text_length.quantile(q), low, high, error
+        if column == 'rating':
+            value = histogram_quantile(self.ratings, q)
+            return value, value, value, 0.0
+        raise ValueError(f"분위수를 답할 수 없는 열: {column} (사용 가능: {', '.join(QUANTILE_COLUMNS)})")
+
+
+def histogram_quantile(counts: np.ndarray, q: float) -> float:
+    """평점 히스토그램(0~5점 개수)의 분위수 (numpy 기본 방식과 같은 선형 보간, 없으면 nan)"""
+    total = int(counts.sum())
+    if total == 0:
+        return math.nan
+    position = min(max(q, 0.0), 1.0) * (total - 1)
+    cumulative = np.cumsum(counts)
+    lower = RATING_VALUES[int(np.searchsorted(cumulative, math.floor(position), side='right'))]
+    upper = RATING_VALUES[int(np.searchsorted(cumulative, math.ceil(position), side='right'))]
+    return lower + (upper - lower) * (position - math.floor(position))
+
+
+def _row_hashes(column) -> Tuple[np.ndarray, np.ndarray]:
+    """행별 해시와 null이 아닌 행 마스크 (null 행의 해시는 0)"""
+    valid = np.asarray(pc.is_valid(column), dtype=bool)
+    hashes = np.zeros(len(column), dtype=np.uint64)
+    hashes[valid] = hash_values(column)
+    return hashes, valid
+
+
+def sketch_batches(batches: Iterable) -> Dict[Tuple[str, str], ReviewSketch]:
+    """
+    리뷰 배치를 훑어 (restaurant_id, grid)별 스케치 생성
+
+    해시는 배치 전체에 한 번 계산하고, 배치 안에서 (레스토랑, grid) 순으로 정렬한 행 구간마다 스케치에 반영
+
+    Args:
+        batches: 리뷰 레코드 배치 (restaurant_id, grid, review_id, text, language, text_length, rating 열)
+
+    Returns:
+        (restaurant_id, grid) -> ReviewSketch
+    """
+    sketches = {}
+    restaurants, grids = {}, {}
+    caches = {'restaurant_id': {}, 'grid': {}}
+    for batch in batches:
+        if batch.num_rows == 0:
+            continue
+        restaurant, has_restaurant = dictionary_codes(batch.column('restaurant_id'), restaurants,
+                                                      caches['restaurant_id'])
+        grid, has_grid = dictionary_codes(batch.column('grid'), grids, caches['grid'])
+        review_id = pc.if_else(pc.equal(batch.column('review_id'), ''), None, batch.column('review_id'))
+        review_hashes, has_review = _row_hashes(pc.coalesce(review_id, batch.column('text')))
+        language_hashes, has_language = _row_hashes(batch.column('language'))
+        lengths = batch.column('text_length')
+        has_length = np.asarray(pc.is_valid(lengths), dtype=bool)
+        lengths = lengths.to_numpy(zero_copy_only=False)
+        ratings = batch.column('rating')
+        has_rating = np.asarray(pc.is_valid(ratings), dtype=bool)
+        ratings = pc.fill_null(ratings, 0).to_numpy(zero_copy_only=False).astype(np.int64)
+
+        keys = np.where(has_restaurant & has_grid, (restaurant << 16) | grid, -1)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)]
+        restaurant_values, grid_values = list(restaurants), list(grids)
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            key = int(sorted_keys[start])
+            if key < 0:
+                continue
+            rows = order[start:end]
+            sketch = sketches.setdefault((restaurant_values[key >> 16], grid_values[key & 0xFFFF]), ReviewSketch())
+            sketch.update(len(rows), review_hashes[rows][has_review[rows]],
+                          language_hashes[rows][has_language[rows]], lengths[rows][has_length[rows]],
+                          ratings[rows][has_rating[rows]])
+    return sketches
+
+
+def build_restaurant_sketches(restaurants: pa.Table, sketches: Dict[Tuple[str, str], ReviewSketch]) -> pa.Table:
+    """
+    restaurant_sketches 행 생성 (레스토랑 순서, 리뷰가 없는 레스토랑은 빈 스케치)
+
+    Args:
+        restaurants: 행을 만들 레스토랑 (source, source_sha256, restaurant_id, name, grid)
+        sketches: sketch_batches 결과
+
+    Returns:
+        RESTAURANT_SKETCH_SCHEMA 테이블
+    """
+    rows = []
+    for restaurant in restaurants.select(['source', 'source_sha256', 'restaurant_id', 'name', 'grid']).to_pylist():
+        grid = None if restaurant['grid'] is None else str(restaurant['grid'])
+        sketch = sketches.get((restaurant['restaurant_id'], grid)) or ReviewSketch()
+        rows.append({'source': restaurant['source'], 'source_sha256': restaurant['source_sha256'],
+                     'restaurant_id': restaurant['restaurant_id'], 'restaurant_name': restaurant['name'],
+                     'grid': grid, **sketch.to_row()})
+    return pa.Table.from_pylist(rows, schema=RESTAURANT_SKETCH_SCHEMA)
+
+
+def merge_rows(table: pa.Table, key: Union[str, Callable[[Dict], object]]) -> Dict[object, ReviewSketch]:
+    """
+    스케치 테이블 행을 묶음별로 합침
+
+    Args:
+        table: restaurant_sketches 또는 grid_sketches
+        key: 묶음 기준 열 이름 또는 행 -> 묶음 값 함수 (None을 돌려주면 건너뜀)
+
+    Returns:
+        묶음 값 -> ReviewSketch (처음 등장한 순서)
+    """
+    key_of = (lambda row: row[key]) if isinstance(key, str) else key
+    groups = {}
+    for row in table.to_pylist():
+        group = key_of(row)
+        if group is None:
+            continue
+        sketch = ReviewSketch.from_row(row)
+        if group in groups:
+            groups[group].merge(sketch)
+        else:
+            groups[group] = sketch
+    return groups
+
+
+def build_grid_sketches(restaurant_sketches: pa.Table) -> pa.Table:
+    """restaurant_sketches 행을 grid별로 합친 grid_sketches (grid 이름 순)"""
+    groups = merge_rows(restaurant_sketches, 'grid')
+    restaurant_counts = {}
+    for grid in restaurant_sketches['grid'].to_pylist():
+        restaurant_counts[grid] = restaurant_counts.get(grid, 0) + 1
+    rows = [{'grid': grid, 'restaurant_count': restaurant_counts[grid], **groups[grid].to_row()}
+            for grid in sorted(groups)]
+    return pa.Table.from_pylist(rows, schema=GRID_SKETCH_SCHEMA)
+
+
+def read_sketches(sketch_dir) -> Dict[str, pa.Table]:
+    """스케치 테이블 읽기 (없는 테이블은 빠짐)"""
+    sketch_dir = Path(sketch_dir)
+    return {name: pq.read_table(sketch_dir / f"{name}.parquet") for name in SKETCH_TABLES
+            if (sketch_dir / f"{name}.parquet").exists()}
+
+
+def write_sketches(sketch_dir, restaurant_sketches: pa.Table) -> Dict[str, pa.Table]:
+    """
+    restaurant_sketches와 여기서 다시 만든 grid_sketches를 저장 (임시 파일에 쓴 뒤 교체)
+
+    Returns:
+        저장한 테이블 이름 -> 테이블
+    """
+    sketch_dir = Path(sketch_dir)
+    tables = {'restaurant_sketches': restaurant_sketches, 'grid_sketches': build_grid_sketches(restaurant_sketches)}
+    for name, table in tables.items():
+        path = sketch_dir / f"{name}.parquet"
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        pq.write_table(table, temp_path, compression='snappy')
+        os.replace(temp_path, path)
+    return tables
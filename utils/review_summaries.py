@@ -0,0 +1,288 @@
+"""
+review_summaries.py
+리뷰 요약 테이블 (restaurant_stats, language_stats, grid_stats) 생성 및 증분 갱신
+
+- restaurant_stats: 원본 JSON 파일(레스토랑-grid)마다 한 행. 리뷰 수, 평점 개수/합/제곱합/히스토그램(0~5점),
+  리뷰 길이 합/제곱합/최소/최대와 길이별 개수(text_lengths, text_length_counts)
+- language_stats: 원본 파일 x 언어마다 한 행. 리뷰 수, 평점 합/제곱합/히스토그램, 리뷰 길이 합/최소/최대
+- grid_stats: grid마다 한 행 (restaurant_stats, language_stats를 합친 값 + 평균/중앙값/표준편차)
+
+모든 열이 개수/합계/최소/최대/히스토그램이라 행을 더해서 합칠 수 있으므로, 증분 변환에서는 바뀐 파일의 행만
+다시 계산하고 grid_stats는 남은 행에서 다시 만듭니다 (리뷰 원본을 다시 읽지 않음).
+language와 restaurant_name 열은 리뷰 데이터의 범주 순서(사전 순서)를 그대로 가진 사전 인코딩 열이라,
+이 테이블로 만든 리포트의 동률 순서도 리뷰 데이터로 만든 리포트와 같습니다.
+
+사용 예:
+    categories = {}
+    cells, lengths = summarize_batches(pq.ParquetFile("reviews.parquet").iter_batches(), categories)
+    restaurant_stats, language_stats = build_stats(restaurants, cells, lengths)
+    write_summaries("parquet_data", restaurant_stats, language_stats, categories)
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from utils.review_aggregates import KOREAN, RATING_VALUES, dictionary_codes
+
+SUMMARY_TABLES = ('restaurant_stats', 'language_stats', 'grid_stats')
+CATEGORY_COLUMNS = ('language', 'restaurant_name')
+
+_RESTAURANT_KEYS = ['restaurant_id', 'grid']
+_RATING_COLUMNS = [f'rating_{value}' for value in RATING_VALUES]
+# 부분 집계 열 -> 다시 집계할 때의 함수
+_CELL_MEASURES = {
+    'review_count': 'sum', 'rating_count': 'sum', 'rating_sum': 'sum', 'rating_sq_sum': 'sum',
+    **{column: 'sum' for column in _RATING_COLUMNS},
+    'text_length_count': 'sum', 'text_length_sum': 'sum', 'text_length_sq_sum': 'sum',
+    'text_length_min': 'min', 'text_length_max': 'max',
+}
+
+
+def _regroup(table: pa.Table, keys, measures: Dict[str, str]) -> pa.Table:
+    """부분 집계 테이블을 keys로 다시 집계 (열 이름 유지)"""
+    grouped = table.group_by(keys, use_threads=False).aggregate(
+        [(column, function) for column, function in measures.items()])
+    names = {f"{column}_{function}": column for column, function in measures.items()}
+    return grouped.rename_columns([names.get(name, name) for name in grouped.column_names])
+
+
+def partial_stats(batch) -> Tuple[pa.Table, pa.Table]:
+    """
+    리뷰 배치 하나의 부분 집계 (배치별 결과를 merge_partials로 합칠 수 있음)
+
+    Returns:
+        (cells: (restaurant_id, grid, restaurant_name, language)별 리뷰/평점/길이 집계,
+         lengths: (restaurant_id, grid, text_length)별 리뷰 수)
+    """
+    def text(column):
+        return pc.cast(batch.column(column), pa.string())
+
+    rating = batch.column('rating')
+    length = pc.cast(batch.column('text_length'), pa.int64())
+    rating64 = pc.cast(rating, pa.int64())
+    table = pa.table({
+        'restaurant_id': text('restaurant_id'), 'grid': text('grid'),
+        'restaurant_name': text('restaurant_name'), 'language': text('language'),
+        'review_count': pa.array(np.ones(batch.num_rows, dtype=np.int64)),
+        'rating_count': pc.cast(pc.is_valid(rating), pa.int64()),
+        'rating_sum': rating64,
+        'rating_sq_sum': pc.multiply(rating64, rating64),
+        **{f'rating_{value}': pc.cast(pc.fill_null(pc.equal(rating64, value), False), pa.int64())
+           for value in RATING_VALUES},
+        'text_length_count': pc.cast(pc.is_valid(length), pa.int64()),
+        'text_length_sum': length,
+        'text_length_sq_sum': pc.multiply(length, length),
+        'text_length_min': length,
+        'text_length_max': length,
+    })
+    cells = _regroup(table, _RESTAURANT_KEYS + ['restaurant_name', 'language'], _CELL_MEASURES)
+    lengths = pa.table({'restaurant_id': table['restaurant_id'], 'grid': table['grid'], 'text_length': length,
+                        'review_count': table['review_count']})
+    lengths = _regroup(lengths.filter(pc.is_valid(length)), _RESTAURANT_KEYS + ['text_length'],
+                       {'review_count': 'sum'})
+    return cells, lengths
+
+
+def merge_partials(partials: Iterable[Tuple[pa.Table, pa.Table]]) -> Tuple[Optional[pa.Table], Optional[pa.Table]]:
+    """배치별 부분 집계를 하나로 합침 (없으면 (None, None))"""
+    partials = list(partials)
+    if not partials:
+        return None, None
+    cells = pa.concat_tables([cells for cells, _ in partials])
+    lengths = pa.concat_tables([lengths for _, lengths in partials])
+    if len(partials) > 1:
+        cells = _regroup(cells, _RESTAURANT_KEYS + ['restaurant_name', 'language'], _CELL_MEASURES)
+        lengths = _regroup(lengths, _RESTAURANT_KEYS + ['text_length'], {'review_count': 'sum'})
+    return cells, lengths
+
+
+def summarize_batches(batches: Iterable, categories: Dict[str, Dict[str, int]],
+                      rows_per_partial: int = 100_000) -> Tuple[Optional[pa.Table], Optional[pa.Table]]:
+    """
+    리뷰 배치를 훑어 범주 순서를 기록하고 부분 집계를 합친 결과 반환
+
+    작은 배치(증분 모드의 파일별 리뷰 조각)는 rows_per_partial개까지 모아서 한 번에 부분 집계함
+
+    Args:
+        batches: 리뷰 레코드 배치 (파일 순서)
+        categories: 범주 열 -> 값 순서 (기존 순서 뒤에 처음 보는 값을 추가)
+        rows_per_partial: 부분 집계 하나에 모을 최대 리뷰 수
+
+    Returns:
+        merge_partials 결과
+    """
+    partials = []
+    pending, pending_rows = [], 0
+    for batch in collect_categories(batches, categories):
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        if pending_rows >= rows_per_partial:
+            partials.append(partial_stats(pa.Table.from_batches(pending)))
+            pending, pending_rows = [], 0
+    if pending:
+        partials.append(partial_stats(pa.Table.from_batches(pending)))
+    return merge_partials(partials)
+
+
+def build_stats(restaurants: pa.Table, cells: Optional[pa.Table],
+                lengths: Optional[pa.Table]) -> Tuple[pa.Table, pa.Table]:
+    """
+    부분 집계로 restaurant_stats, language_stats 행 생성 (범주 열은 문자열, write_summaries에서 인코딩)
+
+    Args:
+        restaurants: 행을 만들 레스토랑 (source, source_sha256, restaurant_id, name, grid) - 리뷰가 없는 레스토랑도 한 행
+        cells, lengths: merge_partials 결과 (리뷰가 하나도 없으면 None)
+
+    Returns:
+        (restaurant_stats, language_stats)
+    """
+    restaurants = restaurants.select(['source', 'source_sha256', 'restaurant_id', 'name', 'grid'])
+    restaurants = restaurants.set_column(4, 'grid', pc.cast(restaurants['grid'], pa.string()))
+    if cells is None:
+        empty = {column: pa.array([], pa.string()) for column in _RESTAURANT_KEYS + ['restaurant_name', 'language']}
+        cells, lengths = partial_stats(pa.table({**empty, 'rating': pa.array([], pa.int8()),
+                                                 'text_length': pa.array([], pa.int32())}))
+
+    per_restaurant = _regroup(cells.drop_columns(['restaurant_name', 'language']), _RESTAURANT_KEYS, _CELL_MEASURES)
+    histograms = lengths.sort_by([('restaurant_id', 'ascending'), ('grid', 'ascending'), ('text_length', 'ascending')])
+    histograms = _regroup(histograms, _RESTAURANT_KEYS, {'text_length': 'list', 'review_count': 'list'})
+    histograms = histograms.rename_columns(['restaurant_id', 'grid', 'text_lengths', 'text_length_counts'])
+
+    # 조인은 리스트 열을 옮기지 못하므로 히스토그램은 행 번호로 조인한 뒤 take (행 순서는 restaurants 순서로)
+    histograms = histograms.append_column('histogram_row', pa.array(np.arange(len(histograms), dtype=np.int64)))
+    restaurant_stats = restaurants.append_column('row', pa.array(np.arange(len(restaurants), dtype=np.int64)))
+    restaurant_stats = restaurant_stats.join(per_restaurant, _RESTAURANT_KEYS, join_type='left outer',
+                                             use_threads=False)
+    restaurant_stats = restaurant_stats.join(histograms.select(_RESTAURANT_KEYS + ['histogram_row']),
+                                             _RESTAURANT_KEYS, join_type='left outer', use_threads=False)
+    restaurant_stats = restaurant_stats.sort_by('row')
+    for column in ('text_lengths', 'text_length_counts'):
+        restaurant_stats = restaurant_stats.append_column(
+            column, histograms[column].take(restaurant_stats['histogram_row']))
+    restaurant_stats = restaurant_stats.rename_columns(
+        ['restaurant_name' if name == 'name' else name for name in restaurant_stats.column_names])
+    for column, function in _CELL_MEASURES.items():
+        if function == 'sum':
+            index = restaurant_stats.schema.get_field_index(column)
+            restaurant_stats = restaurant_stats.set_column(index, column, pc.fill_null(restaurant_stats[column], 0))
+
+    language_stats = cells.append_column('cell_row', pa.array(np.arange(len(cells), dtype=np.int64)))
+    language_stats = language_stats.join(restaurant_stats.select(['source', 'restaurant_id', 'grid', 'row']),
+                                         _RESTAURANT_KEYS, join_type='inner', use_threads=False)
+    language_stats = language_stats.sort_by([('row', 'ascending'), ('cell_row', 'ascending')]).select(
+        ['source', 'restaurant_id', 'restaurant_name', 'grid', 'language'] + list(_CELL_MEASURES))
+    restaurant_stats = restaurant_stats.select(
+        ['source', 'source_sha256', 'restaurant_id', 'restaurant_name', 'grid'] + list(_CELL_MEASURES)
+        + ['text_lengths', 'text_length_counts'])
+    return restaurant_stats, language_stats
+
+
+def _histogram_columns(table: pa.Table) -> Dict[str, np.ndarray]:
+    """평점 히스토그램 열로 평균/중앙값/표준편차 계산 (행별, 평점이 없으면 nan)"""
+    counts = np.column_stack([table[column].to_numpy(zero_copy_only=False) for column in _RATING_COLUMNS])
+    values = np.array(RATING_VALUES, dtype=np.float64)
+    total = counts.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = (counts * values).sum(axis=1) / total
+        variance = (counts * (values - mean[:, None]) ** 2).sum(axis=1) / (total - 1)
+        cumulative = counts.cumsum(axis=1)
+        lower = (cumulative > ((total - 1) // 2)[:, None]).argmax(axis=1)
+        upper = (cumulative > (total // 2)[:, None]).argmax(axis=1)
+        median = np.where(total > 0, (values[lower] + values[upper]) / 2, np.nan)
+    return {'rating_mean': mean, 'rating_median': median,
+            'rating_std': np.where(total > 1, np.sqrt(variance), np.nan)}
+
+
+def build_grid_stats(restaurant_stats: pa.Table, language_stats: pa.Table) -> pa.Table:
+    """restaurant_stats, language_stats 행을 grid별로 합친 grid_stats (평균/중앙값/표준편차 포함)"""
+    restaurant_stats = restaurant_stats.set_column(
+        restaurant_stats.schema.get_field_index('grid'), 'grid', pc.cast(restaurant_stats['grid'], pa.string()))
+    grid_stats = _regroup(restaurant_stats.append_column('restaurant_count',
+                                                         pa.array(np.ones(len(restaurant_stats), dtype=np.int64))),
+                          ['grid'], {'restaurant_count': 'sum', **_CELL_MEASURES})
+    korean = language_stats.filter(pc.equal(pc.cast(language_stats['language'], pa.string()), KOREAN))
+    korean = pa.table({'grid': pc.cast(korean['grid'], pa.string()), 'korean_reviews': korean['review_count']})
+    korean = _regroup(korean, ['grid'], {'korean_reviews': 'sum'})
+    grid_stats = grid_stats.join(korean, 'grid', join_type='left outer', use_threads=False)
+    grid_stats = grid_stats.set_column(grid_stats.schema.get_field_index('korean_reviews'), 'korean_reviews',
+                                       pc.fill_null(grid_stats['korean_reviews'], 0))
+    grid_stats = grid_stats.sort_by([('review_count', 'descending'), ('grid', 'ascending')])
+    derived = _histogram_columns(grid_stats)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        derived['text_length_mean'] = (grid_stats['text_length_sum'].to_numpy().astype(np.float64)
+                                       / grid_stats['text_length_count'].to_numpy())
+    grid_stats = grid_stats.select(['grid', 'restaurant_count', 'review_count', 'korean_reviews']
+                                   + [column for column in _CELL_MEASURES if column != 'review_count'])
+    for column, values in derived.items():
+        grid_stats = grid_stats.append_column(column, pa.array(values))
+    return grid_stats
+
+
+def encode_categories(table: pa.Table, column: str, categories: Dict[str, int]) -> pa.Table:
+    """문자열 열을 categories 순서(+ 처음 보는 값은 뒤에)의 사전 인코딩 열로 변환"""
+    values = pc.cast(table[column], pa.string()).combine_chunks()
+    for value in pc.unique(values).to_pylist():
+        if value is not None:
+            categories.setdefault(value, len(categories))
+    dictionary = pa.array(list(categories), pa.string())
+    indices = pc.index_in(values, value_set=dictionary)
+    encoded = pa.DictionaryArray.from_arrays(pc.cast(indices, pa.int32()), dictionary)
+    return table.set_column(table.schema.get_field_index(column), column, encoded)
+
+
+def collect_categories(batches: Iterable, categories: Dict[str, Dict[str, int]]):
+    """리뷰 배치를 훑어 범주 열의 순서(사전 순서, pandas category 순서와 같음)를 기록하며 배치를 그대로 넘김"""
+    caches = {column: {} for column in CATEGORY_COLUMNS}
+    for batch in batches:
+        for column in CATEGORY_COLUMNS:
+            dictionary_codes(batch.column(column), categories.setdefault(column, {}), caches[column])
+        yield batch
+
+
+def read_summaries(summary_dir) -> Dict[str, pa.Table]:
+    """요약 테이블 읽기 (없는 테이블은 빠짐)"""
+    summary_dir = Path(summary_dir)
+    return {name: pq.read_table(summary_dir / f"{name}.parquet") for name in SUMMARY_TABLES
+            if (summary_dir / f"{name}.parquet").exists()}
+
+
+def existing_categories(summaries: Dict[str, pa.Table]) -> Dict[str, Dict[str, int]]:
+    """기존 요약 테이블의 범주 순서"""
+    categories = {}
+    for column, table_name in (('language', 'language_stats'), ('restaurant_name', 'restaurant_stats')):
+        order = categories.setdefault(column, {})
+        if table_name in summaries:
+            dictionary_codes(summaries[table_name][column], order)
+    return categories
+
+
+def write_summaries(summary_dir, restaurant_stats: pa.Table, language_stats: pa.Table,
+                    categories: Dict[str, Dict[str, int]]) -> Dict[str, pa.Table]:
+    """
+    restaurant_stats, language_stats와 여기서 다시 만든 grid_stats를 저장 (임시 파일에 쓴 뒤 교체)
+
+    Args:
+        summary_dir: 저장할 디렉토리
+        categories: 범주 열 -> 값 순서 (리뷰 데이터의 사전 순서)
+
+    Returns:
+        저장한 테이블 이름 -> 테이블
+    """
+    summary_dir = Path(summary_dir)
+    restaurant_stats = encode_categories(restaurant_stats, 'restaurant_name', categories.setdefault('restaurant_name', {}))
+    language_stats = encode_categories(language_stats, 'restaurant_name', categories['restaurant_name'])
+    language_stats = encode_categories(language_stats, 'language', categories.setdefault('language', {}))
+    tables = {'restaurant_stats': restaurant_stats, 'language_stats': language_stats,
+              'grid_stats': build_grid_stats(restaurant_stats, language_stats)}
+    for name, table in tables.items():
+        path = summary_dir / f"{name}.parquet"
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        pq.write_table(table, temp_path, compression='snappy')
+        os.replace(temp_path, path)
+    return tables
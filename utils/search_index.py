@@ -0,0 +1,242 @@
+"""
+search_index.py
+리뷰 본문과 레스토랑 이름의 전문 검색 색인 (SQLite FTS5, Parquet 파일 옆의 search_index.db)
+
+- 한글은 띄어쓰기 단위로 검색되지 않는 경우가 많으므로 한글 구간을 글자 2-gram으로 나눠 색인합니다.
+  ("김치찌개" -> 김치 치찌 찌개 개) 검색어도 같은 방식으로 나눠 연속된 구(phrase)로 찾으므로
+  "김치"로 "김치찌개가"를 찾을 수 있습니다. 영문/숫자는 단어 단위입니다.
+- 문서는 원본 JSON 파일(source) 단위로 추가/삭제되므로 증분 변환에서는 바뀐 파일만 다시 색인합니다.
+- FTS 테이블은 토큰 사본을 저장하지 않는 contentless 테이블이며, 원문은 reviews/restaurants 테이블에 한 번만 저장합니다.
+- 검색 결과는 bm25 점수 순이며, 원문에서 검색어 주변을 잘라 스니펫을 만듭니다.
+
+사용 예:
+    with SearchIndex("parquet_data/search_index.db") as index:
+        for hit in index.search_reviews("김치", limit=5):
+            print(hit['restaurant_name'], hit['snippet'])
+"""
+
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+HANGUL = '\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3'  # 한글 자모, 호환 자모, 완성형 음절
+_RUN_RE = re.compile(f'[{HANGUL}]+|[^\\W{HANGUL}]+')
+_HANGUL_RE = re.compile(f'[{HANGUL}]')
+
+REVIEW_COLUMNS = ('review_id', 'restaurant_id', 'restaurant_name', 'rating', 'language', 'text')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (path TEXT PRIMARY KEY, sha256 TEXT);
+CREATE TABLE IF NOT EXISTS reviews (
+    rowid INTEGER PRIMARY KEY, source TEXT, review_id TEXT, restaurant_id TEXT, restaurant_name TEXT,
+    rating INTEGER, language TEXT, text TEXT);
+CREATE INDEX IF NOT EXISTS reviews_source ON reviews (source);
+CREATE VIRTUAL TABLE IF NOT EXISTS reviews_fts USING fts5 (
+    tokens, content = '', tokenize = 'unicode61 remove_diacritics 2');
+CREATE TABLE IF NOT EXISTS restaurants (
+    rowid INTEGER PRIMARY KEY, source TEXT, restaurant_id TEXT, name TEXT, grid TEXT);
+CREATE INDEX IF NOT EXISTS restaurants_source ON restaurants (source);
+CREATE VIRTUAL TABLE IF NOT EXISTS restaurants_fts USING fts5 (
+    tokens, content = '', tokenize = 'unicode61 remove_diacritics 2');
+"""
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    색인/검색용 토큰 (소문자 영문/숫자 단어, 한글 구간은 글자 2-gram + 마지막 글자)
+
+    마지막 글자를 따로 넣으므로 한 글자 검색어도 접두어 검색(김*)으로 구간의 모든 글자를 찾을 수 있음
+    """
+    tokens = []
+    for run in _RUN_RE.findall((text or '').lower()):
+        if _HANGUL_RE.match(run):
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+            tokens.append(run[-1])
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def match_query(query: str) -> str:
+    """
+    검색어를 FTS5 MATCH 식으로 변환 (단어는 모두 포함, 한글 구간은 2-gram 구)
+
+    Returns:
+        MATCH 식 (검색할 토큰이 없으면 빈 문자열)
+    """
+    terms = []
+    for run in _RUN_RE.findall(query.lower()):
+        if _HANGUL_RE.match(run) and len(run) == 1:
+            terms.append(f'"{run}"*')
+        elif _HANGUL_RE.match(run):
+            terms.append('"' + ' '.join(run[i:i + 2] for i in range(len(run) - 1)) + '"')
+        else:
+            terms.append(f'"{run}"')
+    return ' '.join(terms)
+
+
+def snippet(text: str, query: str, width: int = 40) -> str:
+    """
+    원문에서 검색어가 처음 나오는 곳 주변을 잘라 검색어를 [ ]로 표시 (못 찾으면 앞부분)
+
+    Args:
+        text: 리뷰 원문
+        query: 검색어
+        width: 검색어 앞뒤로 보여줄 글자 수
+    """
+    text = ' '.join((text or '').split())
+    lowered = text.lower()
+    found = [(lowered.find(word), word) for word in query.lower().split() if word in lowered]
+    if not found:
+        return text[:width * 2] + ('…' if len(text) > width * 2 else '')
+    position, word = min(found)
+    start = max(0, position - width)
+    end = min(len(text), position + len(word) + width)
+    marked = f"{text[start:position]}[{text[position:position + len(word)]}]{text[position + len(word):end]}"
+    return ('…' if start > 0 else '') + marked + ('…' if end < len(text) else '')
+
+
+class SearchIndex:
+    """리뷰/레스토랑 전문 검색 색인 (SQLite FTS5)"""
+
+    def __init__(self, db_path):
+        """
+        Args:
+            db_path: 색인 데이터베이스 파일 경로 (없으면 생성)
+        """
+        self.db_path = Path(db_path)
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    # ---- 색인 ----
+
+    def indexed_sources(self) -> Dict[str, str]:
+        """색인된 원본 파일 -> 내용 해시"""
+        return dict(self.connection.execute("SELECT path, sha256 FROM sources"))
+
+    def remove_sources(self, paths: Iterable[str]):
+        """원본 파일 단위로 문서 삭제 (contentless FTS는 색인할 때와 같은 토큰을 넘겨 삭제)"""
+        connection = self.connection
+        with connection:
+            for path in paths:
+                for table, text_column in (('reviews', 'text'), ('restaurants', 'name')):
+                    rows = connection.execute(f"SELECT rowid, {text_column} FROM {table} WHERE source = ?", (path,))
+                    connection.executemany(f"INSERT INTO {table}_fts ({table}_fts, rowid, tokens) "
+                                           f"VALUES ('delete', ?, ?)",
+                                           [(rowid, ' '.join(tokenize(text))) for rowid, text in rows.fetchall()])
+                    connection.execute(f"DELETE FROM {table} WHERE source = ?", (path,))
+                connection.execute("DELETE FROM sources WHERE path = ?", (path,))
+
+    def add_source(self, path: str, sha256: Optional[str], restaurants: Iterable[Dict], review_batches=()):
+        """
+        원본 파일 하나(또는 전체 재색인의 한 묶음)의 레스토랑과 리뷰 추가
+
+        Args:
+            path: 원본 파일 경로 (변환 기록의 상대 경로)
+            sha256: 원본 파일 내용 해시 (다음 증분 색인에서 변경 확인용)
+            restaurants: 레스토랑 정보 (restaurant_id, name, grid)
+            review_batches: 리뷰 레코드 배치/테이블 (REVIEW_COLUMNS 열 포함)
+        """
+        connection = self.connection
+        with connection:
+            self._insert(path, 'restaurants', [(row['restaurant_id'], row['name'], str(row.get('grid') or ''))
+                                               for row in restaurants], 'name')
+            for batch in review_batches:
+                rows = zip(*(batch.column(column).to_pylist() for column in REVIEW_COLUMNS))
+                self._insert(path, 'reviews', list(rows), 'text')
+            connection.execute("INSERT OR REPLACE INTO sources VALUES (?, ?)", (path, sha256))
+
+    def _insert(self, path: str, table: str, rows: List[tuple], text_column: str):
+        """문서 행과 FTS 토큰을 같은 rowid로 추가"""
+        if not rows:
+            return
+        columns = {'reviews': REVIEW_COLUMNS, 'restaurants': ('restaurant_id', 'name', 'grid')}[table]
+        text_position = columns.index(text_column)
+        start = self.connection.execute(f"SELECT IFNULL(MAX(rowid), 0) + 1 FROM {table}").fetchone()[0]
+        placeholders = ', '.join('?' * (len(columns) + 2))
+        self.connection.executemany(f"INSERT INTO {table} (rowid, source, {', '.join(columns)}) "
+                                    f"VALUES ({placeholders})",
+                                    [(start + i, path) + tuple(row) for i, row in enumerate(rows)])
+        self.connection.executemany(f"INSERT INTO {table}_fts (rowid, tokens) VALUES (?, ?)",
+                                    [(start + i, ' '.join(tokenize(row[text_position])))
+                                     for i, row in enumerate(rows)])
+
+    def clear(self):
+        """모든 문서 삭제 (전체 재색인 전)"""
+        with self.connection:
+            for table in ('sources', 'reviews', 'restaurants'):
+                self.connection.execute(f"DELETE FROM {table}")
+            for table in ('reviews_fts', 'restaurants_fts'):
+                self.connection.execute(f"INSERT INTO {table} ({table}) VALUES ('delete-all')")
+
+    def optimize(self):
+        """색인 조각을 합쳐 검색 속도 향상 (대량 추가/삭제 후)"""
+        with self.connection:
+            for table in ('reviews_fts', 'restaurants_fts'):
+                self.connection.execute(f"INSERT INTO {table} ({table}) VALUES ('optimize')")
+
+    def document_counts(self) -> Dict[str, int]:
+        """색인된 리뷰/레스토랑 수"""
+        return {table: self.connection.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+                for table in ('reviews', 'restaurants')}
+
+    # ---- 검색 ----
+
+    def search_reviews(self, query: str, limit: int = 10, snippet_width: int = 40) -> List[Dict]:
+        """
+        리뷰 본문 검색 (bm25 점수 순)
+
+        Args:
+            query: 검색어 (여러 단어는 모두 포함하는 리뷰)
+            limit: 최대 결과 수
+            snippet_width: 스니펫에서 검색어 앞뒤로 보여줄 글자 수
+
+        Returns:
+            [{'review_id', 'restaurant_id', 'restaurant_name', 'rating', 'language', 'score', 'snippet'}, ...]
+        """
+        expression = match_query(query)
+        if not expression:
+            return []
+        rows = self.connection.execute(
+            "SELECT r.review_id, r.restaurant_id, r.restaurant_name, r.rating, r.language, r.text, m.rank "
+            "FROM (SELECT rowid, rank FROM reviews_fts WHERE reviews_fts MATCH ? ORDER BY rank LIMIT ?) AS m "
+            "JOIN reviews AS r ON r.rowid = m.rowid ORDER BY m.rank", (expression, limit)).fetchall()
+        return [{'review_id': review_id, 'restaurant_id': restaurant_id, 'restaurant_name': name,
+                 'rating': rating, 'language': language, 'score': -rank,
+                 'snippet': snippet(text, query, snippet_width)}
+                for review_id, restaurant_id, name, rating, language, text, rank in rows]
+
+    def count_reviews(self, query: str) -> int:
+        """검색어가 들어간 리뷰 수"""
+        expression = match_query(query)
+        if not expression:
+            return 0
+        return self.connection.execute("SELECT count(*) FROM reviews_fts WHERE reviews_fts MATCH ?",
+                                       (expression,)).fetchone()[0]
+
+    def search_restaurants(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        레스토랑 이름 검색 (bm25 점수 순)
+
+        Returns:
+            [{'restaurant_id', 'name', 'grid', 'score'}, ...]
+        """
+        expression = match_query(query)
+        if not expression:
+            return []
+        rows = self.connection.execute(
+            "SELECT r.restaurant_id, r.name, r.grid, m.rank "
+            "FROM (SELECT rowid, rank FROM restaurants_fts WHERE restaurants_fts MATCH ? ORDER BY rank LIMIT ?) AS m "
+            "JOIN restaurants AS r ON r.rowid = m.rowid ORDER BY m.rank", (expression, limit)).fetchall()
+        return [{'restaurant_id': restaurant_id, 'name': name, 'grid': grid, 'score': -rank}
+                for restaurant_id, name, grid, rank in rows]
@@ -0,0 +1,322 @@
+"""
+shard_planner.py
+그리드/레스토랑별 예상 크롤링 시간을 추정하고, 여러 머신(또는 워커)에 균형 있게 작업을 나누는 스크립트
+
+- 비용 모델: 레스토랑당 고정 오버헤드 + 리뷰당 비용 (log/pipeline_log_*.json의 과거 실행 기록으로 보정)
+- 분할: LPT(Longest Processing Time first) - 큰 작업부터 현재 부하가 가장 작은 샤드에 배정
+- 결과: main.py의 --shard_plan / --shard_index 옵션으로 사용할 수 있는 샤드 계획 JSON 파일
+
+사용법:
+    python utils/shard_planner.py --shards 5 --max_reviews 40 --output shard_plan.json
+
+    # 팀원 i (0부터 시작)
+    python main.py --shard_plan shard_plan.json --shard_index 0 --use_tier_based_restaurants --max_reviews 40 --headless
+"""
+
+import argparse
+import csv
+import glob
+import heapq
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 상위 디렉토리를 sys.path에 추가하여 config 모듈을 임포트할 수 있도록 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import TIER_RESTAURANT_COUNT, GRID_TIER_CSV, GRID_INFO_TXT, RESTAURANTS_DIR, LOG_DIR
+
+# 과거 기록이 없을 때 사용하는 기본 비용 (초)
+DEFAULT_SECONDS_PER_RESTAURANT = 25.0  # 페이지 로드, 리뷰 탭/정렬 클릭 (정렬 2회)
+DEFAULT_SECONDS_PER_REVIEW = 0.3       # 스크롤 및 배치 추출
+# --max_reviews가 없을 때 크롤러가 목표로 하는 리뷰 수 (getReviews_optimized.py와 동일)
+UNLIMITED_REVIEW_TARGET = 1000
+# 레스토랑 파일이 아직 없는 그리드에서 사용할 레스토랑당 기본 리뷰 수
+DEFAULT_RATINGS_TOTAL = 500
+
+
+class CrawlCostModel:
+    """레스토랑 단위 크롤링 시간 추정 모델: seconds = per_restaurant + per_review * 예상 리뷰 수"""
+
+    def __init__(self, seconds_per_restaurant: float = DEFAULT_SECONDS_PER_RESTAURANT,
+                 seconds_per_review: float = DEFAULT_SECONDS_PER_REVIEW,
+                 max_reviews: Optional[int] = None):
+        """
+        Args:
+            seconds_per_restaurant: 레스토랑당 고정 오버헤드(초)
+            seconds_per_review: 수집 리뷰 1개당 비용(초)
+            max_reviews: 레스토랑당 최대 리뷰 수 (main.py의 --max_reviews와 동일하게 지정)
+        """
+        self.seconds_per_restaurant = seconds_per_restaurant
+        self.seconds_per_review = seconds_per_review
+        self.max_reviews = max_reviews
+        self.calibrated_from = 0  # 보정에 사용한 그리드 기록 수
+
+    def expected_reviews(self, user_ratings_total: Optional[int]) -> int:
+        """레스토랑에서 실제로 수집될 것으로 예상되는 리뷰 수"""
+        total = user_ratings_total if user_ratings_total is not None else DEFAULT_RATINGS_TOTAL
+        cap = self.max_reviews if self.max_reviews else UNLIMITED_REVIEW_TARGET
+        return max(0, min(int(total), cap))
+
+    def restaurant_seconds(self, restaurant: Dict) -> float:
+        """레스토랑 하나의 예상 크롤링 시간(초)"""
+        reviews = self.expected_reviews(restaurant.get('user_ratings_total'))
+        return self.seconds_per_restaurant + self.seconds_per_review * reviews
+
+    def calibrate(self, log_dir: str = LOG_DIR) -> bool:
+        """
+        pipeline_log_*.json의 그리드별 실행 기록으로 비용 계수 보정
+
+        그리드별 (레스토랑 수, 수집 리뷰 수, 소요 시간)에 대해
+        elapsed = a * restaurants + b * reviews 를 최소제곱으로 적합합니다.
+        그리드별 소요 시간이 없는 예전 로그는 전체 합계를 하나의 표본으로 사용합니다.
+
+        Returns:
+            보정 여부 (표본이 부족하거나 적합 결과가 비정상이면 기본값 유지)
+        """
+        samples = []
+        for log_file in glob.glob(os.path.join(str(log_dir), 'pipeline_log_*.json')):
+            try:
+                with open(log_file, 'r', encoding='utf-8') as f:
+                    log_data = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            results = log_data.get('results', [])
+            per_grid = [r for r in results if r.get('elapsed_seconds') and r.get('reviews_success')]
+            if per_grid:
+                for r in per_grid:
+                    samples.append((r['restaurant_count'], r['review_count'], r['elapsed_seconds']))
+            elif log_data.get('total_restaurants') and log_data.get('elapsed_seconds'):
+                samples.append((log_data['total_restaurants'], log_data.get('total_reviews', 0),
+                                log_data['elapsed_seconds']))
+
+        if len(samples) < 2:
+            return False
+
+        # 2x2 정규방정식 풀이
+        s_rr = sum(r * r for r, _, _ in samples)
+        s_rv = sum(r * v for r, v, _ in samples)
+        s_vv = sum(v * v for _, v, _ in samples)
+        s_rt = sum(r * t for r, _, t in samples)
+        s_vt = sum(v * t for _, v, t in samples)
+        det = s_rr * s_vv - s_rv * s_rv
+        if det <= 0:
+            return False
+
+        a = (s_rt * s_vv - s_vt * s_rv) / det
+        b = (s_vt * s_rr - s_rt * s_rv) / det
+        if a <= 0 or b < 0:
+            # 리뷰 수 정보가 없거나 음수 계수가 나오면 레스토랑 수만으로 적합
+            if s_rr <= 0:
+                return False
+            a, b = s_rt / s_rr, 0.0
+            if a <= 0:
+                return False
+
+        self.seconds_per_restaurant = a
+        self.seconds_per_review = b
+        self.calibrated_from = len(samples)
+        return True
+
+    def to_dict(self) -> Dict:
+        return {
+            'seconds_per_restaurant': round(self.seconds_per_restaurant, 3),
+            'seconds_per_review': round(self.seconds_per_review, 4),
+            'max_reviews': self.max_reviews,
+            'calibrated_from': self.calibrated_from
+        }
+
+
+def load_tier_info(csv_path=GRID_TIER_CSV) -> Dict[str, str]:
+    """grid_tier.csv 파일을 읽어서 {code: tier} 딕셔너리 반환"""
+    tier_dict = {}
+    if not os.path.exists(csv_path):
+        return tier_dict
+
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            code = row.get('code', '').strip()
+            tier = row.get('tier', '').strip()
+            if code and tier:
+                tier_dict[code] = tier
+    return tier_dict
+
+
+def parse_grid_codes(txt_path=GRID_INFO_TXT) -> List[str]:
+    """gridInfo.txt에서 그리드 코드 목록만 순서대로 추출 (예: ["MN1", "MN2", ...])"""
+    codes = []
+    with open(txt_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = re.match(r'^([A-Z]{2})\s+(\d+),', line.strip())
+            if match:
+                codes.append(f"{match.group(1)}{match.group(2)}")
+    return codes
+
+
+def load_restaurants(restaurants_dir: str, code: str) -> Optional[List[Dict]]:
+    """restaurants_{code}.json 로드 (없거나 읽을 수 없으면 None)"""
+    path = os.path.join(str(restaurants_dir), f"restaurants_{code}.json")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def estimate_grid_costs(codes: Sequence[str], model: CrawlCostModel, tier_dict: Dict[str, str],
+                        restaurants_dir: str = RESTAURANTS_DIR,
+                        max_restaurants: Optional[int] = None) -> Dict[str, float]:
+    """
+    그리드별 예상 크롤링 시간(초) 계산
+
+    - 레스토랑 파일이 있으면 각 레스토랑의 user_ratings_total로 합산
+    - 없으면 tier별 목표 레스토랑 수 × 평균 레스토랑 비용으로 추정
+
+    Args:
+        codes: 그리드 코드 목록
+        model: 비용 모델
+        tier_dict: {code: tier}
+        restaurants_dir: 레스토랑 정보 디렉토리
+        max_restaurants: 그리드당 레스토랑 수 고정값 (None이면 tier 기반)
+    """
+    costs = {}
+    missing = []
+    known_restaurant_costs = []
+    for code in codes:
+        target = max_restaurants or TIER_RESTAURANT_COUNT.get(tier_dict.get(code, "MID").upper(), 50)
+        restaurants = load_restaurants(restaurants_dir, code)
+        if restaurants:
+            restaurant_costs = [model.restaurant_seconds(r) for r in restaurants[:target]]
+            known_restaurant_costs.extend(restaurant_costs)
+            costs[code] = sum(restaurant_costs)
+        else:
+            missing.append((code, target))
+
+    if known_restaurant_costs:
+        avg_cost = sum(known_restaurant_costs) / len(known_restaurant_costs)
+    else:
+        avg_cost = model.restaurant_seconds({'user_ratings_total': DEFAULT_RATINGS_TOTAL})
+    for code, target in missing:
+        costs[code] = target * avg_cost
+    return costs
+
+
+def partition_lpt(costs: Dict[str, float], num_shards: int) -> List[Tuple[float, List[str]]]:
+    """
+    LPT 분할: 비용이 큰 작업부터 현재 부하가 가장 작은 샤드에 배정
+
+    Returns:
+        [(샤드 총 비용, [작업 키, ...]), ...] - 샤드 번호 순서
+    """
+    shards = [[0.0, []] for _ in range(num_shards)]
+    heap = [(0.0, i) for i in range(num_shards)]
+    for key in sorted(costs, key=lambda k: (-costs[k], k)):
+        load, i = heapq.heappop(heap)
+        shards[i][0] = load + costs[key]
+        shards[i][1].append(key)
+        heapq.heappush(heap, (shards[i][0], i))
+    return [(load, keys) for load, keys in shards]
+
+
+def order_restaurants_by_cost(restaurants: List[Dict], model: CrawlCostModel) -> List[Dict]:
+    """
+    레스토랑을 예상 시간이 긴 순서로 정렬 (워커 풀에 LPT 순서로 투입하기 위함)
+
+    워커 풀은 먼저 끝난 워커에게 다음 작업을 주므로, 긴 작업을 먼저 투입하면
+    마지막에 긴 작업 하나만 남아 나머지 워커가 노는 상황을 줄일 수 있습니다.
+    """
+    return sorted(restaurants, key=model.restaurant_seconds, reverse=True)
+
+
+def build_shard_plan(codes: Sequence[str], num_shards: int, model: CrawlCostModel,
+                     tier_dict: Dict[str, str], restaurants_dir: str = RESTAURANTS_DIR,
+                     max_restaurants: Optional[int] = None) -> Dict:
+    """샤드 계획 딕셔너리 생성 (JSON으로 저장 가능)"""
+    costs = estimate_grid_costs(codes, model, tier_dict, restaurants_dir, max_restaurants)
+    shards = partition_lpt(costs, num_shards)
+    return {
+        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'num_shards': num_shards,
+        'model': model.to_dict(),
+        'grid_costs': {code: round(costs[code], 1) for code in codes},
+        'shards': [
+            {
+                'shard_index': i,
+                'estimated_seconds': round(load, 1),
+                # 샤드 내에서는 큰 그리드부터 처리
+                'grids': keys
+            }
+            for i, (load, keys) in enumerate(shards)
+        ]
+    }
+
+
+def load_shard_grids(plan_path: str, shard_index: int) -> List[str]:
+    """샤드 계획 파일에서 특정 샤드의 그리드 코드 목록 반환"""
+    with open(plan_path, 'r', encoding='utf-8') as f:
+        plan = json.load(f)
+    shards = plan['shards']
+    if not 0 <= shard_index < len(shards):
+        raise ValueError(f"shard_index는 0~{len(shards) - 1} 범위여야 합니다: {shard_index}")
+    return shards[shard_index]['grids']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='예상 크롤링 시간 기반 그리드 샤드 계획 생성 (LPT)')
+    parser.add_argument('--shards', type=int, required=True,
+                        help='나눌 샤드(머신/팀원) 수')
+    parser.add_argument('--output', type=str, default='shard_plan.json',
+                        help='샤드 계획 출력 파일 (기본값: shard_plan.json)')
+    parser.add_argument('--max_reviews', type=int, default=None,
+                        help='레스토랑당 최대 리뷰 수 (main.py와 동일하게 지정)')
+    parser.add_argument('--max_restaurants', type=int, default=None,
+                        help='그리드당 레스토랑 수 고정값 (기본값: tier 기반)')
+    parser.add_argument('--grid_file', type=str, default=str(GRID_INFO_TXT),
+                        help='Grid 정보 파일 경로')
+    parser.add_argument('--tier_file', type=str, default=str(GRID_TIER_CSV),
+                        help='Tier 정보 CSV 파일 경로')
+    parser.add_argument('--restaurants_dir', type=str, default=str(RESTAURANTS_DIR),
+                        help='레스토랑 정보 디렉토리')
+    parser.add_argument('--log_dir', type=str, default=str(LOG_DIR),
+                        help='과거 pipeline_log_*.json이 있는 디렉토리 (비용 보정용)')
+    args = parser.parse_args()
+
+    if args.shards < 1:
+        parser.error("--shards는 1 이상이어야 합니다.")
+
+    model = CrawlCostModel(max_reviews=args.max_reviews)
+    if model.calibrate(args.log_dir):
+        print(f"✓ 과거 실행 기록 {model.calibrated_from}건으로 비용 모델 보정")
+    else:
+        print("과거 실행 기록이 부족하여 기본 비용 모델을 사용합니다.")
+    print(f"  레스토랑당 {model.seconds_per_restaurant:.1f}초 + 리뷰당 {model.seconds_per_review:.3f}초")
+
+    codes = parse_grid_codes(args.grid_file)
+    tier_dict = load_tier_info(args.tier_file)
+    plan = build_shard_plan(codes, args.shards, model, tier_dict,
+                            args.restaurants_dir, args.max_restaurants)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(plan, f, ensure_ascii=False, indent=4)
+
+    print(f"\n{'샤드':<6} {'그리드 수':<10} {'예상 시간':<12} 그리드")
+    print("=" * 80)
+    for shard in plan['shards']:
+        hours = shard['estimated_seconds'] / 3600
+        print(f"{shard['shard_index']:<6} {len(shard['grids']):<10} {hours:>6.2f}시간    {', '.join(shard['grids'])}")
+
+    loads = [s['estimated_seconds'] for s in plan['shards']]
+    print(f"\n예상 완료 시간(가장 느린 샤드): {max(loads) / 3600:.2f}시간 "
+          f"(평균 {sum(loads) / len(loads) / 3600:.2f}시간)")
+    print(f"✓ 샤드 계획 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
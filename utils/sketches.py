@@ -0,0 +1,386 @@
+"""
+sketches.py
+메모리에 다 올릴 수 없는 리뷰 데이터를 배치 단위로 훑으면서 유지하는 스트리밍 요약 (병합 가능)
+
+- TDigest: 분위수(중앙값, p90 등) 근사. 값을 (평균, 가중치) 중심점 수백 개로 요약하며, 양 끝(q가 0이나 1에 가까운 곳)은
+  중심점을 작게 유지하므로 꼬리 분위수가 정확합니다. 데이터 크기와 관계없이 메모리가 일정하고, 배치/파티션별
+  다이제스트를 merge()로 합칠 수 있습니다 (merging t-digest, 스케일 함수 k1).
+- TopN: 값이 큰 상위 n개 키 (최소 힙). 같은 값이면 먼저 들어온 키를 남기므로 pandas nlargest(keep='first')와 순서가 같습니다.
+- HyperLogLog: 서로 다른 값의 수 근사 (레지스터 2^precision개, 상대 표준오차 1.04 / sqrt(2^precision)).
+  레지스터별 최댓값으로 합치므로 겹치는 집합(예: 여러 grid에 함께 수집된 레스토랑의 리뷰)도 중복 없이 합쳐집니다.
+- TDigest, HyperLogLog는 to_bytes()/from_bytes()로 Parquet binary 열에 저장하고 다른 실행의 결과와 합칠 수 있습니다.
+
+사용 예:
+    digest = TDigest()
+    for batch in pq.ParquetFile("reviews.parquet").iter_batches(columns=['text_length']):
+        digest.update(batch['text_length'].to_numpy(zero_copy_only=False))
+    digest.quantile(0.5), digest.quantile(0.9)
+
+    top = TopN(10)
+    top.update(restaurant_ids, review_counts)
+    top.items()  # [(restaurant_id, review_count), ...] 값 내림차순
+
+    hll = HyperLogLog()
+    hll.update(hash_values(batch['review_id']))
+    hll.estimate(), hll.relative_error
+"""
+
+import heapq
+import math
+import struct
+from typing import Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+DEFAULT_COMPRESSION = 200   # 중심점 수 상한의 기준 (클수록 정확하고 커짐, 중심점은 대략 compression / 2개)
+BUFFER_SIZE = 65_536        # 이만큼 값이 모이면 중심점으로 압축
+HLL_PRECISION = 12          # HyperLogLog 레지스터 수 2^12 (상대 표준오차 약 1.6%)
+
+_DIGEST_HEADER = struct.Struct('<4d')   # compression, count, min, max
+_HLL_DENSE, _HLL_SPARSE = b'D', b'S'
+
+
+def hash_values(values) -> np.ndarray:
+    """
+    값의 64비트 해시 (null 제외, HyperLogLog 입력용)
+
+    pandas hash_array(고정 키 SipHash)를 사용하므로 프로세스/실행이 달라도 같은 값은 같은 해시가 되어
+    저장해 둔 HyperLogLog와 합칠 수 있음. 사전 인코딩 열은 사전 값만 해시한 뒤 행으로 펼침
+
+    Args:
+        values: pyarrow 배열(사전 인코딩 포함), 목록 또는 numpy 배열
+
+    Returns:
+        uint64 해시 배열
+    """
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    if isinstance(values, pa.Array):
+        values = values.drop_null()
+        if pa.types.is_dictionary(values.type):
+            dictionary = hash_values(values.dictionary)
+            return dictionary[values.indices.to_numpy(zero_copy_only=False)]
+        values = values.to_numpy(zero_copy_only=False)
+    import pandas as pd  # 해시에만 사용 (변환 스크립트가 임포트만으로 pandas를 읽지 않도록)
+
+    values = np.asarray(values, dtype=object)
+    return pd.util.hash_array(values, categorize=False)
+
+
+class TDigest:
+    """분위수 근사 다이제스트 (merging t-digest, 병합 가능)"""
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION, buffer_size: int = BUFFER_SIZE):
+        """
+        Args:
+            compression: 압축 정도 (중심점 수 상한의 기준, 클수록 정확)
+            buffer_size: 이만큼 값이 모이면 압축 (다이제스트를 많이 만들 때는 작게)
+        """
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._buffered = 0
+
+    def update(self, values, weights=None):
+        """
+        값 배열(가중치 배열)을 반영 (NaN은 건너뜀)
+
+        Args:
+            values: 값 배열
+            weights: 값별 가중치 (기본값: 모두 1) - 히스토그램(값, 개수)을 그대로 넣을 때 사용
+        """
+        values = np.asarray(values, dtype=np.float64)
+        weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=np.float64)
+        keep = ~np.isnan(values) & (weights > 0)
+        if not keep.all():
+            values, weights = values[keep], weights[keep]
+        if len(values) == 0:
+            return
+        self.count += float(weights.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._buffer.append((values, weights))
+        self._buffered += len(values)
+        if self._buffered >= self.buffer_size:
+            self._compress()
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        """
+        다른 다이제스트를 합침 (다른 배치/파티션/실행의 다이제스트)
+
+        Returns:
+            self
+        """
+        if other.count == 0:
+            return self
+        other._compress()
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._buffer.append((other.means, other.weights))
+        self._buffered += len(other.means)
+        self._compress()
+        return self
+
+    def _compress(self):
+        """버퍼와 중심점을 값 순으로 정렬한 뒤, 스케일 함수 k1 구간(폭 1)마다 하나의 중심점으로 합침"""
+        if not self._buffer:
+            return
+        means = np.concatenate([self.means] + [values for values, _ in self._buffer])
+        weights = np.concatenate([self.weights] + [weights for _, weights in self._buffer])
+        self._buffer, self._buffered = [], 0
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+
+        total = weights.sum()
+        centers = (np.cumsum(weights) - weights / 2) / total
+        scale = self.compression / (2 * math.pi) * np.arcsin(2 * centers - 1)
+        bins = np.floor(scale - scale[0]).astype(np.int64)
+        _, bins = np.unique(bins, return_inverse=True)
+        merged_weights = np.bincount(bins, weights=weights)
+        self.means = np.bincount(bins, weights=means * weights) / merged_weights
+        self.weights = merged_weights
+
+    def quantile(self, q: float) -> float:
+        """
+        분위수 근사값 (중심점 사이는 선형 보간, 양 끝은 실제 최솟값/최댓값)
+
+        Args:
+            q: 0~1 (0.5 = 중앙값)
+
+        Returns:
+            근사값 (값이 없으면 nan)
+        """
+        if self.count == 0:
+            return math.nan
+        self._compress()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centers, [self.count]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(min(max(q, 0.0), 1.0) * self.count, positions, values))
+
+    def cdf(self, value: float) -> float:
+        """값 이하인 비율의 근사값 (quantile의 역함수)"""
+        if self.count == 0:
+            return math.nan
+        self._compress()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centers, [self.count]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(value, values, positions) / self.count)
+
+    def quantile_bounds(self, q: float) -> Tuple[float, float, float]:
+        """
+        분위수 근사값의 오차 범위 (목표 순위 양쪽 중심점 크기로 정한 순위 오차 추정치, 엄밀한 보장은 아님)
+
+        Args:
+            q: 0~1
+
+        Returns:
+            (하한 값, 상한 값, 순위 오차 - 비율, 예: 0.004면 ±0.4%p)
+        """
+        if self.count == 0:
+            return math.nan, math.nan, math.nan
+        self._compress()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        index = int(np.searchsorted(centers, q * self.count))
+        neighbours = self.weights[max(index - 1, 0):index + 1]
+        error = float(neighbours.max()) / 2 / self.count
+        return self.quantile(q - error), self.quantile(q + error), error
+
+    def __len__(self) -> int:
+        """중심점 수"""
+        self._compress()
+        return len(self.means)
+
+    def to_bytes(self) -> bytes:
+        """직렬화 (압축 설정, 개수, 최솟값, 최댓값 + 중심점 평균/가중치)"""
+        self._compress()
+        return _DIGEST_HEADER.pack(self.compression, self.count, self.min, self.max) \
+            + self.means.astype('<f8').tobytes() + self.weights.astype('<f8').tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'TDigest':
+        """to_bytes() 결과로 다이제스트 복원"""
+        compression, count, minimum, maximum = _DIGEST_HEADER.unpack_from(data)
+        digest = cls(compression)
+        centroids = np.frombuffer(data, dtype='<f8', offset=_DIGEST_HEADER.size).astype(np.float64)
+        half = len(centroids) // 2
+        digest.means, digest.weights = centroids[:half], centroids[half:]
+        digest.count, digest.min, digest.max = count, minimum, maximum
+        return digest
+
+
+class TopN:
+    """값이 큰 상위 n개 키 (최소 힙, 같은 값이면 먼저 들어온 키 우선, 병합 가능)"""
+
+    def __init__(self, n: int):
+        """
+        Args:
+            n: 유지할 키 수
+        """
+        self.n = n
+        self._heap: List[Tuple] = []  # (값, -들어온 순서, 키) - 루트가 가장 먼저 밀려날 항목
+        self._order = 0
+
+    def push(self, key: Hashable, value):
+        """키 하나 반영 (상위 n개에 들지 못하면 버림)"""
+        item = (value, -self._order, key)
+        self._order += 1
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, item)
+        elif item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+
+    def update(self, keys: Iterable[Hashable], values):
+        """
+        키/값 배열 반영 (현재 n번째 값보다 작은 값은 힙에 넣기 전에 배열 연산으로 거름)
+
+        Args:
+            keys: 키 목록
+            values: 키별 값 배열
+        """
+        values = np.asarray(values)
+        keys = list(keys)
+        positions = np.arange(len(values))
+        if len(self._heap) >= self.n and len(values):
+            positions = np.flatnonzero(values > self._heap[0][0])
+        elif len(values) > self.n:
+            kth = np.partition(values, len(values) - self.n)[len(values) - self.n]
+            positions = np.flatnonzero(values >= kth)
+        for position in positions.tolist():
+            self.push(keys[position], values[position].item())
+        self._order += len(values) - len(positions)
+
+    def merge(self, other: 'TopN') -> 'TopN':
+        """
+        다른 TopN을 합침 (other가 self 다음 데이터를 본 것으로 간주)
+
+        Returns:
+            self
+        """
+        for value, _, key in sorted(other._heap, key=lambda item: -item[1]):
+            self.push(key, value)
+        return self
+
+    def items(self) -> List[Tuple[Hashable, object]]:
+        """(키, 값) 목록 - 값 내림차순, 같은 값이면 먼저 들어온 순"""
+        return [(key, value) for value, _, key in sorted(self._heap, reverse=True)]
+
+    def min_value(self) -> Optional[object]:
+        """현재 상위 n개 중 가장 작은 값 (n개가 차지 않았으면 None)"""
+        return self._heap[0][0] if len(self._heap) >= self.n else None
+
+
+class HyperLogLog:
+    """서로 다른 값의 수 근사 (병합 가능, 값이 적을 때는 0이 아닌 레지스터만 (위치, 값)으로 보관)"""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        """
+        Args:
+            precision: 레지스터 수의 지수 (4~16, 클수록 정확하고 커짐)
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError(f"precision은 4~16이어야 합니다: {precision}")
+        self.precision = precision
+        self._dense = None   # 레지스터 배열 (희소 표현이 레지스터 수의 1/8을 넘으면 전환)
+        self._index = np.empty(0, dtype=np.int64)
+        self._rank = np.empty(0, dtype=np.uint8)
+
+    @property
+    def registers(self) -> np.ndarray:
+        """레지스터 배열 (2^precision개)"""
+        if self._dense is not None:
+            return self._dense
+        registers = np.zeros(1 << self.precision, dtype=np.uint8)
+        registers[self._index] = self._rank
+        return registers
+
+    def _set_sparse(self, index: np.ndarray, rank: np.ndarray):
+        """(위치, 값) 목록을 위치별 최댓값으로 정리하여 보관 (많으면 레지스터 배열로 전환)"""
+        order = np.lexsort((rank, index))
+        index, rank = index[order], rank[order]
+        last = np.r_[index[1:] != index[:-1], True] if len(index) else np.empty(0, dtype=bool)
+        self._index, self._rank = index[last], rank[last]
+        if len(self._index) * 8 > (1 << self.precision):
+            self._dense = self.registers
+            self._index, self._rank = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray):
+        """
+        64비트 해시 배열 반영 (hash_values 결과)
+
+        위 precision비트로 레지스터를 정하고, 나머지 비트에서 처음 1이 나오는 위치를 레지스터별 최댓값으로 기록
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(hashes) == 0:
+            return
+        width = 64 - self.precision
+        index = (hashes >> np.uint64(width)).astype(np.int64)
+        rest = hashes & np.uint64((1 << width) - 1)
+        _, bit_length = np.frexp(rest.astype(np.float64))
+        rank = (width - bit_length + 1).astype(np.uint8)
+        if self._dense is not None:
+            np.maximum.at(self._dense, index, rank)
+        else:
+            self._set_sparse(np.concatenate([self._index, index]), np.concatenate([self._rank, rank]))
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """
+        다른 HyperLogLog를 합침 (합집합의 서로 다른 값 수)
+
+        Returns:
+            self
+        """
+        if other.precision != self.precision:
+            raise ValueError(f"precision이 다른 HyperLogLog는 합칠 수 없습니다: {self.precision}, {other.precision}")
+        if self._dense is None and other._dense is None:
+            self._set_sparse(np.concatenate([self._index, other._index]), np.concatenate([self._rank, other._rank]))
+        else:
+            self._dense = np.maximum(self.registers, other.registers)
+            self._index, self._rank = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint8)
+        return self
+
+    def estimate(self) -> float:
+        """서로 다른 값의 수 추정치 (작은 값은 선형 카운팅으로 보정)"""
+        registers = self.registers
+        m = len(registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / float(np.sum(np.ldexp(1.0, -registers.astype(np.int64))))
+        zeros = int(np.count_nonzero(registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return estimate
+
+    @property
+    def relative_error(self) -> float:
+        """추정치의 상대 표준오차 (1.04 / sqrt(레지스터 수))"""
+        return 1.04 / math.sqrt(1 << self.precision)
+
+    def to_bytes(self) -> bytes:
+        """직렬화 (0이 아닌 레지스터가 적으면 (위치, 값) 목록, 많으면 레지스터 전체)"""
+        registers = self.registers
+        nonzero = np.flatnonzero(registers)
+        header = struct.pack('<B', self.precision)
+        if len(nonzero) * 3 < len(registers):
+            return _HLL_SPARSE + header + nonzero.astype('<u2').tobytes() + registers[nonzero].tobytes()
+        return _HLL_DENSE + header + registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'HyperLogLog':
+        """to_bytes() 결과로 HyperLogLog 복원"""
+        hll = cls(data[1])
+        body = data[2:]
+        if data[:1] == _HLL_DENSE:
+            hll._dense = np.frombuffer(body, dtype=np.uint8).copy()
+        else:
+            count = len(body) // 3
+            hll._set_sparse(np.frombuffer(body, dtype='<u2', count=count).astype(np.int64),
+                            np.frombuffer(body, dtype=np.uint8, offset=count * 2).copy())
+        return hll
@@ -0,0 +1,316 @@
+"""
+work_queue.py
+여러 대의 머신에서 실행되는 main.py 인스턴스가 공유하는 리스(lease) 기반 작업 큐
+
+- 공유 저장소(SQLite 파일) 하나만 있으면 되며 별도의 코디네이터 프로세스가 필요 없습니다.
+- 각 인스턴스는 작업 단위(그리드 또는 레스토랑)를 리스로 가져가고, 하트비트로 리스를 연장합니다.
+- 하트비트가 끊겨 리스가 만료된 작업은 다음 lease() 호출 시 자동으로 다시 대기열에 들어갑니다.
+
+사용 예:
+    queue = WorkQueue("work_queue.db")
+    queue.enqueue([("grid:MN1", "grid", {"code": "MN1"}, 80)])
+    unit = queue.lease("worker-1", lease_seconds=300)
+    with LeaseHeartbeat(queue, unit['unit_id'], "worker-1", lease_seconds=300):
+        ...  # 작업 수행
+    queue.complete(unit['unit_id'], "worker-1", {"review_count": 1500})
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 작업 상태
+STATUS_PENDING = "pending"
+STATUS_LEASED = "leased"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_units (
+    unit_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    result TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_work_units_status ON work_units (status, priority);
+"""
+
+
+def default_worker_id() -> str:
+    """호스트 이름과 PID로 워커 ID 생성 (예: "laptop-01:12345")"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """SQLite 파일 위에 구현한 리스 기반 작업 큐"""
+
+    def __init__(self, db_path: str, max_attempts: int = 3, busy_timeout: float = 30.0):
+        """
+        초기화
+
+        Args:
+            db_path: 공유 SQLite 파일 경로 (모든 머신이 같은 파일을 바라봐야 함)
+            max_attempts: 작업 하나당 최대 시도 횟수 (초과 시 failed 처리)
+            busy_timeout: 다른 인스턴스가 잠금을 잡고 있을 때 기다릴 최대 시간(초)
+        """
+        self.db_path = str(db_path)
+        self.max_attempts = max_attempts
+        self.busy_timeout = busy_timeout
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """autocommit 모드 연결 생성 (트랜잭션은 BEGIN IMMEDIATE로 직접 관리)"""
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def enqueue(self, units: Iterable[Tuple[str, str, Dict, float]]) -> int:
+        """
+        작업 단위 등록 (이미 등록된 unit_id는 무시하므로 여러 인스턴스가 동시에 호출해도 안전)
+
+        Args:
+            units: (unit_id, kind, payload, priority) 튜플 목록. priority가 클수록 먼저 리스됨
+
+        Returns:
+            새로 추가된 작업 수
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            added = 0
+            for unit_id, kind, payload, priority in units:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO work_units (unit_id, kind, payload, priority, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (unit_id, kind, json.dumps(payload, ensure_ascii=False), priority, now)
+                )
+                added += cursor.rowcount
+            conn.execute("COMMIT")
+            return added
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _requeue_expired(self, conn: sqlite3.Connection, now: float) -> int:
+        """리스가 만료된 작업을 다시 대기 상태로 되돌림 (트랜잭션 내부에서 호출)"""
+        cursor = conn.execute(
+            "UPDATE work_units SET status = ?, owner = NULL, lease_expires = NULL, "
+            "last_error = 'lease expired', updated_at = ? "
+            "WHERE status = ? AND lease_expires < ?",
+            (STATUS_PENDING, now, STATUS_LEASED, now)
+        )
+        return cursor.rowcount
+
+    def lease(self, owner: str, lease_seconds: float = 300.0) -> Optional[Dict]:
+        """
+        대기 중인 작업 하나를 리스
+
+        Args:
+            owner: 워커 ID
+            lease_seconds: 리스 유효 시간(초). 하트비트로 연장하지 않으면 이후 다른 워커가 가져감
+
+        Returns:
+            작업 정보 딕셔너리 (unit_id, kind, payload, attempts) 또는 대기 작업이 없으면 None
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._requeue_expired(conn, now)
+            row = conn.execute(
+                "SELECT unit_id, kind, payload, attempts FROM work_units "
+                "WHERE status = ? ORDER BY priority DESC, rowid LIMIT 1",
+                (STATUS_PENDING,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                "UPDATE work_units SET status = ?, owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE unit_id = ?",
+                (STATUS_LEASED, owner, now + lease_seconds, now, row['unit_id'])
+            )
+            conn.execute("COMMIT")
+            return {
+                'unit_id': row['unit_id'],
+                'kind': row['kind'],
+                'payload': json.loads(row['payload']),
+                'attempts': row['attempts'] + 1
+            }
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def heartbeat(self, unit_id: str, owner: str, lease_seconds: float = 300.0) -> bool:
+        """
+        리스 연장
+
+        Returns:
+            연장 성공 여부 (False면 리스가 이미 만료되어 다른 워커에게 넘어간 상태)
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE work_units SET lease_expires = ?, updated_at = ? "
+                "WHERE unit_id = ? AND owner = ? AND status = ?",
+                (now + lease_seconds, now, unit_id, owner, STATUS_LEASED)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def complete(self, unit_id: str, owner: str, result: Optional[Dict] = None) -> bool:
+        """
+        작업 완료 처리
+
+        리스가 만료되어 다른 워커가 같은 작업을 가져간 뒤라도 결과 자체는 유효하므로,
+        아직 done이 아닌 작업이면 완료로 기록합니다.
+
+        Returns:
+            이번 호출로 완료 처리되었는지 여부
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE work_units SET status = ?, owner = ?, lease_expires = NULL, "
+                "result = ?, updated_at = ? WHERE unit_id = ? AND status != ?",
+                (STATUS_DONE, owner, json.dumps(result or {}, ensure_ascii=False), now,
+                 unit_id, STATUS_DONE)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def fail(self, unit_id: str, owner: str, error: str = "") -> str:
+        """
+        작업 실패 처리 - 최대 시도 횟수 미만이면 다시 대기열로, 아니면 failed
+
+        Returns:
+            변경된 상태 (pending 또는 failed). 이미 다른 워커 소유라면 현재 상태 그대로 반환
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT status, owner, attempts FROM work_units WHERE unit_id = ?",
+                (unit_id,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return STATUS_FAILED
+            if row['status'] != STATUS_LEASED or row['owner'] != owner:
+                conn.execute("COMMIT")
+                return row['status']
+
+            new_status = STATUS_PENDING if row['attempts'] < self.max_attempts else STATUS_FAILED
+            conn.execute(
+                "UPDATE work_units SET status = ?, owner = NULL, lease_expires = NULL, "
+                "last_error = ?, updated_at = ? WHERE unit_id = ?",
+                (new_status, error, now, unit_id)
+            )
+            conn.execute("COMMIT")
+            return new_status
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def counts(self) -> Dict[str, int]:
+        """상태별 작업 수 반환 (만료된 리스는 pending으로 집계)"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT CASE WHEN status = ? AND lease_expires < ? THEN ? ELSE status END AS s, "
+                "COUNT(*) AS n FROM work_units GROUP BY s",
+                (STATUS_LEASED, now, STATUS_PENDING)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        counts = {STATUS_PENDING: 0, STATUS_LEASED: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+        for row in rows:
+            counts[row['s']] = row['n']
+        return counts
+
+    def is_drained(self) -> bool:
+        """대기/진행 중인 작업이 하나도 없는지 여부"""
+        counts = self.counts()
+        return counts[STATUS_PENDING] == 0 and counts[STATUS_LEASED] == 0
+
+    def failed_units(self) -> List[Dict]:
+        """최종 실패한 작업 목록"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT unit_id, attempts, last_error FROM work_units WHERE status = ? ORDER BY unit_id",
+                (STATUS_FAILED,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+
+class LeaseHeartbeat:
+    """작업을 처리하는 동안 백그라운드 스레드에서 주기적으로 리스를 연장하는 컨텍스트 매니저"""
+
+    def __init__(self, queue: WorkQueue, unit_id: str, owner: str,
+                 lease_seconds: float = 300.0, interval: Optional[float] = None):
+        """
+        Args:
+            queue: 작업 큐
+            unit_id: 리스한 작업 ID
+            owner: 워커 ID
+            lease_seconds: 한 번 연장할 때의 리스 시간(초)
+            interval: 하트비트 주기(초). 기본값은 리스 시간의 1/3
+        """
+        self.queue = queue
+        self.unit_id = unit_id
+        self.owner = owner
+        self.lease_seconds = lease_seconds
+        self.interval = interval or max(lease_seconds / 3, 1.0)
+        self.lost = False  # 리스를 다른 워커에게 빼앗겼는지 여부
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not self.queue.heartbeat(self.unit_id, self.owner, self.lease_seconds):
+                    self.lost = True
+                    print(f"경고: [{self.unit_id}] 리스가 만료되어 다른 워커에게 넘어갔습니다.")
+                    return
+            except sqlite3.Error as e:
+                # 일시적인 잠금/네트워크 오류는 다음 주기에 재시도
+                print(f"경고: [{self.unit_id}] 하트비트 실패: {e}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+        return False